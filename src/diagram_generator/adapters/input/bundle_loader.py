@@ -0,0 +1,230 @@
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+from diagram_generator.core.domain.compact_flow import COMPACT_FLOW_STEPS, AnyFlow, CompactFlow
+from diagram_generator.core.domain.component import Component
+from diagram_generator.core.domain.relationship import Relationship
+from diagram_generator.core.domain.view_config import ViewConfig
+from diagram_generator.core.ports.metadata_port import MetadataPort
+from diagram_generator.core.services.profiler import span
+from diagram_generator.core.services.trusted_loader import (
+    TrustedLoader,
+    dump_flow_records,
+    dump_records,
+    schema_version,
+)
+
+BUNDLE_SUFFIX = ".dgb"
+MAGIC = b"DGBUNDLE"
+FORMAT_VERSION = 1
+# Field each record is looked up by, for kinds that have one
+KEY_FIELDS = {"components": "id", "flows": "id", "views": "key"}
+# Magic, then the length of the JSON header that follows it
+_PREAMBLE = struct.Struct("<8sQ")
+# Start and end of one record in its records section
+_SPAN = struct.Struct("<QQ")
+_ALIGNMENT = 8
+
+
+class BundleError(ValueError):
+    """The file is not a bundle this version can read."""
+
+
+def write_bundle( # noqa: PLR0913, PLR0917
+    path: Path,
+    components: Sequence[Component],
+    relationships: Sequence[Relationship],
+    flows: Sequence[AnyFlow],
+    views: Sequence[ViewConfig],
+    source: str = "",
+) -> dict[str, int]:
+    """
+    Writes the model as one bundle and returns the number of records per kind.
+
+    Layout: magic, header length, JSON header, then per kind a records section (a JSON
+    array, so a whole kind decodes in one call), an index section (little-endian uint64
+    start/end of every record in it, so one record decodes alone) and a key section
+    (JSON object of key -> position). Header offsets are relative to the first section.
+    """
+    records = {
+        "components": dump_records(components),
+        "relationships": dump_records(relationships),
+        "flows": dump_flow_records(flows),
+        "views": dump_records(views),
+    }
+    body = bytearray()
+    sections: dict[str, dict[str, list[int]]] = {}
+    for kind, items in records.items():
+        data = bytearray(b"[")
+        spans = array("Q")
+        for position, record in enumerate(items):
+            if position:
+                data += b","
+            spans.append(len(data))
+            data += json.dumps(record, separators=(",", ":")).encode()
+            spans.append(len(data))
+        data += b"]"
+        if sys.byteorder == "big":
+            spans.byteswap()
+
+        sections[kind] = {"records": _append(body, data), "index": _append(body, spans.tobytes())}
+        key = KEY_FIELDS.get(kind)
+        if key:
+            # The first record with a key, as the use case picks it
+            keys: dict[str, int] = {}
+            for position, record in enumerate(items):
+                keys.setdefault(record[key], position)
+            sections[kind]["keys"] = _append(body, json.dumps(keys, separators=(",", ":")).encode())
+
+    counts = {kind: len(items) for kind, items in records.items()}
+    header = json.dumps({
+        "format": FORMAT_VERSION,
+        "schema_version": schema_version(),
+        "source": source,
+        "counts": counts,
+        "sections": sections,
+    }).encode()
+    header += b" " * (-(_PREAMBLE.size + len(header)) % _ALIGNMENT)
+
+    # Written aside and renamed, so readers never map a half-written bundle
+    partial = path.with_name(path.name + ".tmp")
+    with open(partial, "wb") as f:
+        f.write(_PREAMBLE.pack(MAGIC, len(header)))
+        f.write(header)
+        f.write(body)
+    os.replace(partial, path)
+    return counts
+
+
+def _append(body: bytearray, data: bytes | bytearray) -> list[int]:
+    """Appends an 8-byte aligned section and returns its [offset, length]."""
+    body += b"\0" * (-len(body) % _ALIGNMENT)
+    offset = len(body)
+    body += data
+    return [offset, len(data)]
+
+
+class Bundle:
+    """
+    Read-only, memory-mapped view of a bundle written by write_bundle. Nothing is
+    decoded up front: `records` decodes one kind, `record` and `lookup` a single record.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        with open(path, "rb") as f:
+            try:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise BundleError(f"{path} is empty.") from None
+        try:
+            magic, header_length = _PREAMBLE.unpack_from(self._map)
+        except struct.error:
+            magic, header_length = b"", 0
+        if magic != MAGIC:
+            self.close()
+            raise BundleError(f"{path} is not a diagram-generator bundle.")
+
+        self._base = _PREAMBLE.size + header_length
+        header = json.loads(self._map[_PREAMBLE.size:self._base])
+        if header.get("format") != FORMAT_VERSION:
+            self.close()
+            raise BundleError(f"{path} has bundle format {header.get('format')}, expected {FORMAT_VERSION}.")
+        self.schema_version: str | None = header.get("schema_version")
+        self.source: str = header.get("source", "")
+        self.counts: dict[str, int] = header["counts"]
+        self._sections: dict[str, dict[str, list[int]]] = header["sections"]
+        self._keys: dict[str, dict[str, int]] = {}
+
+    def _section(self, kind: str, name: str) -> tuple[int, int]:
+        offset, length = self._sections[kind][name]
+        return self._base + offset, length
+
+    def records(self, kind: str) -> list[dict[str, Any]]:
+        """Every record of `kind`, decoded in one call."""
+        start, length = self._section(kind, "records")
+        records: list[dict[str, Any]] = json.loads(self._map[start:start + length])
+        return records
+
+    def record(self, kind: str, position: int) -> dict[str, Any]:
+        """The record of `kind` at `position`, decoding nothing else."""
+        if not 0 <= position < self.counts[kind]:
+            raise IndexError(f"No {kind} record at position {position}.")
+        records_start, _ = self._section(kind, "records")
+        index_start, _ = self._section(kind, "index")
+        begin, end = _SPAN.unpack_from(self._map, index_start + position * _SPAN.size)
+        record: dict[str, Any] = json.loads(self._map[records_start + begin:records_start + end])
+        return record
+
+    def lookup(self, kind: str, key: str) -> dict[str, Any] | None:
+        """The record of `kind` whose KEY_FIELDS value is `key`, if any."""
+        if kind not in self._keys:
+            start, length = self._section(kind, "keys")
+            self._keys[kind] = json.loads(self._map[start:start + length])
+        position = self._keys[kind].get(key)
+        return None if position is None else self.record(kind, position)
+
+    def close(self) -> None:
+        self._map.close()
+
+
+class BundleMetadataAdapter(MetadataPort):
+    """
+    Loads the model from a compiled bundle (see the `compile` command) instead of a
+    data dir. Discovery was applied when compiling, and each kind is decoded once and
+    cached, so every view of a run works on the same lists.
+    """
+
+    def __init__(self, bundle_path: str, verify_every: int | None = None):
+        self.bundle = Bundle(Path(bundle_path))
+        self.loader = TrustedLoader(verify_every)
+        self._models: dict[str, list[Any]] = {}
+
+    def _load(self, kind: str) -> list[Any]:
+        if kind not in self._models:
+            with span(f"bundle.{kind}", "load", records=self.bundle.counts[kind]):
+                records = self.bundle.records(kind)
+            if kind == "flows":
+                self._models[kind] = self._flows(records)
+            else:
+                self._models[kind] = self.loader.load(kind, records, self.bundle.schema_version)
+        return self._models[kind]
+
+    def _flows(self, records: list[dict[str, Any]]) -> list[AnyFlow]:
+        """Flows in bundle order; ones with at least COMPACT_FLOW_STEPS steps as CompactFlow."""
+        def is_large(record: dict[str, Any]) -> bool:
+            return len(record.get("steps") or ()) >= COMPACT_FLOW_STEPS
+
+        flows = iter(self.loader.load("flows", [r for r in records if not is_large(r)], self.bundle.schema_version))
+        return [CompactFlow.validate(record) if is_large(record) else next(flows) for record in records]
+
+    def load_components(self) -> list[Component]:
+        return self._load("components")
+
+    def load_relationships(self) -> list[Relationship]:
+        return self._load("relationships")
+
+    def load_view_configs(self) -> list[ViewConfig]:
+        return self._load("views")
+
+    def load_flows(self) -> list[AnyFlow]:
+        return self._load("flows")
+
+    def load_view_config(self, key: str) -> ViewConfig | None:
+        """One view, decoded alone."""
+        record = self.bundle.lookup("views", key)
+        return None if record is None else ViewConfig.model_validate(record)
+
+    def load_flow(self, flow_id: str) -> AnyFlow | None:
+        """One flow, decoded alone."""
+        record = self.bundle.lookup("flows", flow_id)
+        if record is None:
+            return None
+        return self._flows([record])[0]
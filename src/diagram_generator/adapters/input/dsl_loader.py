@@ -9,6 +9,7 @@ try:
 except ImportError:
     YAML = None # type: ignore
 
+from diagram_generator.core.domain.compact_flow import COMPACT_FLOW_STEPS, AnyFlow, CompactFlow, StepStore
 from diagram_generator.core.domain.component import (
     Component,
     ComponentType,
@@ -24,6 +25,7 @@ from diagram_generator.core.domain.component import (
 )
 from diagram_generator.core.domain.flow import Flow, FlowStep
 from diagram_generator.core.domain.relationship import Relationship
+from diagram_generator.core.services.profiler import span
 
 
 class DSLVisitor(Visitor[Any]):
@@ -192,10 +194,10 @@ class DSLLoader:
             self.grammar = f.read()
         self.parser = Lark(self.grammar, parser='lalr', propagate_positions=True)
 
-    def load_debug(self) -> tuple[list[Component], list[Relationship], list[Flow]]:
+    def load_debug(self) -> tuple[list[Component], list[Relationship], list[AnyFlow]]:
         relationships = []
         components = []
-        flows = []
+        flows: list[AnyFlow] = []
         
         target_dirs = [
             self.data_dir / "relationships", 
@@ -222,45 +224,10 @@ class DSLLoader:
             processed_files.add(str(file_path))
             
             try:
-                with open(file_path) as f:
-                    text = f.read()
-                
-                config: dict[str, Any] = {}
-                # Parsing YAML Frontmatter
-                if text.startswith("---"):
-                    parts = text.split("---", 2)
-                    if len(parts) >= 3: # noqa: PLR2004
-                        frontmatter = parts[1]
-                        dsl_content = parts[2]
-                        try:
-                            if YAML is not None:
-                                yaml = YAML(typ='safe')
-                                config = yaml.load(frontmatter) or {}
-                                # If config is nested under 'config' key
-                                if "config" in config:
-                                    config = config["config"]
-                            text = dsl_content
-                        except Exception as e:
-                            print(f"Error parsing frontmatter in {file_path}: {e}")
-                
-                tree = self.parser.parse(text)
-                
-                # Use TopDown visitor to handle Group Context
-                visitor = DSLVisitor(flow_id=file_path.stem)
-                
-                visitor.visit_topdown(tree)
-                
-                relationships.extend(visitor.relationships)
-                components.extend(visitor.components)
-                
-                # Create Flow object
-                if visitor.flow_steps:
-                    flow = Flow(
-                        id=file_path.stem, # Filename as ID e.g. "showcase"
-                        description=f"Flow loaded from {file_path.name}",
-                        steps=visitor.flow_steps,
-                        metadata={"source": "dsl", "config": config}
-                    )
+                file_components, file_relationships, flow = self.parse_file(file_path)
+                relationships.extend(file_relationships)
+                components.extend(file_components)
+                if flow:
                     flows.append(flow)
                     
             except Exception as e:
@@ -269,4 +236,55 @@ class DSLLoader:
 
         return components, relationships, flows
 
+    def parse_file(self, file_path: Path) -> tuple[list[Component], list[Relationship], AnyFlow | None]:
+        """
+        Parses one .flow file: its components, its relationships, and its flow (None when it
+        has no steps). Raises on a syntax error.
+        """
+        with open(file_path) as f:
+            text = f.read()
+
+        config: dict[str, Any] = {}
+        # Parsing YAML Frontmatter
+        if text.startswith("---"):
+            parts = text.split("---", 2)
+            if len(parts) >= 3: # noqa: PLR2004
+                frontmatter = parts[1]
+                dsl_content = parts[2]
+                try:
+                    if YAML is not None:
+                        yaml = YAML(typ='safe')
+                        config = yaml.load(frontmatter) or {}
+                        # If config is nested under 'config' key
+                        if "config" in config:
+                            config = config["config"]
+                    text = dsl_content
+                except Exception as e:
+                    print(f"Error parsing frontmatter in {file_path}: {e}")
+
+        with span("dsl.parse", "load", file=str(file_path)):
+            tree = self.parser.parse(text)
+
+            # Use TopDown visitor to handle Group Context
+            visitor = DSLVisitor(flow_id=file_path.stem)
+
+            visitor.visit_topdown(tree)
+
+        # Create Flow object
+        flow = self._build_flow(file_path, visitor.flow_steps, config) if visitor.flow_steps else None
+        return visitor.components, visitor.relationships, flow
+
+    def _build_flow(self, file_path: Path, steps: list[FlowStep], config: dict[str, Any]) -> AnyFlow:
+        """The flow of one .flow file; very long ones are kept as CompactFlow."""
+        description = f"Flow loaded from {file_path.name}"
+        metadata = {"source": "dsl", "config": config}
+        if len(steps) >= COMPACT_FLOW_STEPS:
+            return CompactFlow(file_path.stem, description, StepStore.from_steps(steps), metadata=metadata)
+        return Flow(
+            id=file_path.stem, # Filename as ID e.g. "showcase"
+            description=description,
+            steps=steps,
+            metadata=metadata
+        )
+
 
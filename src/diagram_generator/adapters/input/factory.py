@@ -0,0 +1,37 @@
+from collections.abc import Sequence
+from pathlib import Path
+
+from diagram_generator.adapters.input.bundle_loader import BUNDLE_SUFFIX, BundleMetadataAdapter, write_bundle
+from diagram_generator.adapters.input.sqlite_loader import SQLITE_SUFFIXES, SQLiteMetadataAdapter, write_database
+from diagram_generator.adapters.input.yaml_loader import YAMLMetadataAdapter
+from diagram_generator.core.domain.compact_flow import AnyFlow
+from diagram_generator.core.domain.component import Component
+from diagram_generator.core.domain.relationship import Relationship
+from diagram_generator.core.domain.view_config import ViewConfig
+from diagram_generator.core.ports.metadata_port import MetadataPort
+
+
+def open_metadata(data_path: str) -> MetadataPort:
+    """
+    The adapter for `data_path`, by its suffix: a compiled bundle, a SQLite database,
+    otherwise a YAML/DSL data dir.
+    """
+    suffix = Path(data_path).suffix
+    if suffix == BUNDLE_SUFFIX:
+        return BundleMetadataAdapter(data_path)
+    if suffix in SQLITE_SUFFIXES:
+        return SQLiteMetadataAdapter(data_path)
+    return YAMLMetadataAdapter(data_path)
+
+
+def write_metadata( # noqa: PLR0913, PLR0917
+    path: Path,
+    components: Sequence[Component],
+    relationships: Sequence[Relationship],
+    flows: Sequence[AnyFlow],
+    views: Sequence[ViewConfig],
+    source: str = "",
+) -> dict[str, int]:
+    """Writes a compiled model that open_metadata reads back: a SQLite database by its suffix, else a bundle."""
+    write = write_database if path.suffix in SQLITE_SUFFIXES else write_bundle
+    return write(path, components, relationships, flows, views, source)
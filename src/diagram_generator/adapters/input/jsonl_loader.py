@@ -0,0 +1,88 @@
+import json
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Any
+
+from pydantic import TypeAdapter
+from rich.console import Console
+from rich.table import Table
+
+from diagram_generator.core.domain.compact_flow import COMPACT_FLOW_STEPS, AnyFlow, CompactFlow
+from diagram_generator.core.domain.component import Component
+from diagram_generator.core.domain.flow import Flow
+from diagram_generator.core.domain.relationship import Relationship
+from diagram_generator.core.domain.view_config import ViewConfig
+from diagram_generator.core.ports.metadata_port import MetadataPort
+from diagram_generator.core.services.profiler import span
+
+try:
+    import orjson
+    loads: Callable[[bytes], Any] = orjson.loads
+except ImportError:
+    loads = json.loads
+
+JSONL_PATTERN = "*.jsonl"
+
+
+class JSONLMetadataAdapter(MetadataPort):
+    """
+    Reads `<kind>/*.jsonl` files (components, relationships, flows, views), one JSON
+    record per line, as inventory jobs write them. Every line is validated as it is
+    read, so no raw records are kept; invalid lines are reported by file and line
+    number and skipped. YAMLMetadataAdapter reads these files next to its YAML and
+    .flow sources, so a data dir can mix all three.
+    """
+
+    def __init__(self, data_path: str | Path):
+        self.data_path = Path(data_path)
+
+    def _lines(self, directory: str) -> Iterator[tuple[str, bytes]]:
+        """(location, line) for every non-blank line of the directory's JSONL files, in file name order."""
+        for file_path in sorted((self.data_path / directory).glob(JSONL_PATTERN)):
+            location = file_path.relative_to(self.data_path)
+            with open(file_path, "rb") as f:
+                for number, line in enumerate(f, 1):
+                    if line.strip():
+                        yield f"{location}:{number}", line
+
+    def _validate(self, directory: str, validate: Callable[[bytes], Any]) -> list[Any]:
+        models: list[Any] = []
+        errors: list[tuple[str, str]] = []
+        with span(f"jsonl.{directory}", "load"):
+            for where, line in self._lines(directory):
+                try:
+                    models.append(validate(line))
+                except ValueError as e: # Malformed JSON and ValidationError alike
+                    errors.append((where, str(e).split("\n")[0]))
+
+        if errors:
+            table = Table(title=f"[bold red]Invalid Records in {directory.title()} JSONL Files[/bold red]")
+            table.add_column("Location", style="cyan", no_wrap=True)
+            table.add_column("Error", style="red")
+            for where, error in errors:
+                table.add_row(where, error)
+            console = Console()
+            console.print(table)
+            console.print(f"[yellow]Warning: Skipping invalid {directory}.[/yellow]")
+        return models
+
+    def load_components(self) -> list[Component]:
+        adapter: TypeAdapter[Component] = TypeAdapter(Component)
+        return self._validate("components", adapter.validate_json)
+
+    def load_relationships(self) -> list[Relationship]:
+        return self._validate("relationships", Relationship.model_validate_json)
+
+    def load_view_configs(self) -> list[ViewConfig]:
+        return self._validate("views", ViewConfig.model_validate_json)
+
+    def load_flows(self) -> list[AnyFlow]:
+        """Flows with at least COMPACT_FLOW_STEPS steps are kept as CompactFlow."""
+        def validate(line: bytes) -> AnyFlow:
+            record = loads(line)
+            steps = record.get("steps") if isinstance(record, dict) else None
+            if isinstance(steps, list) and len(steps) >= COMPACT_FLOW_STEPS:
+                return CompactFlow.validate(record)
+            return Flow.model_validate(record)
+
+        return self._validate("flows", validate)
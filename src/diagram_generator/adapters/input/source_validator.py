@@ -0,0 +1,228 @@
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, ClassVar
+
+import yaml
+from pydantic import TypeAdapter, ValidationError
+from ruamel.yaml.resolver import implicit_resolvers
+
+from diagram_generator.adapters.input.dsl_loader import DSLLoader
+from diagram_generator.adapters.input.jsonl_loader import JSONL_PATTERN, loads
+from diagram_generator.core.domain.compact_flow import COMPACT_FLOW_STEPS, AnyFlow, CompactFlow
+from diagram_generator.core.domain.component import Component
+from diagram_generator.core.domain.flow import Flow
+from diagram_generator.core.domain.relationship import Relationship
+from diagram_generator.core.domain.view_config import ViewConfig
+from diagram_generator.core.services.model_integrity import CHECKS, IntegrityChecker, SourceSummary, issue
+
+# The directories YAMLMetadataAdapter reads records from; .flow files are read from DSL_DIRS
+KINDS = ("components", "relationships", "flows", "views")
+DSL_DIRS = ("relationships", "flows")
+
+
+class _Loader(getattr(yaml, "CSafeLoader", yaml.SafeLoader)): # type: ignore[misc]
+    """
+    PyYAML's libyaml-backed safe loader, several times faster than ruamel.yaml's, with ruamel's
+    YAML 1.2 plain scalar rules (`yes` is a string), so values come out as YAMLMetadataAdapter reads them.
+    """
+
+    yaml_implicit_resolvers: ClassVar[dict[str | None, list[tuple[str, Any]]]] = {}
+
+    def construct_mapping(self, node: yaml.MappingNode, deep: bool = False) -> dict[Any, Any]:
+        """Rejects a repeated key, as ruamel.yaml does, rather than keeping its last value."""
+        seen = set()
+        for key, _ in node.value:
+            if isinstance(key, yaml.ScalarNode) and key.tag != "tag:yaml.org,2002:merge":
+                if (key.tag, key.value) in seen:
+                    raise yaml.constructor.ConstructorError(
+                        "while constructing a mapping", node.start_mark,
+                        f"found duplicate key {key.value!r}", key.start_mark,
+                    )
+                seen.add((key.tag, key.value))
+        return super().construct_mapping(node, deep=deep)  # type: ignore[no-any-return]
+
+
+def _construct_int(loader: _Loader, node: yaml.ScalarNode) -> int:
+    """A YAML 1.2 int, as ruamel reads it: a leading 0 is not octal, 0o is."""
+    value = loader.construct_scalar(node).replace("_", "")
+    sign = -1 if value[0] == "-" else 1
+    value = value.lstrip("+-")
+    for prefix, base in (("0b", 2), ("0x", 16), ("0o", 8)):
+        if value.startswith(prefix):
+            return sign * int(value[2:], base)
+    return sign * int(value)
+
+
+for _versions, _tag, _regexp, _first in implicit_resolvers:
+    if (1, 2) in _versions:
+        _Loader.add_implicit_resolver(_tag, _regexp, _first)
+_Loader.add_constructor("tag:yaml.org,2002:int", _construct_int)
+
+
+class SourceValidator:
+    """
+    Validates every source file of a data dir the way YAMLMetadataAdapter reads them
+    (`<kind>/*.yaml`, `<kind>/*.jsonl` and the .flow files): each file is parsed and its
+    records schema-checked, across a pool of worker processes with more than one worker,
+    then the files' summaries are checked against one another (see IntegrityChecker).
+    """
+
+    def __init__(self, data_dir: str | Path):
+        self.data_dir = Path(data_dir)
+        if not self.data_dir.is_dir():
+            raise ValueError(f"{data_dir} is not a data directory.")
+
+    def files(self) -> list[tuple[str, str]]:
+        """(kind, path relative to the data dir) of every source file, by kind and then name."""
+        files: list[tuple[str, str]] = []
+        for kind in KINDS:
+            directory = self.data_dir / kind
+            patterns = ["*.yaml", JSONL_PATTERN, *(["*.flow"] if kind in DSL_DIRS else [])]
+            paths = sorted(path for pattern in patterns for path in directory.glob(pattern))
+            files.extend((kind, str(path.relative_to(self.data_dir))) for path in paths)
+        return files
+
+    def run(self, workers: int = 1) -> dict[str, Any]:
+        """
+        The report: whether no error was found, issue counts by severity and check, record
+        and file counts, and the issues (see IntegrityChecker.check).
+        """
+        files = self.files()
+        if workers > 1 and len(files) > 1:
+            # Largest files first, so that none starts last
+            order = sorted(range(len(files)), key=lambda i: -(self.data_dir / files[i][1]).stat().st_size)
+            with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(str(self.data_dir),)) as pool:
+                by_index = dict(zip(order, pool.map(_summarize, [files[i] for i in order]), strict=True))
+            summaries = [by_index[i] for i in range(len(files))]
+        else:
+            reader = _SourceReader(self.data_dir)
+            summaries = [reader.summarize(*file) for file in files]
+
+        issues = IntegrityChecker(summaries).check()
+        summary = {check: 0 for check in CHECKS}
+        severities = {"error": 0, "warning": 0}
+        for found in issues:
+            summary[found["check"]] += 1
+            severities[found["severity"]] += 1
+        return {
+            "passed": severities["error"] == 0,
+            "errors": severities["error"],
+            "warnings": severities["warning"],
+            "files": len(files),
+            "records": sum(s.records for s in summaries),
+            "summary": summary,
+            "issues": issues,
+        }
+
+
+class _SourceReader:
+    """Parses and schema-checks source files one at a time, into their SourceSummary."""
+
+    def __init__(self, data_dir: Path):
+        self.data_dir = data_dir
+        self.dsl = DSLLoader(data_dir)
+        self.component_adapter: TypeAdapter[Component] = TypeAdapter(Component)
+        self.flow_adapter = TypeAdapter(Flow)
+
+    def summarize(self, kind: str, path: str) -> SourceSummary:
+        summary = SourceSummary(path, 0, [], [], [], [], [])
+        if path.endswith(".flow"):
+            return self._summarize_dsl(summary)
+        records = self._records(kind, summary)
+        for location, record in records:
+            try:
+                self._add(kind, location, record, summary)
+            except ValidationError as e:
+                errors = "; ".join(f"{'.'.join(map(str, err['loc'])) or kind}: {err['msg']}" for err in e.errors())
+                summary.issues.append(issue("schema", location, errors))
+            except (TypeError, ValueError) as e:
+                summary.issues.append(issue("schema", location, str(e)))
+        return summary._replace(records=len(records))
+
+    def _records(self, kind: str, summary: SourceSummary) -> list[tuple[str, Any]]:
+        """(location, raw record) of a YAML or JSONL file; a file that does not parse has none."""
+        file_path = self.data_dir / summary.path
+        records: list[tuple[str, Any]] = []
+        if summary.path.endswith(".jsonl"):
+            with open(file_path, "rb") as f:
+                for number, line in enumerate(f, 1):
+                    if not line.strip():
+                        continue
+                    try:
+                        records.append((f"{summary.path}:{number}", loads(line)))
+                    except ValueError as e:
+                        summary.issues.append(issue("parse", f"{summary.path}:{number}", str(e)))
+            return records
+
+        documents: list[Any] = []
+        try:
+            with open(file_path) as f:
+                for data in yaml.load_all(f, Loader=_Loader):
+                    if isinstance(data, list):
+                        documents.extend(data)
+                    elif data:
+                        documents.append(data)
+        except yaml.YAMLError as e:
+            summary.issues.append(issue("parse", summary.path, " ".join(str(e).split())))
+            return records
+        # Unwrapped from the root key, as YAMLMetadataAdapter does
+        unwrapped: list[Any] = []
+        for item in documents:
+            if isinstance(item, dict) and isinstance(item.get(kind), list):
+                unwrapped.extend(item[kind])
+            else:
+                unwrapped.append(item)
+        return [(f"{summary.path}#{number}", record) for number, record in enumerate(unwrapped, 1)]
+
+    def _add(self, kind: str, location: str, record: Any, summary: SourceSummary) -> None:
+        if kind == "components":
+            component = self.component_adapter.validate_python(record)
+            summary.components.append((location, component.id, component.metadata.get("group"), True))
+        elif kind == "relationships":
+            relationship = Relationship.model_validate(record)
+            summary.relationships.append((location, relationship.source_id, relationship.target_id))
+        elif kind == "flows":
+            steps = record.get("steps") if isinstance(record, dict) else None
+            flow: AnyFlow
+            if isinstance(steps, list) and len(steps) >= COMPACT_FLOW_STEPS:
+                flow = CompactFlow.validate(record)
+            else:
+                flow = self.flow_adapter.validate_python(record)
+            self._add_flow(location, flow, summary)
+        else:
+            view = ViewConfig.model_validate(record)
+            summary.views.append((location, view.key, view.flow_id, view.scope_id))
+
+    def _add_flow(self, location: str, flow: AnyFlow, summary: SourceSummary) -> None:
+        steps = [
+            (step.source_id, step.target_id) for step in flow.steps if (step.metadata or {}).get("type") != "note"
+        ]
+        summary.flows.append((location, flow.id, steps))
+
+    def _summarize_dsl(self, summary: SourceSummary) -> SourceSummary:
+        try:
+            components, relationships, flow = self.dsl.parse_file(self.data_dir / summary.path)
+        except Exception as e:
+            summary.issues.append(issue("parse", summary.path, " ".join(str(e).split())))
+            return summary
+        # DSL components may restate YAML ones (to group them), so they are not duplicates
+        summary.components.extend((summary.path, c.id, c.metadata.get("group"), False) for c in components)
+        summary.relationships.extend((summary.path, r.source_id, r.target_id) for r in relationships)
+        if flow:
+            self._add_flow(summary.path, flow, summary)
+        return summary._replace(records=len(components) + len(relationships) + (1 if flow else 0))
+
+
+# The reader of a worker process of a parallel run
+_worker: dict[str, _SourceReader] = {}
+
+
+def _init_worker(data_dir: str) -> None:
+    # The DSL parser reports frontmatter errors on stdout, which may hold a JSON report
+    sys.stdout = sys.stderr
+    _worker["reader"] = _SourceReader(Path(data_dir))
+
+
+def _summarize(file: tuple[str, str]) -> SourceSummary:
+    return _worker["reader"].summarize(*file)
@@ -0,0 +1,293 @@
+import json
+import os
+import sqlite3
+from collections.abc import Iterable, Sequence
+from itertools import groupby
+from pathlib import Path
+from typing import Any, Literal
+
+from diagram_generator.core.domain.compact_flow import COMPACT_FLOW_STEPS, AnyFlow, CompactFlow
+from diagram_generator.core.domain.component import Component
+from diagram_generator.core.domain.relationship import Relationship
+from diagram_generator.core.domain.view_config import ViewConfig
+from diagram_generator.core.ports.metadata_port import MetadataPort
+from diagram_generator.core.services.component_hierarchy import group_path
+from diagram_generator.core.services.profiler import span
+from diagram_generator.core.services.trusted_loader import (
+    TrustedLoader,
+    dump_flow_records,
+    dump_records,
+    schema_version,
+)
+
+SQLITE_SUFFIXES = (".sqlite", ".db")
+
+# Records are kept as JSON next to the columns they are queried by. `position` is the
+# record's place in the data dir, so every query can return records in model order.
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE components (
+    position INTEGER PRIMARY KEY, id TEXT NOT NULL UNIQUE, type TEXT NOT NULL, grp TEXT NOT NULL, record TEXT NOT NULL
+);
+CREATE INDEX components_type ON components (type, position);
+CREATE INDEX components_grp ON components (grp, position);
+CREATE TABLE component_tags (tag TEXT NOT NULL, position INTEGER NOT NULL, PRIMARY KEY (tag, position)) WITHOUT ROWID;
+CREATE TABLE relationships (
+    position INTEGER PRIMARY KEY, source_id TEXT NOT NULL, target_id TEXT NOT NULL, record TEXT NOT NULL
+);
+CREATE INDEX relationships_source ON relationships (source_id, position);
+CREATE INDEX relationships_target ON relationships (target_id, position);
+CREATE TABLE flows (position INTEGER PRIMARY KEY, id TEXT NOT NULL, steps INTEGER NOT NULL, record TEXT NOT NULL);
+CREATE INDEX flows_id ON flows (id, position);
+CREATE TABLE steps (
+    flow INTEGER NOT NULL, position INTEGER NOT NULL, source_id TEXT NOT NULL, target_id TEXT NOT NULL,
+    record TEXT NOT NULL, PRIMARY KEY (flow, position)
+) WITHOUT ROWID;
+CREATE INDEX steps_source ON steps (source_id);
+CREATE INDEX steps_target ON steps (target_id);
+CREATE TABLE views (position INTEGER PRIMARY KEY, key TEXT NOT NULL, record TEXT NOT NULL);
+CREATE INDEX views_key ON views (key, position);
+"""
+
+Direction = Literal["out", "in", "both"]
+
+# Conditions on `components`, shared by the indexed queries and filter_graph
+_TAGGED = "position IN (SELECT position FROM component_tags WHERE tag IN (SELECT value FROM json_each(:tags)))"
+_TYPED = "type IN (SELECT value FROM json_each(:types))"
+
+
+def write_database( # noqa: PLR0913, PLR0917
+    path: Path,
+    components: Sequence[Component],
+    relationships: Sequence[Relationship],
+    flows: Sequence[AnyFlow],
+    views: Sequence[ViewConfig],
+    source: str = "",
+) -> dict[str, int]:
+    """Writes the model to a new SQLite database at `path` and returns the number of records per kind."""
+    partial = path.with_name(path.name + ".tmp")
+    partial.unlink(missing_ok=True)
+    connection = sqlite3.connect(partial)
+    try:
+        connection.executescript("PRAGMA journal_mode = OFF; PRAGMA synchronous = OFF;" + SCHEMA)
+        counts = _insert(connection, components, relationships, flows, views)
+        connection.executemany(
+            "INSERT INTO meta VALUES (?, ?)", [("schema_version", schema_version()), ("source", source)]
+        )
+        connection.commit()
+    finally:
+        connection.close()
+    # Built aside and renamed, so readers never open a half-written database
+    os.replace(partial, path)
+    return counts
+
+
+def _insert(
+    connection: sqlite3.Connection,
+    components: Sequence[Component],
+    relationships: Sequence[Relationship],
+    flows: Sequence[AnyFlow],
+    views: Sequence[ViewConfig],
+) -> dict[str, int]:
+    component_records = dump_records(components)
+    connection.executemany("INSERT INTO components VALUES (?, ?, ?, ?, ?)", (
+        (position, record["id"], record["type"], group_path((record.get("metadata") or {}).get("group")),
+         _encode(record))
+        for position, record in enumerate(component_records)
+    ))
+    connection.executemany("INSERT OR IGNORE INTO component_tags VALUES (?, ?)", (
+        (tag, position) for position, record in enumerate(component_records) for tag in record.get("tags") or ()
+    ))
+    connection.executemany("INSERT INTO relationships VALUES (?, ?, ?, ?)", (
+        (position, record["source_id"], record["target_id"], _encode(record))
+        for position, record in enumerate(dump_records(relationships))
+    ))
+
+    flow_records = dump_flow_records(flows)
+    for position, record in enumerate(flow_records):
+        steps = record.pop("steps", [])
+        connection.execute(
+            "INSERT INTO flows VALUES (?, ?, ?, ?)", (position, record["id"], len(steps), _encode(record))
+        )
+        connection.executemany("INSERT INTO steps VALUES (?, ?, ?, ?, ?)", (
+            (position, index, step["source_id"], step["target_id"], _encode(step)) for index, step in enumerate(steps)
+        ))
+
+    view_records = dump_records(views)
+    connection.executemany("INSERT INTO views VALUES (?, ?, ?)", (
+        (position, record["key"], _encode(record)) for position, record in enumerate(view_records)
+    ))
+    return {
+        "components": len(component_records),
+        "relationships": len(relationships),
+        "flows": len(flow_records),
+        "views": len(view_records),
+    }
+
+
+def _encode(record: dict[str, Any]) -> str:
+    return json.dumps(record, separators=(",", ":"))
+
+
+def _in_groups(groups: Iterable[str]) -> tuple[str, dict[str, str]]:
+    """A condition on `components` for any of `groups` or a group nested under one ("Bank" matches "Bank.Core")."""
+    conditions, parameters = [], {}
+    for index, group in enumerate(group_path(g) for g in groups):
+        # '/' sorts right after '.', so the range covers exactly the "group." prefix
+        conditions.append(f"grp = :group{index} OR (grp >= :from{index} AND grp < :to{index})")
+        parameters.update({f"group{index}": group, f"from{index}": f"{group}.", f"to{index}": f"{group}/"})
+    return f"({' OR '.join(conditions)})", parameters
+
+
+class SQLiteMetadataAdapter(MetadataPort):
+    """
+    Loads the model from a database written by `compile --output model.sqlite`.
+    The database is opened read-only, so any number of processes can share it, and
+    besides the MetadataPort loads it answers indexed queries (by id, tag, type,
+    group prefix and relationship end) and evaluates a view's filters in SQL (see
+    FilteringMetadataPort), without loading the rest of the model.
+    """
+
+    def __init__(self, db_path: str, verify_every: int | None = None):
+        self.db_path = Path(db_path)
+        if not self.db_path.exists():
+            raise FileNotFoundError(f"Database {db_path} does not exist.")
+        self.connection = sqlite3.connect(f"{self.db_path.resolve().as_uri()}?mode=ro", uri=True)
+        self.loader = TrustedLoader(verify_every)
+        meta = dict(self.connection.execute("SELECT key, value FROM meta").fetchall())
+        self.schema_version: str | None = meta.get("schema_version")
+        self.source: str = meta.get("source", "")
+        # Whole-model loads, cached so every view of a run works on the same lists
+        self._models: dict[str, list[Any]] = {}
+
+    def _records(self, sql: str, parameters: Sequence[Any] | dict[str, Any] = ()) -> list[dict[str, Any]]:
+        return [json.loads(record) for record, in self.connection.execute(sql, parameters)]
+
+    def _components(self, where: str = "", parameters: Sequence[Any] | dict[str, Any] = ()) -> list[Component]:
+        records = self._records(f"SELECT record FROM components {where} ORDER BY position", parameters)
+        return self.loader.load("components", records, self.schema_version)
+
+    def _relationships(self, where: str = "", parameters: Sequence[Any] | dict[str, Any] = ()) -> list[Relationship]:
+        records = self._records(f"SELECT record FROM relationships {where} ORDER BY position", parameters)
+        return self.loader.load("relationships", records, self.schema_version)
+
+    def _load(self, kind: str) -> list[Any]:
+        if kind not in self._models:
+            with span(f"sqlite.{kind}", "load"):
+                if kind == "components":
+                    self._models[kind] = self._components()
+                elif kind == "relationships":
+                    self._models[kind] = self._relationships()
+                elif kind == "flows":
+                    self._models[kind] = self._flows()
+                else:
+                    records = self._records("SELECT record FROM views ORDER BY position")
+                    self._models[kind] = self.loader.load("views", records, self.schema_version)
+        return self._models[kind]
+
+    def load_components(self) -> list[Component]:
+        return self._load("components")
+
+    def load_relationships(self) -> list[Relationship]:
+        return self._load("relationships")
+
+    def load_view_configs(self) -> list[ViewConfig]:
+        return self._load("views")
+
+    def load_flows(self) -> list[AnyFlow]:
+        return self._load("flows")
+
+    def _flows(self, flow_id: str | None = None) -> list[AnyFlow]:
+        where, parameters = ("WHERE id = ?", (flow_id,)) if flow_id is not None else ("", ())
+        headers = self.connection.execute(
+            f"SELECT position, steps, record FROM flows {where} ORDER BY position", parameters
+        ).fetchall()
+        step_rows = self.connection.execute(
+            f"SELECT flow, record FROM steps WHERE flow IN (SELECT position FROM flows {where}) "
+            "ORDER BY flow, position",
+            parameters,
+        )
+        steps = {flow: [json.loads(record) for _, record in rows] for flow, rows in groupby(step_rows, lambda r: r[0])}
+
+        records, large = [], []
+        for position, step_count, header in headers:
+            record = json.loads(header)
+            record["steps"] = steps.get(position, [])
+            records.append(record)
+            large.append(step_count >= COMPACT_FLOW_STEPS)
+
+        flows = iter(self.loader.load(
+            "flows", [r for r, is_large in zip(records, large, strict=True) if not is_large], self.schema_version
+        ))
+        return [
+            CompactFlow.validate(r) if is_large else next(flows) for r, is_large in zip(records, large, strict=True)
+        ]
+
+    def load_flow(self, flow_id: str) -> AnyFlow | None:
+        """One flow (the first with that id, as the use case picks it) and its steps."""
+        flows = self._flows(flow_id)
+        return flows[0] if flows else None
+
+    def load_view_config(self, key: str) -> ViewConfig | None:
+        records = self._records("SELECT record FROM views WHERE key = ? ORDER BY position LIMIT 1", (key,))
+        return self.loader.load("views", records, self.schema_version)[0] if records else None
+
+    def load_component(self, component_id: str) -> Component | None:
+        components = self._components("WHERE id = ?", (component_id,))
+        return components[0] if components else None
+
+    def components_with_tags(self, tags: Iterable[str]) -> list[Component]:
+        """Components carrying any of `tags`, in model order."""
+        return self._components(f"WHERE {_TAGGED}", {"tags": json.dumps(list(tags))})
+
+    def components_of_type(self, component_type: str) -> list[Component]:
+        return self._components("WHERE type = ?", (component_type,))
+
+    def components_in_group(self, group: str) -> list[Component]:
+        """Components in group `group` or any group nested under it ("Bank" matches "Bank.Core")."""
+        in_groups, parameters = _in_groups([group])
+        return self._components(f"WHERE {in_groups}", parameters)
+
+    def relationships_of(self, component_id: str, direction: Direction = "both") -> list[Relationship]:
+        """Relationships leaving (`out`), entering (`in`) or touching (`both`) a component."""
+        conditions = {
+            "out": "source_id = :id",
+            "in": "target_id = :id",
+            "both": "position IN (SELECT position FROM relationships WHERE source_id = :id "
+                    "UNION SELECT position FROM relationships WHERE target_id = :id)",
+        }
+        return self._relationships(f"WHERE {conditions[direction]}", {"id": component_id})
+
+    def filter_graph(self, view_config: ViewConfig) -> tuple[list[Component], list[Relationship]]:
+        """
+        GenerateDiagramUseCase.filter_graph evaluated in SQL: the components matching every
+        filter the view sets (any of its tags, types and groups) and the relationships
+        between them, in model order.
+        """
+        filters = view_config.filters
+        conditions: list[str] = []
+        parameters: dict[str, str] = {}
+        if filters and filters.tags:
+            conditions.append(_TAGGED)
+            parameters["tags"] = json.dumps(filters.tags)
+        if filters and filters.types:
+            conditions.append(_TYPED)
+            parameters["types"] = json.dumps(filters.types)
+        if filters and filters.groups:
+            in_groups, group_parameters = _in_groups(filters.groups)
+            conditions.append(in_groups)
+            parameters.update(group_parameters)
+        if not conditions:
+            return self.load_components(), self.load_relationships()
+
+        where = " AND ".join(conditions)
+        components = self._components(f"WHERE {where}", parameters)
+        relationships = self._relationships(
+            f"WHERE source_id IN (SELECT id FROM components WHERE {where}) "
+            f"AND target_id IN (SELECT id FROM components WHERE {where})",
+            parameters,
+        )
+        return components, relationships
+
+    def close(self) -> None:
+        self.connection.close()
@@ -7,11 +7,15 @@ from rich.table import Table
 from ruamel.yaml import YAML
 
 from diagram_generator.adapters.input.dsl_loader import DSLLoader
+from diagram_generator.adapters.input.jsonl_loader import JSONLMetadataAdapter
+from diagram_generator.core.domain.compact_flow import COMPACT_FLOW_STEPS, AnyFlow, CompactFlow
 from diagram_generator.core.domain.component import Component
 from diagram_generator.core.domain.flow import Flow
 from diagram_generator.core.domain.relationship import Relationship
 from diagram_generator.core.domain.view_config import ViewConfig
 from diagram_generator.core.ports.metadata_port import MetadataPort
+from diagram_generator.core.services.edge_aggregator import EdgeAggregator
+from diagram_generator.core.services.profiler import span
 
 
 class YAMLMetadataAdapter(MetadataPort):
@@ -19,7 +23,8 @@ class YAMLMetadataAdapter(MetadataPort):
         self.data_path = Path(data_path)
         self.yaml = YAML(typ='safe')
         self.dsl_loader = DSLLoader(self.data_path)
-        self._dsl_cache: tuple[list[Component], list[Relationship], list[Flow]] | None = None
+        self.jsonl = JSONLMetadataAdapter(self.data_path)
+        self._dsl_cache: tuple[list[Component], list[Relationship], list[AnyFlow]] | None = None
 
     def _load_files(self, directory: str) -> list[dict[str, Any]]:
         results = []
@@ -33,7 +38,7 @@ class YAMLMetadataAdapter(MetadataPort):
         # console.print(f"[dim]DEBUG: Found files: {files}[/dim]")
         
         for file_path in files:
-            with open(file_path) as f:
+            with span("yaml.parse", "load", file=str(file_path)), open(file_path) as f:
                 for data in self.yaml.load_all(f):
                     if isinstance(data, list):
                         results.extend(data)
@@ -60,14 +65,23 @@ class YAMLMetadataAdapter(MetadataPort):
                 unwrapped.append(item)
         return unwrapped
 
-    def _load_dsl(self) -> tuple[list[Component], list[Relationship], list[Flow]]:
+    def _load_dsl(self) -> tuple[list[Component], list[Relationship], list[AnyFlow]]:
         if self._dsl_cache is None:
             self._dsl_cache = self.dsl_loader.load_debug()
         return self._dsl_cache
 
+    def load_raw(self, directory: str) -> list[dict[str, Any]]:
+        """Reads every YAML document under `directory`, unwrapped from its root key."""
+        return self._unwrap_data(self._load_files(directory), directory)
+
     def load_components(self) -> list[Component]:
-        raw_data = self._load_files("components")
-        data = self._unwrap_data(raw_data, "components")
+        valid_components = [*self.validate_components(self.load_raw("components")), *self.jsonl.load_components()]
+        dsl_comps, _, _ = self._load_dsl()
+        with span("merge.components", "load"):
+            return self.merge_dsl_components(valid_components, dsl_comps)
+
+    def validate_components(self, data: list[dict[str, Any]]) -> list[Component]:
+        """Validates raw component records, reporting (and skipping) invalid ones."""
         adapter: TypeAdapter[Component] = TypeAdapter(Component)
         
         valid_components = []
@@ -75,12 +89,13 @@ class YAMLMetadataAdapter(MetadataPort):
         
         console = Console()
 
-        for index, item in enumerate(data):
-            try:
-                valid_components.append(adapter.validate_python(item))
-            except Exception as e:
-                item_id = item.get("id", f"Index {index}")
-                errors.append({"id": item_id, "error": str(e)})
+        with span("validate.components", "validate", records=len(data)):
+            for index, item in enumerate(data):
+                try:
+                    valid_components.append(adapter.validate_python(item))
+                except Exception as e:
+                    item_id = item.get("id", f"Index {index}")
+                    errors.append({"id": item_id, "error": str(e)})
 
         if errors:
             table = Table(title="[bold red]Validation Errors in Components[/bold red]")
@@ -96,8 +111,10 @@ class YAMLMetadataAdapter(MetadataPort):
             console.print(table)
             console.print("[yellow]Warning: Skipping invalid components.[/yellow]")
 
-        # Merge DSL Components
-        dsl_comps, _, _ = self._load_dsl()
+        return valid_components
+
+    def merge_dsl_components(self, valid_components: list[Component], dsl_comps: list[Component]) -> list[Component]:
+        """Merges DSL components into the YAML ones; DSL metadata wins for shared IDs."""
         # console.print(f"[dim]DEBUG: DSL Components: {[(c.id, c.type) for c in dsl_comps]}[/dim]")
         
         # Merge Strategy: 
@@ -119,36 +136,59 @@ class YAMLMetadataAdapter(MetadataPort):
         return list(comp_map.values())
 
     def load_relationships(self) -> list[Relationship]:
-        raw_data = self._load_files("relationships")
-        data = self._unwrap_data(raw_data, "relationships")
-        yaml_rels = [Relationship(**item) for item in data]
+        yaml_rels = [*self.validate_relationships(self.load_raw("relationships")), *self.jsonl.load_relationships()]
         
         # Merge DSL Relationships
         _, dsl_rels, _ = self._load_dsl()
-        return yaml_rels + dsl_rels
+        with span("merge.relationships", "load"):
+            return self.merge_dsl_relationships(yaml_rels, dsl_rels)
+
+    def validate_relationships(self, data: list[dict[str, Any]]) -> list[Relationship]:
+        with span("validate.relationships", "validate", records=len(data)):
+            return [Relationship(**item) for item in data]
+
+    def merge_dsl_relationships(
+        self, yaml_rels: list[Relationship], dsl_rels: list[Relationship]
+    ) -> list[Relationship]:
+        """Combines YAML and DSL relationships, dropping edges declared in both."""
+        return EdgeAggregator().dedupe(yaml_rels + dsl_rels)
 
     def load_view_configs(self) -> list[ViewConfig]:
-        raw_data = self._load_files("views")
-        data = self._unwrap_data(raw_data, "views")
-        return [ViewConfig(**item) for item in data]
+        return [*self.validate_view_configs(self.load_raw("views")), *self.jsonl.load_view_configs()]
 
-    def load_flows(self) -> list[Flow]:
-        raw_data = self._load_files("flows")
-        data = self._unwrap_data(raw_data, "flows")
-        adapter = TypeAdapter(Flow)
-        
-        valid_flows = []
-        for item in data:
-            try:
-                valid_flows.append(adapter.validate_python(item))
-            except Exception as e:
-                # Use a local console or pass one if we had it, for now just use print -> console.print ideally
-                # but we didn't init console in __init__. Let's init one locally.
-                Console().print(f"[yellow]Warning: Failed to load flow item: {e}[/yellow]")
+    def validate_view_configs(self, data: list[dict[str, Any]]) -> list[ViewConfig]:
+        with span("validate.views", "validate", records=len(data)):
+            return [ViewConfig(**item) for item in data]
+
+    def load_flows(self) -> list[AnyFlow]:
+        valid_flows = [*self.validate_flows(self.load_raw("flows")), *self.jsonl.load_flows()]
 
         # Merge DSL Flows
         _, _, dsl_flows = self._load_dsl()
         # Console().print(f"[dim]DEBUG: YAML Flows: {[f.id for f in valid_flows]}[/dim]")
         # Console().print(f"[dim]DEBUG: DSL Flows: {[f.id for f in dsl_flows]}[/dim]")
-        all_flows = valid_flows + dsl_flows
+        all_flows: list[AnyFlow] = [*valid_flows, *dsl_flows]
         return all_flows
+
+    def validate_flows(self, data: list[dict[str, Any]]) -> list[AnyFlow]:
+        """
+        Validates raw flow records, warning about (and skipping) invalid ones.
+        Flows with at least COMPACT_FLOW_STEPS steps are kept as CompactFlow.
+        """
+        adapter = TypeAdapter(Flow)
+        
+        valid_flows: list[AnyFlow] = []
+        with span("validate.flows", "validate", records=len(data)):
+            for item in data:
+                try:
+                    steps = item.get("steps") if isinstance(item, dict) else None
+                    if isinstance(steps, list) and len(steps) >= COMPACT_FLOW_STEPS:
+                        valid_flows.append(CompactFlow.validate(item))
+                        continue
+                    valid_flows.append(adapter.validate_python(item))
+                except Exception as e:
+                    # Use a local console or pass one if we had it, for now just use print -> console.print ideally
+                    # but we didn't init console in __init__. Let's init one locally.
+                    Console().print(f"[yellow]Warning: Failed to load flow item: {e}[/yellow]")
+
+        return valid_flows
@@ -9,11 +9,13 @@ try:
 except ImportError:
     YAML = None # type: ignore
 
+from diagram_generator.core.domain.compact_flow import AnyFlow
 from diagram_generator.core.domain.component import Component
-from diagram_generator.core.domain.flow import Flow
 from diagram_generator.core.domain.relationship import Relationship
 from diagram_generator.core.domain.view_config import ViewConfig
 from diagram_generator.core.ports.diagram_port import DiagramPort
+from diagram_generator.core.services.component_hierarchy import ComponentHierarchy
+from diagram_generator.core.services.profiler import span
 
 
 class MermaidDiagramAdapter(DiagramPort):
@@ -41,7 +43,7 @@ class MermaidDiagramAdapter(DiagramPort):
         view_config: ViewConfig,
         components: list[Component],
         relationships: list[Relationship],
-        flows: list[Flow] | None = None
+        flows: list[AnyFlow] | None = None
     ) -> str:
         template_name = f"{view_config.type.value}.j2"
         try:
@@ -58,42 +60,17 @@ class MermaidDiagramAdapter(DiagramPort):
                  flow_styles = active_flow.metadata.get("styles", {})
 
         # Build Hierarchy for Swimlanes
-        # Structure: {'name': 'Root', 'type': 'group', 'children': {...}, 'node_components': [Component]}
-        hierarchy: dict[str, Any] = {'name': 'root', 'type': 'root', 'children': {}, 'node_components': []}
-        
-        for comp in components:
-            group_path = comp.metadata.get("group")
-            if not group_path:
-                hierarchy['node_components'].append(comp)
-                continue
-            
-            # Split by dot or some separator, currently assuming "Parent.Child"
-            parts = group_path.split("__SEPARATOR__") 
-            # Note: User request implied "Infrastructure Layer.PSOS" so let's try dot, 
-            # but usually dot is dangerous in IDs. Let's support explicit dot.
-            # If no dot, it's just one group.
-            parts = group_path.split('.')
-            
-            current = hierarchy
-            for raw_part in parts:
-                part = raw_part.strip()
-                if part not in current['children']:
-                    current['children'][part] = {
-                        'name': part, 
-                        'type': 'group', 
-                        'children': {}, 
-                        'node_components': []
-                    }
-                current = current['children'][part]
-            
-            current['node_components'].append(comp)
+        # Same group-path trie the abstractor rolls up with, so subgraph IDs match parent IDs
+        with span("render.hierarchy", "render", view=view_config.key):
+            hierarchy = ComponentHierarchy(components).root
 
-        return template.render(
-            config=view_config,
-            components=components,
-            relationships=relationships,
-            flows=flows,
-            flow=active_flow,
-            hierarchy=hierarchy,
-            styles=flow_styles
-        )
+        with span("render", "render", view=view_config.key, template=template_name):
+            return template.render(
+                config=view_config,
+                components=components,
+                relationships=relationships,
+                flows=flows,
+                flow=active_flow,
+                hierarchy=hierarchy,
+                styles=flow_styles
+            )
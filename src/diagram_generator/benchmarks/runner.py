@@ -0,0 +1,154 @@
+import contextlib
+import io
+import platform
+import subprocess
+import tempfile
+import time
+from collections.abc import Iterator
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from diagram_generator.adapters.input.yaml_loader import YAMLMetadataAdapter
+from diagram_generator.adapters.output.mermaid_renderer import MermaidDiagramAdapter
+from diagram_generator.benchmarks.synthetic import load_spec
+from diagram_generator.core.use_cases.generate_diagram import GenerateDiagramUseCase
+
+# Pipeline stages in execution order. Model stages run once, view stages are summed over views.
+MODEL_STAGES = ("yaml_load", "validation", "dsl_parse", "merge", "discovery")
+VIEW_STAGES = ("filter", "abstraction", "render", "write")
+STAGES = MODEL_STAGES + VIEW_STAGES
+RESULTS_VERSION = 1
+
+
+class BenchmarkRunner:
+    """
+    Runs the generate pipeline over a data dir once, timing every stage separately.
+    The model is loaded once; per-view stages are summed across the views rendered.
+    """
+
+    def __init__(self, data_dir: str, template_dir: str = "templates", output_dir: str | None = None):
+        self.data_dir = Path(data_dir)
+        self.template_dir = template_dir
+        self.output_dir = output_dir
+        self.timings: dict[str, float] = dict.fromkeys(STAGES, 0.0)
+
+    @contextlib.contextmanager
+    def _timed(self, stage: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[stage] += time.perf_counter() - start
+
+    def run(self, max_views: int | None = None) -> dict[str, Any]:
+        """Runs every stage and returns the results document (see `RESULTS_VERSION`)."""
+        self.timings = dict.fromkeys(STAGES, 0.0)
+        metadata = YAMLMetadataAdapter(str(self.data_dir))
+        renderer = MermaidDiagramAdapter(self.template_dir)
+        use_case = GenerateDiagramUseCase(metadata, renderer)
+
+        # 1. Model stages
+        with self._timed("yaml_load"):
+            raw = {d: metadata.load_raw(d) for d in ("components", "relationships", "flows", "views")}
+
+        with self._timed("validation"):
+            components = metadata.validate_components(raw["components"])
+            relationships = metadata.validate_relationships(raw["relationships"])
+            flows = metadata.validate_flows(raw["flows"])
+            view_configs = metadata.validate_view_configs(raw["views"])
+
+        # The DSL loader reports progress on stdout
+        with self._timed("dsl_parse"), contextlib.redirect_stdout(io.StringIO()):
+            dsl_components, dsl_relationships, dsl_flows = metadata.dsl_loader.load_debug()
+
+        with self._timed("merge"):
+            components = metadata.merge_dsl_components(components, dsl_components)
+            relationships = metadata.merge_dsl_relationships(relationships, dsl_relationships)
+            flows = [*flows, *dsl_flows]
+
+        with self._timed("discovery"):
+            use_case.discover_components(components, relationships)
+
+        # 2. View stages
+        views = view_configs[:max_views] if max_views is not None else view_configs
+        view_seconds: dict[str, float] = {}
+        with tempfile.TemporaryDirectory() as scratch_dir:
+            output_dir = Path(self.output_dir or scratch_dir)
+            output_dir.mkdir(parents=True, exist_ok=True)
+            for view_config in views:
+                start = time.perf_counter()
+                with self._timed("filter"):
+                    filtered_components, filtered_relationships = use_case.filter_graph(
+                        view_config, components, relationships
+                    )
+                with self._timed("abstraction"):
+                    config, view_components, view_relationships, view_flows = use_case.abstract_graph(
+                        view_config, components, filtered_components, filtered_relationships, flows
+                    )
+                with self._timed("render"):
+                    content = renderer.render(config, view_components, view_relationships, view_flows)
+                with self._timed("write"):
+                    (output_dir / f"{view_config.key}.mmd").write_text(content)
+                view_seconds[view_config.key] = time.perf_counter() - start
+
+        return {
+            "version": RESULTS_VERSION,
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "data_dir": str(self.data_dir),
+            "spec": load_spec(self.data_dir),
+            "counts": {
+                "components": len(components),
+                "relationships": len(relationships),
+                "flows": len(flows),
+                "views": len(views),
+            },
+            "stages": {stage: round(seconds, 6) for stage, seconds in self.timings.items()},
+            "total": round(sum(self.timings.values()), 6),
+            "slowest_views": dict(sorted(view_seconds.items(), key=lambda kv: kv[1], reverse=True)[:10]),
+        }
+
+
+def compare_results(
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    tolerance: float = 0.1,
+    tolerances: dict[str, float] | None = None,
+    min_delta: float = 0.0,
+) -> list[dict[str, Any]]:
+    """
+    Compares the stage timings of two results documents. A stage regressed when it
+    got slower than `baseline * (1 + tolerance)`, using the stage's entry in
+    `tolerances` when it has one, and by more than `min_delta` seconds (a noise
+    floor for very short stages). Stages missing from either side are skipped.
+    """
+    rows = []
+    for stage in [*STAGES, "total"]:
+        before = baseline.get("total") if stage == "total" else baseline["stages"].get(stage)
+        after = current.get("total") if stage == "total" else current["stages"].get(stage)
+        if before is None or after is None:
+            continue
+        allowed = (tolerances or {}).get(stage, tolerance)
+        ratio = after / before if before else None
+        rows.append({
+            "stage": stage,
+            "baseline": before,
+            "current": after,
+            "ratio": ratio,
+            "tolerance": allowed,
+            "regressed": ratio is not None and ratio > 1 + allowed and after - before > min_delta,
+        })
+    return rows
+
+
+def _git_commit() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True, timeout=5
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
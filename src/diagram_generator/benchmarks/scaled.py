@@ -0,0 +1,80 @@
+import json
+import re
+from pathlib import Path
+from typing import Any
+
+from ruamel.yaml import YAML
+
+# Record fields holding an id that must be made unique per replica, by data directory
+ID_FIELDS = {
+    "components": ("id",),
+    "relationships": ("source_id", "target_id"),
+    "flows": ("id",),
+    "views": ("key", "flow_id"),
+}
+STEP_ID_FIELDS = ("source_id", "target_id")
+# `source -> target : description` (and `-->`) connections in .flow files
+_DSL_CONNECTION = re.compile(r"^(\s*)([\w.-]+)(\s*-{1,2}>\s*)([\w.-]+)")
+SCALE_FILE = "scaled.json"
+
+
+class ScaledRepoGenerator:
+    """
+    Copies a real data dir `factor` times into one, renaming every id per replica
+    (`api-gateway` -> `api-gateway-r7`), so the shape of the model is kept while its
+    size grows. Views are replicated too, so a generate-all renders `factor` times
+    as many views. Only connection lines of .flow files are renamed.
+    """
+
+    def __init__(self, source_dir: Path, factor: int):
+        self.source_dir = source_dir
+        self.factor = factor
+        self.yaml = YAML(typ="safe")
+
+    def generate(self, root: Path) -> dict[str, int]:
+        """Writes the scaled repo under `root` and returns the number of records per kind."""
+        counts = dict.fromkeys(ID_FIELDS, 0)
+        for key in ID_FIELDS:
+            (root / key).mkdir(parents=True, exist_ok=True)
+            for path in sorted((self.source_dir / key).glob("*.yaml")):
+                records = self._load_records(path, key)
+                scaled = [self._rename(record, key, replica) for replica in range(self.factor) for record in records]
+                with open(root / key / path.name, "w") as f:
+                    self.yaml.dump({key: scaled}, f)
+                counts[key] += len(scaled)
+
+            for path in sorted((self.source_dir / key).glob("*.flow")):
+                text = path.read_text()
+                for replica in range(self.factor):
+                    (root / key / f"{path.stem}-r{replica}.flow").write_text(self._rename_dsl(text, replica))
+
+        (root / SCALE_FILE).write_text(json.dumps({"source": str(self.source_dir), "factor": self.factor}, indent=2))
+        return counts
+
+    def _load_records(self, path: Path, key: str) -> list[dict[str, Any]]:
+        records: list[dict[str, Any]] = []
+        with open(path) as f:
+            for data in self.yaml.load_all(f):
+                if isinstance(data, dict) and isinstance(data.get(key), list):
+                    records.extend(data[key])
+                elif isinstance(data, list):
+                    records.extend(data)
+        return records
+
+    def _rename(self, record: dict[str, Any], key: str, replica: int) -> dict[str, Any]:
+        renamed = dict(record)
+        for field in ID_FIELDS[key]:
+            if isinstance(renamed.get(field), str):
+                renamed[field] = f"{renamed[field]}-r{replica}"
+        if key == "flows":
+            renamed["steps"] = [
+                {**step, **{field: f"{step[field]}-r{replica}" for field in STEP_ID_FIELDS if field in step}}
+                for step in record.get("steps", [])
+            ]
+        return renamed
+
+    def _rename_dsl(self, text: str, replica: int) -> str:
+        return "\n".join(
+            _DSL_CONNECTION.sub(rf"\g<1>\g<2>-r{replica}\g<3>\g<4>-r{replica}", line)
+            for line in text.splitlines()
+        ) + "\n"
@@ -0,0 +1,112 @@
+import csv
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from diagram_generator.core.services.seed_ingester import SeedIngester
+
+FORMATS = ("yaml", "json", "jsonl", "csv")
+ROOT = "services"
+DOMAINS = ["Payments", "Orders", "Ledger", "Identity", "Search"]
+
+MAPPINGS = {
+    "components": [{
+        "source_path": ROOT,
+        "item_model": "Service",
+        "spec": {
+            "id": "id", "name": "name", "description": "description",
+            "metadata": {"group": "owner.domain", "tier": "tier", "vendor": "vendor"},
+        },
+    }],
+    "relationships": [{
+        "source_path": ROOT,
+        "spec": {"source_id": "name", "targets": "depends_on", "type": "dependency"},
+    }],
+}
+
+
+class SourceFormatBenchmark:
+    """
+    Ingests one generated CMDB export written as YAML, JSON, JSONL and CSV, each loaded
+    whole and streamed, and checks that every run produces the records of the whole
+    YAML load.
+    """
+
+    def __init__(self, items: int = 20_000, seed: int = 42):
+        self.items = items
+        self.rng = random.Random(seed)
+
+    def run(self) -> list[dict[str, Any]]:
+        """One row per format and mode: seconds, items per second, records, and whether they agree."""
+        rows = [self._item(index) for index in range(self.items)]
+        results = []
+        with tempfile.TemporaryDirectory() as tmp:
+            directory = Path(tmp)
+            for fmt in FORMATS:
+                self._write(directory / f"{ROOT}.{fmt}", fmt, rows)
+
+            expected = None
+            for fmt in FORMATS:
+                for stream in (False, True):
+                    config = directory / f"config_{fmt}_{stream}.yaml"
+                    source = {"file": f"{ROOT}.{fmt}", "format": fmt, "stream": stream}
+                    config.write_text(yaml.safe_dump({"sources": [source], "mappings": MAPPINGS}))
+
+                    start = time.perf_counter()
+                    records = SeedIngester(str(config), tmp).ingest()
+                    seconds = time.perf_counter() - start
+
+                    dumped = {kind: [r.model_dump() for r in rs] for kind, rs in records.items()}
+                    expected = expected or dumped
+                    results.append({
+                        "format": fmt,
+                        "stream": stream,
+                        "seconds": seconds,
+                        "items_per_second": self.items / seconds if seconds else float("inf"),
+                        "records": sum(len(rs) for rs in records.values()),
+                        "equal": dumped == expected,
+                    })
+        return results
+
+    def _item(self, index: int) -> dict[str, Any]:
+        """A flat CMDB row; CSV only holds strings, so every value is one."""
+        item = {
+            "id": f"svc-{index}",
+            "name": f"Service {index}",
+            "description": f"Handles {self.rng.choice(DOMAINS).lower()} requests",
+            "owner": {"domain": self.rng.choice(DOMAINS)},
+            "tier": str(self.rng.randint(1, 3)),
+            "vendor": self.rng.choice(["internal", "acme", None]),
+            "depends_on": f"Service {self.rng.randrange(self.items)}",
+        }
+        return {key: value for key, value in item.items() if value is not None}
+
+    def _write(self, path: Path, fmt: str, rows: list[dict[str, Any]]) -> None:
+        with open(path, "w", newline="") as f:
+            if fmt == "yaml":
+                yaml.safe_dump({ROOT: rows}, f)
+            elif fmt == "json":
+                json.dump({ROOT: rows}, f)
+            elif fmt == "jsonl":
+                f.writelines(f"{json.dumps(row)}\n" for row in rows)
+            else:
+                columns = ["id", "name", "description", "owner.domain", "tier", "vendor", "depends_on"]
+                writer = csv.writer(f)
+                writer.writerow(columns)
+                for row in rows:
+                    writer.writerow([_flat(row).get(column, "") for column in columns])
+
+
+def _flat(row: dict[str, Any], prefix: str = "") -> dict[str, Any]:
+    flat: dict[str, Any] = {}
+    for key, value in row.items():
+        if isinstance(value, dict):
+            flat.update(_flat(value, f"{prefix}{key}."))
+        else:
+            flat[f"{prefix}{key}"] = value
+    return flat
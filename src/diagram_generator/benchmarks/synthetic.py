@@ -0,0 +1,204 @@
+import json
+import math
+import random
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+# Names for the segments of generated group paths, outermost first
+GROUP_LEVEL_NAMES = ("Domain", "Area", "Team", "Squad", "Unit", "Cell")
+COMPONENT_TYPES = ("service", "service", "service", "database", "web_ui", "container")
+PROTOCOLS = ("HTTPS", "gRPC", "AMQP", "JDBC")
+# Components per innermost group
+GROUP_SIZE = 8
+# Records per generated YAML file
+SHARD_SIZE = 5000
+SPEC_FILE = "synthetic.json"
+
+
+class SyntheticSpec(BaseModel):
+    """Size and shape of a generated architecture repo."""
+    components: int = Field(10_000, description="Number of components.")
+    relationships: int = Field(20_000, description="Number of YAML relationships.")
+    group_depth: int = Field(3, description="Depth of the generated group hierarchy.")
+    flows: int = Field(50, description="Number of YAML flows.")
+    flow_steps: int = Field(50, description="Steps per YAML flow.")
+    dsl_files: int = Field(2, description=".flow DSL files.")
+    dsl_lines: int = Field(5_000, description="Lines per .flow DSL file.")
+    views: int = Field(100, description="Number of views.")
+    seed: int = Field(42, description="Random seed; the same spec always generates the same repo.")
+
+
+PRESETS = {
+    "tiny": SyntheticSpec.model_validate({
+        "components": 200, "relationships": 400, "group_depth": 2, "flows": 5, "flow_steps": 10,
+        "dsl_files": 1, "dsl_lines": 100, "views": 10,
+    }),
+    "small": SyntheticSpec.model_validate({}),
+    "medium": SyntheticSpec.model_validate({
+        "components": 50_000, "relationships": 100_000, "group_depth": 4, "flows": 200,
+        "dsl_files": 4, "dsl_lines": 25_000, "views": 500,
+    }),
+    "large": SyntheticSpec.model_validate({
+        "components": 200_000, "relationships": 200_000, "group_depth": 5, "flows": 500, "flow_steps": 100,
+        "dsl_files": 4, "dsl_lines": 50_000, "views": 1_000,
+    }),
+}
+
+
+class SyntheticRepoGenerator:
+    """
+    Writes a deterministic data dir (components, relationships, flows, views and
+    .flow DSL files) of a given size, for benchmarking every pipeline stage.
+    """
+
+    def __init__(self, spec: SyntheticSpec):
+        self.spec = spec
+        self.rng = random.Random(spec.seed)
+        leaf_groups = max(1, math.ceil(spec.components / GROUP_SIZE))
+        self.fanout = max(2, math.ceil(leaf_groups ** (1 / max(1, spec.group_depth))))
+
+    def generate(self, root: Path) -> dict[str, int]:
+        """Writes the repo under `root` and returns the number of records per kind."""
+        for directory in ("components", "relationships", "flows", "views"):
+            (root / directory).mkdir(parents=True, exist_ok=True)
+
+        self._write_shards(root / "components", "components", self._components())
+        self._write_shards(root / "relationships", "relationships", self._relationships())
+        self._write_shards(root / "flows", "flows", self._flows())
+        self._write_shards(root / "views", "views", self._views())
+        for index in range(self.spec.dsl_files):
+            (root / "flows" / f"dsl_{index}.flow").write_text(self._dsl(index))
+
+        (root / SPEC_FILE).write_text(json.dumps(self.spec.model_dump(), indent=2))
+        return {
+            "components": self.spec.components,
+            "relationships": self.spec.relationships,
+            "flows": self.spec.flows + self.spec.dsl_files,
+            "views": self.spec.views,
+            "dsl_lines": self.spec.dsl_files * self.spec.dsl_lines,
+        }
+
+    def group_path(self, index: int) -> list[str]:
+        """Group path segments of the `index`-th component, outermost first."""
+        leaf = index // GROUP_SIZE
+        digits = []
+        for _ in range(self.spec.group_depth):
+            leaf, digit = divmod(leaf, self.fanout)
+            digits.append(digit)
+        digits.reverse()
+        names = [GROUP_LEVEL_NAMES[level % len(GROUP_LEVEL_NAMES)] for level in range(len(digits))]
+        return [f"{name} {digit}" for name, digit in zip(names, digits, strict=True)]
+
+    def _component_id(self, index: int) -> str:
+        return f"c{index}"
+
+    def _pick_pair(self) -> tuple[int, int]:
+        source = self.rng.randrange(self.spec.components)
+        return source, self._neighbour(source)
+
+    def _neighbour(self, source: int) -> int:
+        """Mostly local targets (same or neighbouring groups) with some long-range ones."""
+        count = self.spec.components
+        if self.rng.random() < 0.8: # noqa: PLR2004
+            target = min(count - 1, max(0, source + self.rng.randint(-2 * GROUP_SIZE, 2 * GROUP_SIZE)))
+        else:
+            target = self.rng.randrange(count)
+        return target if target != source else (source + 1) % count
+
+    def _components(self) -> Iterator[str]:
+        for index in range(self.spec.components):
+            path = self.group_path(index)
+            comp_type = COMPONENT_TYPES[index % len(COMPONENT_TYPES)]
+            yield (
+                f"  - id: {self._component_id(index)}\n"
+                f"    name: Component {index}\n"
+                f"    type: {comp_type}\n"
+                f"    description: Synthetic {comp_type} {index}\n"
+                f"    tags: [{path[0].lower().replace(' ', '-')}]\n"
+                f"    metadata:\n"
+                f"      group: \"{'.'.join(path)}\"\n"
+            )
+
+    def _relationships(self) -> Iterator[str]:
+        for index in range(self.spec.relationships):
+            source, target = self._pick_pair()
+            yield (
+                f"  - source_id: {self._component_id(source)}\n"
+                f"    target_id: {self._component_id(target)}\n"
+                f"    description: Call {index % 10}\n"
+                f"    protocol: {PROTOCOLS[index % len(PROTOCOLS)]}\n"
+            )
+
+    def _flows(self) -> Iterator[str]:
+        for index in range(self.spec.flows):
+            lines = [f"  - id: flow-{index}\n", f"    description: Synthetic flow {index}\n", "    steps:\n"]
+            current = self.rng.randrange(self.spec.components)
+            for step in range(self.spec.flow_steps):
+                target = self._neighbour(current)
+                lines.append(
+                    f"      - source_id: {self._component_id(current)}\n"
+                    f"        target_id: {self._component_id(target)}\n"
+                    f"        description: Step {step}\n"
+                )
+                current = target
+            yield "".join(lines)
+
+    def _views(self) -> Iterator[str]:
+        flow_ids = [f"flow-{i}" for i in range(self.spec.flows)] + [f"dsl_{i}" for i in range(self.spec.dsl_files)]
+        for index in range(self.spec.views):
+            tag = self.group_path(self.rng.randrange(self.spec.components))[0].lower().replace(" ", "-")
+            kind = index % 5
+            lines = [f"  - key: view-{index}\n", f"    title: Synthetic view {index}\n"]
+            if kind == 0:
+                lines += ["    type: c4_context\n", f"    filters:\n      tags: [{tag}]\n"]
+            elif kind == 1:
+                lines += ["    type: c4_container\n", f"    filters:\n      tags: [{tag}]\n"]
+            elif kind == 2: # noqa: PLR2004
+                lines += [
+                    "    type: flowchart\n", "    abstraction_level: container\n",
+                    f"    filters:\n      tags: [{tag}]\n",
+                ]
+            elif kind == 3 and flow_ids: # noqa: PLR2004
+                lines += ["    type: sequence\n", f"    flow_id: {flow_ids[index % len(flow_ids)]}\n"]
+            elif flow_ids:
+                lines += [
+                    "    type: flowchart_swimlane\n", f"    flow_id: {flow_ids[index % len(flow_ids)]}\n",
+                    "    max_nodes: 50\n",
+                ]
+            else:
+                lines += ["    type: flowchart\n", "    max_nodes: 50\n"]
+            yield "".join(lines)
+
+    def _dsl(self, index: int) -> str:
+        lines = [f"# Synthetic DSL file {index}\n"]
+        for line in range(self.spec.dsl_lines):
+            source, target = self._pick_pair()
+            arrow = "-->" if line % 7 == 0 else "->"
+            lines.append(f"{self._component_id(source)} {arrow} {self._component_id(target)} : DSL step {line}\n")
+        return "".join(lines)
+
+    def _write_shards(self, directory: Path, key: str, records: Iterator[str]) -> None:
+        shard: list[str] = []
+        shard_index = 0
+        for record in records:
+            shard.append(record)
+            if len(shard) == SHARD_SIZE:
+                self._write_shard(directory / f"{key}_{shard_index:04d}.yaml", key, shard)
+                shard, shard_index = [], shard_index + 1
+        if shard or shard_index == 0:
+            self._write_shard(directory / f"{key}_{shard_index:04d}.yaml", key, shard)
+
+    def _write_shard(self, path: Path, key: str, records: list[str]) -> None:
+        path.write_text(f"{key}:\n" + "".join(records) if records else f"{key}: []\n")
+
+
+def load_spec(data_dir: Path) -> dict[str, Any] | None:
+    """The spec a synthetic repo was generated from, if `data_dir` is one."""
+    spec_path = data_dir / SPEC_FILE
+    if not spec_path.exists():
+        return None
+    spec: dict[str, Any] = json.loads(spec_path.read_text())
+    return spec
@@ -0,0 +1,160 @@
+import json
+from pathlib import Path
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from diagram_generator.benchmarks.extractors import ExtractorBenchmark
+from diagram_generator.benchmarks.runner import BenchmarkRunner, compare_results
+from diagram_generator.benchmarks.source_formats import SourceFormatBenchmark
+from diagram_generator.benchmarks.synthetic import PRESETS, SyntheticRepoGenerator
+
+app = typer.Typer()
+console = Console()
+
+@app.command()
+def synth( # noqa: PLR0913, PLR0917
+    output_dir: str = typer.Option(..., help="Directory to write the synthetic data dir to."),
+    preset: str = typer.Option("small", help=f"Base size: {', '.join(PRESETS)}."),
+    components: int | None = typer.Option(None, help="Number of components."),
+    relationships: int | None = typer.Option(None, help="Number of YAML relationships."),
+    group_depth: int | None = typer.Option(None, help="Depth of the generated group hierarchy."),
+    flows: int | None = typer.Option(None, help="Number of YAML flows."),
+    flow_steps: int | None = typer.Option(None, help="Steps per YAML flow."),
+    dsl_files: int | None = typer.Option(None, help="Number of .flow DSL files."),
+    dsl_lines: int | None = typer.Option(None, help="Lines per .flow DSL file."),
+    views: int | None = typer.Option(None, help="Number of views."),
+    seed: int | None = typer.Option(None, help="Random seed."),
+) -> None:
+    """
+    Generates a synthetic architecture repo for benchmarking.
+    """
+    if preset not in PRESETS:
+        console.print(f"[red]Unknown preset '{preset}'. Choose one of: {', '.join(PRESETS)}[/red]")
+        raise typer.Exit(code=1)
+
+    overrides = {
+        "components": components, "relationships": relationships, "group_depth": group_depth, "flows": flows,
+        "flow_steps": flow_steps, "dsl_files": dsl_files, "dsl_lines": dsl_lines, "views": views, "seed": seed,
+    }
+    spec = PRESETS[preset].model_copy(update={key: value for key, value in overrides.items() if value is not None})
+
+    counts = SyntheticRepoGenerator(spec).generate(Path(output_dir))
+    summary = ", ".join(f"{count:,} {kind}" for kind, count in counts.items())
+    console.print(f"[green]✓ Generated {summary} in {output_dir}[/green]")
+
+@app.command()
+def run(
+    data_dir: str = typer.Option("./data", help="Directory containing the metadata."),
+    template_dir: str = typer.Option("./templates", help="Directory containing templates."),
+    output: str | None = typer.Option(None, help="Write the results JSON to this file."),
+    output_dir: str | None = typer.Option(None, help="Keep the generated diagrams here (default: a temp dir)."),
+    max_views: int | None = typer.Option(None, help="Only render the first N views."),
+) -> None:
+    """
+    Times every pipeline stage (load, validation, DSL parse, discovery, filter,
+    abstraction, render, write) over a data dir.
+    """
+    results = BenchmarkRunner(data_dir, template_dir, output_dir).run(max_views)
+
+    table = Table(title=f"Benchmark: {data_dir}")
+    table.add_column("Stage", style="cyan")
+    table.add_column("Seconds", justify="right")
+    table.add_column("Share", justify="right")
+    for stage, seconds in results["stages"].items():
+        share = seconds / results["total"] if results["total"] else 0.0
+        table.add_row(stage, f"{seconds:.4f}", f"{share:.1%}")
+    table.add_row("[bold]total[/bold]", f"[bold]{results['total']:.4f}[/bold]", "")
+    console.print(table)
+
+    if output:
+        Path(output).write_text(json.dumps(results, indent=2))
+        console.print(f"[green]✓ Results written to {output}[/green]")
+
+@app.command()
+def compare(
+    baseline: str = typer.Argument(..., help="Results JSON of the reference run."),
+    current: str = typer.Argument(..., help="Results JSON of the run to check."),
+    tolerance: float = typer.Option(0.1, help="Allowed slowdown per stage (0.1 = 10%)."),
+) -> None:
+    """
+    Compares two benchmark results and fails if any stage regressed past the tolerance.
+    """
+    rows = compare_results(json.loads(Path(baseline).read_text()), json.loads(Path(current).read_text()), tolerance)
+
+    table = Table(title=f"{baseline} -> {current}")
+    table.add_column("Stage", style="cyan")
+    table.add_column("Baseline", justify="right")
+    table.add_column("Current", justify="right")
+    table.add_column("Change", justify="right")
+    for row in rows:
+        change = f"{row['ratio'] - 1:+.1%}" if row["ratio"] is not None else "n/a"
+        style = "red" if row["regressed"] else "green"
+        table.add_row(row["stage"], f"{row['baseline']:.4f}", f"{row['current']:.4f}", f"[{style}]{change}[/{style}]")
+    console.print(table)
+
+    regressed = [row["stage"] for row in rows if row["regressed"]]
+    if regressed:
+        console.print(f"[red]✗ Regressed beyond {tolerance:.0%}: {', '.join(regressed)}[/red]")
+        raise typer.Exit(code=1)
+    console.print("[green]✓ No regressions[/green]")
+
+@app.command()
+def extractors(
+    config: str = typer.Option("ingestion_config.yaml", help="Ingestion config whose mappings are timed."),
+    items: int = typer.Option(100_000, help="Generated seed items per mapping."),
+    seed: int = typer.Option(42, help="Random seed."),
+) -> None:
+    """
+    Times the ingestion mappings interpreted by glom against their compiled extractors.
+    """
+    rows = ExtractorBenchmark(config, items, seed).run()
+
+    table = Table(title=f"Mapping extraction: {items:,} items per mapping")
+    table.add_column("Mapping", style="cyan")
+    table.add_column("glom (s)", justify="right")
+    table.add_column("Compiled (s)", justify="right")
+    table.add_column("Speedup", justify="right")
+    table.add_column("Same Output", justify="center")
+    for row in rows:
+        speedup = row["glom"] / row["compiled"] if row["compiled"] else float("inf")
+        same = "[green]yes[/green]" if row["equal"] else "[red]no[/red]"
+        table.add_row(
+            f"{row['kind']}: {row['source_path']}",
+            f"{row['glom']:.3f}", f"{row['compiled']:.3f}", f"{speedup:.1f}x", same,
+        )
+    console.print(table)
+
+    if not all(row["equal"] for row in rows):
+        console.print("[red]✗ Compiled extractors disagree with glom[/red]")
+        raise typer.Exit(code=1)
+
+@app.command()
+def sources(
+    items: int = typer.Option(20_000, help="Generated CMDB rows per format."),
+    seed: int = typer.Option(42, help="Random seed."),
+) -> None:
+    """
+    Times ingesting one generated CMDB export per source format, loaded whole and streamed.
+    """
+    rows = SourceFormatBenchmark(items, seed).run()
+
+    table = Table(title=f"Source formats: {items:,} rows")
+    table.add_column("Format", style="cyan")
+    table.add_column("Mode")
+    table.add_column("Seconds", justify="right")
+    table.add_column("Rows/s", justify="right")
+    table.add_column("Records", justify="right")
+    table.add_column("Same Output", justify="center")
+    for row in rows:
+        same = "[green]yes[/green]" if row["equal"] else "[red]no[/red]"
+        table.add_row(
+            row["format"], "stream" if row["stream"] else "whole",
+            f"{row['seconds']:.3f}", f"{row['items_per_second']:,.0f}", f"{row['records']:,}", same,
+        )
+    console.print(table)
+
+    if not all(row["equal"] for row in rows):
+        console.print("[red]✗ Source formats disagree[/red]")
+        raise typer.Exit(code=1)
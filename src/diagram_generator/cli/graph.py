@@ -0,0 +1,170 @@
+import contextlib
+import json
+import sys
+from pathlib import Path
+from typing import Any
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from diagram_generator.adapters.input.factory import open_metadata
+from diagram_generator.adapters.output.mermaid_renderer import MermaidDiagramAdapter
+from diagram_generator.core.services.graph_analytics import DIRECTIONS, DependencyGraph
+from diagram_generator.core.use_cases.generate_diagram import GenerateDiagramUseCase
+
+app = typer.Typer()
+console = Console()
+
+# Cycles listed in full by the table; --json lists them all
+MAX_CYCLE_ROWS = 50
+# Members shown per cycle by the table
+MAX_CYCLE_MEMBERS = 12
+
+DATA_DIR_HELP = "Directory containing the metadata, or a compiled bundle."
+JSON_HELP = "Print the JSON result instead of a table."
+
+
+def _load_graph(data_dir: str, json_output: bool) -> DependencyGraph:
+    # The DSL loader reports progress on stdout, which holds the result with --json
+    with contextlib.redirect_stdout(sys.stderr if json_output else sys.stdout):
+        use_case = GenerateDiagramUseCase(open_metadata(data_dir), MermaidDiagramAdapter("./templates"))
+        components, relationships, _, flows = use_case.load_model()
+        return use_case.dependency_graph(components, relationships, flows)
+
+
+def _print_json(result: dict[str, Any]) -> None:
+    print(json.dumps(result, indent=2))
+
+
+@app.command()
+def impact(
+    component_id: str = typer.Argument(..., help="The component to start from."),
+    depth: int = typer.Option(3, min=1, help="Hops to follow."),
+    direction: str = typer.Option(
+        "in", help="in: what depends on the component; out: what it depends on; both: either."
+    ),
+    data_dir: str = typer.Option("./data", help=DATA_DIR_HELP),
+    json_output: bool = typer.Option(False, "--json", help=JSON_HELP),
+) -> None:
+    """
+    Lists the components within --depth hops of a component over relationships and flow steps,
+    nearest first.
+    """
+    if direction not in DIRECTIONS:
+        console.print(f"[red]Error: --direction must be one of {', '.join(DIRECTIONS)}.[/red]")
+        raise typer.Exit(code=1)
+    try:
+        found = _load_graph(data_dir, json_output).impact(component_id, depth, direction)
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(code=1) from e
+
+    if json_output:
+        _print_json({
+            "component": component_id, "direction": direction, "depth": depth,
+            "impacted": [{"id": node, "hops": hops} for node, hops in found],
+        })
+        return
+    table = Table(title=f"Within {depth} hops of {component_id} ({direction})")
+    table.add_column("Component")
+    table.add_column("Hops", justify="right")
+    for node, hops in found:
+        table.add_row(node, str(hops))
+    console.print(table)
+    console.print(f"{len(found)} components")
+
+
+@app.command()
+def path(
+    source_id: str = typer.Argument(..., help="The component the path starts from."),
+    target_id: str = typer.Argument(..., help="The component the path ends at."),
+    data_dir: str = typer.Option("./data", help=DATA_DIR_HELP),
+    json_output: bool = typer.Option(False, "--json", help=JSON_HELP),
+) -> None:
+    """
+    Prints a shortest call path between two components, following relationships and flow
+    steps in their direction. Exits with 1 when there is none.
+    """
+    try:
+        graph = _load_graph(data_dir, json_output)
+        edges = graph.shortest_path(source_id, target_id)
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(code=1) from e
+
+    hops = [graph.edge(edge) for edge in edges or ()]
+    if json_output:
+        _print_json({"source": source_id, "target": target_id, "found": edges is not None, "hops": hops})
+    elif edges is None:
+        console.print(f"[yellow]No path from {source_id} to {target_id}.[/yellow]")
+    else:
+        console.print(" → ".join([source_id, *(hop["target"] for hop in hops)]))
+        for hop in hops:
+            via = f" [dim](flow {hop['flow']})[/dim]" if hop["flow"] else ""
+            console.print(f"  {hop['source']} -> {hop['target']} : {hop['description']}{via}")
+        console.print(f"{len(hops)} hops")
+    if edges is None:
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def cycles(
+    data_dir: str = typer.Option("./data", help=DATA_DIR_HELP),
+    json_output: bool = typer.Option(False, "--json", help=JSON_HELP),
+) -> None:
+    """
+    Lists the dependency cycles over relationships and flow steps: each set of components
+    that can all reach one another, largest first.
+    """
+    try:
+        found = _load_graph(data_dir, json_output).cycles()
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(code=1) from e
+
+    if json_output:
+        _print_json({"count": len(found), "cycles": found})
+        return
+    if not found:
+        console.print("[green]No dependency cycles.[/green]")
+        return
+    table = Table(title="Dependency cycles")
+    table.add_column("Size", justify="right")
+    table.add_column("Components")
+    for members in found[:MAX_CYCLE_ROWS]:
+        shown = ", ".join(members[:MAX_CYCLE_MEMBERS])
+        more = len(members) - MAX_CYCLE_MEMBERS
+        table.add_row(str(len(members)), f"{shown}, … {more} more" if more > 0 else shown)
+    console.print(table)
+    if len(found) > MAX_CYCLE_ROWS:
+        console.print(f"… {len(found) - MAX_CYCLE_ROWS} more; use --json for all")
+    console.print(f"{len(found)} cycles")
+
+
+@app.command()
+def neighbourhood(
+    component_ids: list[str] = typer.Argument(..., help="The components to start from."), # noqa: B008
+    depth: int = typer.Option(1, min=0, help="Relationships to follow, either way."),
+    data_dir: str = typer.Option("./data", help=DATA_DIR_HELP),
+    template_dir: str = typer.Option("./templates", help="Directory containing the Jinja2 templates."),
+    output: str | None = typer.Option(None, help="Output file path. If not provided, prints to stdout."),
+) -> None:
+    """
+    Draws the components within --depth relationships of the given ones, and the
+    relationships between them, as a flowchart.
+    """
+    try:
+        # The DSL loader reports progress on stdout, which holds the diagram without --output
+        with contextlib.redirect_stdout(sys.stderr if output is None else sys.stdout):
+            use_case = GenerateDiagramUseCase(open_metadata(data_dir), MermaidDiagramAdapter(template_dir))
+            diagram = use_case.execute_neighbourhood(component_ids, depth)
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(code=1) from e
+
+    if output:
+        Path(output).write_text(diagram)
+        console.print(f"[green]Successfully generated diagram to {output}[/green]")
+    else:
+        print(diagram)
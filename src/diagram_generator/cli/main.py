@@ -1,12 +1,23 @@
+import json
+import os
+from collections.abc import Iterator
 from pathlib import Path
+from typing import Any, TextIO
 
 import typer
 import yaml
 from rich.console import Console
+from rich.table import Table
 
+from diagram_generator.adapters.input.bundle_loader import BUNDLE_SUFFIX
+from diagram_generator.adapters.input.factory import open_metadata, write_metadata
+from diagram_generator.adapters.input.source_validator import SourceValidator
 from diagram_generator.adapters.input.yaml_loader import YAMLMetadataAdapter
 from diagram_generator.adapters.output.mermaid_renderer import MermaidDiagramAdapter
-from diagram_generator.cli import docs, init, mcp_server, schema, serve, verify
+from diagram_generator.cli import bench, docs, graph, init, mcp_server, schema, serve, verify
+from diagram_generator.core.services.diagram_splitter import MERMAID_MAX_EDGES
+from diagram_generator.core.services.memory_report import SizeBreakdown, top_allocation_sites
+from diagram_generator.core.services.profiler import Profiler, profiling, span
 from diagram_generator.core.use_cases.generate_diagram import GenerateDiagramUseCase
 
 app = typer.Typer()
@@ -16,8 +27,13 @@ app.add_typer(init.app, name="init", help="Project initialization tools.")
 app.add_typer(serve.app, name="serve", help="Live preview server.")
 app.add_typer(mcp_server.app, name="mcp", help="Model Context Protocol server.")
 app.add_typer(verify.app, name="verify", help="Verification tools.")
+app.add_typer(bench.app, name="bench", help="Performance benchmarks.")
+app.add_typer(graph.app, name="graph", help="Impact, path, cycle and neighbourhood queries over the dependency graph.")
 console = Console()
 
+# Issues `validate` prints; the report holds all of them
+MAX_ISSUE_ROWS = 50
+
 @app.command()
 def version() -> None:
     """Prints the current version."""
@@ -28,7 +44,7 @@ def generate(
     view: str = typer.Option(..., help="The key of the view configuration to generate."),
     data_dir: str = typer.Option(
         "./data",
-        help="Directory containing the metadata (components, relationships, views)."
+        help=f"Directory containing the metadata (components, relationships, views), or a {BUNDLE_SUFFIX} bundle."
     ),
     template_dir: str = typer.Option("./templates", help="Directory containing the Jinja2 templates."),
     output: str | None = typer.Option(None, help="Output file path. If not provided, prints to stdout.")
@@ -38,7 +54,7 @@ def generate(
     """
     try:
         # 1. Initialize Adapters
-        metadata_adapter = YAMLMetadataAdapter(data_dir)
+        metadata_adapter = open_metadata(data_dir)
         diagram_adapter = MermaidDiagramAdapter(template_dir)
 
         # 2. Initialize Use Case
@@ -61,30 +77,113 @@ def generate(
 
 @app.command()
 def validate(
-    data_dir: str = typer.Option("./data", help="Directory containing the metadata.")
+    data_dir: str = typer.Option("./data", help="Directory containing the metadata."),
+    workers: int = typer.Option(os.cpu_count() or 1, help="Worker processes to parse and check files with."),
+    report: str | None = typer.Option(None, help="Write the JSON report to this file."),
+    json_output: bool = typer.Option(False, "--json", help="Print the JSON report instead of a summary."),
+    strict: bool = typer.Option(False, help="Fail on warnings too."),
 ) -> None:
     """
-    Validates the metadata against the schema.
-    (Stub for future implementation)
+    Validates the metadata: parses and schema-checks every file, then checks references
+    across files (dangling relationship and flow step ids, duplicate ids, unknown view
+    flow_id/scope_id, broken group paths). Exits with 1 on errors, or warnings with --strict.
     """
+    try:
+        results = SourceValidator(data_dir).run(workers)
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(code=1) from None
 
-    console.print(f"[yellow]Validating metadata in {data_dir}... (Not implemented)[/yellow]")
+    if report:
+        Path(report).write_text(json.dumps(results, indent=2))
+    if json_output:
+        print(json.dumps(results, indent=2))
+    else:
+        if results["issues"]:
+            table = Table(title=f"Validation Issues in {data_dir}")
+            table.add_column("Check", style="cyan")
+            table.add_column("Location")
+            table.add_column("Issue")
+            for found in results["issues"][:MAX_ISSUE_ROWS]:
+                style = "red" if found["severity"] == "error" else "yellow"
+                table.add_row(found["check"], found["location"], f"[{style}]{found['message']}[/{style}]")
+            console.print(table)
+            if len(results["issues"]) > MAX_ISSUE_ROWS:
+                console.print(f"... and {len(results['issues']) - MAX_ISSUE_ROWS} more (see --report or --json).")
+        console.print(
+            f"Validated {results['records']:,} records in {results['files']} files: "
+            f"{results['errors']} errors, {results['warnings']} warnings"
+        )
+    if results["errors"] or (strict and results["warnings"]):
+        raise typer.Exit(code=1)
 
-@app.command()
-def generate_all(
+@app.command(name="compile")
+def compile_bundle(
     data_dir: str = typer.Option("./data", help="Directory containing the metadata."),
+    output: str = typer.Option(
+        f"./model{BUNDLE_SUFFIX}", help="File to write: a bundle, or a SQLite database for a .sqlite/.db suffix."
+    ),
+) -> None:
+    """
+    Compiles the data dir (YAML and .flow files, discovery applied) into one memory-mappable
+    bundle or an indexed SQLite database, which every command taking --data-dir then loads
+    without parsing.
+    """
+    try:
+        # Nothing is rendered: the use case only loads the model and applies discovery
+        use_case = GenerateDiagramUseCase(YAMLMetadataAdapter(data_dir), MermaidDiagramAdapter("./templates"))
+        components, relationships, views, flows = use_case.load_model()
+        with span("write", "write", file=output):
+            counts = write_metadata(Path(output), components, relationships, flows, views, source=data_dir)
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(code=1) from None
+
+    summary = ", ".join(f"{count} {kind}" for kind, count in counts.items())
+    console.print(f"[green]✓ Compiled {summary} to {output}[/green]")
+
+@app.command()
+def generate_all( # noqa: PLR0913, PLR0917
+    data_dir: str = typer.Option("./data", help=f"Directory containing the metadata, or a {BUNDLE_SUFFIX} bundle."),
     output_dir: str = typer.Option("./dist", help="Directory to save generated diagrams."),
-    template_dir: str = typer.Option("./templates", help="Directory containing templates.")
+    template_dir: str = typer.Option("./templates", help="Directory containing templates."),
+    max_edges: int | None = typer.Option(
+        None,
+        help=f"Split views with more edges than this into linked pages plus an index "
+             f"(Mermaid's default limit is {MERMAID_MAX_EDGES})."
+    ),
+    profile: bool = typer.Option(False, "--profile", help="Print time spent per stage, view and file."),
+    trace_file: str | None = typer.Option(
+        None, help="Write a Chrome trace / Perfetto JSON of the run to this file (implies --profile)."
+    ),
+    memory_report: bool = typer.Option(
+        False, "--memory-report",
+        help="Trace allocations: peak/retained memory per stage, top allocation sites and model size by type."
+    ),
 ) -> None:
     """
     Generates diagrams for ALL view configurations found in the data directory.
     """
+    if profile or trace_file or memory_report:
+        with profiling(memory=memory_report) as profiler:
+            _generate_all(data_dir, output_dir, template_dir, max_edges)
+        if profile or trace_file:
+            _print_profile(profiler)
+        if trace_file:
+            profiler.write_chrome_trace(trace_file)
+            console.print(f"[green]✓ Trace written to {trace_file} (open in ui.perfetto.dev)[/green]")
+        if memory_report:
+            _print_memory_report(profiler, data_dir)
+    else:
+        _generate_all(data_dir, output_dir, template_dir, max_edges)
+
+def _generate_all(data_dir: str, output_dir: str, template_dir: str, max_edges: int | None) -> None:
     try:
         output_path = Path(output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
 
         # 1. Initialize
-        metadata_adapter = YAMLMetadataAdapter(data_dir)
+        metadata_adapter = open_metadata(data_dir)
         diagram_adapter = MermaidDiagramAdapter(template_dir)
         use_case = GenerateDiagramUseCase(metadata_adapter, diagram_adapter)
 
@@ -95,11 +194,16 @@ def generate_all(
         # 3. Generate each
         for view in views:
             try:
-                result = use_case.execute(view.key)
-                file_name = f"{view.key}.mmd"
-                with open(output_path / file_name, 'w') as f:
-                    f.write(result)
-                console.print(f"[green]✓ Generated {file_name}[/green]")
+                with span("view", "view", view=view.key):
+                    if max_edges:
+                        pages = use_case.execute_pages(view.key, max_edges)
+                    else:
+                        pages = {view.key: use_case.execute(view.key)}
+                    for page_key, result in pages.items():
+                        file_name = f"{page_key}.mmd"
+                        with span("write", "write", file=file_name), open(output_path / file_name, 'w') as f:
+                            f.write(result)
+                        console.print(f"[green]✓ Generated {file_name}[/green]")
             except Exception as e:
                 console.print(f"[red]✗ Failed to generate {view.key}: {e}[/red]")
 
@@ -107,47 +211,135 @@ def generate_all(
         console.print(f"[red]Fatal Error: {e}[/red]")
         raise typer.Exit(code=1) from None
 
+def _print_profile(profiler: Profiler) -> None:
+    wall = profiler.wall_time()
+
+    stages = Table(title=f"Profile: {wall:.3f}s wall time (stage times are inclusive)")
+    stages.add_column("Stage", style="cyan")
+    stages.add_column("Calls", justify="right")
+    stages.add_column("Total (s)", justify="right")
+    stages.add_column("Max (s)", justify="right")
+    stages.add_column("% Wall", justify="right")
+    for name, calls, total, longest in profiler.summary():
+        stages.add_row(name, str(calls), f"{total:.4f}", f"{longest:.4f}", f"{total / wall:.1%}")
+    console.print(stages)
+
+    for arg, names, title in (
+        ("view", ("view",), "Slowest Views"),
+        ("file", ("yaml.parse", "dsl.parse"), "Slowest Files"),
+    ):
+        rows = profiler.top(arg, names)
+        if not rows:
+            continue
+        table = Table(title=title)
+        table.add_column(arg.title(), style="cyan")
+        table.add_column("Stage")
+        table.add_column("Calls", justify="right")
+        table.add_column("Total (s)", justify="right")
+        for value, name, calls, total in rows:
+            table.add_row(value, name, str(calls), f"{total:.4f}")
+        console.print(table)
+
+def _format_bytes(size: float) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if abs(size) < 1024: # noqa: PLR2004
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+def _print_memory_report(profiler: Profiler, data_dir: str) -> None:
+    stages = Table(title="Memory per Stage (traced bytes above the stage's starting point)")
+    stages.add_column("Stage", style="cyan")
+    stages.add_column("Calls", justify="right")
+    stages.add_column("Max Peak", justify="right")
+    stages.add_column("Retained (total)", justify="right")
+    for name, calls, peak, retained in profiler.memory_summary():
+        stages.add_row(name, str(calls), _format_bytes(peak), _format_bytes(retained))
+    console.print(stages)
+
+    if profiler.snapshot is not None:
+        sites = Table(title=f"Top Allocation Sites (at {_format_bytes(profiler.high_water)} allocated)")
+        sites.add_column("Location", style="cyan")
+        sites.add_column("Size", justify="right")
+        sites.add_column("Blocks", justify="right")
+        for location, size, blocks in top_allocation_sites(profiler.snapshot):
+            sites.add_row(location, _format_bytes(size), str(blocks))
+        console.print(sites)
+
+    # Deep size of the loaded model
+    adapter = open_metadata(data_dir)
+    breakdown = SizeBreakdown()
+    breakdown.add("components", adapter.load_components())
+    breakdown.add("relationships", adapter.load_relationships())
+    breakdown.add("flows", adapter.load_flows())
+    breakdown.add("views", adapter.load_view_configs())
+
+    model = Table(title="Loaded Model (deep size)")
+    model.add_column("Records", style="cyan")
+    model.add_column("Count", justify="right")
+    model.add_column("Size", justify="right")
+    model.add_column("Per Record", justify="right")
+    for kind, (count, size) in breakdown.kinds.items():
+        model.add_row(kind, str(count), _format_bytes(size), _format_bytes(size / count) if count else "-")
+    console.print(model)
+
+    by_type = Table(title="Loaded Model by Object Type")
+    by_type.add_column("Type", style="cyan")
+    by_type.add_column("Instances", justify="right")
+    by_type.add_column("Size", justify="right")
+    for type_name, count, size in breakdown.top_types():
+        by_type.add_row(type_name, str(count), _format_bytes(size))
+    console.print(by_type)
+
 
 
 @app.command()
 def ingest(
     config: str = typer.Option("ingestion_config.yaml", help="Path to ingestion config"),
-    output_dir: str = typer.Option("examples/enterprise/data/components", help="Output directory for components")
+    output_dir: str = typer.Option("examples/enterprise/data/components", help="Output directory for components"),
+    workers: int = typer.Option(1, help="Worker processes to ingest sources with; 1 streams records serially"),
+    incremental: bool = typer.Option(
+        False, "--incremental", help="Upsert records of changed sources into per-group shards under --data-dir"
+    ),
+    data_dir: str = typer.Option("examples/enterprise/data", help="Data dir holding the shards, with --incremental"),
 ) -> None:
     """Ingest seed data into SSOT."""
+    from diagram_generator.core.services.incremental_ingest import IncrementalIngest  # noqa: PLC0415
     from diagram_generator.core.services.seed_ingester import SeedIngester  # noqa: PLC0415
     
     ingester = SeedIngester(config, ".")
-    results = ingester.ingest()
+    if incremental:
+        report = IncrementalIngest(ingester, data_dir).run()
+        console.print(f"Re-extracted {len(report['changed'])} changed source(s)")
+        for path in report["written"]:
+            console.print(f"Wrote {path}")
+        for path in report["removed"]:
+            console.print(f"Removed {path}")
+        console.print("Ingestion complete.")
+        return
     
-    # Save Components
-    if results["components"]:
-        output_path = Path(output_dir) / "ingested_components.yaml"
-        console.print(f"Saving {len(results['components'])} components to {output_path}")
-        
-        # Serialize
-        components_data = [c.model_dump(exclude_none=True, mode='json') for c in results["components"]]
-        with open(output_path, 'w') as f:
-            yaml.dump({"components": components_data}, f)
-            
-    # Save Flows
-    if results["flows"]:
-        flow_output_path = Path(output_dir) / "ingested_flows.yaml"
-        console.print(f"Saving {len(results['flows'])} flows to {flow_output_path}")
-        
-        flows_data = [f.model_dump(exclude_none=True, mode='json') for f in results["flows"]]
-        with open(flow_output_path, 'w') as f:
-            yaml.dump({"flows": flows_data}, f)
-            
-    # Save Relationships
-    if results.get("relationships"):
-        rel_output_path = Path(output_dir) / "ingested_relationships.yaml"
-        console.print(f"Saving {len(results['relationships'])} relationships to {rel_output_path}")
+    # Each record is written as it is ingested; a kind's file is only (re)written once it has one.
+    # Dumping records one by one gives the same YAML as dumping {kind: records}.
+    files: dict[str, TextIO] = {}
+    counts: dict[str, int] = {}
+    records: Iterator[tuple[str, Any]] = ingester.iter_ingest()
+    if workers > 1:
+        results = ingester.ingest(workers)
+        records = ((kind, record) for kind in results for record in results[kind])
+    try:
+        for kind, record in records:
+            f = files.get(kind)
+            if f is None:
+                f = files[kind] = open(Path(output_dir) / f"ingested_{kind}.yaml", "w")
+                f.write(f"{kind}:\n")
+            yaml.dump([record.model_dump(exclude_none=True, mode='json')], f)
+            counts[kind] = counts.get(kind, 0) + 1
+    finally:
+        for f in files.values():
+            f.close()
         
-        rels_data = [r.model_dump(exclude_none=True, mode='json') for r in results["relationships"]]
-        with open(rel_output_path, 'w') as f:
-            yaml.dump({"relationships": rels_data}, f)
-    
+    for kind, f in files.items():
+        console.print(f"Saved {counts[kind]} {kind} to {f.name}")
     console.print("Ingestion complete.")
 
 if __name__ == "__main__":
@@ -4,7 +4,7 @@ from typing import Any
 import typer
 from rich.console import Console
 
-from diagram_generator.adapters.input.yaml_loader import YAMLMetadataAdapter
+from diagram_generator.adapters.input.factory import open_metadata
 
 app = typer.Typer()
 console = Console()
@@ -33,7 +33,7 @@ def start() -> None:
     @mcp.tool() # type: ignore
     def list_components(data_dir: str = "./data") -> list[dict[str, Any]]:
         """Lists all components in the system."""
-        loader = YAMLMetadataAdapter(data_dir)
+        loader = open_metadata(data_dir)
         return [c.model_dump() for c in loader.load_components()]
 
     @mcp.tool() # type: ignore
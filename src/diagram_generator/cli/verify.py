@@ -1,10 +1,17 @@
 
+import contextlib
+import json
+import sys
 from pathlib import Path
 
 import typer
 from rich.console import Console
 
-from diagram_generator.adapters.input.yaml_loader import YAMLMetadataAdapter
+from diagram_generator.adapters.input.factory import open_metadata
+from diagram_generator.adapters.output.mermaid_renderer import MermaidDiagramAdapter
+from diagram_generator.core.use_cases.generate_diagram import GenerateDiagramUseCase
+from diagram_generator.core.verification.batch_verifier import CACHE_FILE, BatchVerifier
+from diagram_generator.core.verification.expected_graph import expected_graph
 from diagram_generator.core.verification.mermaid_verifier import MermaidVerifier
 
 app = typer.Typer()
@@ -13,17 +20,18 @@ console = Console()
 @app.command()
 def view(
     view_key: str = typer.Argument(..., help="The key of the view to verify."),
-    data_dir: str = typer.Option("./data", help="Directory containing the metadata."),
-    dist_dir: str = typer.Option("./dist", help="Directory containing generated diagrams.")
+    data_dir: str = typer.Option("./data", help="Directory containing the metadata, or a compiled bundle."),
+    dist_dir: str = typer.Option("./dist", help="Directory containing generated diagrams."),
+    template_dir: str = typer.Option("./templates", help="Directory containing the Jinja2 templates."),
 ) -> None:
     """
-    Verifies that a generated diagram matches its source of truth.
+    Verifies that a generated diagram matches its source of truth: the nodes and edges
+    its view draws from the filtered model, and a flow's steps in order.
     """
     try:
         # Load Metadata
-        adapter = YAMLMetadataAdapter(data_dir)
-        view_configs = adapter.load_view_configs()
-        flows = adapter.load_flows()
+        use_case = GenerateDiagramUseCase(open_metadata(data_dir), MermaidDiagramAdapter(template_dir))
+        components, relationships, view_configs, flows = use_case.load_model()
         
         # Find View
         view = next((v for v in view_configs if v.key == view_key), None)
@@ -31,15 +39,7 @@ def view(
             console.print(f"[red]View '{view_key}' not found in metadata.[/red]")
             raise typer.Exit(code=1)
             
-        if not view.flow_id:
-            console.print(
-                f"[yellow]View '{view_key}' is not linked to a flow. "
-                "Verification only supports Flows currently.[/yellow]"
-            )
-            return
-
-        flow = next((f for f in flows if f.id == view.flow_id), None)
-        if not flow:
+        if view.flow_id and not any(f.id == view.flow_id for f in flows):
             console.print(f"[red]Flow '{view.flow_id}' not found.[/red]")
             raise typer.Exit(code=1)
 
@@ -50,9 +50,10 @@ def view(
             raise typer.Exit(code=1)
 
         # Verify
-        console.print(f"Verifying [bold]{view.key}[/bold] against flow [bold]{flow.id}[/bold]...")
-        verifier = MermaidVerifier()
-        result = verifier.verify_flow(flow, mmd_path.read_text())
+        against = f"flow [bold]{view.flow_id}[/bold]" if view.flow_id else "the model"
+        console.print(f"Verifying [bold]{view.key}[/bold] ({view.type.value}) against {against}...")
+        expected = expected_graph(*use_case.view_graph(view, components, relationships, flows))
+        result = MermaidVerifier().verify_graph(expected, mmd_path.read_text())
 
         if result.success:
             console.print("[green]✓ Verification Passed[/green]")
@@ -65,3 +66,48 @@ def view(
     except Exception as e:
         console.print(f"[red]Error: {e}[/red]")
         raise typer.Exit(code=1) from e
+
+@app.command(name="all")
+def all_views( # noqa: PLR0913, PLR0917
+    data_dir: str = typer.Option("./data", help="Directory containing the metadata, or a compiled bundle."),
+    dist_dir: str = typer.Option("./dist", help="Directory containing generated diagrams."),
+    template_dir: str = typer.Option("./templates", help="Directory containing the Jinja2 templates."),
+    workers: int = typer.Option(1, help="Worker processes to verify views with."),
+    report: str | None = typer.Option(None, help="Write the JSON report to this file."),
+    json_output: bool = typer.Option(False, "--json", help="Print the JSON report instead of a summary."),
+    cache: bool = typer.Option(True, help=f"Reuse the results of unchanged views, cached in <dist-dir>/{CACHE_FILE}."),
+    max_edges: int | None = typer.Option(
+        None, help="The --max-edges the diagrams were generated with: split views are checked page by page."
+    ),
+) -> None:
+    """
+    Verifies every view's generated diagram against its filtered model, loading the model once.
+    Exits with 1 when a diagram fails, or its flow or file is missing.
+    """
+    try:
+        # The DSL loader reports progress on stdout, which holds the report with --json
+        with contextlib.redirect_stdout(sys.stderr if json_output else sys.stdout):
+            use_case = GenerateDiagramUseCase(open_metadata(data_dir), MermaidDiagramAdapter(template_dir))
+            cache_path = Path(dist_dir) / CACHE_FILE if cache else None
+            verifier = BatchVerifier(use_case, dist_dir, cache_path, max_edges)
+            results = verifier.run(workers)
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(code=1) from e
+
+    if report:
+        Path(report).write_text(json.dumps(results, indent=2))
+    if json_output:
+        print(json.dumps(results, indent=2))
+    else:
+        for row in results["views"]:
+            if row["status"] == "passed":
+                console.print(f"[green]✓ {row['view']}[/green]")
+            else:
+                console.print(f"[red]✗ {row['view']} ({row['status']})[/red]")
+                for err in row["errors"]:
+                    console.print(f"  - {err}")
+        summary = ", ".join(f"{count} {status}" for status, count in results["summary"].items() if count)
+        console.print(f"Verified {len(results['views'])} views: {summary or 'none'}")
+    if not results["passed"]:
+        raise typer.Exit(code=1)
@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import copy
+from array import array
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+from diagram_generator.core.domain.flow import Flow, FlowStep
+
+# Flows with at least this many steps are loaded as CompactFlow
+COMPACT_FLOW_STEPS = 10_000
+# Index of the shared empty metadata dict in every store's metadata table
+_NO_METADATA = 0
+# Marks a step without a protocol in the protocol column
+_NO_PROTOCOL = -1
+
+
+class StepRecord:
+    """
+    Read-only view of one step of a StepStore, with the same attributes as FlowStep.
+    `metadata` is shared with every step carrying equal metadata; do not mutate it.
+    """
+
+    __slots__ = ("description", "is_dashed", "metadata", "protocol", "source_id", "target_id")
+
+    def __init__( # noqa: PLR0913, PLR0917
+        self,
+        source_id: str,
+        target_id: str,
+        description: str,
+        protocol: str | None,
+        is_dashed: bool,
+        metadata: dict[str, Any],
+    ):
+        self.source_id = source_id
+        self.target_id = target_id
+        self.description = description
+        self.protocol = protocol
+        self.is_dashed = is_dashed
+        self.metadata = metadata
+
+    def as_tuple(self) -> tuple[str, str, str, str | None, bool, dict[str, Any]]:
+        return self.source_id, self.target_id, self.description, self.protocol, self.is_dashed, self.metadata
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, StepRecord) and self.as_tuple() == other.as_tuple()
+
+    __hash__ = None # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"StepRecord({self.source_id!r} -> {self.target_id!r}: {self.description!r})"
+
+
+class StepStore:
+    """
+    Columnar steps of one flow. Ids, descriptions and protocols are stored once in a
+    string table and referenced from int columns; equal metadata dicts are stored once
+    in a metadata table. Iterating yields StepRecords, never pydantic models.
+    """
+
+    __slots__ = (
+        "_metadata", "_metadata_ids", "_string_ids", "_strings",
+        "dashed", "descriptions", "metadata_ids", "protocols", "sources", "targets",
+    )
+
+    def __init__(self) -> None:
+        self._strings: list[str] = []
+        self._string_ids: dict[str, int] = {}
+        self._metadata: list[dict[str, Any]] = [{}]
+        self._metadata_ids: dict[Any, int] = {}
+        self.sources: array[int] = array("i")
+        self.targets: array[int] = array("i")
+        self.descriptions: array[int] = array("i")
+        self.protocols: array[int] = array("i")
+        self.dashed = bytearray()
+        self.metadata_ids: array[int] = array("i")
+
+    @classmethod
+    def from_steps(cls, steps: Iterable[FlowStep | StepRecord]) -> StepStore:
+        store = cls()
+        for step in steps:
+            store.append(step.source_id, step.target_id, step.description, step.protocol, step.is_dashed, step.metadata)
+        return store
+
+    def append( # noqa: PLR0913, PLR0917
+        self,
+        source_id: str,
+        target_id: str,
+        description: str,
+        protocol: str | None = None,
+        is_dashed: bool = False,
+        metadata: dict[str, Any] | None = None,
+    ) -> None:
+        self.sources.append(self._intern(source_id))
+        self.targets.append(self._intern(target_id))
+        self.descriptions.append(self._intern(description))
+        self.protocols.append(_NO_PROTOCOL if protocol is None else self._intern(protocol))
+        self.dashed.append(is_dashed)
+        self.metadata_ids.append(self._metadata_id(metadata) if metadata else _NO_METADATA)
+
+    def _intern(self, value: str) -> int:
+        index = self._string_ids.get(value)
+        if index is None:
+            index = self._string_ids[value] = len(self._strings)
+            self._strings.append(value)
+        return index
+
+    def _metadata_id(self, metadata: dict[str, Any]) -> int:
+        try:
+            key = _freeze(metadata)
+        except TypeError:
+            # Unhashable leaf values: keep this dict on its own
+            self._metadata.append(copy.deepcopy(metadata))
+            return len(self._metadata) - 1
+        index = self._metadata_ids.get(key)
+        if index is None:
+            index = self._metadata_ids[key] = len(self._metadata)
+            self._metadata.append(copy.deepcopy(metadata))
+        return index
+
+    def __len__(self) -> int:
+        return len(self.sources)
+
+    def __getitem__(self, index: int) -> StepRecord:
+        strings = self._strings
+        protocol = self.protocols[index]
+        return StepRecord(
+            strings[self.sources[index]],
+            strings[self.targets[index]],
+            strings[self.descriptions[index]],
+            None if protocol == _NO_PROTOCOL else strings[protocol],
+            bool(self.dashed[index]),
+            self._metadata[self.metadata_ids[index]],
+        )
+
+    def __iter__(self) -> Iterator[StepRecord]:
+        strings, metadata = self._strings, self._metadata
+        for source, target, description, protocol, dashed, metadata_id in zip(
+            self.sources, self.targets, self.descriptions, self.protocols, self.dashed, self.metadata_ids, strict=True
+        ):
+            yield StepRecord(
+                strings[source],
+                strings[target],
+                strings[description],
+                None if protocol == _NO_PROTOCOL else strings[protocol],
+                bool(dashed),
+                metadata[metadata_id],
+            )
+
+    def to_steps(self) -> list[FlowStep]:
+        """Pydantic steps, each with its own copy of its metadata."""
+        return [
+            FlowStep(
+                source_id=r.source_id, target_id=r.target_id, description=r.description,
+                protocol=r.protocol, is_dashed=r.is_dashed, metadata=copy.deepcopy(r.metadata),
+            )
+            for r in self
+        ]
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, StepStore) and len(self) == len(other) and all(
+            a == b for a, b in zip(self, other, strict=True)
+        )
+
+    __hash__ = None # type: ignore[assignment]
+
+
+class CompactFlow:
+    """
+    A Flow whose steps live in a StepStore. It has Flow's attributes, so templates,
+    the abstractor and the verifier use either; `from_flow`/`to_flow` convert losslessly.
+    """
+
+    __slots__ = ("description", "id", "metadata", "steps", "tags")
+
+    def __init__(
+        self,
+        id: str,
+        description: str,
+        steps: StepStore | None = None,
+        tags: list[str] | None = None,
+        metadata: dict[str, Any] | None = None,
+    ):
+        self.id = id
+        self.description = description
+        self.steps = steps if steps is not None else StepStore()
+        self.tags = tags if tags is not None else []
+        self.metadata = metadata if metadata is not None else {}
+
+    @classmethod
+    def validate(cls, record: dict[str, Any]) -> CompactFlow:
+        """Validates a raw flow record step by step straight into a StepStore, so no step model is kept."""
+        header = Flow.model_validate({**record, "steps": []})
+        store = StepStore()
+        for raw_step in record.get("steps") or ():
+            step = FlowStep.model_validate(raw_step)
+            store.append(step.source_id, step.target_id, step.description, step.protocol, step.is_dashed, step.metadata)
+        return cls(header.id, header.description, store, header.tags, header.metadata)
+
+    @classmethod
+    def from_flow(cls, flow: Flow) -> CompactFlow:
+        return cls(
+            flow.id, flow.description, StepStore.from_steps(flow.steps),
+            list(flow.tags), copy.deepcopy(flow.metadata),
+        )
+
+    def to_flow(self) -> Flow:
+        return Flow(
+            id=self.id, description=self.description, steps=self.steps.to_steps(),
+            tags=list(self.tags), metadata=copy.deepcopy(self.metadata),
+        )
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, CompactFlow) and (
+            (self.id, self.description, self.tags, self.metadata)
+            == (other.id, other.description, other.tags, other.metadata)
+            and self.steps == other.steps
+        )
+
+    __hash__ = None # type: ignore[assignment]
+
+
+# Either representation of a flow; everything downstream of loading accepts both
+AnyFlow = Flow | CompactFlow
+
+
+def _freeze(value: Any) -> Any:
+    """Hashable key for equal metadata values. Raises TypeError for unhashable leaves."""
+    if isinstance(value, dict):
+        return ("dict", tuple(sorted((k, _freeze(v)) for k, v in value.items())))
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__, tuple(_freeze(v) for v in value))
+    hash(value)
+    return (type(value).__name__, value)
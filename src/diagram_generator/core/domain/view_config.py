@@ -20,6 +20,10 @@ class Type(Enum):
 
 class Filters(BaseModel):
     tags: list[str] | None = None
+    # Component types to keep (e.g. 'service')
+    types: list[str] | None = None
+    # Groups to keep, with the groups nested under them ('Bank' keeps 'Bank.Core')
+    groups: list[str] | None = None
     include_external: bool | None = True
 
 
@@ -49,3 +53,12 @@ class ViewConfig(BaseModel):
     abstraction_level: Literal['system', 'container', 'component'] | None = Field(
         None, description="Level of abstraction to roll up to (system=Root Group, container=L1 Group)."
     )
+    max_nodes: int | None = Field(
+        None, description="Node budget. Without an explicit abstraction_level, the finest level that fits is used."
+    )
+    max_edges: int | None = Field(
+        None, description="Edge budget. Without an explicit abstraction_level, the finest level that fits is used."
+    )
+    aggregate_relationships: bool = Field(
+        False, description="Merge parallel relationships between the same pair into one labelled edge."
+    )
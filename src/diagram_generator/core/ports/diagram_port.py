@@ -1,7 +1,7 @@
 from typing import Protocol
 
+from diagram_generator.core.domain.compact_flow import AnyFlow
 from diagram_generator.core.domain.component import Component
-from diagram_generator.core.domain.flow import Flow
 from diagram_generator.core.domain.relationship import Relationship
 from diagram_generator.core.domain.view_config import ViewConfig
 
@@ -12,7 +12,7 @@ class DiagramPort(Protocol):
         view_config: ViewConfig,
         components: list[Component],
         relationships: list[Relationship],
-        flows: list[Flow] | None = None
+        flows: list[AnyFlow] | None = None
     ) -> str:
         """
         Renders a diagram based on the provided configuration and graph data.
@@ -1,7 +1,7 @@
-from typing import Protocol
+from typing import Protocol, TypeGuard
 
+from diagram_generator.core.domain.compact_flow import AnyFlow
 from diagram_generator.core.domain.component import Component
-from diagram_generator.core.domain.flow import Flow
 from diagram_generator.core.domain.relationship import Relationship
 from diagram_generator.core.domain.view_config import ViewConfig
 
@@ -16,5 +16,32 @@ class MetadataPort(Protocol):
     def load_view_configs(self) -> list[ViewConfig]:
         ...
 
-    def load_flows(self) -> list[Flow]:
+    def load_flows(self) -> list[AnyFlow]:
         ...
+
+
+class LookupMetadataPort(MetadataPort, Protocol):
+    """A MetadataPort that decodes one view or flow by its key, without loading the rest of its kind."""
+
+    def load_view_config(self, key: str) -> ViewConfig | None:
+        ...
+
+    def load_flow(self, flow_id: str) -> AnyFlow | None:
+        ...
+
+
+class FilteringMetadataPort(MetadataPort, Protocol):
+    """A MetadataPort that evaluates a view's filters itself (with its indexes), without loading the model."""
+
+    def filter_graph(self, view_config: ViewConfig) -> tuple[list[Component], list[Relationship]]:
+        ...
+
+
+def can_filter(port: MetadataPort) -> TypeGuard[FilteringMetadataPort]:
+    """Whether the port's class implements filter_graph (the class, so a MagicMock port does not claim it)."""
+    return callable(getattr(type(port), "filter_graph", None))
+
+
+def can_look_up(port: MetadataPort) -> TypeGuard[LookupMetadataPort]:
+    """Whether the port's class implements load_view_config and load_flow."""
+    return all(callable(getattr(type(port), method, None)) for method in ("load_view_config", "load_flow"))
@@ -1,41 +1,167 @@
+import re
+import sys
+from collections.abc import Iterable
+
 from diagram_generator.core.domain.component import Component
 
+# Finest to coarsest. 'component' is the leaf level (no roll-up).
+ABSTRACTION_LEVELS = ("component", "container", "system")
+
+# Depth of the group path each roll-up level resolves to
+LEVEL_DEPTHS = {"system": 0, "container": 1}
+
+_UNSAFE_ID_CHARS = re.compile(r"[^a-zA-Z0-9_\-]")
+
+
+def sanitize_id(raw: str) -> str:
+    """Convert "System A" -> "System_A", "R&D" -> "R_and_D" (alphanumeric, '_' and '-' only)."""
+    s = str(raw).strip().replace(" ", "_").replace("&", "_and_")
+    return _UNSAFE_ID_CHARS.sub("", s)
+
+
+def group_path(group: object) -> str:
+    """A `metadata.group` normalised as ComponentHierarchy splits it ("Bank . Core" -> "Bank.Core")."""
+    return ".".join(part.strip() for part in str(group or "").split(".") if part.strip())
+
+
+def in_group(path: str, group: str) -> bool:
+    """Whether group path `path` is `group` or nested under it ("Bank.Core" is in "Bank", "Bankers" is not)."""
+    return path == group or path.startswith(f"{group}.")
+
+
+class GroupNode:
+    """
+    One segment of a group path ("Bank.Core" -> Bank -> Core).
+    `id` is the sanitized full path (e.g. "Bank_Core"), used both as the
+    roll-up parent ID and as the swimlane subgraph ID.
+    """
+
+    __slots__ = ("children", "components", "depth", "id", "name", "path")
+
+    def __init__(self, id: str, name: str, path: str, depth: int):
+        self.id = id
+        self.name = name
+        self.path = path
+        self.depth = depth
+        self.children: dict[str, GroupNode] = {}
+        self.components: dict[str, Component] = {}
+
 
 class ComponentHierarchy:
     """Resolves abstraction parents for components based on metadata."""
 
     def __init__(self, components: list[Component]):
-        self.comp_map = {c.id: c for c in components}
-        
+        self.comp_map: dict[str, Component] = {}
+        # Group-path trie; the root holds ungrouped components
+        self.root = GroupNode("root", "root", "", -1)
+        # Component ID -> group nodes from the top-level group down to its own
+        self._paths: dict[str, tuple[GroupNode, ...]] = {}
+        self._parent_maps: dict[str, dict[str, str]] = {}
+        for comp in components:
+            self.add(comp)
+
+    def add(self, component: Component) -> bool:
+        """
+        Inserts (or re-inserts) a component into the trie.
+        Returns True if it is new or its group path changed.
+        """
+        node = self.root
+        path: list[GroupNode] = []
+        for raw_part in str(component.metadata.get("group") or "").split('.'):
+            part = raw_part.strip()
+            if not part:
+                continue
+            child = node.children.get(part)
+            if child is None:
+                full_path = f"{node.path}.{part}" if node.path else part
+                child_id = f"{node.id}_{sanitize_id(part)}" if path else sanitize_id(part)
+                child = GroupNode(sys.intern(child_id), sys.intern(part), sys.intern(full_path), node.depth + 1)
+                node.children[child.name] = child
+            node = child
+            path.append(node)
+
+        previous = self.comp_map.get(component.id)
+        old_path = self._paths.get(component.id, ())
+        new_path = tuple(path)
+        changed = previous is None or new_path != old_path
+        if changed and previous is not None:
+            (old_path[-1] if old_path else self.root).components.pop(component.id)
+
+        self.comp_map[component.id] = component
+        node.components[component.id] = component
+        if new_path:
+            self._paths[component.id] = new_path
+        else:
+            self._paths.pop(component.id, None)
+
+        if changed:
+            self._parent_maps = {}
+        return changed
+
+    def get_parent_node(self, component_id: str, level: str) -> GroupNode | None:
+        """Group node standing for the component at `level`; None if it doesn't roll up."""
+        path = self._paths.get(component_id)
+        depth = LEVEL_DEPTHS.get(level)
+        if not path or depth is None:
+            return None
+        # Shallow paths roll up to their deepest group
+        return path[min(depth, len(path) - 1)]
+
     def get_parent_id(self, component_id: str, level: str) -> str:
         """
         Resolves the parent ID for a given level.
         system (Level 0) -> Root Group
         container (Level 1) -> Root.Child Group
         """
-        comp = self.comp_map.get(component_id)
-        if not comp:
-            return component_id # Unknown, return self
-            
-        group_path = comp.metadata.get("group")
-        if not group_path:
-            return component_id # No group, return self
-            
-        parts = group_path.split('.')
-        # Sanitization: Clean up spaces and forbidden chars
-        parts = [p.strip().replace(' ', '_') for p in parts]
-        
-        if level == "system":
-            return parts[0]
-            
-        if level == "container":
-            if len(parts) >= 2: # noqa: PLR2004
-                # Replace dot with underscore for valid ID
-                return f"{parts[0]}_{parts[1]}"
-            return parts[0] # Fallback to root
-            
-        return component_id
-        
+        node = self.get_parent_node(component_id, level)
+        return node.id if node else component_id
+
+    def get_parent_ids(self, component_id: str) -> dict[str, str]:
+        """Parent IDs for every roll-up level; empty for unknown or ungrouped components."""
+        path = self._paths.get(component_id)
+        if not path:
+            return {}
+        return {level: path[min(depth, len(path) - 1)].id for level, depth in LEVEL_DEPTHS.items()}
+
+    def parent_map(self, level: str) -> dict[str, str]:
+        """Group index: component ID -> parent ID at `level`."""
+        if level not in self._parent_maps:
+            self._parent_maps[level] = {c_id: self.get_parent_id(c_id, level) for c_id in self.comp_map}
+        return self._parent_maps[level]
+
+    def estimate_size(
+        self,
+        node_ids: Iterable[str],
+        edges: Iterable[tuple[str, str]],
+        level: str,
+        ordered: bool = False,
+    ) -> tuple[int, int]:
+        """
+        Estimates (nodes, edges) of the graph rolled up to `level` without building it.
+        Rolled-up edges between the same parents are counted once, matching the
+        aggregated output. With `ordered` (flow steps) only repeats of the previous
+        step collapse, matching what the flow abstractor keeps.
+        """
+        edges = list(edges)
+        if level == "component":
+            return len(set(node_ids)), len(edges)
+
+        parents = self.parent_map(level)
+        nodes = {parents.get(n, n) for n in node_ids}
+
+        if not ordered:
+            pairs = {(parents.get(s, s), parents.get(t, t)) for s, t in edges}
+            return len(nodes), sum(1 for s, t in pairs if s != t)
+
+        count = 0
+        last: tuple[str, str] | None = None
+        for s, t in edges:
+            pair = (parents.get(s, s), parents.get(t, t))
+            if pair[0] != pair[1] and pair != last:
+                count += 1
+                last = pair
+        return len(nodes), count
+
     def get_parent_component(self, component_id: str, level: str) -> Component | None:
         """Typesafe wrapper to return component object if it exists, else synthetic."""
         # For now, we reuse existing components if they match parent ID?
@@ -0,0 +1,217 @@
+import heapq
+
+from diagram_generator.core.domain.component import Component, ComponentType, GenericComponent
+from diagram_generator.core.domain.relationship import Relationship
+from diagram_generator.core.domain.view_config import Type as ViewType
+from diagram_generator.core.domain.view_config import ViewConfig
+
+# Mermaid refuses to lay out graphs above its `maxEdges` setting (500 by default).
+MERMAID_MAX_EDGES = 500
+
+# Views drawn from static relationships. Flow-driven views (sequence, or any view
+# with a flow_id) are ordered step lists and can't be cut into pages meaningfully.
+SPLITTABLE_TYPES = {ViewType.c4_context, ViewType.c4_container, ViewType.flowchart, ViewType.flowchart_swimlane}
+
+
+class DiagramPage:
+    """One renderable slice of a split view."""
+
+    def __init__(self, view_config: ViewConfig, components: list[Component], relationships: list[Relationship]):
+        self.view_config = view_config
+        self.components = components
+        self.relationships = relationships
+
+
+class DiagramSplitter:
+    """
+    Partitions an oversized view into linked pages that each stay under `max_edges`.
+
+    Components are packed page by page following their top-level `group`, so group
+    boundaries become page boundaries where possible. Groups too large for a single
+    page are cut by greedy region growing, which always pulls in the node with the
+    most edges into the current page to keep cross-page edges low.
+    """
+
+    def __init__(self, max_edges: int = MERMAID_MAX_EDGES):
+        if max_edges < 1:
+            raise ValueError("max_edges must be a positive integer.")
+        self.max_edges = max_edges
+
+    def can_split(self, view_config: ViewConfig, relationships: list[Relationship]) -> bool:
+        return (
+            view_config.type in SPLITTABLE_TYPES
+            and not view_config.flow_id
+            and len(relationships) > self.max_edges
+        )
+
+    def split(
+        self, view_config: ViewConfig, components: list[Component], relationships: list[Relationship]
+    ) -> tuple[list[DiagramPage], DiagramPage]:
+        """
+        Returns (pages, index). Every edge is drawn on each page that owns one of its
+        endpoints; the foreign endpoint is replaced by a stub linking to its page.
+        """
+        comp_map = {c.id: c for c in components}
+        partition = self._partition(components, relationships)
+
+        page_keys = [f"{view_config.key}-page-{i + 1}" for i in range(len(partition))]
+        page_of: dict[str, int] = {}
+        for page_idx, ids in enumerate(partition):
+            for comp_id in ids:
+                page_of[comp_id] = page_idx
+
+        page_rels: list[list[Relationship]] = [[] for _ in partition]
+        cut_counts: dict[tuple[int, int], int] = {}
+        for rel in relationships:
+            src_page = page_of[rel.source_id]
+            tgt_page = page_of[rel.target_id]
+            page_rels[src_page].append(rel)
+            if tgt_page != src_page:
+                page_rels[tgt_page].append(rel)
+                cut_counts[(src_page, tgt_page)] = cut_counts.get((src_page, tgt_page), 0) + 1
+
+        total = len(partition)
+        pages = []
+        for page_idx, ids in enumerate(partition):
+            members = set(ids)
+            page_components = [comp_map[i] for i in ids]
+            stub_ids: list[str] = []
+            for rel in page_rels[page_idx]:
+                for end in (rel.source_id, rel.target_id):
+                    if end not in members and end not in stub_ids:
+                        stub_ids.append(end)
+            page_components.extend(
+                self._stub(comp_map[i], page_keys[page_of[i]], page_of[i] + 1) for i in stub_ids
+            )
+
+            page_config = view_config.model_copy(update={
+                "key": page_keys[page_idx],
+                "title": f"{view_config.title} ({page_idx + 1}/{total})",
+            })
+            pages.append(DiagramPage(page_config, page_components, page_rels[page_idx]))
+
+        return pages, self._index(view_config, pages, cut_counts)
+
+    def _partition(self, components: list[Component], relationships: list[Relationship]) -> list[list[str]]:
+        # Edge indices touching each node; a page's edge count is the size of the union.
+        incident: dict[str, list[int]] = {c.id: [] for c in components}
+        for idx, rel in enumerate(relationships):
+            incident[rel.source_id].append(idx)
+            if rel.target_id != rel.source_id:
+                incident[rel.target_id].append(idx)
+
+        groups: dict[str, list[str]] = {}
+        for comp in components:
+            group_path = comp.metadata.get("group") or ""
+            groups.setdefault(str(group_path).split(".")[0].strip(), []).append(comp.id)
+
+        # Whole groups are the packing units; oversized groups contribute their regions instead.
+        units: list[tuple[list[str], set[int]]] = []
+        for group_ids in groups.values():
+            group_edges = {e for comp_id in group_ids for e in incident[comp_id]}
+            if len(group_edges) <= self.max_edges:
+                units.append((group_ids, group_edges))
+            else:
+                units.extend(self._grow_regions(group_ids, relationships, incident))
+
+        pages: list[list[str]] = []
+        current: list[str] = []
+        current_edges: set[int] = set()
+        for unit_ids, unit_edges in units:
+            if current and len(current_edges | unit_edges) > self.max_edges:
+                pages.append(current)
+                current, current_edges = [], set()
+            current.extend(unit_ids)
+            current_edges |= unit_edges
+
+        if current:
+            pages.append(current)
+        return pages
+
+    def _grow_regions(
+        self, node_ids: list[str], relationships: list[Relationship], incident: dict[str, list[int]]
+    ) -> list[tuple[list[str], set[int]]]:
+        order = {node_id: i for i, node_id in enumerate(node_ids)}
+        remaining = set(node_ids)
+        regions = []
+
+        for seed in node_ids:
+            if seed not in remaining:
+                continue
+
+            members = [seed]
+            remaining.discard(seed)
+            edges = set(incident[seed])
+            # Connections from each frontier node into the region; heap is lazily invalidated.
+            gain: dict[str, int] = {}
+            heap: list[tuple[int, int, str]] = []
+            frontier = (gain, heap, remaining, order)
+
+            self._extend_frontier(seed, relationships, incident, frontier)
+            while heap:
+                neg_gain, _, candidate = heapq.heappop(heap)
+                if candidate not in remaining or -neg_gain != gain.get(candidate):
+                    continue
+                new_edges = [e for e in incident[candidate] if e not in edges]
+                if len(edges) + len(new_edges) > self.max_edges:
+                    continue
+                members.append(candidate)
+                remaining.discard(candidate)
+                edges.update(new_edges)
+                self._extend_frontier(candidate, relationships, incident, frontier)
+
+            regions.append((members, edges))
+        return regions
+
+    def _extend_frontier(
+        self,
+        node_id: str,
+        relationships: list[Relationship],
+        incident: dict[str, list[int]],
+        frontier: tuple[dict[str, int], list[tuple[int, int, str]], set[str], dict[str, int]],
+    ) -> None:
+        gain, heap, remaining, order = frontier
+        for e in incident[node_id]:
+            rel = relationships[e]
+            other = rel.target_id if rel.source_id == node_id else rel.source_id
+            if other in remaining:
+                gain[other] = gain.get(other, 0) + 1
+                heapq.heappush(heap, (-gain[other], order[other], other))
+
+    def _stub(self, comp: Component, page_key: str, page_number: int) -> Component:
+        return comp.model_copy(update={
+            "name": f"{comp.name} (page {page_number})",
+            "link": f"{page_key}.mmd",
+            "metadata": {**comp.metadata, "stub": True, "page": page_key},
+        })
+
+    def _index(
+        self, view_config: ViewConfig, pages: list[DiagramPage], cut_counts: dict[tuple[int, int], int]
+    ) -> DiagramPage:
+        index_components: list[Component] = []
+        for page in pages:
+            stubs = sum(1 for c in page.components if c.metadata.get("stub"))
+            index_components.append(GenericComponent(
+                id=page.view_config.key,
+                name=page.view_config.title,
+                description=f"{len(page.components) - stubs} components, {len(page.relationships)} relationships",
+                type=ComponentType.generic,
+                link=f"{page.view_config.key}.mmd",
+            ))
+
+        index_relationships = [
+            Relationship(
+                source_id=pages[src].view_config.key,
+                target_id=pages[tgt].view_config.key,
+                description=f"{count} links",
+                protocol=None,
+            )
+            for (src, tgt), count in cut_counts.items()
+        ]
+
+        index_config = view_config.model_copy(update={
+            "title": f"{view_config.title} (Index)",
+            "type": ViewType.flowchart,
+            "group_by": None,
+        })
+        return DiagramPage(index_config, index_components, index_relationships)
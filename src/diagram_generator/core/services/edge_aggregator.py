@@ -0,0 +1,61 @@
+from typing import Any
+
+from diagram_generator.core.domain.relationship import Relationship
+
+
+class EdgeAggregator:
+    """Collapses redundant relationships so dense graphs render fewer edges."""
+
+    def dedupe(self, relationships: list[Relationship]) -> list[Relationship]:
+        """
+        Drops exact duplicates (same source, target, description and protocol),
+        e.g. an edge declared both in YAML and a .flow file. The first occurrence
+        wins; tags and metadata from later copies are folded into it.
+        """
+        index: dict[tuple[str, str, str, str | None], Relationship] = {}
+        for rel in relationships:
+            key = (rel.source_id, rel.target_id, rel.description, rel.protocol)
+            kept = index.get(key)
+            if kept is None:
+                index[key] = rel
+                continue
+            if rel.tags:
+                kept.tags = list(dict.fromkeys((kept.tags or []) + rel.tags))
+            for meta_key, value in rel.metadata.items():
+                kept.metadata.setdefault(meta_key, value)
+        return list(index.values())
+
+    def aggregate(self, relationships: list[Relationship]) -> list[Relationship]:
+        """
+        Merges parallel edges between the same pair into one labelled edge
+        carrying the count and the combined protocol list.
+        """
+        buckets: dict[tuple[str, str], list[Relationship]] = {}
+        for rel in relationships:
+            buckets.setdefault((rel.source_id, rel.target_id), []).append(rel)
+
+        aggregated = []
+        for (source_id, target_id), rels in buckets.items():
+            if len(rels) == 1:
+                aggregated.append(rels[0])
+                continue
+
+            descriptions = list(dict.fromkeys(r.description for r in rels))
+            protocols = list(dict.fromkeys(r.protocol for r in rels if r.protocol))
+            tags = list(dict.fromkeys(t for r in rels for t in r.tags or []))
+            metadata: dict[str, Any] = {"aggregated": len(rels), "descriptions": descriptions}
+
+            if len(descriptions) == 1:
+                label = f"{descriptions[0]} ({len(rels)}x)"
+            else:
+                label = f"{len(rels)} interactions"
+
+            aggregated.append(Relationship(
+                source_id=source_id,
+                target_id=target_id,
+                description=label,
+                protocol=", ".join(protocols) or None,
+                tags=tags or None,
+                metadata=metadata,
+            ))
+        return aggregated
@@ -1,86 +1,198 @@
+from typing import Any
+
+from diagram_generator.core.domain.compact_flow import AnyFlow, CompactFlow, StepStore
 from diagram_generator.core.domain.component import Component, Container, System
 from diagram_generator.core.domain.flow import Flow, FlowStep
-from diagram_generator.core.services.component_hierarchy import ComponentHierarchy
+from diagram_generator.core.domain.relationship import Relationship
+from diagram_generator.core.services.component_hierarchy import ComponentHierarchy, sanitize_id
+from diagram_generator.core.services.edge_aggregator import EdgeAggregator
+from diagram_generator.core.services.profiler import span
+
+# Levels that roll up to a parent group. 'component' is the leaf level.
+ROLLUP_LEVELS = ("container", "system")
 
 
 class FlowAbstractor:
+    """
+    Rolls flows and relationships up to coarser abstraction levels.
+
+    Parents come from the group-path trie of a ComponentHierarchy that is kept
+    across calls, and abstracted flows are cached per (flow, level), so views at
+    several levels over the same flows share the work. Reuse one instance across views.
+    """
+
+    def __init__(self) -> None:
+        self._hierarchy = ComponentHierarchy([])
+        # (flow ID, level) -> (source flow, abstracted flow, components it references)
+        self._flow_cache: dict[tuple[str, str], tuple[AnyFlow, AnyFlow, list[Component]]] = {}
+
+    def index(self, components: list[Component]) -> None:
+        """Adds components to the hierarchy. Cached flows are dropped if any group changed."""
+        known = self._hierarchy.comp_map
+        changed = False
+        for comp in components:
+            if known.get(comp.id) is comp:
+                continue
+            changed = self._hierarchy.add(comp) or changed
+
+        if changed:
+            self._flow_cache.clear()
+
+    def hierarchy(self, components: list[Component]) -> ComponentHierarchy:
+        """The kept hierarchy with `components` indexed, so its parent maps carry over between views."""
+        self.index(components)
+        return self._hierarchy
+
+    def abstract_flow(
+        self, flow: AnyFlow, components: list[Component], level: str
+    ) -> tuple[AnyFlow, list[Component]]:
+        """
+        Abstracts a single flow to `level`.
+        Returns the abstracted flow (a CompactFlow for a CompactFlow) and the components its steps reference.
+        """
+        with span("abstract.flow", "abstraction", flow=flow.id, level=level):
+            return self._abstract_flow(flow, components, level)
+
+    def _abstract_flow(
+        self, flow: AnyFlow, components: list[Component], level: str
+    ) -> tuple[AnyFlow, list[Component]]:
+        self.index(components)
+        if level not in ROLLUP_LEVELS:
+            # Component level is the leaf level: nothing to roll up.
+            referenced = dict.fromkeys(end for step in flow.steps for end in (step.source_id, step.target_id))
+            known = self._hierarchy.comp_map
+            return flow, [known[c_id] for c_id in referenced if c_id in known]
+
+        key = (flow.id, level)
+        cached = self._flow_cache.get(key)
+        if cached and (cached[0] is flow or cached[0] == flow):
+            return cached[1], list(cached[2])
+
+        parents: dict[str, Component] = {}
+        # (source, target, description, metadata) of the abstract steps
+        new_steps: list[tuple[str, str, str, dict[str, Any]]] = []
+        last_step = None
+
+        for step in flow.steps:
+            # 1. Resolve Parents
+            src_parent_id = self._resolve(step.source_id, level, parents)
+            tgt_parent_id = self._resolve(step.target_id, level, parents)
+
+            # 2. Skip internal steps (same parent interaction)
+            if src_parent_id == tgt_parent_id:
+                continue
+
+            # 3. Deduplicate (if same as last step)
+            if (
+                last_step and
+                last_step[0] == src_parent_id and
+                last_step[1] == tgt_parent_id
+            ):
+                continue
+
+            # 4. Create Abstract Step
+            last_step = (src_parent_id, tgt_parent_id, step.description, step.metadata) # Could be aggregated?
+            new_steps.append(last_step)
+
+        # Only keep parents the abstracted steps still reference
+        referenced = dict.fromkeys(end for step in new_steps for end in step[:2])
+        abstract_components = [parents[c_id] for c_id in referenced]
+
+        new_id = f"{flow.id}_{level}"
+        new_description = f"{flow.description} (Abstracted: {level})"
+        new_flow: AnyFlow
+        if isinstance(flow, CompactFlow):
+            # Compact in, compact out: the steps never become pydantic models
+            store = StepStore()
+            for source_id, target_id, description, metadata in new_steps:
+                store.append(source_id, target_id, description, metadata=metadata)
+            new_flow = CompactFlow(new_id, new_description, store, flow.tags, flow.metadata)
+        else:
+            new_flow = Flow(
+                id=new_id,
+                description=new_description,
+                steps=[
+                    FlowStep(
+                        source_id=source_id,
+                        target_id=target_id,
+                        description=description,
+                        protocol=None,
+                        is_dashed=False,
+                        metadata=metadata.copy()
+                    )
+                    for source_id, target_id, description, metadata in new_steps
+                ],
+                tags=flow.tags,
+                metadata=flow.metadata
+            )
+        self._flow_cache[key] = (flow, new_flow, abstract_components)
+        return new_flow, list(abstract_components)
+
     def abstract_flows(
-        self, flows: list[Flow], components: list[Component], level: str
-    ) -> tuple[list[Flow], list[Component]]:
-        if level not in ['system', 'container']:
+        self, flows: list[AnyFlow], components: list[Component], level: str
+    ) -> tuple[list[AnyFlow], list[Component]]:
+        """Abstracts every flow. Prefer `abstract_flow` when only one flow is rendered."""
+        if level not in ROLLUP_LEVELS:
             return flows, components
             
-        hierarchy = ComponentHierarchy(components)
         abstract_flows = []
-        abstract_components_map = {} # ID -> Component
-        
+        abstract_components_map: dict[str, Component] = {}
         for flow in flows:
-            new_steps = []
-            last_step = None
-            
-            for step in flow.steps:
-                # 1. Resolve Parents
-                src_parent_name = hierarchy.get_parent_id(step.source_id, level)
-                tgt_parent_name = hierarchy.get_parent_id(step.target_id, level)
-                
-                # Sanitize IDs for internal use/linking
-                src_parent_id = self._sanitize_id(src_parent_name)
-                tgt_parent_id = self._sanitize_id(tgt_parent_name)
-                
-                # 2. Skip internal steps (same parent interaction)
-                if src_parent_id == tgt_parent_id:
-                    continue
-                    
-                # 3. Create Abstract Step
-                # We need to register these parents as components if they don't exist
-                if src_parent_id not in abstract_components_map:
-                   abstract_components_map[src_parent_id] = self._create_synthetic_component(
-                       src_parent_id, src_parent_name, level
-                   )
-                if tgt_parent_id not in abstract_components_map:
-                   abstract_components_map[tgt_parent_id] = self._create_synthetic_component(
-                       tgt_parent_id, tgt_parent_name, level
-                   )
-
-                new_step = FlowStep(
-                    source_id=src_parent_id,
-                    target_id=tgt_parent_id,
-                    description=step.description, # Could be aggregated?
-                    metadata=step.metadata.copy()
-                )
-                
-                # 4. Deduplicate (if same as last step)
-                if (
-                    last_step and 
-                    last_step.source_id == new_step.source_id and 
-                    last_step.target_id == new_step.target_id
-                ):
-                    # Append description?
-                    continue
-                    
-                new_steps.append(new_step)
-                last_step = new_step
-            
-            if new_steps:
-                new_flow = Flow(
-                    id=f"{flow.id}_{level}",
-                    description=f"{flow.description} (Abstracted: {level})",
-                    steps=new_steps,
-                    tags=flow.tags,
-                    metadata=flow.metadata
-                )
+            new_flow, flow_components = self.abstract_flow(flow, components, level)
+            if new_flow.steps:
                 abstract_flows.append(new_flow)
-
-        # Merge original components if they match parent IDs, otherwise use synthetic
-        # Actually we just return the synthetic ones + any original that matched?
-        # Let's return just the abstract components that are used.
+            for comp in flow_components:
+                abstract_components_map.setdefault(comp.id, comp)
+        
         return abstract_flows, list(abstract_components_map.values())
         
-    def _sanitize_id(self, raw: str) -> str:
-        import re  # noqa: PLC0415
-        # Convert "System A" -> "System_A", "Mgmt Layer" -> "Mgmt_Layer"
-        s = str(raw).strip().replace(" ", "_").replace("&", "_and_")
-        return re.sub(r'[^a-zA-Z0-9_\-]', '', s)
+    def abstract_relationships(
+        self, relationships: list[Relationship], components: list[Component], level: str
+    ) -> tuple[list[Relationship], list[Component]]:
+        """
+        Rolls static relationships up to `level`. Components without a group stay
+        as they are; edges inside one parent are dropped and parallel edges between
+        parents are aggregated into one.
+        """
+        if level not in ROLLUP_LEVELS:
+            return relationships, components
+
+        with span("abstract.relationships", "abstraction", level=level):
+            return self._abstract_relationships(relationships, components, level)
+
+    def _abstract_relationships(
+        self, relationships: list[Relationship], components: list[Component], level: str
+    ) -> tuple[list[Relationship], list[Component]]:
+        self.index(components)
+        parents: dict[str, Component] = {}
+        for comp in components:
+            self._resolve(comp.id, level, parents)
+
+        rolled_up = []
+        for rel in relationships:
+            src = self._resolve(rel.source_id, level, parents)
+            tgt = self._resolve(rel.target_id, level, parents)
+            if src == tgt:
+                continue
+            rolled_up.append(rel.model_copy(update={"source_id": src, "target_id": tgt}))
+
+        return EdgeAggregator().aggregate(rolled_up), list(parents.values())
+
+    def _resolve(self, component_id: str, level: str, parents: dict[str, Component]) -> str:
+        """Looks up the parent in the hierarchy and registers the component that stands for it."""
+        node = self._hierarchy.get_parent_node(component_id, level)
+        if node is None:
+            # Ungrouped (or unknown) IDs stand for themselves
+            parent_id, parent_name = sanitize_id(component_id), component_id
+            known = self._hierarchy.comp_map.get(component_id)
+            if known is not None:
+                parents.setdefault(parent_id, known)
+        else:
+            parent_id, parent_name = node.id, node.path
+
+        if parent_id not in parents:
+            parents[parent_id] = self._create_synthetic_component(parent_id, parent_name, level)
+        return parent_id
 
     def _create_synthetic_component(self, id: str, name: str, level: str) -> Component:
         # Sanitize ID for validation (alphanumeric only)
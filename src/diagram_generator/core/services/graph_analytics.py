@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+from array import array
+from collections import deque
+from collections.abc import Sequence
+from typing import Any
+
+from diagram_generator.core.domain.compact_flow import AnyFlow
+from diagram_generator.core.services.graph_index import Direction, GraphIndex, csr
+
+DIRECTIONS: tuple[Direction, ...] = ("out", "in", "both")
+
+
+class DependencyGraph:
+    """
+    The dependency graph of a model for impact, path and cycle queries: the relationships
+    of a GraphIndex (reusing its interned ids and edge ends) plus every flow step but notes.
+
+    Edge `e` below `len(index.relationships)` is that relationship; later edges are flow
+    steps, `flows[step_flows[i]].steps[step_numbers[i]]` for `i = e - len(relationships)`.
+    Every query is an iterative walk over CSR int arrays (no recursion), so models with
+    millions of edges are fine.
+    """
+
+    def __init__(self, index: GraphIndex, flows: Sequence[AnyFlow]):
+        self.index = index
+        self.flows = flows
+        self._flow_count = len(flows)
+        self.ids = list(index.ids)
+        self._node_of = {component_id: node for node, component_id in enumerate(self.ids)}
+
+        sources, targets = array("i", index.sources), array("i", index.targets)
+        self.step_flows: array[int] = array("i")
+        self.step_numbers: array[int] = array("i")
+        for position, flow in enumerate(flows):
+            number = -1 # Counted by hand: enumerate() loses the step type of either kind of flow
+            for step in flow.steps:
+                number += 1
+                if (step.metadata or {}).get("type") == "note":
+                    continue
+                sources.append(self._intern(step.source_id))
+                targets.append(self._intern(step.target_id))
+                self.step_flows.append(position)
+                self.step_numbers.append(number)
+        self.sources, self.targets = sources, targets
+        if self.step_flows:
+            self.out_offsets, self.out_edges = csr(sources, len(self.ids))
+            self.in_offsets, self.in_edges = csr(targets, len(self.ids))
+        else:
+            # Only relationships: the index's adjacency is already this graph's
+            self.out_offsets, self.out_edges = index.out_offsets, index.out_edges
+            self.in_offsets, self.in_edges = index.in_offsets, index.in_edges
+
+    def _intern(self, component_id: str) -> int:
+        node = self._node_of.get(component_id)
+        if node is None:
+            node = self._node_of[component_id] = len(self.ids)
+            self.ids.append(component_id)
+        return node
+
+    def is_current(self, index: GraphIndex, flows: Sequence[AnyFlow]) -> bool:
+        """Whether the graph still describes this index and flow list (nothing appended since)."""
+        return index is self.index and flows is self.flows and len(flows) == self._flow_count
+
+    def node(self, component_id: str) -> int:
+        node = self._node_of.get(component_id)
+        if node is None:
+            raise ValueError(f"Unknown component '{component_id}'.")
+        return node
+
+    def edge(self, edge: int) -> dict[str, Any]:
+        """An edge's ends and description, and the flow it is a step of (None for a relationship)."""
+        relationships = self.index.relationships
+        if edge < len(relationships):
+            r = relationships[edge]
+            return {"source": r.source_id, "target": r.target_id, "description": r.description, "flow": None}
+        step_edge = edge - len(relationships)
+        flow = self.flows[self.step_flows[step_edge]]
+        step = flow.steps[self.step_numbers[step_edge]]
+        return {"source": step.source_id, "target": step.target_id, "description": step.description, "flow": flow.id}
+
+    def impact(self, component_id: str, depth: int = 3, direction: Direction = "in") -> list[tuple[str, int]]:
+        """
+        (id, hops) of every component within `depth` edges of `component_id`, by breadth-first
+        search: "in" finds what depends on it, "out" what it depends on, "both" either.
+        """
+        start = self.node(component_id)
+        hops = array("i", [-1]) * len(self.ids)
+        hops[start] = 0
+        queue = deque([start])
+        found: list[tuple[str, int]] = []
+        walks = [
+            (offsets, edges, ends)
+            for way, offsets, edges, ends in (
+                ("out", self.out_offsets, self.out_edges, self.targets),
+                ("in", self.in_offsets, self.in_edges, self.sources),
+            )
+            if direction in (way, "both")
+        ]
+        while queue:
+            node = queue.popleft()
+            distance = hops[node] + 1
+            if distance > depth:
+                break
+            for offsets, edges, ends in walks:
+                for k in range(offsets[node], offsets[node + 1]):
+                    neighbour = ends[edges[k]]
+                    if hops[neighbour] == -1:
+                        hops[neighbour] = distance
+                        queue.append(neighbour)
+                        found.append((self.ids[neighbour], distance))
+        return found
+
+    def shortest_path(self, source_id: str, target_id: str) -> list[int] | None:
+        """
+        The edges of a shortest path following edge directions from `source_id` to `target_id`
+        (the first found by breadth-first search); None if there is none.
+        """
+        start, goal = self.node(source_id), self.node(target_id)
+        reached = bytearray(len(self.ids))
+        reached[start] = 1
+        # The edge each reached node was first reached by
+        via = array("i", [-1]) * len(self.ids)
+        queue = deque([start])
+        out_offsets, out_edges, targets = self.out_offsets, self.out_edges, self.targets
+        while queue and not reached[goal]:
+            node = queue.popleft()
+            for k in range(out_offsets[node], out_offsets[node + 1]):
+                edge = out_edges[k]
+                neighbour = targets[edge]
+                if not reached[neighbour]:
+                    reached[neighbour] = 1
+                    via[neighbour] = edge
+                    queue.append(neighbour)
+        if not reached[goal]:
+            return None
+
+        path: list[int] = []
+        node = goal
+        while node != start:
+            path.append(via[node])
+            node = self.sources[via[node]]
+        path.reverse()
+        return path
+
+    def cycles(self) -> list[list[str]]:
+        """
+        The dependency cycles: strongly connected components of more than one component, or of
+        one with an edge to itself, found by Tarjan's algorithm with explicit stacks. Largest
+        first; the ids of each in model order.
+        """
+        count = len(self.ids)
+        out_offsets, out_edges, targets = self.out_offsets, self.out_edges, self.targets
+        order = array("i", [-1]) * count # Visit order; -1 for unvisited
+        low = array("i", [0]) * count
+        on_stack = bytearray(count)
+        stack: list[int] = []
+        found: list[list[int]] = []
+        visited = 0
+
+        for root in range(count):
+            if order[root] != -1:
+                continue
+            order[root] = low[root] = visited
+            visited += 1
+            stack.append(root)
+            on_stack[root] = 1
+            # (node, position of its next out-edge) of each node on the current DFS path
+            path = [(root, out_offsets[root])]
+            while path:
+                node, k = path[-1]
+                end = out_offsets[node + 1]
+                while k < end:
+                    neighbour = targets[out_edges[k]]
+                    k += 1
+                    if order[neighbour] == -1:
+                        path[-1] = (node, k)
+                        order[neighbour] = low[neighbour] = visited
+                        visited += 1
+                        stack.append(neighbour)
+                        on_stack[neighbour] = 1
+                        path.append((neighbour, out_offsets[neighbour]))
+                        break
+                    if on_stack[neighbour] and order[neighbour] < low[node]:
+                        low[node] = order[neighbour]
+                else:
+                    path.pop()
+                    if path and low[node] < low[path[-1][0]]:
+                        low[path[-1][0]] = low[node]
+                    if low[node] == order[node]:
+                        component = self._pop_component(node, stack, on_stack)
+                        if len(component) > 1 or self._has_self_loop(node):
+                            found.append(component)
+
+        for component in found:
+            component.sort()
+        found.sort(key=lambda c: (-len(c), c[0]))
+        return [[self.ids[node] for node in component] for component in found]
+
+    @staticmethod
+    def _pop_component(root: int, stack: list[int], on_stack: bytearray) -> list[int]:
+        component = []
+        while True:
+            node = stack.pop()
+            on_stack[node] = 0
+            component.append(node)
+            if node == root:
+                return component
+
+    def _has_self_loop(self, node: int) -> bool:
+        return any(
+            self.targets[self.out_edges[k]] == node for k in range(self.out_offsets[node], self.out_offsets[node + 1])
+        )
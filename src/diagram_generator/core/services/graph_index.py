@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+from array import array
+from collections import Counter, deque
+from collections.abc import Iterable, Iterator, Sequence
+from itertools import accumulate
+from typing import Literal
+
+from diagram_generator.core.domain.component import Component
+from diagram_generator.core.domain.relationship import Relationship
+
+Direction = Literal["out", "in", "both"]
+
+
+class GraphIndex:
+    """
+    Compact index of the component graph for filtering, discovery and neighbourhood queries.
+
+    Component ids are interned to dense ints (components first, in list order, then
+    relationship endpoints that are not modelled, in order of first use). Edge `e` is
+    `relationships[e]`; its ends are `sources[e]` and `targets[e]`, and CSR adjacency
+    (offsets + edge numbers, both directions) lists the edges of every node, so queries
+    touch int arrays instead of hashing id strings per relationship.
+    """
+
+    def __init__(self, components: Sequence[Component], relationships: Sequence[Relationship]):
+        self.components = components
+        self.relationships = relationships
+        self.ids: list[str] = []
+        self.nodes: list[Component | None] = []
+        self._node_of: dict[str, int] = {}
+        # tag -> positions in `components`, ascending
+        self._tagged: dict[str, array[int]] = {}
+        self._component_count = 0
+
+        for component in components:
+            self._register(component)
+
+        node_of, intern = self._node_of, self.intern
+        sources, targets = [], []
+        for r in relationships:
+            node = node_of.get(r.source_id)
+            sources.append(intern(r.source_id) if node is None else node)
+            node = node_of.get(r.target_id)
+            targets.append(intern(r.target_id) if node is None else node)
+        self.sources: array[int] = array("i", sources)
+        self.targets: array[int] = array("i", targets)
+        self.out_offsets, self.out_edges = csr(self.sources, len(self.ids))
+        self.in_offsets, self.in_edges = csr(self.targets, len(self.ids))
+
+    def intern(self, component_id: str) -> int:
+        node = self._node_of.get(component_id)
+        if node is None:
+            node = self._node_of[component_id] = len(self.ids)
+            self.ids.append(component_id)
+            self.nodes.append(None)
+        return node
+
+    def node(self, component_id: str) -> int | None:
+        return self._node_of.get(component_id)
+
+    def is_current(self, components: Sequence[Component], relationships: Sequence[Relationship]) -> bool:
+        """Whether the index still describes these lists (same objects, nothing appended since)."""
+        return (
+            components is self.components and relationships is self.relationships
+            and len(components) == self._component_count and len(relationships) == len(self.sources)
+        )
+
+    def add_component(self, component: Component) -> None:
+        """Registers a component appended to `components` after the index was built."""
+        self._register(component)
+
+    def _register(self, component: Component) -> None:
+        self.nodes[self.intern(component.id)] = component
+        for tag in component.tags or ():
+            self._tagged.setdefault(tag, array("i")).append(self._component_count)
+        self._component_count += 1
+
+    def missing_ids(self) -> list[str]:
+        """Relationship endpoints without a component, in order of first use."""
+        return [self.ids[node] for node, component in enumerate(self.nodes) if component is None]
+
+    def with_tags(self, tags: Iterable[str]) -> list[Component]:
+        """Components carrying any of `tags`, in their original order."""
+        positions: set[int] = set()
+        for tag in tags:
+            positions.update(self._tagged.get(tag, ()))
+        return [self.components[p] for p in sorted(positions)]
+
+    def relationships_within(self, component_ids: Iterable[str]) -> list[Relationship]:
+        """Relationships whose two ends are both in `component_ids`, in their original order."""
+        selected = bytearray(len(self.ids))
+        count = 0
+        for component_id in component_ids:
+            node = self._node_of.get(component_id)
+            if node is not None and not selected[node]:
+                selected[node] = 1
+                count += 1
+
+        if count == len(self.ids):
+            return list(self.relationships)
+
+        # Walk only the out-edges of selected nodes, then restore the original edge order
+        edges = []
+        out_offsets, out_edges, targets = self.out_offsets, self.out_edges, self.targets
+        for node in (n for n, flag in enumerate(selected) if flag):
+            for k in range(out_offsets[node], out_offsets[node + 1]):
+                edge = out_edges[k]
+                if selected[targets[edge]]:
+                    edges.append(edge)
+        edges.sort()
+        return [self.relationships[edge] for edge in edges]
+
+    def neighbours(self, node: int, direction: Direction = "both") -> Iterator[int]:
+        """Nodes one relationship away from `node` (with repeats for parallel edges)."""
+        if direction in ("out", "both"):
+            for k in range(self.out_offsets[node], self.out_offsets[node + 1]):
+                yield self.targets[self.out_edges[k]]
+        if direction in ("in", "both"):
+            for k in range(self.in_offsets[node], self.in_offsets[node + 1]):
+                yield self.sources[self.in_edges[k]]
+
+    def neighbourhood(self, component_ids: Iterable[str], depth: int = 1, direction: Direction = "both") -> list[str]:
+        """
+        Ids within `depth` relationships of `component_ids` (which are included),
+        in breadth-first order. Unknown ids are ignored.
+        """
+        visited = bytearray(len(self.ids))
+        queue: deque[tuple[int, int]] = deque()
+        order = []
+        for component_id in component_ids:
+            node = self._node_of.get(component_id)
+            if node is not None and not visited[node]:
+                visited[node] = 1
+                queue.append((node, 0))
+                order.append(node)
+
+        while queue:
+            node, distance = queue.popleft()
+            if distance == depth:
+                continue
+            for neighbour in self.neighbours(node, direction):
+                if not visited[neighbour]:
+                    visited[neighbour] = 1
+                    queue.append((neighbour, distance + 1))
+                    order.append(neighbour)
+        return [self.ids[node] for node in order]
+
+
+def csr(ends: array[int], node_count: int) -> tuple[array[int], array[int]]:
+    """Groups edge numbers by node: node n's edges are edges[offsets[n]:offsets[n + 1]], ascending."""
+    counts = Counter(ends)
+    offsets = array("i", accumulate((counts[node] for node in range(node_count)), initial=0))
+    # A stable sort keeps each node's edges in ascending order
+    edges = array("i", sorted(range(len(ends)), key=ends.__getitem__))
+    return offsets, edges
@@ -0,0 +1,358 @@
+import hashlib
+import io
+import json
+import os
+import re
+from collections.abc import Callable, Container
+from pathlib import Path
+from typing import Any
+
+from ruamel.yaml import YAML
+
+from diagram_generator.core.services.seed_ingester import KINDS, SeedIngester
+from diagram_generator.core.services.yaml_emitter import emit_records
+
+MANIFEST = ".ingest_manifest.json"
+MANIFEST_VERSION = 2
+SHARD_PREFIX = "ingested_"
+UNGROUPED = "ungrouped"
+
+
+class _RecordingMap(dict[str, str]):
+    """A Name -> ID map remembering every name looked up in it, found or not."""
+
+    def __init__(self, names: dict[str, str]):
+        super().__init__(names)
+        self.looked_up: set[str] = set()
+
+    def __contains__(self, key: object) -> bool:
+        self.looked_up.add(str(key))
+        return super().__contains__(key)
+
+    def __getitem__(self, key: str) -> str:
+        self.looked_up.add(str(key))
+        return super().__getitem__(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        self.looked_up.add(str(key))
+        return super().get(key, default)
+
+
+class IncrementalIngest:
+    """
+    Upserts an ingester's records into per-group shards of a data dir
+    (`<kind>/ingested_<group>.yaml`) and re-extracts only the sources whose checksum
+    changed since the last run. Relationships and flows are sharded by the group of
+    the component they start from.
+
+    The manifest (`.ingest_manifest.json`) keeps, per source: its checksum, the names and
+    groups of its components, the names and IDs its flows and relationships looked up,
+    and the shard and key of every record it produced. An unchanged source is only resolved
+    again when one of those names or IDs changed. A changed config re-extracts everything.
+    Shards whose content is unchanged are not rewritten.
+
+    Several sources may produce the same record key; like a full ingest, where later sources
+    win, only the shard of the last of them holds the record, even when the sources put it
+    in different groups. A record is only dropped once no source produces it any more.
+    """
+
+    def __init__(self, ingester: SeedIngester, data_dir: str | Path):
+        self.ingester = ingester
+        self.data_dir = Path(data_dir)
+        self.manifest_path = self.data_dir / MANIFEST
+        self._shards: dict[tuple[str, str], dict[str, dict[str, Any]]] = {}
+
+    def run(self) -> dict[str, list[str]]:
+        """Brings the shards up to date; returns the changed sources and the written and removed shards."""
+        manifest = self._load_manifest()
+        old: dict[str, Any] = manifest.get("sources", {})
+        config_checksum = _checksum(Path(self.ingester.config_path))
+        full = manifest.get("config") != config_checksum
+
+        files = [source["file"] for source in self.ingester.config.get("sources", [])]
+        entries, extracted = self._extract(files, old, full)
+        name_map, groups = _merge(entries)
+        old_names, old_groups = _merge(old)
+        changed = _changed_keys(name_map, old_names) | _changed_keys(groups, old_groups)
+        records = self._resolve(files, entries, extracted, name_map, lambda refs: full or bool(changed & refs))
+        changed_sources = [file for index, file in enumerate(files) if index in extracted]
+        for file in old.keys() - entries.keys():
+            records[file] = {kind: [] for kind in KINDS}
+        self._upsert(files, records, old, entries, groups, name_map)
+
+        report = self._write_shards()
+        report["changed"] = changed_sources
+        _write_if_changed(self.manifest_path, json.dumps({
+            "version": MANIFEST_VERSION,
+            "config": config_checksum,
+            "sources": entries,
+        }, indent=1) + "\n")
+        return report
+
+    def _extract(
+        self, files: list[str], old: dict[str, Any], full: bool
+    ) -> tuple[dict[str, dict[str, Any]], dict[int, tuple[list[Any], list[Any]]]]:
+        """The first phase: manifest entries of all sources, and components and items of the changed ones."""
+        entries: dict[str, dict[str, Any]] = {}
+        extracted: dict[int, tuple[list[Any], list[Any]]] = {}
+        for index, file in enumerate(files):
+            checksum = _checksum(self.ingester.data_dir / file)
+            entry = old.get(file)
+            if full or entry is None or entry["checksum"] != checksum:
+                components, names, items = self.ingester.extract_source(index)
+                extracted[index] = (components, items)
+                groups = {c.id: c.metadata.get("group") for c in components}
+                entry = {"checksum": checksum, "names": dict(names), "groups": groups, "refs": [], "records": {}}
+            entries[file] = {**entry, "records": dict(entry["records"])}
+        return entries, extracted
+
+    def _resolve(
+        self,
+        files: list[str],
+        entries: dict[str, dict[str, Any]],
+        extracted: dict[int, tuple[list[Any], list[Any]]],
+        name_map: dict[str, str],
+        stale: Callable[[set[str]], bool],
+    ) -> dict[str, dict[str, list[Any]]]:
+        """
+        The second phase: records by kind of the changed sources, and flows and relationships
+        of the unchanged ones whose looked up names and IDs are `stale`.
+        """
+        records: dict[str, dict[str, list[Any]]] = {}
+        for index, file in enumerate(files):
+            entry = entries[file]
+            if index in extracted:
+                components, items = extracted[index]
+                records[file] = {"components": components}
+            elif stale(set(entry["refs"])):
+                items = self.ingester.link_items(index)
+                records[file] = {}
+            else:
+                continue
+            records[file].update(self._resolve_links(entry, items, name_map))
+        return records
+
+    def _resolve_links(
+        self, entry: dict[str, Any], items: list[Any], name_map: dict[str, str]
+    ) -> dict[str, list[Any]]:
+        """The flows and relationships of a source's items, recording the names and IDs they look up."""
+        lookups = _RecordingMap(name_map)
+        self.ingester.name_map = lookups
+        links: dict[str, list[Any]] = {"flows": [], "relationships": []}
+        for kind, record in self.ingester.resolve_items(items):
+            links[kind].append(record)
+        entry["refs"] = lookups.looked_up
+        return links
+
+    def _upsert( # noqa: PLR0913, PLR0917
+        self,
+        files: list[str],
+        records: dict[str, dict[str, list[Any]]],
+        old: dict[str, Any],
+        entries: dict[str, dict[str, Any]],
+        groups: dict[str, Any],
+        name_map: dict[str, str],
+    ) -> None:
+        """
+        Replaces the records the sources in `records` produced before with their new ones. Each
+        (kind, key) gets the record of its last owner in source order, in the shard that owner
+        puts it in, and is popped from every other shard: a component two sources put in
+        different groups is only in the later one's. It is dropped once it has no owner. An
+        unchanged source that becomes the last owner of a key another source held is extracted
+        again, since only the record of the previous owner is in the shards.
+        """
+        order = {file: index for index, file in enumerate(files)}
+        produced = {file: self._dump(kinds, groups) for file, kinds in records.items()}
+        # Keys of the replaced records: those the sources in `records` produced before, by kind
+        replaced = {(file, kind) for file, kinds in records.items() for kind in kinds}
+        touched = {
+            (kind, key)
+            for file, kind in replaced for _, key in old.get(file, {}).get("records", {}).get(kind, [])
+        }
+        placed = _placements(old)
+        before = _owners(old, order)
+        owners = _owners(old, order, replaced)
+        for file, kinds in produced.items():
+            for kind, dumped in kinds.items():
+                for shard, key, _ in dumped:
+                    owners.setdefault((kind, key), {})[order[file]] = shard
+                    touched.add((kind, key))
+
+        # Only a touched key can pass to an unchanged source whose record is not in the shards
+        restore = set()
+        for record_key in touched:
+            last = max(owners.get(record_key, ()), default=None)
+            was_last = max(before.get(record_key, ()), default=None)
+            if last is not None and last != was_last and files[last] not in records:
+                restore.add(last)
+        for index in sorted(restore):
+            file = files[index]
+            components, _, items = self.ingester.extract_source(index)
+            records[file] = {"components": components, **self._resolve_links(entries[file], items, name_map)}
+            produced[file] = self._dump(records[file], groups)
+
+        for record_key in touched:
+            kind, key = record_key
+            held = owners.get(record_key, {})
+            home = held[max(held)] if held else None
+            for shard in (placed.get(record_key, set()) | set(held.values())) - {home}:
+                self._shard(kind, shard).pop(key, None)
+        for file in sorted(produced, key=lambda f: order.get(f, -1)):
+            # A removed source keeps no entry
+            self._write_owned(order.get(file), produced[file], owners, entries.get(file, {"refs": [], "records": {}}))
+        for entry in entries.values():
+            entry["refs"] = sorted(entry["refs"])
+
+    def _write_owned(
+        self,
+        position: int | None,
+        dumped_kinds: dict[str, list[tuple[str, str, dict[str, Any]]]],
+        owners: dict[tuple[str, str], dict[int, str]],
+        entry: dict[str, Any],
+    ) -> None:
+        """Upserts the records of the source at `position` it is the last owner of, and lists them in its entry."""
+        refs = entry["refs"] = set(entry["refs"])
+        for kind, dumped in dumped_kinds.items():
+            for shard, key, data in dumped:
+                held = owners[(kind, key)]
+                if max(held) == position and held[position] == shard:
+                    self._shard(kind, shard)[key] = data
+                start = _start(kind, data)
+                if start:
+                    refs.add(start)
+            entry["records"][kind] = [[shard, key] for shard, key, _ in dumped]
+
+    @staticmethod
+    def _dump(kinds: dict[str, list[Any]], groups: dict[str, Any]) -> dict[str, list[tuple[str, str, dict[str, Any]]]]:
+        """(shard, key, data) of a source's records, by kind."""
+        dumped: dict[str, list[tuple[str, str, dict[str, Any]]]] = {}
+        for kind, kind_records in kinds.items():
+            dumped[kind] = []
+            for record in kind_records:
+                data = record.model_dump(exclude_none=True, mode="json")
+                dumped[kind].append((_shard_name(kind, data, groups), _key(kind, data), data))
+        return dumped
+
+    def _load_manifest(self) -> dict[str, Any]:
+        if not self.manifest_path.exists():
+            return {}
+        manifest: dict[str, Any] = json.loads(self.manifest_path.read_text())
+        return manifest if manifest.get("version") == MANIFEST_VERSION else {}
+
+    def _shard_path(self, kind: str, shard: str) -> Path:
+        return self.data_dir / kind / f"{SHARD_PREFIX}{shard}.yaml"
+
+    def _shard(self, kind: str, shard: str) -> dict[str, dict[str, Any]]:
+        """The records of a shard by key, read from its file on first use."""
+        records = self._shards.get((kind, shard))
+        if records is None:
+            records = self._shards[(kind, shard)] = {}
+            path = self._shard_path(kind, shard)
+            if path.exists():
+                data = YAML(typ="safe").load(path.read_text()) or {}
+                for record in data.get(kind) or []:
+                    records[_key(kind, record)] = record
+        return records
+
+    def _write_shards(self) -> dict[str, list[str]]:
+        report: dict[str, list[str]] = {"written": [], "removed": []}
+        for (kind, shard), records in sorted(self._shards.items()):
+            path = self._shard_path(kind, shard)
+            if not records:
+                if path.exists():
+                    path.unlink()
+                    report["removed"].append(str(path))
+                continue
+            out = io.StringIO()
+            emit_records(kind, records.values(), out)
+            if _write_if_changed(path, out.getvalue()):
+                report["written"].append(str(path))
+        return report
+
+
+def _checksum(path: Path) -> str | None:
+    if not path.exists():
+        return None
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _merge(entries: dict[str, Any]) -> tuple[dict[str, str], dict[str, Any]]:
+    """The Name -> ID map and ID -> group map of manifest entries, later sources winning."""
+    names: dict[str, str] = {}
+    groups: dict[str, Any] = {}
+    for entry in entries.values():
+        names.update(entry["names"])
+        groups.update(entry["groups"])
+    return names, groups
+
+
+def _changed_keys(new: dict[str, Any], old: dict[str, Any]) -> set[str]:
+    return {key for key in new.keys() | old.keys() if new.get(key) != old.get(key)}
+
+
+def _owners(
+    old: dict[str, Any], order: dict[str, int], replaced: Container[tuple[str, str]] = ()
+) -> dict[tuple[str, str], dict[int, str]]:
+    """The shard each source, by position, put each (kind, key) in, but for the `replaced` (source, kind)s."""
+    owners: dict[tuple[str, str], dict[int, str]] = {}
+    for file, entry in old.items():
+        if file not in order:
+            continue
+        for kind, owned in entry["records"].items():
+            if (file, kind) in replaced:
+                continue
+            for shard, key in owned:
+                owners.setdefault((kind, key), {})[order[file]] = shard
+    return owners
+
+
+def _placements(old: dict[str, Any]) -> dict[tuple[str, str], set[str]]:
+    """Every shard each (kind, key) was written to, by any source (a removed one included)."""
+    placed: dict[tuple[str, str], set[str]] = {}
+    for entry in old.values():
+        for kind, owned in entry["records"].items():
+            for shard, key in owned:
+                placed.setdefault((kind, key), set()).add(shard)
+    return placed
+
+
+def _key(kind: str, data: dict[str, Any]) -> str:
+    if kind == "relationships":
+        # Relationships have no id: any two that differ in any field are distinct records
+        digest = hashlib.blake2b(json.dumps(data, sort_keys=True).encode(), digest_size=8).hexdigest()
+        return f"{data['source_id']}->{data['target_id']}:{digest}"
+    return str(data["id"])
+
+
+def _start(kind: str, data: dict[str, Any]) -> str | None:
+    """The component a flow or relationship starts from, which picks its shard."""
+    if kind == "components":
+        return None
+    if kind == "relationships":
+        return str(data["source_id"])
+    steps = data.get("steps") or []
+    return str(steps[0]["source_id"]) if steps else None
+
+
+def _shard_name(kind: str, data: dict[str, Any], groups: dict[str, Any]) -> str:
+    if kind == "components":
+        group = (data.get("metadata") or {}).get("group")
+    else:
+        start = _start(kind, data)
+        group = groups.get(start) if start else None
+    return re.sub(r"[^A-Za-z0-9_\-]", "_", str(group)) if group else UNGROUPED
+
+
+def _write_if_changed(path: Path, text: str) -> bool:
+    """Atomically writes `text` unless the file already holds it; returns whether it wrote."""
+    if path.exists() and path.read_text() == text:
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_name(path.name + ".tmp")
+    partial.write_text(text)
+    os.replace(partial, path)
+    return True
@@ -0,0 +1,370 @@
+import logging
+import re
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import nullcontext
+from itertools import groupby
+from pathlib import Path
+from typing import Any, NamedTuple
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+# internal.yaml inventories (scripts/ingest_internal.py) and internal-flow.yaml flows (scripts/ingest_flows.py)
+LEGACY_FORMATS = ("legacy_components", "legacy_flows")
+# Entries per parse task, and parse tasks in flight per worker
+BATCH = 256
+WINDOW = 4
+# Entries between progress log lines
+PROGRESS_EVERY = 10_000
+
+# The legacy scripts parse with PyYAML (YAML 1.1: `yes` is true), so the same values come out
+_Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_KEY = re.compile(r"[a-z0-9_]+:")
+# A category whose entries can be parsed one by one: nothing after the colon but a comment
+_HEADER = re.compile(r"[a-z0-9_]+:[ \t]*(?:#.*)?\n?\Z")
+# What may be an anchor (`&name`); one inside a quoted string only costs a whole-block parse
+_ANCHOR = re.compile(r"(?:^|[\s\[{,])&[^\s\[\]{},]")
+_CATEGORY_TYPES = {"actors": "person", "systems": "system", "vendors": "external_system"}
+_TYPE_FIXES = {"actor": "person", "component": "service", "api": "service", "integration": "service", "ui": "web_ui"}
+
+Progress = Callable[[int, int], None]
+
+
+class _Unit(NamedTuple):
+    """Consecutive lines of a block, parsed on their own; map entries are parsed under their category line."""
+
+    block: int
+    kind: str
+    header: str
+    text: str
+
+
+class LegacyStream:
+    """
+    Reads a legacy `internal.yaml` inventory or `internal-flow.yaml` flow file as one list
+    of rows at the `root` path, like RowStream: the component and flow dicts the legacy
+    scripts wrote. The file is tokenised in one streaming pass into entries (a list item,
+    a category entry, a flow section), which are parsed in batches, across `workers`
+    processes when there are several. `progress(entries, bytes)` is called as batches
+    complete.
+    """
+
+    def __init__(self, path: Path, fmt: str, root: str, workers: int = 1, progress: Progress | None = None):
+        self.path = path
+        self.fmt = fmt
+        self.root = root
+        self.workers = workers
+        self.progress = progress
+        self.blocks = 0
+
+    def items(self, source_paths: Iterable[str]) -> Iterator[tuple[str, Any]]:
+        if self.root in set(source_paths):
+            for row in self.rows():
+                yield self.root, row
+
+    def rows(self) -> Iterator[dict[str, Any]]:
+        with open(self.path) as f, _executor(self.workers) as pool:
+            if self.fmt == "legacy_flows":
+                yield from self._flows(f, pool)
+            else:
+                yield from self._components(f, pool)
+
+    def _components(self, f: Any, pool: Executor | None) -> Iterator[dict[str, Any]]:
+        """
+        Components block by block. A block is parsed from its entries when they merge into
+        what the whole block parses to, and whole otherwise (an anchor, which the whole
+        block may reject as a duplicate, an alias to another entry, a top-level line the
+        tokeniser does not split on, an entry that fails alone).
+        """
+        tokenizer = _ComponentTokenizer()
+        self.blocks = 0
+        parsed = self._parse(tokenizer.units(f), f, pool, _parse_units)
+        for block, results in groupby(parsed, key=lambda result: result[0].block):
+            units = list(results)
+            kind = units[0][0].kind
+            data = None if block in tokenizer.whole else _merge(kind, units)
+            if data is None:
+                try:
+                    data = yaml.load("".join(unit.text for unit, _ in units), Loader=_Loader)
+                except Exception as e:
+                    logger.warning(f"Error parsing block {block} ({kind}) of {self.path}: {e}")
+                    continue
+            self.blocks += 1
+            components: list[dict[str, Any]] = []
+            try:
+                for component in _block_components(kind, data):
+                    components.append(component)
+            except Exception as e:
+                logger.warning(f"Error parsing block {block} ({kind}) of {self.path}: {e}")
+            yield from components
+
+    def _flows(self, f: Any, pool: Executor | None) -> Iterator[dict[str, Any]]:
+        """Flows section by section: each `id:` line at the start of a line starts one."""
+        for unit, (flow, error) in self._parse(_flow_units(f), f, pool, _parse_flows):
+            if error is not None:
+                logger.warning(f"Error parsing flow section {unit.block} of {self.path}: {error}")
+            elif flow is not None:
+                yield flow
+
+    def _parse(
+        self,
+        units: Iterator[_Unit],
+        f: Any,
+        pool: Executor | None,
+        parse: Callable[[list[str]], list[Any]],
+    ) -> Iterator[tuple[_Unit, Any]]:
+        """(unit, parse result) in file order, `parse` running on batches of units, at most WINDOW per worker ahead."""
+        pending: deque[tuple[list[_Unit], int, Any]] = deque()
+        entries = 0
+        while True:
+            batch = [unit for _, unit in zip(range(BATCH), units, strict=False)]
+            if batch:
+                texts = [unit.header + unit.text for unit in batch]
+                pending.append((batch, f.buffer.tell(), pool.submit(parse, texts) if pool else parse(texts)))
+            if pending and (not batch or len(pending) >= WINDOW * self.workers):
+                done, position, results = pending.popleft()
+                results = results if pool is None else results.result()
+                entries += len(done)
+                yield from zip(done, results, strict=True)
+                if self.progress:
+                    self.progress(entries, position)
+            elif not batch:
+                return
+
+
+class _ComponentTokenizer:
+    """
+    The block state machine of scripts/ingest_internal.py, which splits a file into map
+    and list blocks where a `- ` item follows a map or a `key:` line follows a list,
+    one line at a time. Blocks are further split into units: list items, categories
+    (`key:` lines) and, when a category line holds nothing else, its entries. Blocks with
+    a top-level line that starts none of those, or with an anchor, are put in `whole`.
+    """
+
+    def __init__(self) -> None:
+        self.whole: set[int] = set()
+
+    def units(self, lines: Iterable[str]) -> Iterator[_Unit]: # noqa: PLR0912
+        block, kind = 0, None
+        buffer: list[str] = []
+        # The unit being read: its block, kind and category line
+        unit_block, unit_kind, unit_header = 0, "", ""
+        category: str | None = None
+        child: int | None = None  # The indent of the category's entries, -1 when they are not split
+        for line in lines:
+            stripped = line.strip()
+            if not stripped or stripped.startswith("#"):
+                buffer.append(line)
+                continue
+
+            is_list_item = line.startswith("- ")
+            is_key = _KEY.match(line) is not None
+            boundary: str | None = None  # The category line of the unit this line starts, if it starts one
+            if kind is None:
+                kind = "list" if is_list_item else "map" if is_key else None
+                unit_kind = kind or ""
+                if kind is None:
+                    self.whole.add(block)
+            elif (kind == "map" and is_list_item) or (kind == "list" and is_key):
+                boundary, kind = "", "list" if is_list_item else "map"
+                block += 1
+            elif is_list_item or is_key:
+                boundary = ""
+            elif kind == "map" and category is not None and line.startswith(" "):
+                indent = len(line) - len(line.lstrip(" "))
+                if child is None:
+                    child = -1 if line[indent:].startswith("-") else indent
+                elif indent == child:
+                    boundary = category
+            elif not line.startswith(" "):
+                self.whole.add(block)
+
+            if boundary is not None:
+                yield _Unit(unit_block, unit_kind, unit_header, "".join(buffer))
+                buffer, unit_block, unit_kind, unit_header = [], block, kind or "", boundary
+            if "&" in line and _ANCHOR.search(line):
+                self.whole.add(block)
+            if is_key and kind == "map":
+                category, child = (line if _HEADER.match(line) else None), None
+            buffer.append(line)
+
+        if buffer and kind is not None:
+            yield _Unit(unit_block, unit_kind, unit_header, "".join(buffer))
+
+
+def _flow_units(lines: Iterable[str]) -> Iterator[_Unit]:
+    """The sections of scripts/ingest_flows.py: each starts at an `id:` line; lines before the first are dropped."""
+    section = -1
+    buffer: list[str] = []
+    for line in lines:
+        if line.startswith("id:"):
+            if buffer:
+                yield _Unit(section, "flow", "", "".join(buffer))
+            section, buffer = section + 1, []
+        if section >= 0:
+            buffer.append(line)
+    if buffer:
+        yield _Unit(section, "flow", "", "".join(buffer))
+
+
+def _executor(workers: int) -> Any:
+    """A process pool for more than one worker; otherwise units are parsed in this process."""
+    if workers > 1:
+        return ProcessPoolExecutor(workers)
+    return nullcontext()
+
+
+def _parse_units(texts: list[str]) -> list[tuple[bool, Any]]:
+    """(parsed, data or error message) of each unit."""
+    results: list[tuple[bool, Any]] = []
+    for text in texts:
+        try:
+            results.append((True, yaml.load(text, Loader=_Loader)))
+        except Exception as e:
+            results.append((False, str(e)))
+    return results
+
+
+def _parse_flows(texts: list[str]) -> list[tuple[dict[str, Any] | None, str | None]]:
+    """(flow or None, error message or None) of each section."""
+    results: list[tuple[dict[str, Any] | None, str | None]] = []
+    for text in texts:
+        try:
+            results.append((_flow(yaml.load(text, Loader=_Loader)), None))
+        except Exception as e:
+            results.append((None, str(e)))
+    return results
+
+
+def _merge(kind: str, units: list[tuple[_Unit, tuple[bool, Any]]]) -> Any:
+    """
+    The data of a block from its parsed units, as the whole block parses to; None when
+    a unit failed or is not the shape it would be part of. Later categories and entries
+    replace earlier ones of the same key in place, as with duplicate keys in one mapping.
+    """
+    if kind == "list":
+        items: list[Any] = []
+        for _, (parsed, data) in units:
+            if not parsed or not isinstance(data, list):
+                return None
+            items.extend(data)
+        return items
+
+    categories: dict[Any, Any] = {}
+    for unit, (parsed, data) in units:
+        if not parsed or not isinstance(data, dict) or len(data) != 1:
+            return None
+        ((category, entries),) = data.items()
+        if not unit.header:
+            categories[category] = entries
+        elif isinstance(categories.get(category), dict) and isinstance(entries, dict):
+            categories[category].update(entries)
+        else:
+            return None
+    return categories
+
+
+def _block_components(kind: str, data: Any) -> Iterator[dict[str, Any]]:
+    """The components of a parsed block, as scripts/ingest_internal.py made them."""
+    if not data:
+        return
+    if kind == "list":
+        if not isinstance(data, list):
+            logger.warning("List block parsed but wasn't a list")
+            return
+        for item in data:
+            if "id" not in item:
+                continue
+            if "type" not in item:
+                item["type"] = "component"
+            yield item
+    elif not isinstance(data, dict):
+        logger.warning("Map block parsed but wasn't a dict")
+    else:
+        yield from _category_components(data)
+
+
+def _category_components(data: dict[Any, Any]) -> Iterator[dict[str, Any]]:
+    """The components of a map block's categories: actors, systems, vendors, ..."""
+    for category, items in data.items():
+        if not items or not isinstance(items, dict):
+            continue
+        for key, props in items.items():
+            comp_type = props.get("type") or _CATEGORY_TYPES.get(category, "component")
+            if isinstance(comp_type, str):
+                comp_type = _TYPE_FIXES.get(comp_type, comp_type)  # Types the domain model accepts
+
+            component = {
+                "id": props.get("id", key),
+                "name": props.get("name", key),
+                "type": comp_type,
+                "description": props.get("description", ""),
+                "tags": [category],
+            }
+            for k, v in props.items():
+                if k in component or v is None:
+                    continue
+                if k == "deployment" and isinstance(v, str):
+                    # A string deployment moves to metadata; a dict one is kept (Service supports it)
+                    component.setdefault("metadata", {})["deployment_string"] = v
+                    continue
+                component[k] = v
+            yield component
+
+
+def _flow(data: Any) -> dict[str, Any] | None:
+    """The flow of a parsed section, as scripts/ingest_flows.py made it; None without an `id`."""
+    if not isinstance(data, dict) or not data.get("id"):
+        return None
+
+    steps = []
+    for s in data.get("flow_steps", []):
+        step_meta = {}
+        if "data" in s:
+            step_meta["data_payload"] = s["data"]
+        if "note" in s:
+            step_meta["note"] = s["note"]
+        if "action" in s:
+            step_meta["original_action"] = s["action"]
+        if "type" in s:
+            step_meta["interaction_type"] = s["type"]
+
+        desc = s.get("action", "Interaction").replace("\n", " ").strip()
+        if "data" in s:
+            desc += f"\\n[{s['data']}]"
+
+        protocol = s.get("type", None)
+        if protocol == "response":
+            protocol = "HTTP 200"
+
+        steps.append({
+            "source_id": s.get("from"),
+            "target_id": s.get("to"),
+            "description": desc,
+            "protocol": protocol,
+            "metadata": step_meta,
+        })
+
+    return {
+        "id": data["id"],
+        "description": data.get("name", "Imported Flow"),
+        "steps": steps,
+        "tags": [data.get("status", "import")],
+        "metadata": {k: v for k, v in data.items() if k not in ["id", "name", "flow_steps", "components"]},
+    }
+
+
+def log_progress(path: Path) -> Progress:
+    """A progress callback logging every PROGRESS_EVERY entries of `path`."""
+    size = path.stat().st_size or 1
+    logged = [0]
+
+    def progress(entries: int, position: int) -> None:
+        if entries - logged[0] >= PROGRESS_EVERY:
+            logged[0] = entries
+            logger.info(f"Parsed {entries} entries of {path} ({min(100, 100 * position // size)}%)")
+
+    return progress
@@ -0,0 +1,84 @@
+import sys
+import tracemalloc
+import types
+from collections.abc import Iterable
+from enum import Enum
+from typing import Any
+
+# Shared, long-lived objects that are not part of the model
+_SKIPPED_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType, Enum)
+
+
+class SizeBreakdown:
+    """Deep sizes of a set of objects: per kind of record and per Python type."""
+
+    def __init__(self) -> None:
+        self.kinds: dict[str, tuple[int, int]] = {}
+        self.types: dict[str, list[int]] = {}
+        self._seen: set[int] = set()
+        # Keeps measured objects alive so their ids cannot be reused while measuring
+        self._roots: list[list[Any]] = []
+
+    def add(self, kind: str, records: Iterable[Any]) -> None:
+        """Adds the deep size of `records`. Objects already counted under another kind are not counted again."""
+        kept = list(records)
+        self._roots.append(kept)
+        self.kinds[kind] = (len(kept), sum(self._deep_sizeof(record) for record in kept))
+
+    def top_types(self, limit: int = 15) -> list[tuple[str, int, int]]:
+        """(type name, instances, bytes), largest first."""
+        rows = [(name, count, size) for name, (count, size) in self.types.items()]
+        return sorted(rows, key=lambda row: row[2], reverse=True)[:limit]
+
+    def _deep_sizeof(self, root: Any) -> int:
+        total = 0
+        stack = [root]
+        while stack:
+            obj = stack.pop()
+            if id(obj) in self._seen or isinstance(obj, _SKIPPED_TYPES):
+                continue
+            self._seen.add(id(obj))
+
+            size = sys.getsizeof(obj)
+            total += size
+            entry = self.types.setdefault(type(obj).__name__, [0, 0])
+            entry[0] += 1
+            entry[1] += size
+
+            if isinstance(obj, dict):
+                stack.extend(obj.keys())
+                stack.extend(obj.values())
+            elif isinstance(obj, (list, tuple, set, frozenset)):
+                stack.extend(obj)
+            elif not isinstance(obj, (str, bytes, int, float, bool)) and obj is not None:
+                # Plain objects and pydantic models (whose field values live in slots and __dict__)
+                if hasattr(obj, "__dict__"):
+                    stack.append(vars(obj))
+                for cls in type(obj).__mro__:
+                    for slot in cls.__dict__.get("__slots__", ()):
+                        if slot != "__dict__" and hasattr(obj, slot):
+                            stack.append(getattr(obj, slot))
+        return total
+
+
+def top_allocation_sites(snapshot: tracemalloc.Snapshot, limit: int = 10) -> list[tuple[str, int, int]]:
+    """(file:line, bytes, blocks) of the largest allocation sites in `snapshot`."""
+    snapshot = snapshot.filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    ))
+    rows = []
+    for stat in snapshot.statistics("lineno")[:limit]:
+        frame = stat.traceback[0]
+        rows.append((f"{_short_path(frame.filename)}:{frame.lineno}", stat.size, stat.count))
+    return rows
+
+
+def _short_path(filename: str) -> str:
+    """Path from the package root, e.g. 'pydantic/main.py' rather than the full site-packages path."""
+    for marker in ("site-packages/", "src/", "lib/python"):
+        if marker in filename:
+            tail = filename.rsplit(marker, 1)[1]
+            return tail.split("/", 1)[1] if marker == "lib/python" and "/" in tail else tail
+    return filename
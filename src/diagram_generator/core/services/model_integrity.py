@@ -0,0 +1,146 @@
+from collections.abc import Iterable
+from typing import Any, NamedTuple
+
+from diagram_generator.core.services.component_hierarchy import sanitize_id
+
+# Issue checks, in report order; "parse" and "schema" issues come from reading the files
+CHECKS = (
+    "parse", "schema", "duplicate_id", "dangling_relationship", "dangling_flow_step",
+    "unknown_flow", "unknown_scope", "group_path",
+)
+
+# Step endpoints that are not components
+NOTE_ANCHOR = "NOTE_ANCHOR"
+
+# A problem found in the sources: its check, severity ("error" or "warning"), location and message
+Issue = dict[str, str]
+
+
+class SourceSummary(NamedTuple):
+    """
+    What the integrity checks need from one source file, each record with its location:
+    components (id, group path, declared: False for DSL components, which may restate
+    YAML ones), relationships (source, target), flows (id, step endpoints, notes left
+    out), views (key, flow id, scope id), and the file's parse and schema issues.
+    """
+
+    path: str
+    records: int
+    components: list[tuple[str, str, Any, bool]]
+    relationships: list[tuple[str, str, str]]
+    flows: list[tuple[str, str, list[tuple[str, str]]]]
+    views: list[tuple[str, str, str | None, str | None]]
+    issues: list[Issue]
+
+
+def issue(check: str, location: str, message: str, severity: str = "error") -> Issue:
+    return {"check": check, "severity": severity, "location": location, "message": message}
+
+
+class IntegrityChecker:
+    """
+    Cross-file checks over the summaries of every source file of a data dir. Each check
+    is a pass over the records against an index (a dict or set) built in an earlier pass,
+    so checking is linear in the number of records (and group path segments).
+    """
+
+    def __init__(self, summaries: Iterable[SourceSummary]):
+        self.summaries = list(summaries)
+
+    def check(self) -> list[Issue]:
+        """Every issue, by check (see CHECKS), then in file and record order."""
+        issues = [i for summary in self.summaries for i in summary.issues]
+        issues += self._duplicates()
+
+        component_ids = {c[1] for s in self.summaries for c in s.components}
+        # Relationship endpoints are auto-discovered as generic components
+        known_ids = component_ids | {e for s in self.summaries for r in s.relationships for e in r[1:]}
+        flow_ids = {f[1] for s in self.summaries for f in s.flows}
+
+        discovered: set[str] = set()
+        for summary in self.summaries:
+            for location, source, target in summary.relationships:
+                for end in (source, target):
+                    if end not in component_ids and end not in discovered:
+                        # Once per id, where it is first used
+                        discovered.add(end)
+                        issues.append(issue(
+                            "dangling_relationship", location,
+                            f"'{end}' is not a component; it is auto-discovered as a generic one", "warning",
+                        ))
+            for location, flow_id, steps in summary.flows:
+                for number, step in enumerate(steps, 1):
+                    for end in step:
+                        if end not in known_ids and end != NOTE_ANCHOR:
+                            issues.append(issue(
+                                "dangling_flow_step", location, f"Step {number} of flow '{flow_id}': unknown id '{end}'"
+                            ))
+            for location, key, view_flow, scope_id in summary.views:
+                if view_flow and view_flow not in flow_ids:
+                    issues.append(issue("unknown_flow", location, f"View '{key}': unknown flow_id '{view_flow}'"))
+                if scope_id and scope_id not in known_ids:
+                    issues.append(issue("unknown_scope", location, f"View '{key}': unknown scope_id '{scope_id}'"))
+
+        issues += self._group_paths(known_ids)
+        by_check: dict[str, list[Issue]] = {check: [] for check in CHECKS}
+        for found in issues:
+            by_check[found["check"]].append(found)
+        return [found for check in CHECKS for found in by_check[check]]
+
+    def _duplicates(self) -> list[Issue]:
+        """Components (declared ones), flows and views whose id another record already used."""
+        issues: list[Issue] = []
+        for kind, records in (
+            ("Component", ((c[0], c[1]) for s in self.summaries for c in s.components if c[3])),
+            ("Flow", ((f[0], f[1]) for s in self.summaries for f in s.flows)),
+            ("View", ((v[0], v[1]) for s in self.summaries for v in s.views)),
+        ):
+            first: dict[str, str] = {}
+            for location, record_id in records:
+                seen = first.setdefault(record_id, location)
+                if seen != location:
+                    issues.append(issue("duplicate_id", location, f"{kind} id '{record_id}' is also defined at {seen}"))
+        return issues
+
+    def _group_paths(self, known_ids: set[str]) -> list[Issue]:
+        """
+        Group paths ("Bank.Core") that cannot make a hierarchy: not a string, an empty or
+        unsafe segment, or a group id (the sanitized path, used for subgraphs and roll-up
+        parents) that another path or a component already has. Each distinct path is checked once.
+        """
+        issues: list[Issue] = []
+        checked: set[str] = set()
+        group_ids: dict[str, str] = {} # Group id -> its path
+        for summary in self.summaries:
+            for location, component_id, group, _ in summary.components:
+                if not group:
+                    continue
+                if not isinstance(group, str):
+                    problem: str | None = f"group must be a string, not {type(group).__name__}"
+                elif group in checked:
+                    continue
+                else:
+                    checked.add(group)
+                    problem = _group_problem(group, group_ids, known_ids)
+                if problem:
+                    issues.append(issue("group_path", location, f"Component '{component_id}': {problem}"))
+        return issues
+
+
+def _group_problem(group: str, group_ids: dict[str, str], known_ids: set[str]) -> str | None:
+    """What is wrong with a group path, registering its groups' ids in `group_ids`; None if nothing."""
+    path = group_id = ""
+    for raw_part in group.split("."):
+        part = raw_part.strip()
+        if not part:
+            return f"group path '{group}' has an empty segment"
+        if not sanitize_id(part):
+            return f"group '{part}' of '{group}' has no id characters"
+        path = f"{path}.{part}" if path else part
+        group_id = f"{group_id}_{sanitize_id(part)}" if group_id else sanitize_id(part)
+        other = group_ids.setdefault(group_id, path)
+        if other != path:
+            return f"group '{path}' has the id '{group_id}' of group '{other}'"
+        if group_id in known_ids:
+            return f"group '{path}' has the id '{group_id}' of a component"
+    return None
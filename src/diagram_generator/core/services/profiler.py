@@ -0,0 +1,179 @@
+import contextlib
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import AbstractContextManager
+from pathlib import Path
+from typing import Any
+
+# Shared no-op span handed out while profiling is off
+_NULL_SPAN = contextlib.nullcontext()
+
+
+class Span:
+    """
+    One timed section of a run. Times are nanoseconds from perf_counter_ns.
+    With memory tracking, `peak` and `retained` are traced bytes above the
+    amount allocated when the span started.
+    """
+
+    __slots__ = ("args", "category", "duration", "name", "peak", "retained", "start", "thread_id")
+
+    def __init__(self, name: str, category: str, start: int, duration: int, args: dict[str, Any]):
+        self.name = name
+        self.category = category
+        self.start = start
+        self.duration = duration
+        self.args = args
+        self.thread_id = threading.get_ident()
+        self.peak: int | None = None
+        self.retained: int | None = None
+
+
+class Profiler:
+    """
+    Collects spans while active and summarises them per stage, view and file.
+    With `memory`, spans also record tracemalloc peak and retained bytes, and a
+    snapshot is kept from the span boundary with the most memory allocated.
+    """
+
+    def __init__(self, memory: bool = False) -> None:
+        self.spans: list[Span] = []
+        self.origin = time.perf_counter_ns()
+        self.memory = memory
+        # Running peak of every open span; tracemalloc has a single peak counter
+        self._open_peaks: list[int] = []
+        self.high_water = 0
+        self.snapshot: tracemalloc.Snapshot | None = None
+
+    @contextlib.contextmanager
+    def span(self, name: str, category: str, args: dict[str, Any]) -> Iterator[None]:
+        allocated = self._enter_memory() if self.memory else 0
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            s = Span(name, category, start, time.perf_counter_ns() - start, args)
+            if self.memory:
+                s.peak, s.retained = self._exit_memory(allocated)
+            self.spans.append(s)
+
+    def _enter_memory(self) -> int:
+        current, peak = tracemalloc.get_traced_memory()
+        if self._open_peaks:
+            self._open_peaks[-1] = max(self._open_peaks[-1], peak)
+        tracemalloc.reset_peak()
+        self._open_peaks.append(current)
+        return current
+
+    def _exit_memory(self, allocated: int) -> tuple[int, int]:
+        current, peak = tracemalloc.get_traced_memory()
+        peak = max(self._open_peaks.pop(), peak)
+        if self._open_peaks:
+            self._open_peaks[-1] = max(self._open_peaks[-1], peak)
+        if current > self.high_water:
+            self.snapshot = None
+            self.snapshot = tracemalloc.take_snapshot()
+            # The snapshot itself is traced; only re-take it once the pipeline allocates past it
+            self.high_water = tracemalloc.get_traced_memory()[0]
+        return peak - allocated, current - allocated
+
+    def memory_summary(self) -> list[tuple[str, int, int, int]]:
+        """(name, calls, max peak bytes, total retained bytes) per span name, hungriest first."""
+        totals: dict[str, list[int]] = {}
+        for s in self.spans:
+            if s.peak is None or s.retained is None:
+                continue
+            entry = totals.setdefault(s.name, [0, 0, 0])
+            entry[0] += 1
+            entry[1] = max(entry[1], s.peak)
+            entry[2] += s.retained
+        rows = [(name, calls, peak, retained) for name, (calls, peak, retained) in totals.items()]
+        return sorted(rows, key=lambda row: row[2], reverse=True)
+
+    def summary(self, category: str | None = None) -> list[tuple[str, int, float, float]]:
+        """(name, calls, total seconds, max seconds) per span name, slowest first. Times are inclusive."""
+        totals: dict[str, list[float]] = {}
+        for s in self.spans:
+            if category is not None and s.category != category:
+                continue
+            entry = totals.setdefault(s.name, [0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += s.duration / 1e9
+            entry[2] = max(entry[2], s.duration / 1e9)
+        rows = [(name, int(calls), total, longest) for name, (calls, total, longest) in totals.items()]
+        return sorted(rows, key=lambda row: row[2], reverse=True)
+
+    def top(self, arg: str, names: tuple[str, ...], limit: int = 10) -> list[tuple[str, str, int, float]]:
+        """
+        Slowest values of `arg` (e.g. 'view' or 'file') across spans named `names`:
+        (value, span name, calls, total seconds).
+        """
+        totals: dict[tuple[str, str], list[float]] = {}
+        for s in self.spans:
+            if s.name in names and arg in s.args:
+                entry = totals.setdefault((str(s.args[arg]), s.name), [0, 0.0])
+                entry[0] += 1
+                entry[1] += s.duration / 1e9
+        rows = [(value, name, int(calls), total) for (value, name), (calls, total) in totals.items()]
+        return sorted(rows, key=lambda row: row[3], reverse=True)[:limit]
+
+    def wall_time(self) -> float:
+        return (time.perf_counter_ns() - self.origin) / 1e9
+
+    def to_chrome_trace(self) -> dict[str, Any]:
+        """Trace Event Format, loadable in chrome://tracing and ui.perfetto.dev."""
+        pid = os.getpid()
+        events = [
+            {
+                "name": s.name,
+                "cat": s.category,
+                "ph": "X",
+                "ts": (s.start - self.origin) / 1e3,
+                "dur": s.duration / 1e3,
+                "pid": pid,
+                "tid": s.thread_id,
+                "args": {
+                    **{key: str(value) for key, value in s.args.items()},
+                    **({"peak_bytes": s.peak, "retained_bytes": s.retained} if s.peak is not None else {}),
+                },
+            }
+            for s in self.spans
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path: str | Path) -> None:
+        Path(path).write_text(json.dumps(self.to_chrome_trace()))
+
+
+_active: Profiler | None = None
+
+
+def span(name: str, category: str = "stage", **args: Any) -> AbstractContextManager[None]:
+    """
+    Times the enclosed block when profiling is active. Otherwise returns a shared
+    no-op context manager, so instrumented code pays only for this call.
+    """
+    if _active is None:
+        return _NULL_SPAN
+    return _active.span(name, category, args)
+
+
+@contextlib.contextmanager
+def profiling(memory: bool = False) -> Iterator[Profiler]:
+    """Activates a fresh profiler for the enclosed block, tracing allocations if `memory`."""
+    global _active # noqa: PLW0603
+    profiler = Profiler(memory)
+    started = memory and not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    previous, _active = _active, profiler
+    try:
+        yield profiler
+    finally:
+        _active = previous
+        if started:
+            tracemalloc.stop()
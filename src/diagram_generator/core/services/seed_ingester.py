@@ -1,10 +1,15 @@
+import csv
+import json
 import logging
 import re
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Any
 
 from glom import Coalesce, glom
 from ruamel.yaml import YAML
+from ruamel.yaml.error import YAMLError
 
 from diagram_generator.core.domain.component import (
     Component,
@@ -17,10 +22,22 @@ from diagram_generator.core.domain.component import (
 )
 from diagram_generator.core.domain.flow import Flow, FlowStep
 from diagram_generator.core.domain.relationship import Relationship
+from diagram_generator.core.services.source_streams import ROW_FORMATS, STREAM_FORMATS, open_stream, row_stream
+from diagram_generator.core.services.spec_compiler import Extractor, compile_path, compile_spec
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Record kinds, in the order each source is mapped
+KINDS = ("components", "flows", "relationships")
+# Kinds mapped in the second phase, once every source's components have mapped their names
+LINK_KINDS = ("flows", "relationships")
+# Items per second phase task of a parallel ingest
+RESOLVE_CHUNK = 10_000
+
+# (kind, mapping index, transformed item), awaiting creation
+PendingItem = tuple[str, int, dict[str, Any]]
+
 class SeedIngester:
     """
     Enterprise-grade Data Ingestion Service.
@@ -31,64 +48,185 @@ class SeedIngester:
         self.yaml = YAML(typ='safe')
         self.yaml.preserve_quotes = True
         self.yaml.allow_duplicate_keys = True
+        self.config_path = config_path
         self.config = self._load_yaml(config_path)
         self.data_dir = Path(data_dir)
-        self.name_map = {} # Maps Name -> ID for relationship resolution
+        self.name_map: dict[str, str] = {} # Maps Name -> ID for relationship resolution
+        # Mapping (by identity) -> (items extractor, item extractor), compiled on first use
+        self._extractors: dict[int, tuple[Extractor, Extractor]] = {}
 
-    def ingest(self) -> dict[str, list[Any]]:
+    def ingest(self, workers: int = 1) -> dict[str, list[Any]]:
         """
-        Main ingestion entry point.
+        Main ingestion entry point. With more than one worker, sources are ingested
+        in parallel (see `_ingest_parallel`), with the same results.
         """
-        results = {"components": [], "flows": [], "relationships": []}
+        results: dict[str, list[Any]] = {kind: [] for kind in KINDS}
+        records = self._ingest_parallel(workers) if workers > 1 else self.iter_ingest()
+        for kind, record in records:
+            results[kind].append(record)
+        return results
         
+    def iter_ingest(self) -> Iterator[tuple[str, Any]]:
+        """
+        Yields (kind, record) for every component, flow and relationship as it is created,
+        so callers can write them out without holding the results.
+
+        Ingestion runs in two phases: the components of every source first, which builds
+        the Name -> ID map, then the flows and relationships of every source. Names thus
+        resolve whichever source defines them (the last one, when several do). A source is
+        read whole and mapped kind by kind and mapping by mapping, its flow and relationship
+        items kept for the second phase. With `stream: true` it is read item by item instead
+        (see `_stream_source`), once per phase, so memory stays bounded however big it is.
+        """
         sources = self.config.get("sources", [])
+        pending: list[list[PendingItem] | None] = []
         for source in sources:
-            file_path = self.data_dir / source["file"]
-            raw_data = self._load_source(file_path, source.get("format"))
-            
-            if not raw_data:
+            if source.get("stream"):
+                for kind, index, item_data in self._transform_source(source, ("components",)):
+                    yield from self._create(kind, index, item_data)
+                pending.append(None)
                 continue
 
-            # Process Components Mappings
-            for mapping in self.config.get("mappings", {}).get("components", []):
-                items = self._process_mapping(raw_data, mapping)
-                for item_data in items:
-                    # Validate and Create
-                    if item_data.get("id"):
-                        comp = self._create_component(item_data, mapping.get("item_model"))
-                        if comp:
-                            results["components"].append(comp)
-
-            # Process Flows Mappings
-            for mapping in self.config.get("mappings", {}).get("flows", []):
-                items = self._process_mapping(raw_data, mapping)
-                for item_data in items:
-                    flow = self._create_flow(item_data)
-                    if flow:
-                        results["flows"].append(flow)
-
-            # Process Relationships Mappings
-            for mapping in self.config.get("mappings", {}).get("relationships", []):
-                items = self._process_mapping(raw_data, mapping)
-                for item_data in items:
-                    rels = self._create_relationships(item_data)
-                    results["relationships"].extend(rels)
+            items: list[PendingItem] = []
+            for kind, index, item_data in self._transform_source(source, KINDS):
+                if kind == "components":
+                    yield from self._create(kind, index, item_data)
+                else:
+                    items.append((kind, index, item_data))
+            pending.append(items)
+
+        for source, source_items in zip(sources, pending, strict=True):
+            links = self._transform_source(source, LINK_KINDS) if source_items is None else source_items
+            for kind, index, item_data in links:
+                yield from self._create(kind, index, item_data)
+
+    def _ingest_parallel(self, workers: int) -> Iterator[tuple[str, Any]]:
+        """
+        `iter_ingest` across a pool of worker processes. In the first phase a worker
+        extracts each source: its components, the names they map, and its flow and
+        relationship items. The names are merged in source order into the Name -> ID map,
+        which second phase workers resolve the items against, in chunks. Results are
+        collected in source order, so they do not depend on how the sources are scheduled.
+        """
+        sources = self.config.get("sources", [])
+        init = (self.config_path, str(self.data_dir))
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(*init, {})) as pool:
+            extracted = list(pool.map(_extract_source, range(len(sources))))
+
+        chunks: list[list[PendingItem]] = []
+        for components, names, items in extracted:
+            self.name_map.update(names)
+            for comp in components:
+                yield "components", comp
+            chunks.extend(items[start:start + RESOLVE_CHUNK] for start in range(0, len(items), RESOLVE_CHUNK))
+
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(*init, self.name_map)) as pool:
+            for records in pool.map(_resolve_items, chunks):
+                yield from records
+
+    def extract_source(self, index: int) -> tuple[list[Component], dict[str, str], list[PendingItem]]:
+        """
+        The first phase for the `index`-th source alone: its components, the names they map
+        (resetting `name_map`), and its flow and relationship items.
+        """
+        self.name_map = {}
+        components: list[Component] = []
+        items: list[PendingItem] = []
+        for kind, mapping_index, item_data in self._transform_source(self.config["sources"][index], KINDS):
+            if kind == "components":
+                components.extend(comp for _, comp in self._create(kind, mapping_index, item_data))
+            else:
+                items.append((kind, mapping_index, item_data))
+        return components, self.name_map, items
+
+    def link_items(self, index: int) -> list[PendingItem]:
+        """The flow and relationship items of the `index`-th source, to resolve again."""
+        return list(self._transform_source(self.config["sources"][index], LINK_KINDS))
+
+    def resolve_items(self, items: list[PendingItem]) -> list[tuple[str, Any]]:
+        """The second phase for some flow and relationship items, against the current `name_map`."""
+        return [record for item in items for record in self._create(*item)]
+
+    def _transform_source(self, source: dict[str, Any], kinds: tuple[str, ...]) -> Iterator[PendingItem]:
+        """(kind, mapping index, transformed item) for the source's items of the given kinds."""
+        file_path = self.data_dir / source["file"]
+        if source.get("stream"):
+            yield from self._stream_source(file_path, source, kinds)
+            return
+
+        raw_data = self._load_source(file_path, source.get("format"), source)
+        if not raw_data:
+            return
+
+        for kind in kinds:
+            for index, mapping in enumerate(self.config.get("mappings", {}).get(kind, [])):
+                for item_data in self._process_mapping(raw_data, mapping):
+                    yield kind, index, item_data
+
+    def _stream_source(self, path: Path, source: dict[str, Any], kinds: tuple[str, ...]) -> Iterator[PendingItem]:
+        """
+        Streams a source (see `open_stream`): the lists at the source paths of the given
+        kinds' mappings are read item by item, and each item is transformed as soon as it
+        is read. Items come in file order rather than mapping order. Source paths must be
+        plain dotted paths; items read before a parse error are kept.
+        """
+        fmt = source.get("format")
+        if not path.exists():
+            print(f"Warning: Source file {path} not found.")
+            return
+        if fmt not in STREAM_FORMATS:
+            print(f"Warning: Cannot stream {fmt} source {path}.")
+            return
                 
-        return results
+        by_path: dict[str, list[tuple[str, int, dict[str, Any]]]] = {}
+        for kind in kinds:
+            for index, mapping in enumerate(self.config.get("mappings", {}).get(kind, [])):
+                source_path = mapping.get("source_path")
+                if not isinstance(source_path, str) or "*" in source_path or "\\" in source_path:
+                    logger.warning(f"Cannot stream source path {source_path!r}, skipping it")
+                    continue
+                by_path.setdefault(source_path, []).append((kind, index, mapping))
+        if not by_path:
+            return
+
+        try:
+            for source_path, item in open_stream(path, source).items(by_path):
+                for kind, index, mapping in by_path[source_path]:
+                    _, transform = self._compile_mapping(mapping)
+                    try:
+                        yield kind, index, transform(item)
+                    except Exception as e:
+                        logger.warning(f"Transformation failed for item in {source_path}: {e}")
+        except (YAMLError, ValueError, csv.Error) as e:
+            print(f"Error parsing {str(fmt).upper()} {path}: {e}")
+
+    def _create(self, kind: str, index: int, item_data: dict[str, Any]) -> Iterator[tuple[str, Any]]:
+        """Validates and creates the records of one item transformed by the kind's `index`-th mapping."""
+        if kind == "components":
+            if item_data.get("id"):
+                mapping = self.config["mappings"]["components"][index]
+                comp = self._create_component(item_data, mapping.get("item_model"))
+                if comp:
+                    yield kind, comp
+        elif kind == "flows":
+            flow = self._create_flow(item_data)
+            if flow:
+                yield kind, flow
+        else:
+            for rel in self._create_relationships(item_data):
+                yield kind, rel
 
     def _process_mapping(self, source_data: dict[str, Any], mapping_config: dict) -> list[dict]:
         """
-        Uses glom to extract and transform data based on the spec.
+        Extracts and transforms data based on the spec, with the mapping's compiled
+        extractors (same results as glom with `_build_safe_spec`).
         """
         source_path = mapping_config.get("source_path")
-        raw_spec = mapping_config.get("spec")
-        
-        # Build safe spec with defaults
-        spec = self._build_safe_spec(raw_spec)
+        extract_items, transform = self._compile_mapping(mapping_config)
         
         # 1. Extract the list of items
         try:
-            raw_items = glom(source_data, source_path, default=[])
+            raw_items = extract_items(source_data)
         except Exception as e:
             logger.warning(f"Could not extract path {source_path}: {e}")
             return []
@@ -101,14 +239,26 @@ class SeedIngester:
         transformed_items = []
         for item in raw_items:
             try:
-                # glom transformation
-                transformed = glom(item, spec)
+                transformed = transform(item)
                 transformed_items.append(transformed)
             except Exception as e:
                 logger.warning(f"Transformation failed for item in {source_path}: {e}")
                 
         return transformed_items
 
+    def _compile_mapping(self, mapping_config: dict[str, Any]) -> tuple[Extractor, Extractor]:
+        """Compiles a mapping once: a function of the source returning its items, and one transforming an item."""
+        compiled = self._extractors.get(id(mapping_config))
+        if compiled is None:
+            source_path = mapping_config.get("source_path")
+            if isinstance(source_path, str):
+                extract_items = compile_path(source_path, default=[])
+            else:
+                def extract_items(source_data: Any) -> Any:
+                    return glom(source_data, source_path, default=[])
+            compiled = self._extractors[id(mapping_config)] = (extract_items, compile_spec(mapping_config.get("spec")))
+        return compiled
+
     def _build_safe_spec(self, spec: Any) -> Any:
         """
         Recursively wraps string paths in Coalesce(path, default=None) 
@@ -124,7 +274,7 @@ class SeedIngester:
             return Coalesce(spec, default=None)
         return spec
 
-    def _create_component(self, data: dict[str, Any], model_type: str) -> Component | None: # noqa: PLR0911
+    def _create_component(self, data: dict[str, Any], model_type: str | None) -> Component | None: # noqa: PLR0911
         """
         Factory method to convert dict to Pydantic Component.
         """
@@ -281,19 +431,41 @@ class SeedIngester:
             logger.error(f"Failed to load config {path}: {e}")
             raise
 
-    def _load_source(self, path: Path, fmt: str) -> dict[str, Any]:
-        """Loads source data with messy YAML handling."""
+    def _load_source(self, path: Path, fmt: str | None, source: dict[str, Any] | None = None) -> Any:
+        """Loads source data with messy YAML handling. JSONL and CSV rows load as {root: rows}."""
         if not path.exists():
             print(f"Warning: Source file {path} not found.")
             return {}
             
-        with open(path) as f:
-            content = f.read()
-            
-        if fmt == "yaml":
-            try:
+        try:
+            if fmt in ROW_FORMATS:
+                rows = row_stream(path, source or {"format": fmt})
+                return {rows.root: list(rows.rows())}
+            with open(path) as f:
+                content = f.read()
+            if fmt == "yaml":
                 return self.yaml.load(content)
-            except Exception as e:
-                print(f"Error parsing YAML {path}: {e}")
-                return {}
+            if fmt == "json":
+                return json.loads(content)
+        except Exception as e:
+            print(f"Error parsing {str(fmt).upper()} {path}: {e}")
+            return {}
+        print(f"Warning: Unknown format {fmt} for source {path}.")
         return {}
+
+
+# The ingester of a worker process of a parallel ingest
+_worker: dict[str, SeedIngester] = {}
+
+
+def _init_worker(config_path: str, data_dir: str, name_map: dict[str, str]) -> None:
+    _worker["ingester"] = SeedIngester(config_path, data_dir)
+    _worker["ingester"].name_map = name_map
+
+
+def _extract_source(index: int) -> tuple[list[Component], dict[str, str], list[PendingItem]]:
+    return _worker["ingester"].extract_source(index)
+
+
+def _resolve_items(items: list[PendingItem]) -> list[tuple[str, Any]]:
+    return _worker["ingester"].resolve_items(items)
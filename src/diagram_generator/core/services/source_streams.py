@@ -0,0 +1,232 @@
+import csv
+import json
+import logging
+import re
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+from diagram_generator.core.services.legacy_sources import LEGACY_FORMATS, LegacyStream, log_progress
+from diagram_generator.core.services.yaml_stream import YAMLListStream
+
+try:
+    import orjson
+    loads: Callable[[str], Any] = orjson.loads
+except ImportError:
+    loads = json.loads
+
+logger = logging.getLogger(__name__)
+
+# Formats whose file is one list of rows, presented as {root: rows}
+ROW_FORMATS = ("jsonl", "csv", *LEGACY_FORMATS)
+STREAM_FORMATS = ("yaml", "json", *ROW_FORMATS)
+
+# A string (possibly cut off by the end of the buffer: no closing quote) or a bracket
+_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*("?)|[\[\]{}]', re.DOTALL)
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_NUMBER_TAIL = re.compile(r"[0-9.eE+\-]*\Z")
+
+
+class JSONListStream:
+    """
+    Reads the lists at given dotted paths of a JSON file item by item, like
+    YAMLListStream, from a buffer refilled as the file is read. Each item is decoded
+    by the json module in one call; everything else is skipped by matching brackets,
+    without being decoded. Memory stays bounded by the largest item.
+    """
+
+    CHUNK = 1 << 16
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._decoder = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def items(self, source_paths: Iterable[str]) -> Iterator[tuple[str, Any]]:
+        """(source_path, item) for every item of every list at `source_paths`, in file order."""
+        targets = {tuple(path.split(".")): path for path in source_paths}
+        prefixes = {target[:depth] for target in targets for depth in range(len(target))}
+        with open(self.path, encoding="utf-8-sig") as f:
+            self._file = f
+            self._buf, self._pos, self._eof = "", 0, False
+            if self._peek():
+                yield from self._walk((), targets, prefixes)
+
+    def _walk(
+        self, path: tuple[str, ...], targets: dict[tuple[str, ...], str], prefixes: set[tuple[str, ...]]
+    ) -> Iterator[tuple[str, Any]]:
+        """Reads the value at `path`, streaming it when it is a target list."""
+        start = self._peek()
+        if path in targets and start == "[":
+            if self._open("]"):
+                yield targets[path], self._decode()
+                while not self._closed("]"):
+                    yield targets[path], self._decode()
+            return
+        if path in targets:
+            logger.warning(f"Expected list at {targets[path]}, got {start!r}")
+        if path not in prefixes or start not in "{[":
+            self._skip()
+            return
+
+        end = "}" if start == "{" else "]"
+        if not self._open(end):
+            return
+        index = 0
+        while True:
+            if start == "{":
+                key = str(self._decode())
+                self._expect(":")
+            else:
+                key, index = str(index), index + 1
+            yield from self._walk((*path, key), targets, prefixes)
+            if self._closed(end):
+                return
+
+    def _open(self, end: str) -> bool:
+        """Consumes the bracket at the cursor, and `end` too when nothing is inside; whether something is."""
+        self._pos += 1
+        if self._peek() == end:
+            self._pos += 1
+            return False
+        return True
+
+    def _closed(self, end: str) -> bool:
+        """Consumes the separator after a member: True for `end`, False for a comma."""
+        separator = self._peek()
+        self._pos += 1
+        if separator not in (",", end):
+            raise ValueError(f"Expected ',' or {end!r} in {self.path}, got {separator!r}")
+        return separator == end
+
+    def _peek(self) -> str:
+        """The next non-whitespace character ("" at the end of the file), without consuming it."""
+        while True:
+            match = _WHITESPACE.match(self._buf, self._pos)
+            self._pos = match.end() if match else self._pos
+            if self._pos < len(self._buf) or not self._fill():
+                return self._buf[self._pos:self._pos + 1]
+
+    def _expect(self, char: str) -> None:
+        if self._peek() != char:
+            raise ValueError(f"Expected {char!r} in {self.path}, got {self._peek()!r}")
+        self._pos += 1
+
+    def _decode(self) -> Any:
+        """Decodes the value at the cursor, reading on until it is complete."""
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number at the end of the buffer ("12", "1.", "1e") may go on in the next chunk
+            if not _NUMBER_TAIL.match(self._buf, end) or not self._fill():
+                self._pos = end
+                return value
+
+    def _skip(self) -> None:
+        """Moves past the value at the cursor without decoding it."""
+        if self._peek() not in "{[":
+            self._decode()
+            return
+        depth = 0
+        while True:
+            match = _TOKEN.search(self._buf, self._pos)
+            if match is None or (match.group().startswith('"') and not match.group(1)):
+                # Nothing left, or a string cut off by the end of the buffer
+                self._pos = match.start() if match else len(self._buf)
+                if not self._fill():
+                    raise ValueError(f"Unexpected end of {self.path}")
+                continue
+            self._pos = match.end()
+            token = match.group()
+            if token in "{[":
+                depth += 1
+            elif token in "}]":
+                depth -= 1
+                if depth == 0:
+                    return
+
+    def _fill(self) -> bool:
+        """Drops the consumed buffer and reads at least as much again; False at the end of the file."""
+        if self._eof:
+            return False
+        chunk = self._file.read(max(self.CHUNK, len(self._buf) - self._pos))
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+        self._eof = not chunk
+        return bool(chunk)
+
+
+class RowStream:
+    """
+    Reads a JSONL or CSV file as one list of rows at the `root` path, so mappings read it
+    with `source_path: <root>`. CSV cells are strings, and empty cells are None. Dotted
+    column names nest ("owner.domain" -> {"owner": {"domain": ...}}), so the same specs
+    read tabular exports and nested documents. Malformed JSONL lines are skipped with a
+    warning.
+    """
+
+    def __init__(self, path: Path, fmt: str, root: str, delimiter: str = ","):
+        self.path = path
+        self.fmt = fmt
+        self.root = root
+        self.delimiter = delimiter
+
+    def items(self, source_paths: Iterable[str]) -> Iterator[tuple[str, Any]]:
+        if self.root in set(source_paths):
+            for row in self.rows():
+                yield self.root, row
+
+    def rows(self) -> Iterator[Any]:
+        with open(self.path, encoding="utf-8-sig", newline="") as f:
+            if self.fmt == "csv":
+                reader = csv.reader(f, delimiter=self.delimiter)
+                header = [column.split(".") for column in next(reader, [])]
+                for row in reader:
+                    yield _nest(header, row)
+                return
+            for number, line in enumerate(f, 1):
+                if line.strip():
+                    try:
+                        yield loads(line)
+                    except ValueError as e:
+                        logger.warning(f"Skipping invalid line {self.path}:{number}: {e}")
+
+
+def open_stream(path: Path, source: dict[str, Any]) -> YAMLListStream | JSONListStream | RowStream | LegacyStream:
+    """The streaming reader for a source: its `format`, and `root` and `delimiter` for row formats."""
+    fmt = source.get("format")
+    if fmt in ROW_FORMATS:
+        return row_stream(path, source)
+    if fmt == "json":
+        return JSONListStream(path)
+    return YAMLListStream(path)
+
+
+def row_stream(path: Path, source: dict[str, Any]) -> RowStream | LegacyStream:
+    """
+    The row reader for a JSONL, CSV or legacy source; `root` defaults to the file's stem.
+    Legacy sources are parsed across `workers` processes, logging progress.
+    """
+    fmt, root = str(source.get("format")), source.get("root") or path.stem
+    if fmt in LEGACY_FORMATS:
+        return LegacyStream(path, fmt, root, source.get("workers", 1), log_progress(path))
+    return RowStream(path, fmt, root, source.get("delimiter", ","))
+
+
+def _nest(header: list[list[str]], row: list[str]) -> dict[str, Any]:
+    record: dict[str, Any] = {}
+    for parts, cell in zip(header, row, strict=False):
+        target = record
+        for part in parts[:-1]:
+            if not isinstance(target.get(part), dict):
+                target[part] = {}
+            target = target[part]
+        target[parts[-1]] = cell if cell != "" else None
+    return record
@@ -0,0 +1,74 @@
+from collections.abc import Callable
+from typing import Any
+
+from glom import Coalesce, glom
+
+Extractor = Callable[[Any], Any]
+
+
+class MissingPathError(LookupError):
+    """A required path (a `T.` spec) is missing from the item."""
+
+
+def compile_spec(spec: Any) -> Extractor:
+    """
+    Compiles an ingestion mapping spec into a function of one item, equivalent to
+    `glom(item, SeedIngester._build_safe_spec(spec))` without re-building the spec or
+    running the glom interpreter per item:
+
+    - dicts build a dict of their compiled values, in order;
+    - paths ("a.b.0") resolve to None when any part is missing, like Coalesce(path, default=None);
+    - `T.` paths are required and raise MissingPathError when missing;
+    - anything else is handed to glom as is.
+    """
+    if isinstance(spec, dict):
+        fields = [(key, compile_spec(value)) for key, value in spec.items()]
+        return lambda item: {key: extract(item) for key, extract in fields}
+    if isinstance(spec, str):
+        if spec.startswith("T."):
+            return compile_path(spec[2:], required=True)
+        return compile_path(spec)
+    return lambda item: glom(item, spec)
+
+
+def compile_path(path: str, default: Any = None, required: bool = False) -> Extractor:
+    """
+    Compiles a dotted glom path. Each part is looked up the way glom's default
+    registry does it: dict keys, list/tuple indexes (the part as an int, negative
+    ones included) and attributes of anything else. A missing part gives `default`,
+    or raises MissingPathError when `required`.
+    """
+    if "*" in path or "\\" in path:
+        # Star and escaped paths are left to glom
+        if required:
+            return lambda item: glom(item, path)
+        return lambda item: glom(item, Coalesce(path, default=default))
+
+    parts = [(part, _as_index(part)) for part in path.split(".")]
+
+    def extract(item: Any) -> Any:
+        target = item
+        for key, index in parts:
+            try:
+                if isinstance(target, dict):
+                    target = target[key]
+                elif isinstance(target, (list, tuple)):
+                    if index is None:
+                        raise LookupError(key)
+                    target = target[index]
+                else:
+                    target = getattr(target, key)
+            except Exception: # glom treats any failed lookup as a missing path
+                if required:
+                    raise MissingPathError(f"Path {path!r} is missing {key!r}") from None
+                return default
+        return target
+
+    return extract
+
+
+def _as_index(part: str) -> int | None:
+    try:
+        return int(part)
+    except ValueError:
+        return None
@@ -0,0 +1,231 @@
+import copy
+import functools
+import hashlib
+import json
+import os
+import types
+from collections.abc import Callable, Iterable, Sequence
+from enum import Enum
+from typing import Annotated, Any, Literal, Union, get_args, get_origin
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+from diagram_generator.core.domain.compact_flow import AnyFlow
+from diagram_generator.core.domain.component import Component
+from diagram_generator.core.domain.flow import Flow
+from diagram_generator.core.domain.relationship import Relationship
+from diagram_generator.core.domain.view_config import ViewConfig
+from diagram_generator.core.services.profiler import span
+
+# Re-validate every n-th trusted record when set, e.g. DIAGRAM_GENERATOR_VERIFY_TRUSTED=100 (1 = all of them)
+VERIFY_ENV = "DIAGRAM_GENERATOR_VERIFY_TRUSTED"
+
+# The record types a trusted load can produce, by kind
+MODELS: dict[str, Any] = {
+    "components": Component,
+    "relationships": Relationship,
+    "flows": Flow,
+    "views": ViewConfig,
+}
+
+# Kinds that are constructed when trusted. Flows and views are always validated: their
+# nested steps and filters validate faster in pydantic-core than they construct in Python.
+TRUSTED_KINDS = frozenset({"components", "relationships"})
+
+Converter = Callable[[Any], Any]
+_object_setattr = object.__setattr__
+
+
+class TrustedDataError(ValueError):
+    """A trusted record did not survive re-validation: the producer and the models disagree."""
+
+
+@functools.cache
+def schema_version() -> str:
+    """
+    Stamp of the current model schemas. Data written under one stamp can only be
+    constructed without validation by code whose models produce the same stamp.
+    """
+    schemas = {kind: TypeAdapter(model).json_schema() for kind, model in MODELS.items()}
+    return hashlib.sha256(json.dumps(schemas, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def dump_records(models: Iterable[BaseModel]) -> list[dict[str, Any]]:
+    """
+    Records to store as trusted data: JSON-safe and limited to the fields that were set,
+    plus `type`, which picks the member of a union such as Component.
+    """
+    records = []
+    for model in models:
+        record = model.model_dump(mode="json", exclude_unset=True)
+        if "type" in type(model).model_fields and "type" not in record:
+            record["type"] = model.model_dump(mode="json", include={"type"})["type"]
+        records.append(record)
+    return records
+
+
+def dump_flow_records(flows: Iterable[AnyFlow]) -> list[dict[str, Any]]:
+    """dump_records for flows of either representation; CompactFlow steps are dumped without a model per step."""
+    records = []
+    for flow in flows:
+        if isinstance(flow, Flow):
+            records.extend(dump_records([flow]))
+            continue
+        header = Flow(id=flow.id, description=flow.description, tags=flow.tags, metadata=flow.metadata)
+        record = dump_records([header])[0]
+        steps = []
+        for step in flow.steps:
+            raw: dict[str, Any] = {
+                "source_id": step.source_id, "target_id": step.target_id, "description": step.description,
+            }
+            if step.protocol is not None:
+                raw["protocol"] = step.protocol
+            if step.is_dashed:
+                raw["is_dashed"] = True
+            if step.metadata:
+                raw["metadata"] = step.metadata
+            steps.append(raw)
+        record["steps"] = steps
+        records.append(record)
+    return records
+
+
+class TrustedLoader:
+    """
+    Builds models from records that we produced and validated ourselves (caches,
+    compiled bundles) without validating them again. Records are only trusted when their
+    `version` matches `schema_version()` and their kind is in TRUSTED_KINDS; anything
+    else is validated.
+
+    `verify_every` (default: the DIAGRAM_GENERATOR_VERIFY_TRUSTED environment variable)
+    re-validates every n-th constructed record and raises TrustedDataError on a mismatch.
+    """
+
+    def __init__(self, verify_every: int | None = None):
+        if verify_every is None:
+            verify_every = int(os.environ.get(VERIFY_ENV) or 0)
+        self.verify_every = verify_every
+
+    def load(self, kind: str, records: Sequence[dict[str, Any]], version: str | None) -> list[Any]:
+        """Models of `kind` (see MODELS) from `records` written under schema `version`."""
+        model = MODELS[kind]
+        adapter: TypeAdapter[Any] = TypeAdapter(model)
+        trusted = version == schema_version() and kind in TRUSTED_KINDS
+        # A model always needs a converter; without one the records are validated like untrusted ones
+        construct = _converter(model) if trusted else None
+        if construct is None:
+            with span(f"validate.{kind}", "validate", records=len(records)):
+                return [adapter.validate_python(record) for record in records]
+
+        with span(f"construct.{kind}", "validate", records=len(records)):
+            models = [construct(record) for record in records]
+
+        if self.verify_every:
+            with span(f"verify.{kind}", "validate"):
+                for index in range(0, len(records), self.verify_every):
+                    try:
+                        validated = adapter.validate_python(records[index])
+                    except ValidationError as e:
+                        raise TrustedDataError(f"Trusted {kind} record {index} is invalid: {e}") from e
+                    if validated != models[index]:
+                        raise TrustedDataError(f"Trusted {kind} record {index} differs from its validated form.")
+        return models
+
+
+@functools.cache
+def _converter(annotation: Any) -> Converter | None:
+    """
+    Builds values of `annotation` from JSON-mode data without validating them: nested
+    models are constructed and enums looked up. None when the data can be used as is.
+    """
+    args = get_args(annotation)
+    if isinstance(annotation, type):
+        if issubclass(annotation, BaseModel):
+            return _model_constructor(annotation)
+        return annotation if issubclass(annotation, Enum) else None
+    if get_origin(annotation) is Annotated:
+        return _converter(args[0])
+    if get_origin(annotation) is Literal:
+        members = {member.value: member for member in args if isinstance(member, Enum)}
+        return (lambda value: members.get(value, value)) if members else None
+    return _generic_converter(get_origin(annotation), args)
+
+
+def _generic_converter(origin: Any, args: tuple[Any, ...]) -> Converter | None:
+    """Converter for list[...], dict[..., ...], Optional[...] and unions of models."""
+    if origin in (Union, types.UnionType):
+        options = [arg for arg in args if arg is not type(None)]
+        if all(isinstance(arg, type) and issubclass(arg, BaseModel) for arg in options) and len(options) > 1:
+            return _union_constructor(tuple(options))
+        item = _converter(options[0]) if len(options) == 1 else None
+    elif origin in (list, dict):
+        item = _converter(args[-1])
+    else:
+        return None
+    if item is None:
+        return None
+
+    convert: Converter = item
+    if origin is list:
+        return lambda values: [convert(value) for value in values]
+    if origin is dict:
+        return lambda values: {key: convert(value) for key, value in values.items()}
+    return lambda value: None if value is None else convert(value)
+
+
+def _model_constructor(model: type[BaseModel]) -> Converter:
+    plan: list[tuple[str, Converter]] = []
+    # Defaults filled in here: model_construct inspects every default_factory on every call
+    defaults: list[tuple[str, Callable[[], Any]]] = []
+    for name, field in model.model_fields.items():
+        annotation: Any = field.annotation
+        convert = _converter(annotation)
+        if convert is not None:
+            plan.append((name, convert))
+        if field.default_factory is not None:
+            defaults.append((name, field.default_factory)) # type: ignore[arg-type]
+        elif not field.is_required():
+            defaults.append((name, functools.partial(copy.copy, field.default)))
+
+    if model.__private_attributes__ or model.model_config.get("extra") == "allow":
+        def construct(data: dict[str, Any]) -> BaseModel:
+            values = _converted(data)
+            return model.model_construct(set(values), **values)
+        return construct
+
+    def construct_fast(data: dict[str, Any]) -> BaseModel:
+        # What model_construct does, minus its per-call default and extras handling
+        values = _converted(data)
+        fields_set = set(values)
+        for name, default in defaults:
+            if name not in values:
+                values[name] = default()
+        instance = model.__new__(model)
+        _object_setattr(instance, "__dict__", values)
+        _object_setattr(instance, "__pydantic_fields_set__", fields_set)
+        _object_setattr(instance, "__pydantic_extra__", None)
+        _object_setattr(instance, "__pydantic_private__", None)
+        return instance
+
+    def _converted(data: dict[str, Any]) -> dict[str, Any]:
+        values = dict(data)
+        for name, convert in plan:
+            if name in values:
+                values[name] = convert(values[name])
+        return values
+
+    return construct_fast
+
+
+def _union_constructor(options: tuple[type[BaseModel], ...]) -> Converter:
+    """Picks the union member by its `type` literal, as the Component union is discriminated."""
+    by_type: dict[Any, Converter] = {}
+    for option in options:
+        field = option.model_fields.get("type")
+        default = field.default if field is not None else None
+        by_type[default.value if isinstance(default, Enum) else default] = _model_constructor(option)
+
+    def construct(data: dict[str, Any]) -> BaseModel:
+        return by_type[data.get("type")](data) # type: ignore[no-any-return]
+
+    return construct
@@ -0,0 +1,92 @@
+import json
+import math
+import re
+from collections.abc import Iterable
+from typing import Any, TextIO
+
+# Strings written unquoted: no indicators, and nothing YAML 1.1 or 1.2 would read as another type
+_PLAIN = re.compile(r"[A-Za-z_][A-Za-z0-9_\-./()]*(?: [A-Za-z0-9_\-./()]+)*\Z")
+_RESERVED = {"y", "n", "yes", "no", "true", "false", "on", "off", "null"}
+# Characters JSON leaves raw that YAML reads as line breaks or rejects
+_ESCAPES = str.maketrans({
+    **{code: f"\\u{code:04x}" for code in range(0x7F, 0xA0)},
+    0x2028: "\\u2028", 0x2029: "\\u2029", 0xFEFF: "\\ufeff",
+})
+
+
+def emit_records(kind: str, records: Iterable[dict[str, Any]], out: TextIO) -> None:
+    """
+    Writes `{kind: records}` as block YAML, one record at a time, for JSON-like records
+    (`model_dump(mode="json")`). Keys keep their order. Strings are plain when that is
+    unambiguous and JSON-quoted (a valid YAML double-quoted scalar) otherwise, so the
+    output loads back as the same data without a general-purpose YAML emitter.
+    """
+    empty = True
+    for record in records:
+        if empty:
+            out.write(f"{kind}:\n")
+            empty = False
+        out.write("- ")
+        _value(record, "  ", out)
+    if empty:
+        out.write(f"{kind}: []\n")
+
+
+def _value(value: Any, indent: str, out: TextIO) -> None:
+    """Writes a value that follows "key: " or "- " on the current line, children at `indent`."""
+    if isinstance(value, dict) and value:
+        first = True
+        for key, item in value.items():
+            if not first:
+                out.write(indent)
+            first = False
+            out.write(f"{_scalar(key)}:")
+            _child(item, indent, out)
+    elif isinstance(value, list) and value:
+        first = True
+        for item in value:
+            if not first:
+                out.write(indent)
+            first = False
+            out.write("- ")
+            _value(item, indent + "  ", out)
+    else:
+        out.write(f"{_scalar(value)}\n")
+
+
+def _child(value: Any, indent: str, out: TextIO) -> None:
+    """Writes the value of a mapping key whose "key:" is already written."""
+    if isinstance(value, dict) and value:
+        out.write(f"\n{indent}  ")
+        _value(value, indent + "  ", out)
+    elif isinstance(value, list) and value:
+        out.write(f"\n{indent}")
+        _value(value, indent, out)
+    else:
+        out.write(f" {_scalar(value)}\n")
+
+
+def _scalar(value: Any) -> str: # noqa: PLR0911
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, float):
+        if math.isnan(value):
+            return ".nan"
+        if math.isinf(value):
+            return ".inf" if value > 0 else "-.inf"
+        text = repr(value)
+        # YAML 1.1 floats need a dot: 1e+300 -> 1.0e+300
+        return text if "." in text or "e" not in text else text.replace("e", ".0e")
+    if isinstance(value, str):
+        if _PLAIN.match(value) and value.lower() not in _RESERVED:
+            return value
+        return json.dumps(value, ensure_ascii=False).translate(_ESCAPES)
+    if isinstance(value, dict):
+        return "{}"
+    if isinstance(value, list):
+        return "[]"
+    raise TypeError(f"Cannot emit {type(value).__name__} value {value!r}")
@@ -0,0 +1,146 @@
+import logging
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+from ruamel.yaml import YAML
+from ruamel.yaml.events import (
+    AliasEvent,
+    Event,
+    MappingEndEvent,
+    MappingStartEvent,
+    ScalarEvent,
+    SequenceEndEvent,
+    SequenceStartEvent,
+)
+from ruamel.yaml.nodes import ScalarNode
+
+logger = logging.getLogger(__name__)
+
+_STR_TAG = "tag:yaml.org,2002:str"
+_MERGE_KEY = "<<"
+
+
+class YAMLListStream:
+    """
+    Reads the lists at given dotted paths ("data.databases_list", "items.0.children")
+    of a YAML (or JSON) file item by item, from parser events: only the item being read
+    is ever built, so memory stays bounded by the largest item rather than the file.
+
+    Scalars are typed as the safe loader types them. Anchors are kept while their
+    document is read, so aliases resolve as they would in a full load. Lists nested in
+    a streamed item are not streamed themselves; they arrive as part of their item.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.yaml = YAML(typ="safe")
+        self._scalar_constructors: dict[str, Callable[[ScalarNode], Any]] = {}
+
+    def items(self, source_paths: Iterable[str]) -> Iterator[tuple[str, Any]]:
+        """(source_path, item) for every item of every list at `source_paths`, in file order."""
+        targets = {tuple(path.split(".")): path for path in source_paths}
+        prefixes = {target[:depth] for target in targets for depth in range(len(target))}
+        with open(self.path) as f:
+            events = iter(self.yaml.parse(f))
+            for event in events:
+                if isinstance(event, (MappingStartEvent, SequenceStartEvent)):
+                    # A document's root node
+                    anchors: dict[str, Any] = {}
+                    yield from self._walk(event, events, (), targets, prefixes, anchors)
+
+    def _walk( # noqa: PLR0913, PLR0917
+        self,
+        start: Event,
+        events: Iterator[Event],
+        path: tuple[str, ...],
+        targets: dict[tuple[str, ...], str],
+        prefixes: set[tuple[str, ...]],
+        anchors: dict[str, Any],
+    ) -> Iterator[tuple[str, Any]]:
+        """Descends into the container opened by `start` at `path`, streaming target lists."""
+        if path in targets and isinstance(start, SequenceStartEvent):
+            for event in events:
+                if isinstance(event, SequenceEndEvent):
+                    return
+                yield targets[path], self._build(event, events, anchors)
+            return
+        if path in targets:
+            logger.warning(f"Expected list at {targets[path]}, got a mapping")
+        if path not in prefixes:
+            self._build(start, events, anchors) # Read past it; it may hold anchors used later
+            return
+
+        index = 0
+        for event in events:
+            if isinstance(event, (MappingEndEvent, SequenceEndEvent)):
+                return
+            if isinstance(start, MappingStartEvent):
+                key = self._build(event, events, anchors)
+                event = next(events) # noqa: PLW2901
+            else:
+                key, index = index, index + 1
+            if isinstance(event, (MappingStartEvent, SequenceStartEvent)):
+                yield from self._walk(event, events, (*path, str(key)), targets, prefixes, anchors)
+            else:
+                self._build(event, events, anchors)
+
+    def _build(self, event: Event, events: Iterator[Event], anchors: dict[str, Any]) -> Any:
+        """The value whose first event is `event`, consuming the rest of its events."""
+        if isinstance(event, AliasEvent):
+            return anchors[event.anchor]
+        if isinstance(event, ScalarEvent):
+            value = self._scalar(event)
+            if event.anchor:
+                anchors[event.anchor] = value
+            return value
+        if isinstance(event, SequenceStartEvent):
+            return self._sequence(event, events, anchors)
+        if isinstance(event, MappingStartEvent):
+            return self._mapping(event, events, anchors)
+        raise ValueError(f"Unexpected YAML event {event}")
+
+    def _sequence(self, start: SequenceStartEvent, events: Iterator[Event], anchors: dict[str, Any]) -> list[Any]:
+        value: list[Any] = []
+        if start.anchor:
+            anchors[start.anchor] = value
+        for event in events:
+            if isinstance(event, SequenceEndEvent):
+                break
+            value.append(self._build(event, events, anchors))
+        return value
+
+    def _mapping(self, start: MappingStartEvent, events: Iterator[Event], anchors: dict[str, Any]) -> dict[Any, Any]:
+        value: dict[Any, Any] = {}
+        if start.anchor:
+            anchors[start.anchor] = value
+        merged: dict[Any, Any] = {}
+        for event in events:
+            if isinstance(event, MappingEndEvent):
+                break
+            key = self._build(event, events, anchors)
+            item = self._build(next(events), events, anchors)
+            if key == _MERGE_KEY and isinstance(event, ScalarEvent) and event.style is None:
+                for source in item if isinstance(item, list) else [item]:
+                    for merged_key, merged_value in source.items():
+                        merged.setdefault(merged_key, merged_value)
+            else:
+                value.setdefault(key, item) # The first of duplicate keys wins, as in a safe load
+        if merged:
+            # Merged keys come first; explicit keys override them
+            combined = {**merged, **value}
+            value.clear()
+            value.update(combined)
+        return value
+
+    def _scalar(self, event: ScalarEvent) -> Any:
+        tag = str(event.tag or self.yaml.resolver.resolve(ScalarNode, event.value, event.implicit))
+        construct = self._scalar_constructors.get(tag)
+        if construct is None:
+            constructor = self.yaml.constructor
+            method = type(constructor).yaml_constructors.get(tag) or type(constructor).yaml_constructors[_STR_TAG]
+            construct = self._scalar_constructors[tag] = lambda node: method(constructor, node)
+        try:
+            return construct(ScalarNode(tag, event.value, style=event.style))
+        except Exception: # Unknown or malformed tagged scalars stay strings
+            return event.value
@@ -1,36 +1,246 @@
+from diagram_generator.core.domain.compact_flow import AnyFlow
 from diagram_generator.core.domain.component import Component, ComponentType, GenericComponent
+from diagram_generator.core.domain.relationship import Relationship
+from diagram_generator.core.domain.view_config import Type as ViewType
 from diagram_generator.core.domain.view_config import ViewConfig
 from diagram_generator.core.ports.diagram_port import DiagramPort
-from diagram_generator.core.ports.metadata_port import MetadataPort
+from diagram_generator.core.ports.metadata_port import MetadataPort, can_filter, can_look_up
+from diagram_generator.core.services.component_hierarchy import (
+    ABSTRACTION_LEVELS,
+    ComponentHierarchy,
+    group_path,
+    in_group,
+)
+from diagram_generator.core.services.diagram_splitter import DiagramSplitter
+from diagram_generator.core.services.edge_aggregator import EdgeAggregator
+from diagram_generator.core.services.flow_abstractor import FlowAbstractor
+from diagram_generator.core.services.graph_analytics import DependencyGraph
+from diagram_generator.core.services.graph_index import GraphIndex
+from diagram_generator.core.services.profiler import span
 
 
 class GenerateDiagramUseCase:
     def __init__(self, metadata_port: MetadataPort, diagram_port: DiagramPort):
         self._metadata_port = metadata_port
         self._diagram_port = diagram_port
+        # Shared across views so roll-ups computed for one view are reused by the next
+        self._abstractor = FlowAbstractor()
+        self._graph: GraphIndex | None = None
+        self._dependencies: DependencyGraph | None = None
 
     def execute(self, view_key: str) -> str:
-        # 1. Load all metadata
-        # (In a real scenario, we might optimize this to only load what's needed,
-        # but for V1 we load all and filter in memory)
-        all_components = self._metadata_port.load_components()
-        all_relationships = self._metadata_port.load_relationships()
-        all_view_configs = self._metadata_port.load_view_configs()
-        all_flows = self._metadata_port.load_flows()
-
-        # 2. Find the requested ViewConfig
-        view_config = next((vc for vc in all_view_configs if vc.key == view_key), None)
-        if not view_config:
-            raise ValueError(f"View configuration with key '{view_key}' not found.")
+        view_config, components, relationships, flows = self.prepare(view_key)
+
+        # 4. Render
+        return self._diagram_port.render(view_config, components, relationships, flows)
+
+    def execute_pages(self, view_key: str, max_edges: int) -> dict[str, str]:
+        """
+        Renders a view, splitting it into linked pages if it exceeds `max_edges`.
+        Returns a mapping of page key -> diagram source. The entry for `view_key`
+        is either the whole diagram or, when split, the index page.
+        """
+        view_config, components, relationships, flows = self.prepare(view_key)
+
+        splitter = DiagramSplitter(max_edges)
+        if not splitter.can_split(view_config, relationships):
+            return {view_key: self._diagram_port.render(view_config, components, relationships, flows)}
+
+        pages, index = splitter.split(view_config, components, relationships)
+        results = {
+            index.view_config.key: self._diagram_port.render(index.view_config, index.components, index.relationships)
+        }
+        for page in pages:
+            results[page.view_config.key] = self._diagram_port.render(
+                page.view_config, page.components, page.relationships, flows
+            )
+        return results
+
+    def prepare(self, view_key: str) -> tuple[ViewConfig, list[Component], list[Relationship], list[AnyFlow]]:
+        """
+        Loads the model and reduces it to the graph a single view needs.
+        Returns (view_config, components, relationships, flows) ready for rendering.
+        A port that looks records up by key (see LookupMetadataPort) decodes only the view
+        and its flow, and one that filters views itself (see FilteringMetadataPort) is asked
+        for the view's graph, unless the view rolls components up.
+        """
+        port = self._metadata_port
+        if not can_look_up(port) and not can_filter(port):
+            # 1. Load all metadata (auto-discovered components included)
+            all_components, all_relationships, all_view_configs, all_flows = self.load_model()
+
+            # 2. Find the requested ViewConfig
+            view_config = self._find_view(all_view_configs, view_key)
+
+            return self.view_graph(view_config, all_components, all_relationships, all_flows)
+
+        with span("load", view=view_key):
+            view_config, flows = self._load_view(view_key)
+        if can_filter(port) and not self._rolls_up(view_config):
+            with span("filter", view=view_key):
+                components, relationships = port.filter_graph(view_config)
+            # Nothing to roll up, so no component outside the view is read
+            with span("abstract", view=view_key):
+                return self.abstract_graph(view_config, components, components, relationships, flows)
+
+        with span("load"):
+            all_components = port.load_components()
+            all_relationships = port.load_relationships()
+        with span("discover"):
+            self.discover_components(all_components, all_relationships)
+        return self.view_graph(view_config, all_components, all_relationships, flows)
+
+    def view_graph(
+        self,
+        view_config: ViewConfig,
+        all_components: list[Component],
+        all_relationships: list[Relationship],
+        all_flows: list[AnyFlow],
+    ) -> tuple[ViewConfig, list[Component], list[Relationship], list[AnyFlow]]:
+        """
+        Reduces a loaded model (see `load_model`) to the graph one of its views renders.
+        Returns (view_config, components, relationships, flows) ready for rendering.
+        """
+        # 3. Filter Graph based on ViewConfig
+        with span("filter", view=view_config.key):
+            filtered_components, filtered_relationships = self.filter_graph(
+                view_config, all_components, all_relationships
+            )
+
+        # 3.4 - 3.6 Level of detail, abstraction and aggregation
+        with span("abstract", view=view_config.key):
+            return self.abstract_graph(
+                view_config, all_components, filtered_components, filtered_relationships, all_flows
+            )
+
+    def load_model(self) -> tuple[list[Component], list[Relationship], list[ViewConfig], list[AnyFlow]]:
+        """
+        Loads every record and appends the components discovered from relationships.
+        Returns (components, relationships, view_configs, flows).
+        """
+        with span("load"):
+            components = self._metadata_port.load_components()
+            relationships = self._metadata_port.load_relationships()
+            view_configs = self._metadata_port.load_view_configs()
+            flows = self._metadata_port.load_flows()
+
+        # Auto-Discover Missing Components (Quick Draw)
+        with span("discover"):
+            self.discover_components(components, relationships)
+        return components, relationships, view_configs, flows
+
+    def filter_graph(
+        self, view_config: ViewConfig, components: list[Component], relationships: list[Relationship]
+    ) -> tuple[list[Component], list[Relationship]]:
+        """Keeps the components the view selects and the relationships between them."""
+        graph = self.graph_index(components, relationships)
+        # (Simple implementation: include all for now, or filter by tags if present)
+        filtered_components = self._filter_components(components, view_config, graph)
+        
+        # Filter relationships: only include if both source and target are in filtered_components
+        filtered_relationships = graph.relationships_within(c.id for c in filtered_components)
+        return filtered_components, filtered_relationships
+
+    def graph_index(self, components: list[Component], relationships: list[Relationship]) -> GraphIndex:
+        """The interned graph of these lists, rebuilt only when they are replaced."""
+        if self._graph is None or not self._graph.is_current(components, relationships):
+            with span("graph.index", components=len(components), relationships=len(relationships)):
+                self._graph = GraphIndex(components, relationships)
+        return self._graph
+
+    def dependency_graph(
+        self, components: list[Component], relationships: list[Relationship], flows: list[AnyFlow]
+    ) -> DependencyGraph:
+        """Relationships plus flow steps, for impact, path and cycle queries; rebuilt only when they change."""
+        graph = self.graph_index(components, relationships)
+        if self._dependencies is None or not self._dependencies.is_current(graph, flows):
+            with span("graph.dependencies", flows=len(flows)):
+                self._dependencies = DependencyGraph(graph, flows)
+        return self._dependencies
 
-        # 2.5 Auto-Discover Missing Components (Quick Draw)
-        known_ids = {c.id for c in all_components}
-        missing_ids = set()
-        for r in all_relationships:
-            if r.source_id not in known_ids:
-                missing_ids.add(r.source_id)
-            if r.target_id not in known_ids:
-                missing_ids.add(r.target_id)
+    def neighbourhood(
+        self,
+        component_ids: list[str],
+        components: list[Component],
+        relationships: list[Relationship],
+        depth: int = 1,
+    ) -> tuple[list[Component], list[Relationship]]:
+        """Components within `depth` relationships of `component_ids`, and the relationships between them."""
+        graph = self.graph_index(components, relationships)
+        ids = graph.neighbourhood(component_ids, depth)
+        nodes = [graph.nodes[node] for node in map(graph.intern, ids)]
+        return [c for c in nodes if c is not None], graph.relationships_within(ids)
+
+    def execute_neighbourhood(self, component_ids: list[str], depth: int = 1) -> str:
+        """
+        Renders as a flowchart the components within `depth` relationships of `component_ids`,
+        either way, and the relationships between them.
+        """
+        components, relationships, _, _ = self.load_model()
+        graph = self.graph_index(components, relationships)
+        unknown = next((c for c in component_ids if graph.node(c) is None), None)
+        if unknown is not None:
+            raise ValueError(f"Unknown component '{unknown}'.")
+
+        nearby, between = self.neighbourhood(component_ids, components, relationships, depth)
+        hops = "hop" if depth == 1 else "hops"
+        view_config = ViewConfig.model_validate({
+            "key": "neighbourhood",
+            "title": f"Within {depth} {hops} of {', '.join(component_ids)}",
+            "type": ViewType.flowchart,
+        })
+        return self._diagram_port.render(view_config, nearby, between)
+
+    def abstract_graph(
+        self,
+        view_config: ViewConfig,
+        all_components: list[Component],
+        filtered_components: list[Component],
+        filtered_relationships: list[Relationship],
+        all_flows: list[AnyFlow],
+    ) -> tuple[ViewConfig, list[Component], list[Relationship], list[AnyFlow]]:
+        """
+        Rolls the filtered graph up to the view's abstraction level and aggregates edges.
+        Returns (view_config, components, relationships, flows) ready for rendering.
+        """
+        # 3.4 Level of Detail: with a node/edge budget, pick the finest level that fits
+        if not view_config.abstraction_level and (view_config.max_nodes or view_config.max_edges):
+            hierarchy = self._abstractor.hierarchy(all_components)
+            fitting_level = self._pick_abstraction_level(
+                view_config, hierarchy, filtered_components, filtered_relationships, all_flows
+            )
+            if fitting_level != "component":
+                view_config = view_config.model_copy(update={"abstraction_level": fitting_level})
+
+        # 3.5 Abstraction (Roll-up). 'component' is the leaf level: nothing to roll up.
+        level = view_config.abstraction_level
+        if level and level != "component":
+            # Parents are resolved against ALL components, even ones filtered out by tags.
+            if view_config.flow_id:
+                # Only the rendered flow is abstracted; the abstractor caches it per level.
+                flow = next((f for f in all_flows if f.id == view_config.flow_id), None)
+                if flow:
+                    abstract_flow, filtered_components = self._abstractor.abstract_flow(flow, all_components, level)
+                    all_flows = [abstract_flow if f is flow else f for f in all_flows]
+                    # The abstracted flow carries a level suffix; point the view at it.
+                    view_config = view_config.model_copy(update={"flow_id": abstract_flow.id})
+            else:
+                # Static views: roll the relationships up to the same parents.
+                filtered_relationships, filtered_components = self._abstractor.abstract_relationships(
+                    filtered_relationships, filtered_components, level
+                )
+
+        # 3.6 Edge Aggregation (parallel edges -> one labelled edge)
+        if view_config.aggregate_relationships:
+            filtered_relationships = EdgeAggregator().aggregate(filtered_relationships)
+
+        return view_config, filtered_components, filtered_relationships, all_flows
+
+    def discover_components(self, components: list[Component], relationships: list[Relationship]) -> None:
+        """Appends a generic component for every relationship endpoint that isn't modelled."""
+        graph = self.graph_index(components, relationships)
+        # In order of first use, so repeated runs render identically
+        missing_ids = graph.missing_ids()
         
         if missing_ids:
             for mid in missing_ids:
@@ -41,67 +251,74 @@ class GenerateDiagramUseCase:
                     description="Auto-discovered component",
                     type=ComponentType.generic
                 )
-                all_components.append(new_comp)
+                components.append(new_comp)
+                graph.add_component(new_comp)
 
-        # 3. Filter Graph based on ViewConfig
-        # (Simple implementation: include all for now, or filter by tags if present)
-        filtered_components = self._filter_components(all_components, view_config)
-        
-        # Filter relationships: only include if both source and target are in filtered_components
-        filtered_component_ids = {c.id for c in filtered_components}
-        filtered_relationships = [
-            r for r in all_relationships
-            if r.source_id in filtered_component_ids and r.target_id in filtered_component_ids
-        ]
-
-        # 3.5 Abstraction (Roll-up)
-        if view_config.abstraction_level:
-            from diagram_generator.core.services.flow_abstractor import FlowAbstractor  # noqa: PLC0415
-            abstractor = FlowAbstractor()
-            # For abstraction, we might need access to ALL components to resolve parents,
-            # even if they were filtered out by tags originally. 
-            # But usually we want to abstract the filtered set?
-            # Actually, standard logic is: Use All Components for resolution.
-            all_flows, extra_components = abstractor.abstract_flows(
-                all_flows, all_components, view_config.abstraction_level
-            )
-            
-            # Add synthetic group components to the pool
-            all_components.extend(extra_components)
-            
-            # We also need to re-filter relations? 
-            # Or assume flow steps dictate relations?
-            # The abstraction logic returns NEW flows with steps between PARENTS.
-            # We need to make sure we render those parents.
-            # and potentially the parents of parents?
-            # Abstractor.abstract_flows returns `extra_components` which are the synthetic parents.
-            # But the flow might also involve "Leaf nodes" that didn't need abstraction 
-            # (e.g. they were already at the right level).
-            # So we should gather all components referenced in `all_flows` (the abstracted flows).
-            
-            abstracted_ids = set()
-            for f in all_flows:
-                for s in f.steps:
-                    abstracted_ids.add(s.source_id)
-                    abstracted_ids.add(s.target_id)
-            
-            # Re-select components from all_components
-            filtered_components = [c for c in all_components if c.id in abstracted_ids]
-            
-            # CRITICAL: The abstractor generated new flows with suffixes.
-            # We need to update the requested flow_id to match the abstracted version.
-            if view_config.flow_id:
-                view_config.flow_id = f"{view_config.flow_id}_{view_config.abstraction_level}"
+    def _pick_abstraction_level(
+        self,
+        view_config: ViewConfig,
+        hierarchy: ComponentHierarchy,
+        components: list[Component],
+        relationships: list[Relationship],
+        flows: list[AnyFlow],
+    ) -> str:
+        """Finest level whose estimated rolled-up size fits the view's budget; coarsest otherwise."""
+        flow = next((f for f in flows if f.id == view_config.flow_id), None) if view_config.flow_id else None
 
-        # 4. Render
-        return self._diagram_port.render(view_config, filtered_components, filtered_relationships, all_flows)
+        edges: list[tuple[str, str]]
+        if flow:
+            edges = [(step.source_id, step.target_id) for step in flow.steps]
+            node_ids = [end for edge in edges for end in edge]
+        else:
+            edges = [(r.source_id, r.target_id) for r in relationships]
+            node_ids = [c.id for c in components]
 
-    def _filter_components(self, components: list[Component], config: ViewConfig) -> list[Component]:
-        if not config.filters or not config.filters.tags:
+        for level in ABSTRACTION_LEVELS:
+            nodes, edge_count = hierarchy.estimate_size(node_ids, edges, level, ordered=flow is not None)
+            fits_nodes = not view_config.max_nodes or nodes <= view_config.max_nodes
+            fits_edges = not view_config.max_edges or edge_count <= view_config.max_edges
+            if fits_nodes and fits_edges:
+                return level
+        return ABSTRACTION_LEVELS[-1]
+
+    def _filter_components(self, components: list[Component], config: ViewConfig, graph: GraphIndex) -> list[Component]:
+        """Components matching every filter the view sets: any of its tags, types and groups."""
+        filters = config.filters
+        if not filters:
             return components
         
-        required_tags = set(config.filters.tags)
-        return [
-            c for c in components
-            if c.tags and set(c.tags).intersection(required_tags)
-        ]
+        selected = graph.with_tags(filters.tags) if filters.tags else components
+        if filters.types:
+            types = set(filters.types)
+            selected = [c for c in selected if c.type.value in types]
+        if filters.groups:
+            groups = [group_path(g) for g in filters.groups]
+            selected = [
+                c for c in selected if any(in_group(group_path(c.metadata.get("group")), g) for g in groups)
+            ]
+        return selected
+
+    def _load_view(self, view_key: str) -> tuple[ViewConfig, list[AnyFlow]]:
+        """The view and the flows it may render: only its own flow when the port looks it up by key."""
+        port = self._metadata_port
+        if not can_look_up(port):
+            return self._find_view(port.load_view_configs(), view_key), port.load_flows()
+
+        view_config = port.load_view_config(view_key)
+        if not view_config:
+            raise ValueError(f"View configuration with key '{view_key}' not found.")
+        flow = port.load_flow(view_config.flow_id) if view_config.flow_id else None
+        return view_config, [flow] if flow else []
+
+    @staticmethod
+    def _find_view(view_configs: list[ViewConfig], view_key: str) -> ViewConfig:
+        view_config = next((vc for vc in view_configs if vc.key == view_key), None)
+        if not view_config:
+            raise ValueError(f"View configuration with key '{view_key}' not found.")
+        return view_config
+
+    @staticmethod
+    def _rolls_up(view_config: ViewConfig) -> bool:
+        """Whether the view may be abstracted, which resolves parents against every component."""
+        level = view_config.abstraction_level
+        return bool((level and level != "component") or view_config.max_nodes or view_config.max_edges)
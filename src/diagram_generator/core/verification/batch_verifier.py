@@ -0,0 +1,175 @@
+import hashlib
+import json
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from diagram_generator.core.domain.compact_flow import AnyFlow
+from diagram_generator.core.domain.component import Component
+from diagram_generator.core.domain.relationship import Relationship
+from diagram_generator.core.domain.view_config import ViewConfig
+from diagram_generator.core.services.diagram_splitter import DiagramSplitter
+from diagram_generator.core.use_cases.generate_diagram import GenerateDiagramUseCase
+from diagram_generator.core.verification.diagram_parser import DiagramGraph
+from diagram_generator.core.verification.expected_graph import expected_graph
+from diagram_generator.core.verification.mermaid_verifier import MermaidVerifier
+
+logger = logging.getLogger(__name__)
+
+# Report statuses; every status but "passed" fails the run
+STATUSES = ("passed", "failed", "missing_flow", "missing_file")
+
+# The default cache file, in the diagrams' directory
+CACHE_FILE = ".verify-cache.json"
+# Bumped whenever verification changes, so older results are not reused
+CACHE_VERSION = 1
+
+# (diagram content, expected graph) of a view to verify
+ViewTask = tuple[str, DiagramGraph]
+
+
+class BatchVerifier:
+    """
+    Verifies the generated diagram (`<dist_dir>/<view key>.mmd`) of every view of a model
+    against the graph its template draws from the view's filtered model, the model being
+    loaded once. Results are cached by view, keyed by a digest of the diagram and of the
+    expected graph, so a rerun only verifies the views whose diagram or model changed.
+    With more than one worker, those views are verified across a pool of worker processes.
+
+    With `max_edges`, views are split as `generate-all --max-edges` splits them: a split
+    view's diagram is its index page, checked against the index, and each of its pages
+    (`<view key>-page-N.mmd`) is checked against that page, in a row of its own.
+    """
+
+    def __init__(
+        self,
+        use_case: GenerateDiagramUseCase,
+        dist_dir: str | Path,
+        cache: str | Path | None = None,
+        max_edges: int | None = None,
+    ):
+        self.use_case = use_case
+        self.dist_dir = Path(dist_dir)
+        self.cache_path = Path(cache) if cache else None
+        self.splitter = DiagramSplitter(max_edges) if max_edges else None
+
+    def run(self, workers: int = 1) -> dict[str, Any]:
+        """
+        The report: whether every view passed, counts by status, and one row per view in view order,
+        each followed by the rows of its pages when it is split.
+        """
+        components, relationships, views, flows = self.use_case.load_model()
+        flow_ids = {flow.id for flow in flows}
+        cached = self._load_cache()
+        entries: dict[str, dict[str, Any]] = {}
+        rows: list[dict[str, Any]] = []
+        tasks: list[ViewTask] = []
+        checked: list[dict[str, Any]] = [] # The row of each task
+        for view in views:
+            row = _row(view.key, view, self.dist_dir)
+            rows.append(row)
+            if view.flow_id and view.flow_id not in flow_ids:
+                row["status"] = "missing_flow"
+                row["errors"] = [f"Flow '{view.flow_id}' not found."]
+                continue
+            try:
+                diagrams = self._expected(view, components, relationships, flows)
+            except Exception as e:
+                row["status"], row["errors"] = "failed", [f"Could not prepare the view: {e}"]
+                continue
+
+            for key, expected in diagrams:
+                if key != view.key:
+                    row = _row(key, view, self.dist_dir)
+                    rows.append(row)
+                try:
+                    content = Path(row["file"]).read_text()
+                except FileNotFoundError:
+                    row["status"] = "missing_file"
+                    row["errors"] = [f"Generated file {row['file']} does not exist. Run generate-all first."]
+                    continue
+
+                digest = hashlib.sha256(f"{content}\0{expected.fingerprint()}".encode()).hexdigest()
+                entry = entries[key] = {"digest": digest, "errors": []}
+                previous = cached.get(key)
+                if previous and previous.get("digest") == digest:
+                    entry["errors"] = row["errors"] = previous["errors"]
+                    row["status"], row["cached"] = ("failed" if row["errors"] else "passed"), True
+                else:
+                    tasks.append((content, expected))
+                    checked.append(row)
+
+        if workers > 1 and len(tasks) > 1:
+            chunksize = max(1, len(tasks) // (workers * 4))
+            with ProcessPoolExecutor(workers) as pool:
+                results = list(pool.map(_verify_view, tasks, chunksize=chunksize))
+        else:
+            results = [_verify_view(task) for task in tasks]
+
+        for row, errors in zip(checked, results, strict=True):
+            row["status"], row["errors"] = ("failed" if errors else "passed"), errors
+            entries[row["view"]]["errors"] = errors
+        self._save_cache(entries)
+
+        summary = {status: 0 for status in STATUSES}
+        for row in rows:
+            summary[row["status"]] += 1
+        return {
+            "passed": all(row["status"] == "passed" for row in rows),
+            "summary": summary,
+            "views": rows,
+        }
+
+    def _expected(
+        self,
+        view: ViewConfig,
+        components: list[Component],
+        relationships: list[Relationship],
+        flows: list[AnyFlow],
+    ) -> list[tuple[str, DiagramGraph]]:
+        """(diagram key, expected graph) of the view's diagram, then of its pages when it is split."""
+        view_config, view_components, view_relationships, view_flows = self.use_case.view_graph(
+            view, components, relationships, flows
+        )
+        if not self.splitter or not self.splitter.can_split(view_config, view_relationships):
+            return [(view.key, expected_graph(view_config, view_components, view_relationships, view_flows))]
+        pages, index = self.splitter.split(view_config, view_components, view_relationships)
+        return [(view.key, expected_graph(index.view_config, index.components, index.relationships))] + [
+            (page.view_config.key, expected_graph(page.view_config, page.components, page.relationships, view_flows))
+            for page in pages
+        ]
+
+    def _load_cache(self) -> dict[str, dict[str, Any]]:
+        if not self.cache_path or not self.cache_path.exists():
+            return {}
+        try:
+            data = json.loads(self.cache_path.read_text())
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable verification cache {self.cache_path}: {e}")
+            return {}
+        if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+            return {}
+        views = data.get("views")
+        return views if isinstance(views, dict) else {}
+
+    def _save_cache(self, entries: dict[str, dict[str, Any]]) -> None:
+        if not self.cache_path:
+            return
+        try:
+            self.cache_path.write_text(json.dumps({"version": CACHE_VERSION, "views": entries}))
+        except OSError as e:
+            logger.warning(f"Could not write the verification cache {self.cache_path}: {e}")
+
+
+def _row(key: str, view: ViewConfig, dist_dir: Path) -> dict[str, Any]:
+    """A diagram's report row, passed until checked."""
+    return {
+        "view": key, "type": view.type.value, "flow": view.flow_id, "file": str(dist_dir / f"{key}.mmd"),
+        "status": "passed", "errors": [], "cached": False,
+    }
+
+
+def _verify_view(task: ViewTask) -> list[str]:
+    content, expected = task
+    return MermaidVerifier().verify_graph(expected, content).errors
@@ -0,0 +1,230 @@
+import hashlib
+import re
+from collections.abc import Iterable, Iterator
+
+# (source, target, label, dashed)
+Edge = tuple[str, str, str, bool]
+
+# Diagram kinds by the first keyword of a Mermaid diagram
+HEADERS = {
+    "sequenceDiagram": "sequence",
+    "graph": "flowchart",
+    "flowchart": "flowchart",
+    "C4Context": "c4",
+    "C4Container": "c4",
+    "C4Component": "c4",
+    "C4Dynamic": "c4",
+    "C4Deployment": "c4",
+}
+
+# Sequence statements that declare neither a participant nor a message
+_SEQUENCE_KEYWORDS = {
+    "title", "autonumber", "box", "end", "note", "loop", "alt", "else", "opt", "par", "and", "rect",
+    "activate", "deactivate", "critical", "break", "link", "links", "create", "destroy", "accTitle", "accDescr",
+}
+_FLOWCHART_KEYWORDS = {"subgraph", "end", "direction", "style", "classDef", "class", "click", "linkStyle"}
+_C4_ELEMENTS = {
+    f"{base}{suffix}"
+    for base in ("Person", "System", "SystemDb", "SystemQueue", "Container", "ContainerDb", "ContainerQueue",
+                 "Component", "ComponentDb", "ComponentQueue")
+    for suffix in ("", "_Ext")
+}
+_C4_RELATIONS = {"Rel", "BiRel", "RelIndex", "Rel_Back", *(f"Rel_{d}" for d in ("U", "D", "L", "R")),
+                 *(f"Rel_{d}" for d in ("Up", "Down", "Left", "Right"))}
+
+# A sequence arrow: -> --> ->> -->>
+_SEQUENCE_ARROW = re.compile(r"(-{1,2})(>>|>)")
+# A flowchart link, with an optional |label|: --> --- -.-> -.- ==>
+_LINK = re.compile(r"\s*(-\.+->|-\.+-|-{2,}>|={2,}>|-{3,})\s*(?:\|([^|]*)\|)?\s*")
+# A node id; a hyphen belongs to it unless it starts a link (-- or -.)
+_NODE_ID = re.compile(r"[^\s\[({>|=.-]+(?:-(?![-.])[^\s\[({>|=.-]*)*")
+_NODE_SHAPE = re.compile(r"[\[({>]")
+_NODE_CLASS = re.compile(r":::[\w-]+")
+_SHAPE_CLOSERS = {"[": "]", "(": ")", "{": "}"}
+_TEXT_DELIMITER = re.compile(r'["|]')
+
+
+class DiagramGraph:
+    """
+    The nodes (declared participants, flowchart nodes and C4 elements) and edges (messages,
+    links and relations, in diagram order) of a Mermaid diagram, or of the model it should show.
+    """
+
+    def __init__(self, kind: str, nodes: Iterable[str] = (), edges: Iterable[Edge] = ()):
+        self.kind = kind
+        self.nodes = set(nodes)
+        self.edges = list(edges)
+
+    def fingerprint(self) -> str:
+        """A digest of the graph, stable across processes; nodes are summed so their order doesn't count."""
+        nodes = sum(
+            int.from_bytes(hashlib.blake2b(node.encode(), digest_size=16).digest(), "big") for node in self.nodes
+        )
+        digest = hashlib.sha256(f"{self.kind}\0{nodes:x}".encode())
+        for source, target, label, dashed in self.edges:
+            digest.update(f"\0{source}\0{target}\0{label}\0{int(dashed)}".encode())
+        return digest.hexdigest()
+
+
+def parse_diagram(content: str) -> DiagramGraph:
+    """
+    Tokenises a Mermaid sequence, flowchart or C4 diagram in one pass over its lines,
+    skipping front matter, init directives and comments. Raises ValueError for other
+    diagram types.
+    """
+    graph: DiagramGraph | None = None
+    lines = iter(content.splitlines())
+    for raw in lines:
+        line = raw.strip()
+        if not line or (line.startswith("%%") and not line.startswith("%%{")):
+            continue
+        if line.startswith("%%{"):
+            # An init directive, up to its closing }%%
+            while "}%%" not in line:
+                line = next(lines, "}%%")
+            continue
+        if graph is None:
+            if line == "---":
+                # Front matter, up to its closing ---
+                while next(lines, "---").strip() != "---":
+                    pass
+                continue
+            keyword = line.split()[0]
+            if keyword not in HEADERS:
+                raise ValueError(f"Unknown diagram type '{keyword}'")
+            graph = DiagramGraph(HEADERS[keyword])
+        elif graph.kind == "sequence":
+            _sequence_line(line, graph)
+        elif graph.kind == "flowchart":
+            _flowchart_line(_statement(raw, lines, True), graph)
+        else:
+            _c4_line(_statement(raw, lines, False), graph)
+    if graph is None:
+        raise ValueError("Empty diagram")
+    return graph
+
+
+def _sequence_message(line: str) -> tuple[str, str, str, str] | None:
+    """
+    (source, arrow, target, text) of a sequence message line ("a-->>b: text"), or None.
+    Ids may hold hyphens: the arrow is the first run of one or two dashes and a head.
+    """
+    colon = line.find(":")
+    if colon < 0:
+        return None
+    match = _SEQUENCE_ARROW.search(line, 0, colon)
+    if match is None:
+        return None
+    source = line[:match.start()].strip()
+    target = line[match.end():colon].strip().lstrip("+-")
+    text = line[colon + 1:].strip()
+    if not source or not target or " " in source or " " in target:
+        return None
+    return source, match.group(), target, text
+
+
+def _statement(raw: str, lines: Iterator[str], labels: bool) -> str:
+    """The statement starting on `raw`: quoted text and |labels| may hold newlines, so it may go on for more lines."""
+    state = _open_text(raw, labels)
+    while state and (more := next(lines, None)) is not None:
+        raw = f"{raw}\n{more}"
+        state = _open_text(more, labels, state)
+    return raw.strip()
+
+
+def _open_text(text: str, labels: bool, state: str = "") -> str:
+    """
+    The text left open at the end of `text` ('"' inside quotes, '|' inside a |label|, "" when
+    none), scanning from `state`, the text left open before it.
+    """
+    if not labels or "|" not in text:
+        # Only quotes count: their parity tells
+        return state if text.count('"') % 2 == 0 else ("" if state else '"')
+    for match in _TEXT_DELIMITER.finditer(text):
+        char = match.group()
+        if char == '"' and state != "|":
+            state = "" if state else '"'
+        elif char == "|" and state != '"':
+            state = "" if state else "|"
+    return state
+
+
+def _sequence_line(line: str, graph: DiagramGraph) -> None:
+    keyword = line.split(None, 1)[0]
+    if keyword in ("participant", "actor"):
+        parts = line.split()
+        if len(parts) > 1:
+            graph.nodes.add(parts[1])
+    elif keyword.lower() not in _SEQUENCE_KEYWORDS and keyword not in _SEQUENCE_KEYWORDS:
+        message = _sequence_message(line)
+        if message:
+            source, arrow, target, text = message
+            graph.edges.append((source, target, text, arrow.startswith("--")))
+
+
+def _flowchart_line(line: str, graph: DiagramGraph) -> None:
+    match = _NODE_ID.match(line)
+    if match is None:
+        return
+    node, end = match.group(), match.end()
+    if node in _FLOWCHART_KEYWORDS:
+        return
+    link = _LINK.match(line, _node_end(line, end))
+    if link is None:
+        if _NODE_SHAPE.match(line, end):
+            graph.nodes.add(node)
+        return
+    # A chain (a --> b --> c) is one edge per link
+    while link:
+        target = _NODE_ID.match(line, link.end())
+        if target is None:
+            return
+        graph.edges.append((node, target.group(), (link.group(2) or "").strip(), "." in link.group(1)))
+        node = target.group()
+        link = _LINK.match(line, _node_end(line, target.end()))
+
+
+def _node_end(line: str, end: int) -> int:
+    """The end of the shape (`[text]`, `((text))`, `>text]`...) and `:::class` after the node id ending at `end`."""
+    closers = ["]"] if line.startswith(">", end) else []
+    position = end + len(closers)
+    while position < len(line) and (closers or _NODE_SHAPE.match(line, position)):
+        char = line[position]
+        if char == '"':
+            quote = line.find('"', position + 1)
+            position = len(line) if quote < 0 else quote
+        elif char in _SHAPE_CLOSERS:
+            closers.append(_SHAPE_CLOSERS[char])
+        elif closers and char == closers[-1]:
+            closers.pop()
+            if not closers:
+                position += 1
+                break
+        position += 1
+    node_class = _NODE_CLASS.match(line, position)
+    return node_class.end() if node_class else position
+
+
+def _c4_line(line: str, graph: DiagramGraph) -> None:
+    opening = line.find("(")
+    closing = line.rfind(")")
+    if opening < 0 or closing < opening:
+        return
+    name = line[:opening].strip()
+    args = line[opening + 1:closing]
+    if name in _C4_ELEMENTS:
+        graph.nodes.add(args.split(",", 1)[0].strip().strip('"'))
+        return
+    if name not in _C4_RELATIONS:
+        return
+    # Ids first, then the quoted label (commas inside quotes do not separate)
+    source, target, *rest = [*args.split(",", 2), ""]
+    if not rest:
+        return
+    label = rest[0].strip()
+    if label.startswith('"'):
+        end = label.find('"', 1)
+        label = label[1:end] if end > 0 else label[1:]
+    else:
+        label = label.split(",", 1)[0]
+    graph.edges.append((source.strip().strip('"'), target.strip().strip('"'), label.strip(), False))
@@ -0,0 +1,60 @@
+from diagram_generator.core.domain.compact_flow import AnyFlow
+from diagram_generator.core.domain.component import Component
+from diagram_generator.core.domain.relationship import Relationship
+from diagram_generator.core.domain.view_config import Type as ViewType
+from diagram_generator.core.domain.view_config import ViewConfig
+from diagram_generator.core.verification.diagram_parser import DiagramGraph, Edge
+
+# The diagram kind each view type's template emits
+VIEW_KINDS = {
+    ViewType.sequence: "sequence",
+    ViewType.flowchart: "flowchart",
+    ViewType.flowchart_swimlane: "flowchart",
+    ViewType.c4_context: "c4",
+    ViewType.c4_container: "c4",
+}
+
+# Component types c4_container draws; it leaves out the others
+_C4_CONTAINER_TYPES = {"container", "service", "web_ui", "database", "person", "system", "external_system"}
+
+
+def expected_graph(
+    view_config: ViewConfig,
+    components: list[Component],
+    relationships: list[Relationship],
+    flows: list[AnyFlow] | None = None,
+) -> DiagramGraph:
+    """
+    The graph the view's template draws for this (filtered, abstracted) model: the nodes
+    it declares, and the edges it draws with their labels, in template order.
+    """
+    kind = VIEW_KINDS[view_config.type]
+    flow = next((f for f in flows if f.id == view_config.flow_id), None) if view_config.flow_id and flows else None
+    nodes = [c.id for c in components]
+    edges: list[Edge] = []
+
+    if view_config.type == ViewType.c4_container:
+        nodes = [c.id for c in components if c.type.value in _C4_CONTAINER_TYPES]
+    if kind == "c4" or view_config.type == ViewType.flowchart:
+        edges = [(r.source_id, r.target_id, r.description.strip(), False) for r in relationships]
+    elif view_config.type == ViewType.sequence and flow:
+        edges = [
+            (s.source_id, s.target_id, s.description.replace("\n", "<br/>").strip(), s.is_dashed)
+            for s in flow.steps if (s.metadata or {}).get("type") != "note"
+        ]
+    elif view_config.type == ViewType.sequence:
+        edges = [(r.source_id, r.target_id, r.description.strip(), False) for r in relationships]
+    elif flow:
+        for step in flow.steps:
+            metadata = step.metadata or {}
+            if metadata.get("type") != "note":
+                edges.append((step.source_id, step.target_id, step.description.strip(), step.is_dashed))
+                continue
+            # Notes are nodes, linked to their position unless anchored nowhere
+            nodes.append(step.source_id)
+            if step.source_id != "NOTE_ANCHOR":
+                position = str(metadata["position"]) if "position" in metadata else ""
+                edges.append((step.source_id, position, "", True))
+    else:
+        edges = [(r.source_id, r.target_id, "", False) for r in relationships]
+    return DiagramGraph(kind, nodes, edges)
@@ -1,7 +1,6 @@
+from collections import Counter
 
-import re
-
-from diagram_generator.core.domain.flow import Flow
+from diagram_generator.core.verification.diagram_parser import DiagramGraph, Edge, parse_diagram
 
 
 class VerificationResult:
@@ -9,74 +8,43 @@ class VerificationResult:
         self.success = success
         self.errors = errors
 
-class MermaidVerifier:
-    def __init__(self) -> None:
-        # Regex to capture Source, Arrow, Target, Description
-        # Supports ->>, -->>, ->, -->
-        self.flow_regex = re.compile(r"^\s*([a-zA-Z0-9_-]+)\s*(-{1,2}(?:>>|>))\s*([a-zA-Z0-9_-]+)\s*:\s*(.+)$")
 
-    def parse_mermaid(self, content: str) -> list[dict[str, str]]:
+class MermaidVerifier:
+    def verify_graph(self, expected: DiagramGraph, mmd_content: str) -> VerificationResult:
         """
-        Parses Mermaid sequence diagram content into a list of steps.
+        Verifies a diagram of any type the templates emit against the graph it should draw
+        (see `expected_graph`): the same kind of diagram, the same set of nodes, the same
+        edges counted as a multiset, and, when those match, the edges in the same order.
+        Every comparison is a set or counter lookup, so the cost is linear in the diagram.
         """
-        steps = []
-        for line in content.splitlines():
-            match = self.flow_regex.match(line)
-            if match:
-                src, arrow, tgt, desc = match.groups()
-                steps.append({
-                    "source": src,
-                    "target": tgt,
-                    "arrow": arrow,
-                    "description": desc.strip()
-                })
-        return steps
+        try:
+            parsed = parse_diagram(mmd_content)
+        except ValueError as e:
+            return VerificationResult(False, [str(e)])
+        if parsed.kind != expected.kind:
+            return VerificationResult(False, [f"Expected a {expected.kind} diagram, found a {parsed.kind} diagram"])
 
-    def verify_flow(self, flow: Flow, mmd_content: str) -> VerificationResult:
-        """
-        Verifies that all steps in the Flow model are present in the mermaid content
-        in the correct order.
-        """
-        parsed_steps = self.parse_mermaid(mmd_content)
-        errors = []
-        
-        # We need to find the flow steps within the parsed steps.
-        # Since the diagram might contain other things (autonumber, title), parsing filters those out.
-        # But if the view contains extraneous relationships, we just want to ensure our flow exists.
-        
-        # Strategy: Iterate through flow.steps and ensure they appear in parsed_steps sequences.
-        
-        parsed_idx = 0
-        for step_idx, flow_step in enumerate(flow.steps):
-            found = False
-            # Search forward from current position
-            while parsed_idx < len(parsed_steps):
-                p_step = parsed_steps[parsed_idx]
-                
-                # Check match
-                # 1. Source/Target match identifiers
-                src_match = p_step["source"] == flow_step.source_id
-                tgt_match = p_step["target"] == flow_step.target_id
-                
-                # 2. Description match (fuzzy or exact?)
-                # We sanitized newlines to spaces, so we should compare similarly.
-                expected_desc = flow_step.description.replace("\n", " ").strip()
-                # Also mermaid descriptions might have <br/> or \n literal.
-                # The parsed description captured from MMD text should essentially match.
-                
-                # Let's try exact match first
-                desc_match = expected_desc in p_step["description"] # Partial match allows for [metadata] parts
-                
-                if src_match and tgt_match and desc_match:
-                    found = True
-                    parsed_idx += 1 # Advance
-                    break
-                
-                parsed_idx += 1
-            
-            if not found:
-                errors.append(
-                    f"Step {step_idx + 1}: {flow_step.source_id} -> {flow_step.target_id} : {flow_step.description}"
-                )
-        
+        errors = [f"Missing node {node}" for node in sorted(expected.nodes - parsed.nodes)]
+        errors += [f"Unexpected node {node}" for node in sorted(parsed.nodes - expected.nodes)]
+        missing = Counter(expected.edges)
+        missing.subtract(parsed.edges)
+        for edge in expected.edges:
+            if missing[edge] > 0:
+                missing[edge] -= 1
+                errors.append(f"Missing edge {_edge_label(edge)}")
+        for edge in parsed.edges:
+            if missing[edge] < 0:
+                missing[edge] += 1
+                errors.append(f"Unexpected edge {_edge_label(edge)}")
+        if not errors and parsed.edges != expected.edges:
+            # Same edges, another order: report the first one out of place
+            index, (want, found) = next(
+                (i, pair) for i, pair in enumerate(zip(expected.edges, parsed.edges, strict=True)) if pair[0] != pair[1]
+            )
+            errors.append(f"Edge {index + 1} out of order: expected {_edge_label(want)}, found {_edge_label(found)}")
         return VerificationResult(len(errors) == 0, errors)
+
+
+def _edge_label(edge: Edge) -> str:
+    source, target, label, dashed = edge
+    return f"{source} {'-->' if dashed else '->'} {target} : {label}"
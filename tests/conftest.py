@@ -0,0 +1,22 @@
+import pytest
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("perf")
+    group.addoption("--run-perf", action="store_true", help="Run the performance budget tests (marked 'perf').")
+    group.addoption(
+        "--update-perf-budget", action="store_true", help="Rewrite tests/perf_budget.json from this run's timings."
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line("markers", "perf: performance budget test, only run with --run-perf")
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    if config.getoption("--run-perf") or config.getoption("--update-perf-budget"):
+        return
+    skip = pytest.mark.skip(reason="performance budget test, run with --run-perf")
+    for item in items:
+        if "perf" in item.keywords:
+            item.add_marker(skip)
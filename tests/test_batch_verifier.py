@@ -0,0 +1,142 @@
+import json
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+from typer.testing import CliRunner
+
+from diagram_generator.adapters.output.mermaid_renderer import MermaidDiagramAdapter
+from diagram_generator.cli.main import app
+from diagram_generator.core.domain.component import Component, ComponentType, Service
+from diagram_generator.core.domain.flow import Flow, FlowStep
+from diagram_generator.core.domain.relationship import Relationship
+from diagram_generator.core.domain.view_config import Type as ViewType
+from diagram_generator.core.domain.view_config import ViewConfig
+from diagram_generator.core.use_cases.generate_diagram import GenerateDiagramUseCase
+from diagram_generator.core.verification.batch_verifier import CACHE_FILE, BatchVerifier
+
+runner = CliRunner()
+
+COMPONENTS: list[Component] = [
+    Service(id=i, name=i.upper(), type=ComponentType.service) for i in ("web", "api", "ledger")
+]
+PAY = Flow(id="pay", description="Pay", steps=[
+    FlowStep(source_id="web", target_id="api", description="POST /pay"),
+    FlowStep(source_id="api", target_id="ledger", description="Book"),
+    FlowStep(source_id="api", target_id="web", description="Done"),
+])
+REFUND = Flow(id="refund", description="Refund", steps=[
+    FlowStep(source_id="web", target_id="api", description="POST /refund"),
+])
+RELATIONSHIPS = [Relationship(source_id="web", target_id="api", description="Calls", protocol="HTTPS")]
+VIEWS = [
+    ViewConfig(key="pay", title="Pay", type=ViewType.sequence, flow_id="pay"),
+    ViewConfig(key="pay-again", title="Pay", type=ViewType.sequence, flow_id="pay"),
+    ViewConfig(key="refund", title="Refund", type=ViewType.sequence, flow_id="refund"),
+    ViewConfig(key="missing", title="Missing", type=ViewType.sequence, flow_id="pay"),
+    ViewConfig(key="orphan", title="Orphan", type=ViewType.sequence, flow_id="nope"),
+    ViewConfig(key="context", title="Context", type=ViewType.c4_context),
+    ViewConfig(key="lanes", title="Lanes", type=ViewType.flowchart_swimlane, flow_id="pay"),
+]
+RENDERED = ("pay", "pay-again", "refund", "context", "lanes")
+
+
+def use_case(relationships: list[Relationship] = RELATIONSHIPS) -> GenerateDiagramUseCase:
+    metadata = MagicMock()
+    metadata.load_components.side_effect = lambda: list(COMPONENTS)
+    metadata.load_relationships.side_effect = lambda: list(relationships)
+    metadata.load_view_configs.return_value = VIEWS
+    metadata.load_flows.return_value = [PAY, REFUND]
+    return GenerateDiagramUseCase(metadata, MermaidDiagramAdapter("templates"))
+
+
+def render(dist: Path) -> None:
+    renderer = MermaidDiagramAdapter("templates")
+    for view in VIEWS:
+        if view.key in RENDERED:
+            (dist / f"{view.key}.mmd").write_text(renderer.render(view, COMPONENTS, RELATIONSHIPS, [PAY, REFUND]))
+    # The refund diagram lost its only step
+    (dist / "refund.mmd").write_text((dist / "refund.mmd").read_text().replace("POST /refund", "POST /pay"))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_report_covers_every_view(tmp_path: Any, workers: int) -> None:
+    render(tmp_path)
+
+    report = BatchVerifier(use_case(), tmp_path).run(workers)
+
+    assert not report["passed"]
+    assert [(row["view"], row["status"]) for row in report["views"]] == [
+        ("pay", "passed"), ("pay-again", "passed"), ("refund", "failed"), ("missing", "missing_file"),
+        ("orphan", "missing_flow"), ("context", "passed"), ("lanes", "passed"),
+    ]
+    assert report["views"][2]["errors"] == [
+        "Missing edge web -> api : POST /refund", "Unexpected edge web -> api : POST /pay",
+    ]
+    assert report["summary"] == {"passed": 4, "failed": 1, "missing_flow": 1, "missing_file": 1}
+
+
+def test_only_changed_views_are_verified_again(tmp_path: Any) -> None:
+    render(tmp_path)
+    cache = tmp_path / CACHE_FILE
+    BatchVerifier(use_case(), tmp_path, cache).run()
+
+    report = BatchVerifier(use_case(), tmp_path, cache).run()
+    assert all(row["cached"] for row in report["views"] if row["view"] in RENDERED)
+    assert report["views"][2]["errors"] == [
+        "Missing edge web -> api : POST /refund", "Unexpected edge web -> api : POST /pay",
+    ]
+
+    # A fixed diagram, and a model change only the context view draws
+    (tmp_path / "refund.mmd").write_text((tmp_path / "refund.mmd").read_text().replace("POST /pay", "POST /refund"))
+    moved = [Relationship(source_id="api", target_id="ledger", description="Books", protocol=None)]
+    report = BatchVerifier(use_case(moved), tmp_path, cache).run()
+
+    assert [(row["view"], row["status"], row["cached"]) for row in report["views"] if row["view"] in RENDERED] == [
+        ("pay", "passed", True), ("pay-again", "passed", True), ("refund", "passed", False),
+        ("context", "failed", False), ("lanes", "passed", True),
+    ]
+
+
+def test_split_views_are_verified_page_by_page(tmp_path: Any) -> None:
+    books = Relationship(source_id="api", target_id="ledger", description="Books", protocol=None)
+    relationships = [*RELATIONSHIPS, books]
+    generator = use_case(relationships)
+    for view in VIEWS:
+        if view.key in RENDERED:
+            for key, content in generator.execute_pages(view.key, 1).items():
+                (tmp_path / f"{key}.mmd").write_text(content)
+
+    assert not BatchVerifier(use_case(relationships), tmp_path).run()["passed"]
+    report = BatchVerifier(use_case(relationships), tmp_path, max_edges=1).run()
+    pages = ["context", "context-page-1", "context-page-2", "context-page-3"]
+    assert [(row["view"], row["status"]) for row in report["views"] if row["view"].startswith("context")] == [
+        (key, "passed") for key in pages
+    ]
+
+    # The api -> ledger edge is drawn on the pages of both its ends
+    page = tmp_path / "context-page-3.mmd"
+    page.write_text(page.read_text().replace("Books", "Reads"))
+    (tmp_path / "context-page-1.mmd").unlink()
+    report = BatchVerifier(use_case(relationships), tmp_path, max_edges=1).run()
+    statuses = [row["status"] for row in report["views"] if row["view"] in pages]
+    assert statuses == ["passed", "missing_file", "passed", "failed"]
+
+
+def test_verify_all_writes_a_json_report(tmp_path: Any) -> None:
+    dist = tmp_path / "dist"
+    result = runner.invoke(app, ["generate-all", "--data-dir", "examples/complex_bank", "--output-dir", str(dist)])
+    assert result.exit_code == 0
+
+    report_path = tmp_path / "report.json"
+    result = runner.invoke(app, [
+        "verify", "all", "--data-dir", "examples/complex_bank", "--dist-dir", str(dist),
+        "--report", str(report_path), "--workers", "2",
+    ])
+
+    report = json.loads(report_path.read_text())
+    assert result.exit_code == 0
+    assert report["passed"]
+    assert {row["view"] for row in report["views"]} == {p.stem for p in dist.glob("*.mmd")}
+    assert sum(report["summary"].values()) == len(report["views"])
@@ -0,0 +1,91 @@
+import json
+from pathlib import Path
+from typing import Any
+
+from typer.testing import CliRunner
+
+from diagram_generator.benchmarks.runner import STAGES, BenchmarkRunner, compare_results
+from diagram_generator.benchmarks.scaled import ScaledRepoGenerator
+from diagram_generator.benchmarks.synthetic import PRESETS, SyntheticRepoGenerator
+from diagram_generator.cli.main import app
+
+
+def test_synthetic_repo_runs_every_stage(tmp_path: Any) -> None:
+    spec = PRESETS["tiny"]
+    SyntheticRepoGenerator(spec).generate(tmp_path / "data")
+
+    results = BenchmarkRunner(str(tmp_path / "data"), "templates", str(tmp_path / "dist")).run()
+
+    assert set(results["stages"]) == set(STAGES)
+    assert results["counts"]["components"] == spec.components
+    assert results["counts"]["views"] == spec.views
+    assert results["spec"] == spec.model_dump()
+    assert len(list((tmp_path / "dist").glob("*.mmd"))) == spec.views
+    json.dumps(results) # Must be serialisable
+
+
+def test_generator_is_deterministic(tmp_path: Any) -> None:
+    for run in ("a", "b"):
+        SyntheticRepoGenerator(PRESETS["tiny"]).generate(tmp_path / run)
+
+    files = sorted(p.relative_to(tmp_path / "a") for p in (tmp_path / "a").rglob("*") if p.is_file())
+    assert files
+    assert all((tmp_path / "a" / f).read_text() == (tmp_path / "b" / f).read_text() for f in files)
+
+
+def test_compare_flags_regressed_stages(tmp_path: Any) -> None:
+    baseline = {"stages": {"yaml_load": 1.0, "render": 2.0}, "total": 3.0}
+    current = {"stages": {"yaml_load": 1.05, "render": 3.0}, "total": 4.05}
+
+    rows = {row["stage"]: row for row in compare_results(baseline, current, tolerance=0.1)}
+
+    assert not rows["yaml_load"]["regressed"]
+    assert rows["render"]["regressed"]
+    assert rows["total"]["regressed"]
+
+    (tmp_path / "base.json").write_text(json.dumps(baseline))
+    (tmp_path / "current.json").write_text(json.dumps(current))
+    result = CliRunner().invoke(app, ["bench", "compare", str(tmp_path / "base.json"), str(tmp_path / "current.json")])
+    assert result.exit_code == 1
+
+
+def test_compare_uses_stage_tolerances_and_noise_floor() -> None:
+    baseline = {"stages": {"render": 1.0, "write": 0.01, "filter": 1.0}}
+    current = {"stages": {"render": 1.4, "write": 0.03, "filter": 1.4}}
+
+    rows = {
+        row["stage"]: row
+        for row in compare_results(baseline, current, tolerance=0.1, tolerances={"filter": 0.5}, min_delta=0.05)
+    }
+
+    assert rows["render"]["regressed"]
+    assert not rows["write"]["regressed"] # 3x slower, but within the noise floor
+    assert not rows["filter"]["regressed"] # Within its own tolerance
+    assert "total" not in rows
+
+
+def test_scaled_repo_renames_ids_per_replica(tmp_path: Any) -> None:
+    counts = ScaledRepoGenerator(Path("examples/complex_bank"), 3).generate(tmp_path / "data")
+
+    results = BenchmarkRunner(str(tmp_path / "data"), "templates", str(tmp_path / "dist")).run()
+
+    assert counts["views"] == 3 * 4
+    assert results["counts"]["views"] == counts["views"]
+    assert (tmp_path / "dist" / "transfer-sequence-r2.mmd").exists()
+    assert "dsl_user-r1 -> dsl_frontend-r1" in (tmp_path / "data" / "relationships" / "fast-r1.flow").read_text()
+
+
+def test_extractor_benchmark_covers_every_mapping() -> None:
+    result = CliRunner().invoke(app, ["bench", "extractors", "--items", "200"])
+
+    assert result.exit_code == 0, result.stdout
+    assert "Mapping extraction" in result.stdout
+    assert "no" not in result.stdout.split("Same Output")[1]
+
+
+def test_source_format_benchmark_agrees_across_formats() -> None:
+    result = CliRunner().invoke(app, ["bench", "sources", "--items", "100"])
+
+    assert result.exit_code == 0, result.stdout
+    for fmt in ("yaml", "json", "jsonl", "csv"):
+        assert fmt in result.stdout
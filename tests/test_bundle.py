@@ -0,0 +1,135 @@
+import contextlib
+import io
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+from pydantic import ValidationError
+from typer.testing import CliRunner
+
+from diagram_generator.adapters.input.bundle_loader import Bundle, BundleError, BundleMetadataAdapter, write_bundle
+from diagram_generator.adapters.input.yaml_loader import YAMLMetadataAdapter
+from diagram_generator.cli.main import app
+from diagram_generator.core.domain.compact_flow import CompactFlow
+from diagram_generator.core.domain.component import Service
+from diagram_generator.core.domain.flow import Flow, FlowStep
+from diagram_generator.core.domain.view_config import Type as ViewType
+from diagram_generator.core.domain.view_config import ViewConfig
+from diagram_generator.core.use_cases.generate_diagram import GenerateDiagramUseCase
+
+runner = CliRunner()
+
+
+def compile_example(tmp_path: Any) -> Path:
+    bundle = tmp_path / "model.dgb"
+    result = runner.invoke(app, ["compile", "--data-dir", "examples/complex_bank", "--output", str(bundle)])
+    assert result.exit_code == 0, result.stdout
+    return bundle # type: ignore[no-any-return]
+
+
+def test_bundle_round_trips_the_data_dir(tmp_path: Any) -> None:
+    adapter = YAMLMetadataAdapter("examples/complex_bank")
+    with contextlib.redirect_stdout(io.StringIO()):
+        components, relationships = adapter.load_components(), adapter.load_relationships()
+        flows, views = adapter.load_flows(), adapter.load_view_configs()
+
+    bundle = BundleMetadataAdapter(str(compile_example(tmp_path)), verify_every=1)
+
+    assert bundle.load_components()[:len(components)] == components
+    assert bundle.load_relationships() == relationships
+    assert bundle.load_flows() == flows
+    assert bundle.load_view_configs() == views
+    assert bundle.load_components() is bundle.load_components() # Decoded once per run
+
+
+def test_compile_applies_discovery(tmp_path: Any) -> None:
+    bundle = Bundle(compile_example(tmp_path))
+    ids = {c["id"] for c in bundle.records("components")}
+
+    for rel in bundle.records("relationships"):
+        assert {rel["source_id"], rel["target_id"]} <= ids
+
+
+def test_single_records_are_read_alone(tmp_path: Any) -> None:
+    adapter = BundleMetadataAdapter(str(compile_example(tmp_path)))
+    views = adapter.bundle.records("views")
+
+    assert adapter.bundle.record("views", len(views) - 1) == views[-1]
+    view = adapter.load_view_config(views[0]["key"])
+    assert view is not None and view.key == views[0]["key"]
+    assert adapter.load_view_config("no-such-view") is None
+    assert adapter.load_flow("no-such-flow") is None
+    assert "views" not in adapter._models # Nothing was decoded as a whole
+    with pytest.raises(IndexError):
+        adapter.bundle.record("views", len(views))
+
+
+def test_generate_from_bundle_matches_data_dir(tmp_path: Any) -> None:
+    bundle = compile_example(tmp_path)
+
+    for data_dir, name in (("examples/complex_bank", "yaml.mmd"), (str(bundle), "bundle.mmd")):
+        result = runner.invoke(app, [
+            "generate", "--view", "transfer-sequence", "--data-dir", data_dir,
+            "--template-dir", "templates", "--output", str(tmp_path / name),
+        ])
+        assert result.exit_code == 0, result.stdout
+
+    assert (tmp_path / "bundle.mmd").read_text() == (tmp_path / "yaml.mmd").read_text()
+
+
+def test_use_case_decodes_only_the_view_and_its_flow(tmp_path: Any) -> None:
+    adapter = BundleMetadataAdapter(str(compile_example(tmp_path)))
+
+    view, _, _, flows = GenerateDiagramUseCase(adapter, MagicMock()).prepare("transfer-sequence")
+
+    assert [flow.id for flow in flows] == [view.flow_id]
+    assert "views" not in adapter._models and "flows" not in adapter._models
+
+
+def test_lookups_pick_the_first_record_with_a_key(tmp_path: Any) -> None:
+    views = [
+        ViewConfig(key="dup", title="First", type=ViewType.flowchart),
+        ViewConfig(key="dup", title="Second", type=ViewType.flowchart),
+    ]
+    path = tmp_path / "views.dgb"
+    write_bundle(path, [], [], [], views)
+
+    assert BundleMetadataAdapter(str(path)).load_view_config("dup") == views[0]
+
+
+def test_large_flows_stay_compact(tmp_path: Any, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("diagram_generator.adapters.input.bundle_loader.COMPACT_FLOW_STEPS", 2)
+    steps = [
+        FlowStep(source_id="a", target_id="b", description="call", protocol="HTTP"),
+        FlowStep(source_id="b", target_id="a", description="reply", is_dashed=True, metadata={"note": "ok"}),
+    ]
+    small = Flow(id="small", description="Small", steps=steps[:1])
+    large = CompactFlow.from_flow(Flow(id="large", description="Large", steps=steps, tags=["t"]))
+    path = tmp_path / "flows.dgb"
+    write_bundle(path, [], [], [small, large], [])
+
+    adapter = BundleMetadataAdapter(str(path))
+
+    assert adapter.load_flows() == [small, large]
+    assert isinstance(adapter.load_flow("large"), CompactFlow)
+
+
+def test_only_current_schema_stamp_is_trusted(tmp_path: Any, monkeypatch: pytest.MonkeyPatch) -> None:
+    bad = [Service.model_construct(id="not valid!", name="Bad")]
+    current, stale = tmp_path / "current.dgb", tmp_path / "stale.dgb"
+    write_bundle(current, bad, [], [], [])
+    monkeypatch.setattr("diagram_generator.adapters.input.bundle_loader.schema_version", lambda: "stale")
+    write_bundle(stale, bad, [], [], [])
+
+    assert BundleMetadataAdapter(str(current)).load_components()[0].id == "not valid!"
+    with pytest.raises(ValidationError):
+        BundleMetadataAdapter(str(stale)).load_components()
+
+
+def test_rejects_files_that_are_not_bundles(tmp_path: Any) -> None:
+    path = tmp_path / "model.dgb"
+    path.write_text("components: []\n")
+
+    with pytest.raises(BundleError):
+        Bundle(path)
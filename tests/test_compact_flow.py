@@ -0,0 +1,86 @@
+from pathlib import Path
+from typing import Any
+
+from ruamel.yaml import YAML
+
+from diagram_generator.adapters.input import yaml_loader
+from diagram_generator.adapters.input.yaml_loader import YAMLMetadataAdapter
+from diagram_generator.adapters.output.mermaid_renderer import MermaidDiagramAdapter
+from diagram_generator.core.domain.compact_flow import CompactFlow, StepRecord
+from diagram_generator.core.domain.component import Component, ComponentType, Service
+from diagram_generator.core.domain.flow import Flow, FlowStep
+from diagram_generator.core.domain.view_config import Type as ViewType
+from diagram_generator.core.domain.view_config import ViewConfig
+from diagram_generator.core.services.flow_abstractor import FlowAbstractor
+from diagram_generator.core.verification.expected_graph import expected_graph
+from diagram_generator.core.verification.mermaid_verifier import MermaidVerifier
+
+COMPONENTS: list[Component] = [
+    Service(id=i, name=i.upper(), type=ComponentType.service, metadata={"group": f"Bank.{g}"})
+    for i, g in (("web", "Channels"), ("api", "Core"), ("ledger", "Core"), ("psp", "Partner"))
+]
+FLOW = Flow(
+    id="pay",
+    description="Pay",
+    steps=[
+        FlowStep(source_id="web", target_id="api", description="POST /pay", protocol="HTTPS"),
+        FlowStep(source_id="api", target_id="ledger", description="Book", metadata={"data": {"amount": 1}}),
+        FlowStep(source_id="NOTE_ANCHOR", target_id="NOTE_ANCHOR", description="Async from here",
+                 metadata={"type": "note", "position": "over"}),
+        FlowStep(source_id="ledger", target_id="psp", description="Settle", is_dashed=True,
+                 metadata={"data": {"amount": 1}}),
+    ],
+    tags=["payments"],
+    metadata={"styles": {}},
+)
+
+
+def test_round_trip_is_lossless() -> None:
+    compact = CompactFlow.from_flow(FLOW)
+
+    assert compact.to_flow() == FLOW
+    assert len(compact.steps) == len(FLOW.steps)
+    assert compact.steps[3] == StepRecord("ledger", "psp", "Settle", None, True, {"data": {"amount": 1}})
+    # Equal metadata is stored once, and converted steps get their own copy
+    assert compact.steps[1].metadata is compact.steps[3].metadata
+    assert compact.to_flow().steps[1].metadata is not compact.to_flow().steps[3].metadata
+
+
+def test_renders_and_verifies_like_a_flow() -> None:
+    renderer = MermaidDiagramAdapter("templates")
+    compact = CompactFlow.from_flow(FLOW)
+
+    for view_type in (ViewType.sequence, ViewType.flowchart_swimlane):
+        view = ViewConfig(key="v", title="V", type=view_type, flow_id="pay")
+        expected = renderer.render(view, COMPONENTS, [], [FLOW])
+        assert renderer.render(view, COMPONENTS, [], [compact]) == expected
+
+    view = ViewConfig(key="v", title="V", type=ViewType.sequence, flow_id="pay")
+    content = renderer.render(view, COMPONENTS, [], [compact])
+    expected = expected_graph(view, COMPONENTS, [], [compact])
+    assert expected.edges == expected_graph(view, COMPONENTS, [], [FLOW]).edges
+    assert MermaidVerifier().verify_graph(expected, content).success
+
+
+def test_abstracts_compact_flows_to_compact_flows() -> None:
+    flow, components = FlowAbstractor().abstract_flow(FLOW, COMPONENTS, "container")
+    compact_flow, compact_components = FlowAbstractor().abstract_flow(
+        CompactFlow.from_flow(FLOW), COMPONENTS, "container"
+    )
+
+    assert isinstance(compact_flow, CompactFlow)
+    assert compact_flow.to_flow() == flow
+    assert [c.id for c in compact_components] == [c.id for c in components]
+
+
+def test_yaml_loader_keeps_long_flows_compact(tmp_path: Any, monkeypatch: Any) -> None:
+    monkeypatch.setattr(yaml_loader, "COMPACT_FLOW_STEPS", 3)
+    (tmp_path / "flows").mkdir()
+    with open(Path(tmp_path) / "flows" / "flows.yaml", "w") as f:
+        YAML(typ="safe").dump({"flows": [FLOW.model_dump(), {"id": "short", "description": "S", "steps": []}]}, f)
+
+    long_flow, short_flow = YAMLMetadataAdapter(str(tmp_path)).load_flows()
+
+    assert isinstance(long_flow, CompactFlow)
+    assert long_flow.to_flow() == FLOW
+    assert isinstance(short_flow, Flow)
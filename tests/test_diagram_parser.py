@@ -0,0 +1,134 @@
+import pytest
+
+from diagram_generator.adapters.output.mermaid_renderer import MermaidDiagramAdapter
+from diagram_generator.core.domain.component import Component, ComponentType, Service
+from diagram_generator.core.domain.flow import Flow, FlowStep
+from diagram_generator.core.domain.relationship import Relationship
+from diagram_generator.core.domain.view_config import Type as ViewType
+from diagram_generator.core.domain.view_config import ViewConfig
+from diagram_generator.core.verification.diagram_parser import DiagramGraph, parse_diagram
+from diagram_generator.core.verification.expected_graph import expected_graph
+from diagram_generator.core.verification.mermaid_verifier import MermaidVerifier
+
+COMPONENTS: list[Component] = [
+    Service(id="web-app", name="Web", type=ComponentType.service, metadata={"group": "Edge"}),
+    Service(id="api", name="API", type=ComponentType.service, link="https://example.com/api"),
+    Service(id="fraud-service", name="Fraud", type=ComponentType.service),
+]
+RELATIONSHIPS = [
+    Relationship(source_id="web-app", target_id="api", description="Calls, often", protocol="HTTPS"),
+    Relationship(source_id="api", target_id="fraud-service", description="Scores", protocol=None),
+]
+FLOW = Flow(id="pay", description="Pay", steps=[
+    FlowStep(source_id="web-app", target_id="api", description="POST /pay\n[json]"),
+    FlowStep(source_id="NOTE_ANCHOR", target_id="api", description="Checks", metadata={"type": "note"}),
+    FlowStep(source_id="api", target_id="fraud-service", description="Score"),
+    FlowStep(source_id="fraud-service", target_id="api", description="", is_dashed=True),
+])
+
+
+def test_sequence_arrows_between_hyphenated_ids() -> None:
+    graph = parse_diagram("\n".join([
+        "sequenceDiagram",
+        "    participant fraud-service as Fraud",
+        "    %% fraud-service->>api: a comment",
+        "    fraud-service-->>payment-service: Score: 12",
+        "    Note over api: not an edge",
+        "    api->>+fraud-service: Check",
+    ]))
+
+    assert graph.kind == "sequence"
+    assert graph.nodes == {"fraud-service"}
+    assert graph.edges == [
+        ("fraud-service", "payment-service", "Score: 12", True), ("api", "fraud-service", "Check", False),
+    ]
+
+
+def test_flowchart_skips_front_matter_and_directives() -> None:
+    graph = parse_diagram("\n".join([
+        "---",
+        "title: graph LR",
+        "---",
+        "%%{",
+        "  init: {'theme': 'base'}",
+        "}%%",
+        "graph TB",
+        '    subgraph Edge ["Edge"]',
+        '        web-app["Web<br/>x"]:::edge',
+        "    end",
+        '    note1[/"A note"/]:::note',
+        "    web-app -->|Two",
+        "lines| api",
+        "    note1 -.- over",
+        "    api --> db[(Store)]",
+        '    click api href "https://example.com"',
+    ]))
+
+    assert graph.kind == "flowchart"
+    assert graph.nodes == {"web-app", "note1"}
+    assert graph.edges == [
+        ("web-app", "api", "Two\nlines", False), ("note1", "over", "", True), ("api", "db", "", False),
+    ]
+
+
+def test_flowchart_links_from_shaped_nodes_and_chains() -> None:
+    graph = parse_diagram("\n".join([
+        "flowchart LR",
+        "    A[x] --> B",
+        '    C["a ] (b"]:::hot -->|Calls| D((y)) -.-> E>flag] --> F',
+        "    G --> H --> I",
+    ]))
+
+    assert graph.nodes == set()
+    assert graph.edges == [
+        ("A", "B", "", False), ("C", "D", "Calls", False), ("D", "E", "", True), ("E", "F", "", False),
+        ("G", "H", "", False), ("H", "I", "", False),
+    ]
+
+
+def test_c4_elements_and_relations() -> None:
+    graph = parse_diagram("\n".join([
+        "C4Container",
+        "  title Containers",
+        '  Person(user, "User, admin", "")',
+        '  ContainerDb(db, "Store", "", "")',
+        '  Rel(user, db, "Reads, writes", "SQL")',
+        '  Rel_Back(db, user, "Rows")',
+    ]))
+
+    assert graph.kind == "c4"
+    assert graph.nodes == {"user", "db"}
+    assert graph.edges == [("user", "db", "Reads, writes", False), ("db", "user", "Rows", False)]
+
+
+def test_unknown_diagram_type_fails() -> None:
+    result = MermaidVerifier().verify_graph(DiagramGraph("sequence"), "pie title Pets\n")
+
+    assert result.errors == ["Unknown diagram type 'pie'"]
+
+
+@pytest.mark.parametrize("view_type", list(ViewType))
+@pytest.mark.parametrize("flow_id", [None, "pay"])
+def test_rendered_views_match_their_model(view_type: ViewType, flow_id: str | None) -> None:
+    view = ViewConfig(key="v", title="V", type=view_type, flow_id=flow_id, theme={"primaryColor": "#fff"})
+    content = MermaidDiagramAdapter("templates").render(view, COMPONENTS, RELATIONSHIPS, [FLOW])
+
+    assert MermaidVerifier().verify_graph(expected_graph(view, COMPONENTS, RELATIONSHIPS, [FLOW]), content).success
+
+
+def test_differences_are_reported_by_node_and_edge() -> None:
+    expected = DiagramGraph("flowchart", ["a", "b"], [("a", "b", "x", False), ("b", "a", "y", False)])
+    verifier = MermaidVerifier()
+
+    assert verifier.verify_graph(expected, 'graph TB\n  a["A"]\n  c["C"]\n  a -->|x| b\n  a -.->|x| b\n').errors == [
+        "Missing node b",
+        "Unexpected node c",
+        "Missing edge b -> a : y",
+        "Unexpected edge a --> b : x",
+    ]
+    assert verifier.verify_graph(expected, 'graph TB\n  a["A"]\n  b["B"]\n  b -->|y| a\n  a -->|x| b\n').errors == [
+        "Edge 1 out of order: expected a -> b : x, found b -> a : y",
+    ]
+    assert verifier.verify_graph(expected, "sequenceDiagram\n").errors == [
+        "Expected a flowchart diagram, found a sequence diagram",
+    ]
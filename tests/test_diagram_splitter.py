@@ -0,0 +1,103 @@
+from unittest.mock import MagicMock
+
+from diagram_generator.adapters.output.mermaid_renderer import MermaidDiagramAdapter
+from diagram_generator.core.domain.component import Component, ComponentType, Service
+from diagram_generator.core.domain.relationship import Relationship
+from diagram_generator.core.domain.view_config import Type as ViewType
+from diagram_generator.core.domain.view_config import ViewConfig
+from diagram_generator.core.services.diagram_splitter import DiagramSplitter
+from diagram_generator.core.use_cases.generate_diagram import GenerateDiagramUseCase
+
+
+def build_model(groups: int = 4, per_group: int = 10) -> tuple[list[Component], list[Relationship]]:
+    """Dense groups chained together by a single edge each."""
+    components: list[Component] = []
+    relationships = []
+    for g in range(groups):
+        ids = [f"g{g}-s{i}" for i in range(per_group)]
+        components.extend(
+            Service(id=i, name=i, type=ComponentType.service, metadata={"group": f"Domain{g}.Team"}) for i in ids
+        )
+        for i in range(per_group):
+            for j in range(i + 1, min(i + 4, per_group)):
+                relationships.append(Relationship(source_id=ids[i], target_id=ids[j], description="calls"))
+        if g:
+            relationships.append(Relationship(source_id=f"g{g - 1}-s0", target_id=ids[0], description="bridges"))
+    return components, relationships
+
+
+def test_split_respects_edge_budget_and_keeps_every_edge() -> None:
+    components, relationships = build_model()
+    config = ViewConfig(key="big", title="Big", type=ViewType.flowchart)
+    splitter = DiagramSplitter(max_edges=30)
+
+    assert splitter.can_split(config, relationships)
+    pages, index = splitter.split(config, components, relationships)
+
+    assert len(pages) > 1
+    drawn = set()
+    for page in pages:
+        assert len(page.relationships) <= 30 # noqa: PLR2004
+        page_ids = {c.id for c in page.components}
+        for rel in page.relationships:
+            assert rel.source_id in page_ids and rel.target_id in page_ids
+            drawn.add((rel.source_id, rel.target_id))
+    assert drawn == {(r.source_id, r.target_id) for r in relationships}
+
+    # Each real component lives on exactly one page; the rest are stubs.
+    owners = [c.id for p in pages for c in p.components if not c.metadata.get("stub")]
+    assert sorted(owners) == sorted(c.id for c in components)
+
+    # Group boundaries become page boundaries: the only cut edges are the bridges.
+    assert sum(int(r.description.split()[0]) for r in index.relationships) == 3 # noqa: PLR2004
+    assert index.view_config.key == "big"
+    assert {c.id for c in index.components} == {p.view_config.key for p in pages}
+
+
+def test_oversized_group_is_cut_into_regions() -> None:
+    components, relationships = build_model(groups=1, per_group=40)
+    config = ViewConfig(key="one", title="One", type=ViewType.c4_container)
+
+    pages, _ = DiagramSplitter(max_edges=25).split(config, components, relationships)
+
+    assert len(pages) > 1
+    assert all(len(p.relationships) <= 25 for p in pages) # noqa: PLR2004
+
+
+def test_flow_views_are_not_split() -> None:
+    _, relationships = build_model()
+    config = ViewConfig(key="seq", title="Seq", type=ViewType.sequence, flow_id="f")
+    assert not DiagramSplitter(max_edges=5).can_split(config, relationships)
+
+
+def test_execute_pages_renders_linked_index() -> None:
+    components, relationships = build_model()
+    metadata = MagicMock()
+    metadata.load_components.return_value = components
+    metadata.load_relationships.return_value = relationships
+    metadata.load_view_configs.return_value = [ViewConfig(key="big", title="Big", type=ViewType.flowchart)]
+    metadata.load_flows.return_value = []
+
+    use_case = GenerateDiagramUseCase(metadata, MermaidDiagramAdapter(template_dir="templates"))
+    outputs = use_case.execute_pages("big", max_edges=30)
+
+    assert "big" in outputs
+    assert 'click big-page-1 href "big-page-1.mmd"' in outputs["big"]
+    page_two = outputs["big-page-2"]
+    # The bridge from page 1 shows up as a stub pointing back to its home page.
+    assert 'click g0-s0 href "big-page-1.mmd"' in page_two
+
+
+def test_c4_pages_link_stubs_to_their_home_page() -> None:
+    components, relationships = build_model()
+    metadata = MagicMock()
+    metadata.load_components.return_value = components
+    metadata.load_relationships.return_value = relationships
+    metadata.load_view_configs.return_value = [ViewConfig(key="big", title="Big", type=ViewType.c4_context)]
+    metadata.load_flows.return_value = []
+
+    use_case = GenerateDiagramUseCase(metadata, MermaidDiagramAdapter(template_dir="templates"))
+    outputs = use_case.execute_pages("big", max_edges=30)
+
+    assert 'System(g0-s0, "g0-s0 (page 1)", "None", $link="big-page-1.mmd")' in outputs["big-page-2"]
+    assert 'System(g0-s0, "g0-s0", "None")' in outputs["big-page-1"]
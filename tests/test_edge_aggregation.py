@@ -0,0 +1,49 @@
+from typing import Any
+
+from diagram_generator.adapters.input.yaml_loader import YAMLMetadataAdapter
+from diagram_generator.core.domain.relationship import Relationship
+from diagram_generator.core.services.edge_aggregator import EdgeAggregator
+
+
+def test_dedupe_merges_yaml_and_dsl_copies(tmp_path: Any) -> None:
+    rel_dir = tmp_path / "relationships"
+    rel_dir.mkdir()
+    (rel_dir / "wiring.yaml").write_text("""
+relationships:
+  - source_id: api
+    target_id: db
+    description: Query
+    tags: [core]
+  - source_id: api
+    target_id: db
+    description: Query
+  - source_id: api
+    target_id: db
+    description: Write
+""")
+    (rel_dir / "fast.flow").write_text("api -> db : Query\n")
+
+    relationships = YAMLMetadataAdapter(str(tmp_path)).load_relationships()
+
+    assert [(r.description, r.tags) for r in relationships] == [("Query", ["core"]), ("Write", None)]
+
+
+def test_aggregate_parallel_edges() -> None:
+    rels = [
+        Relationship(source_id="a", target_id="b", description="Read", protocol="gRPC"),
+        Relationship(source_id="a", target_id="b", description="Write", protocol="HTTPS"),
+        Relationship(source_id="a", target_id="b", description="Write", protocol="gRPC"),
+        Relationship(source_id="b", target_id="a", description="Callback", protocol=None),
+        Relationship(source_id="a", target_id="c", description="Ping", protocol=None),
+        Relationship(source_id="a", target_id="c", description="Ping", protocol=None),
+    ]
+
+    merged = {(r.source_id, r.target_id): r for r in EdgeAggregator().aggregate(rels)}
+
+    assert len(merged) == 3 # noqa: PLR2004
+    ab = merged[("a", "b")]
+    assert ab.description == "3 interactions"
+    assert ab.protocol == "gRPC, HTTPS"
+    assert ab.metadata == {"aggregated": 3, "descriptions": ["Read", "Write"]}
+    assert merged[("a", "c")].description == "Ping (2x)"
+    assert merged[("b", "a")] is rels[3]
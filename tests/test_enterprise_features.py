@@ -5,6 +5,7 @@ from diagram_generator.adapters.output.mermaid_renderer import MermaidDiagramAda
 from diagram_generator.core.domain.component import ComponentType, Service
 from diagram_generator.core.domain.view_config import Type as ViewType
 from diagram_generator.core.domain.view_config import ViewConfig
+from diagram_generator.core.services.component_hierarchy import ComponentHierarchy
 
 
 class TestEnterpriseFeatures:
@@ -38,16 +39,34 @@ class TestEnterpriseFeatures:
         
         # Verify Nesting
         # subgraph L1 contains L2, Other
-        # subgraph L2 contains L3
+        # subgraph L2 contains L3 (IDs are the full group path)
         assert 'subgraph L1["L1"]' in output
-        assert 'subgraph L2["L2"]' in output
-        assert 'subgraph L3["L3"]' in output
-        assert 'subgraph Other["Other"]' in output
+        assert 'subgraph L1_L2["L2"]' in output
+        assert 'subgraph L1_L2_L3["L3"]' in output
+        assert 'subgraph L1_Other["Other"]' in output
         
         # Top should be outside subgraphs or at root
         # Ideally it shouldn't be inside L1.
         # This is harder to regex without parsing, but spot checking key strings helps.
         
+    def test_swimlane_subgraphs_match_abstraction_parents(self, tmp_path: Any) -> None:
+        """Test that subgraph IDs are valid, unique per path and equal to the roll-up parent IDs."""
+        adapter = MermaidDiagramAdapter(template_dir="templates")
+        components = [
+            Service(id="a", name="A", type=ComponentType.service, metadata={"group": "Retail Bank.Core"}),
+            Service(id="b", name="B", type=ComponentType.service, metadata={"group": "Partners.Core"}),
+        ]
+        config = ViewConfig(key="test", title="Test", type=ViewType.flowchart_swimlane, flow_id=None)
+
+        output = adapter.render(config, components, [])
+
+        assert 'subgraph Retail_Bank["Retail Bank"]' in output
+        assert 'subgraph Retail_Bank_Core["Core"]' in output
+        assert 'subgraph Partners_Core["Core"]' in output
+        hierarchy = ComponentHierarchy(components)
+        assert hierarchy.get_parent_id("a", "container") == "Retail_Bank_Core"
+        assert hierarchy.get_parent_id("b", "system") == "Partners"
+        
     def test_style_class_injection(self, tmp_path: Any) -> None:
         """Test that styles from Flow metadata are injected into classDefs."""
         adapter = MermaidDiagramAdapter(template_dir="templates")
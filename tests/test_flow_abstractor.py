@@ -0,0 +1,90 @@
+from unittest.mock import MagicMock
+
+from diagram_generator.core.domain.component import Component, ComponentType, Service
+from diagram_generator.core.domain.flow import Flow, FlowStep
+from diagram_generator.core.domain.view_config import Type as ViewType
+from diagram_generator.core.domain.view_config import ViewConfig
+from diagram_generator.core.services.flow_abstractor import FlowAbstractor
+from diagram_generator.core.use_cases.generate_diagram import GenerateDiagramUseCase
+
+
+def service(id: str, group: str | None) -> Component:
+    return Service(id=id, name=id, type=ComponentType.service, metadata={"group": group} if group else {})
+
+
+def step(source: str, target: str) -> FlowStep:
+    return FlowStep(source_id=source, target_id=target, description="call", protocol=None, is_dashed=False)
+
+
+COMPONENTS = [
+    service("web", "Bank.Channels"),
+    service("api", "Bank.Core"),
+    service("ledger", "Bank.Core"),
+    service("psp", "Partner.Gateway"),
+    service("user", None),
+]
+FLOW = Flow(id="pay", description="Pay", steps=[
+    step("user", "web"), step("web", "api"), step("api", "ledger"), step("ledger", "psp"),
+])
+
+
+def test_rolls_flow_up_per_level() -> None:
+    abstractor = FlowAbstractor()
+
+    container_flow, container_components = abstractor.abstract_flow(FLOW, COMPONENTS, "container")
+    system_flow, system_components = abstractor.abstract_flow(FLOW, COMPONENTS, "system")
+
+    assert container_flow.id == "pay_container"
+    assert [(s.source_id, s.target_id) for s in container_flow.steps] == [
+        ("user", "Bank_Channels"), ("Bank_Channels", "Bank_Core"), ("Bank_Core", "Partner_Gateway"),
+    ]
+    assert [c.id for c in container_components] == ["user", "Bank_Channels", "Bank_Core", "Partner_Gateway"]
+    assert container_components[0] is COMPONENTS[-1] # Ungrouped components stand for themselves
+    assert [(s.source_id, s.target_id) for s in system_flow.steps] == [("user", "Bank"), ("Bank", "Partner")]
+    assert [c.id for c in system_components] == ["user", "Bank", "Partner"]
+
+
+def test_component_level_is_identity() -> None:
+    flow, components = FlowAbstractor().abstract_flow(FLOW, COMPONENTS, "component")
+
+    assert flow is FLOW
+    assert {c.id for c in components} == {"user", "web", "api", "ledger", "psp"}
+
+
+def test_cache_reused_until_groups_change() -> None:
+    abstractor = FlowAbstractor()
+    first, _ = abstractor.abstract_flow(FLOW, COMPONENTS, "system")
+
+    assert abstractor.abstract_flow(FLOW, COMPONENTS, "system")[0] is first
+
+    regrouped = [*COMPONENTS[:-1], service("user", "Bank.Channels")]
+    refreshed, _ = abstractor.abstract_flow(FLOW, regrouped, "system")
+
+    assert refreshed is not first
+    assert [(s.source_id, s.target_id) for s in refreshed.steps] == [("Bank", "Partner")]
+
+
+def test_use_case_abstracts_only_requested_flow() -> None:
+    other = Flow(id="other", description="Other", steps=[step("web", "psp")])
+    views = [
+        ViewConfig(key="pay-system", title="Pay", type=ViewType.sequence, flow_id="pay", abstraction_level="system"),
+        ViewConfig(key="pay-leaf", title="Pay", type=ViewType.sequence, flow_id="pay", abstraction_level="component"),
+    ]
+    metadata = MagicMock()
+    metadata.load_components.side_effect = lambda: list(COMPONENTS)
+    metadata.load_relationships.return_value = []
+    metadata.load_view_configs.return_value = views
+    metadata.load_flows.return_value = [FLOW, other]
+    use_case = GenerateDiagramUseCase(metadata, MagicMock())
+
+    config, components, _, flows = use_case.prepare("pay-system")
+
+    assert config.flow_id == "pay_system"
+    assert views[0].flow_id == "pay" # The loaded view is left untouched
+    assert [f.id for f in flows] == ["pay_system", "other"]
+    assert [c.id for c in components] == ["user", "Bank", "Partner"]
+
+    config, components, _, flows = use_case.prepare("pay-leaf")
+
+    assert config.flow_id == "pay"
+    assert flows == [FLOW, other]
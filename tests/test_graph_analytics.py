@@ -0,0 +1,149 @@
+import json
+import random
+from collections.abc import Sequence
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+from typer.testing import CliRunner
+
+from diagram_generator.cli.main import app
+from diagram_generator.core.domain.compact_flow import CompactFlow
+from diagram_generator.core.domain.component import Component, ComponentType, Service
+from diagram_generator.core.domain.flow import Flow, FlowStep
+from diagram_generator.core.domain.relationship import Relationship
+from diagram_generator.core.services.graph_analytics import DependencyGraph
+from diagram_generator.core.services.graph_index import GraphIndex
+from diagram_generator.core.use_cases.generate_diagram import GenerateDiagramUseCase
+
+runner = CliRunner()
+
+
+def build(
+    edges: list[tuple[str, str]], steps: Sequence[tuple[str, str]] = (), component_ids: str = ""
+) -> DependencyGraph:
+    components: list[Component] = [Service(id=i, name=i, type=ComponentType.service) for i in component_ids]
+    relationships = [Relationship(source_id=s, target_id=t, description=f"{s}{t}") for s, t in edges]
+    flow = Flow(id="f", description="F", steps=[
+        FlowStep(source_id="NOTE_ANCHOR", target_id="a", description="Note", metadata={"type": "note"}),
+        *(FlowStep(source_id=s, target_id=t, description=f"step {s}{t}") for s, t in steps),
+    ])
+    return DependencyGraph(GraphIndex(components, relationships), [flow])
+
+
+def test_impact_by_depth_and_direction() -> None:
+    # a -> b -> c -> d, and the flow step e -> b
+    graph = build([("a", "b"), ("b", "c"), ("c", "d")], [("e", "b")], component_ids="abcde")
+
+    assert graph.impact("c", depth=1) == [("b", 1)]
+    assert graph.impact("c") == [("b", 1), ("a", 2), ("e", 2)]
+    assert graph.impact("b", depth=2, direction="out") == [("c", 1), ("d", 2)]
+    assert graph.impact("b", depth=1, direction="both") == [("c", 1), ("a", 1), ("e", 1)]
+    with pytest.raises(ValueError, match="Unknown component 'x'"):
+        graph.impact("x")
+    # Notes are not dependencies
+    assert "NOTE_ANCHOR" not in graph.ids
+
+
+def test_shortest_path_over_relationships_and_steps() -> None:
+    graph = build([("a", "b"), ("b", "c"), ("c", "d"), ("a", "c")], [("c", "x"), ("x", "d")])
+
+    path = graph.shortest_path("a", "x")
+
+    assert path is not None
+    assert [graph.edge(e) for e in path] == [
+        {"source": "a", "target": "c", "description": "ac", "flow": None},
+        {"source": "c", "target": "x", "description": "step cx", "flow": "f"},
+    ]
+    assert graph.shortest_path("d", "a") is None
+    assert graph.shortest_path("a", "a") == []
+
+
+def test_cycles_are_strongly_connected_components() -> None:
+    graph = build([("a", "b"), ("b", "a"), ("c", "c"), ("d", "e"), ("e", "f")], [("f", "d"), ("b", "g")])
+
+    assert graph.cycles() == [["d", "e", "f"], ["a", "b"], ["c"]]
+
+
+def test_cycles_match_mutual_reachability() -> None:
+    rng = random.Random(3)
+    ids = [f"n{i}" for i in range(30)]
+    edges = [(rng.choice(ids), rng.choice(ids)) for _ in range(45)]
+    graph = build(edges)
+
+    reach = {i: {i} for i in graph.ids}
+    for _ in graph.ids:
+        for s, t in edges:
+            reach[s] |= reach[t]
+    expected = {
+        frozenset(j for j in graph.ids if i in reach[j] and j in reach[i]) for i in graph.ids
+    }
+    expected = {c for c in expected if len(c) > 1 or any(s == t and s in c for s, t in edges)}
+
+    assert {frozenset(c) for c in graph.cycles()} == expected
+
+
+def test_deep_chains_need_no_recursion() -> None:
+    # One cycle through 50k components, one flow step per hop: deeper than any recursion limit
+    size = 50_000
+    ids = [f"c{i}" for i in range(size)]
+    flow = CompactFlow.from_flow(Flow(id="ring", description="Ring", steps=[
+        FlowStep(source_id=ids[i], target_id=ids[(i + 1) % size], description="") for i in range(size)
+    ]))
+    graph = DependencyGraph(GraphIndex([], []), [flow])
+
+    assert [len(c) for c in graph.cycles()] == [size]
+    path = graph.shortest_path("c0", f"c{size - 1}")
+    assert path is not None
+    assert (len(path), graph.edge(path[-1])["flow"]) == (size - 1, "ring")
+    assert graph.impact("c0", depth=size)[-1] == ("c1", size - 1)
+
+
+def test_use_case_caches_the_graph() -> None:
+    metadata = MagicMock()
+    metadata.load_components.return_value = []
+    metadata.load_relationships.return_value = [Relationship(source_id="a", target_id="b", description="")]
+    metadata.load_views.return_value = []
+    metadata.load_flows.return_value = []
+    use_case = GenerateDiagramUseCase(metadata, MagicMock())
+    components, relationships, _, flows = use_case.load_model()
+
+    graph = use_case.dependency_graph(components, relationships, flows)
+
+    assert use_case.dependency_graph(components, relationships, flows) is graph
+    assert use_case.dependency_graph(components, relationships, []) is not graph
+
+
+def test_graph_commands() -> None:
+    data_dir = ["--data-dir", "examples/complex_bank"]
+
+    result = runner.invoke(app, ["graph", "cycles", "--json", *data_dir])
+    assert result.exit_code == 0
+    assert ["payment-service", "fraud-service"] in json.loads(result.stdout)["cycles"]
+
+    result = runner.invoke(app, ["graph", "path", "customer", "swift-network", *data_dir])
+    assert result.exit_code == 0
+    assert "customer → api-gateway → payment-service → swift-network" in result.stdout
+    result = runner.invoke(app, ["graph", "path", "swift-network", "customer", *data_dir])
+    assert result.exit_code == 1
+
+    result = runner.invoke(app, ["graph", "impact", "payment-service", "--depth", "1", "--json", *data_dir])
+    assert result.exit_code == 0
+    assert {"id": "api-gateway", "hops": 1} in json.loads(result.stdout)["impacted"]
+    result = runner.invoke(app, ["graph", "impact", "payment-service", "--direction", "up", *data_dir])
+    assert result.exit_code == 1
+
+
+def test_neighbourhood_command_draws_the_subgraph(tmp_path: Any) -> None:
+    output = tmp_path / "near.mmd"
+    data_dir = ["--data-dir", "examples/complex_bank"]
+
+    result = runner.invoke(app, ["graph", "neighbourhood", "swift-network", "--output", str(output), *data_dir])
+
+    assert result.exit_code == 0
+    diagram = output.read_text()
+    assert "title: Within 1 hop of swift-network" in diagram
+    assert "payment-service -->|Executes wire| swift-network" in diagram
+    assert "api-gateway" not in diagram
+    result = runner.invoke(app, ["graph", "neighbourhood", "nope", *data_dir])
+    assert result.exit_code == 1
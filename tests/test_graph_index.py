@@ -0,0 +1,78 @@
+import random
+from unittest.mock import MagicMock
+
+from diagram_generator.core.domain.component import Component, ComponentType, Service
+from diagram_generator.core.domain.relationship import Relationship
+from diagram_generator.core.domain.view_config import Filters, ViewConfig
+from diagram_generator.core.domain.view_config import Type as ViewType
+from diagram_generator.core.services.graph_index import GraphIndex
+from diagram_generator.core.use_cases.generate_diagram import GenerateDiagramUseCase
+
+
+def build_graph(count: int = 40, edges: int = 150) -> tuple[list[Component], list[Relationship]]:
+    rng = random.Random(7)
+    components: list[Component] = [
+        Service(id=f"c{i}", name=f"C{i}", type=ComponentType.service, tags=[f"t{i % 3}"]) for i in range(count)
+    ]
+    # Ids past `count` are endpoints without a component
+    ends = [(f"c{rng.randrange(count + 5)}", f"c{rng.randrange(count + 5)}") for _ in range(edges)]
+    relationships = [Relationship(source_id=s, target_id=t, description="x") for s, t in ends]
+    return components, relationships
+
+
+def test_matches_string_filtering() -> None:
+    components, relationships = build_graph()
+    graph = GraphIndex(components, relationships)
+
+    for tags in (["t0"], ["t1", "t2"], ["missing"]):
+        expected_components = [c for c in components if set(c.tags or ()) & set(tags)]
+        ids = {c.id for c in expected_components}
+        expected = [r for r in relationships if r.source_id in ids and r.target_id in ids]
+
+        assert graph.with_tags(tags) == expected_components
+        assert graph.relationships_within(ids) == expected
+
+
+def test_missing_ids_in_order_of_first_use() -> None:
+    components = [Service(id="a", name="A", type=ComponentType.service)]
+    relationships = [
+        Relationship(source_id="x", target_id="a", description=""),
+        Relationship(source_id="a", target_id="y", description=""),
+        Relationship(source_id="y", target_id="x", description=""),
+    ]
+
+    assert GraphIndex(components, relationships).missing_ids() == ["x", "y"]
+
+
+def test_neighbourhood_depth_and_direction() -> None:
+    components = [Service(id=i, name=i, type=ComponentType.service) for i in "abcd"]
+    relationships = [
+        Relationship(source_id=s, target_id=t, description="") for s, t in (("a", "b"), ("b", "c"), ("d", "b"))
+    ]
+    graph = GraphIndex(components, relationships)
+
+    assert graph.neighbourhood(["b"], depth=0) == ["b"]
+    assert graph.neighbourhood(["b"], depth=1, direction="out") == ["b", "c"]
+    assert graph.neighbourhood(["b"], depth=1, direction="in") == ["b", "a", "d"]
+    assert graph.neighbourhood(["a"], depth=2) == ["a", "b", "c", "d"]
+    assert graph.neighbourhood(["unknown"]) == []
+
+
+def test_use_case_reuses_index_across_views() -> None:
+    components, relationships = build_graph()
+    use_case = GenerateDiagramUseCase(MagicMock(), MagicMock())
+
+    use_case.discover_components(components, relationships)
+    graph = use_case.graph_index(components, relationships)
+    assert not graph.missing_ids() # Discovered components are registered as they are appended
+
+    for tag in ("t0", "t1"):
+        view = ViewConfig(key=tag, title=tag, type=ViewType.flowchart, filters=Filters(tags=[tag]))
+        filtered_components, filtered_relationships = use_case.filter_graph(view, components, relationships)
+        ids = {c.id for c in filtered_components}
+        assert filtered_relationships == [r for r in relationships if r.source_id in ids and r.target_id in ids]
+    assert use_case.graph_index(components, relationships) is graph
+
+    nearby, between = use_case.neighbourhood(["c0"], components, relationships, depth=1)
+    assert nearby[0].id == "c0"
+    assert all(r.source_id in {c.id for c in nearby} for r in between)
@@ -0,0 +1,205 @@
+import io
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+import yaml
+from ruamel.yaml import YAML
+
+from diagram_generator.adapters.input.yaml_loader import YAMLMetadataAdapter
+from diagram_generator.core.services.incremental_ingest import IncrementalIngest
+from diagram_generator.core.services.seed_ingester import SeedIngester
+from diagram_generator.core.services.yaml_emitter import emit_records
+
+MAPPINGS = {
+    "components": [
+        {"source_path": "services", "item_model": "Service",
+         "spec": {"id": "id", "name": "name", "description": "about", "metadata": {"group": "group"}}},
+        {"source_path": "databases", "item_model": "Database",
+         "spec": {"id": "id", "name": "name", "metadata": {"group": "group"}}},
+    ],
+    "relationships": [
+        {"source_path": "services", "spec": {"source_id": "name", "targets": "uses", "type": "dependency"}},
+        {"source_path": "chains", "spec": {"direction": "path", "type": "kind"}},
+    ],
+}
+
+SEEDS = {
+    "payments.yaml": "services:\n  - {id: payments, name: Payments Service, group: Payments, uses: [Ledger DB]}\n",
+    "orders.yaml": (
+        "services:\n"
+        "  - {id: orders, name: Orders Service, group: Orders, about: Takes orders, uses: [Ledger DB]}\n"
+        "  - {id: carts, name: Carts Service, group: Orders, uses: Payments Service}\n"
+    ),
+    "data.yaml": "databases:\n  - {id: ledger-db, name: Ledger DB, group: Data}\n",
+}
+
+SHARDS = [
+    "components/ingested_Data.yaml", "components/ingested_Orders.yaml", "components/ingested_Payments.yaml",
+    "relationships/ingested_Orders.yaml", "relationships/ingested_Payments.yaml",
+]
+
+STRINGS = ["plain", "Two words", "yes", "No", "null", "~", "1.5", "0x1F", "2024-01-01", "a: b", "#c", "- d",
+           "", " padded ", "line\nbreak", "tab\tin", "quote\"s", "it's", "*alias", "{x}", "ünïcode", "\x85", "😀"]
+
+
+def setup(tmp_path: Any, files: list[str]) -> tuple[Path, Path]:
+    seeds, data = tmp_path / "seeds", tmp_path / "data"
+    seeds.mkdir(exist_ok=True)
+    for name, seed in SEEDS.items():
+        if not (seeds / name).exists():
+            (seeds / name).write_text(seed)
+    config = seeds / "ingestion_config.yaml"
+    with open(config, "w") as f:
+        YAML(typ="safe").dump({"sources": [{"file": n, "format": "yaml"} for n in files], "mappings": MAPPINGS}, f)
+    return seeds, data
+
+
+def run(seeds: Path, data: Path) -> dict[str, list[str]]:
+    report = IncrementalIngest(SeedIngester(str(seeds / "ingestion_config.yaml"), str(seeds)), data).run()
+    return {key: sorted(Path(p).relative_to(data).as_posix() for p in paths) if key != "changed" else paths
+            for key, paths in report.items()}
+
+
+def full_ingest(seeds: Path) -> dict[str, Any]:
+    """Records of a full ingest, later sources winning like they do in shards."""
+    results = SeedIngester(str(seeds / "ingestion_config.yaml"), str(seeds)).ingest()
+    return {
+        "components": {c.id: c.model_dump(exclude_none=True) for c in results["components"]},
+        "relationships": sorted(r.model_dump_json() for r in results["relationships"]),
+    }
+
+
+def loaded(data: Path) -> dict[str, Any]:
+    adapter = YAMLMetadataAdapter(str(data))
+    return {
+        "components": {c.id: c.model_dump(exclude_none=True) for c in adapter.load_components()},
+        "relationships": sorted(r.model_dump_json() for r in adapter.load_relationships()),
+    }
+
+
+def edges(data: Path) -> set[tuple[str, str]]:
+    return {(r.source_id, r.target_id) for r in YAMLMetadataAdapter(str(data)).load_relationships()}
+
+
+@pytest.mark.parametrize("value", [*STRINGS, 0, -7, 1.5, 1e300, 1e-7, True, False, None, float("inf"), [], {}])
+def test_emitted_records_load_back(value: Any) -> None:
+    key = value if isinstance(value, str) else "key"
+    records = [{"id": "a", "value": value, "nested": {"list": [value, {key: value}], "empty": []}}]
+    out = io.StringIO()
+    emit_records("components", records, out)
+
+    assert YAML(typ="safe").load(out.getvalue()) == {"components": records}
+    assert yaml.safe_load(out.getvalue()) == {"components": records}
+
+
+def test_unchanged_sources_rewrite_nothing(tmp_path: Any) -> None:
+    seeds, data = setup(tmp_path, ["payments.yaml", "orders.yaml", "data.yaml"])
+
+    first = run(seeds, data)
+    again = run(seeds, data)
+
+    assert first["written"] == SHARDS
+    assert again == {"written": [], "removed": [], "changed": []}
+    components = YAMLMetadataAdapter(str(data)).load_components()
+    assert sorted(c.id for c in components) == ["carts", "ledger-db", "orders", "payments"]
+    assert edges(data) == {("payments", "ledger-db"), ("orders", "ledger-db"), ("carts", "payments")}
+
+
+def test_changed_source_only_rewrites_shards_it_changes(tmp_path: Any) -> None:
+    seeds, data = setup(tmp_path, ["payments.yaml", "orders.yaml", "data.yaml"])
+    run(seeds, data)
+
+    (seeds / "orders.yaml").write_text(SEEDS["orders.yaml"].replace("Takes orders", "Takes all orders"))
+
+    assert run(seeds, data) == {
+        "written": ["components/ingested_Orders.yaml"], "removed": [], "changed": ["orders.yaml"],
+    }
+
+
+def test_renamed_ids_are_resolved_again_in_unchanged_sources(tmp_path: Any) -> None:
+    seeds, data = setup(tmp_path, ["payments.yaml", "orders.yaml", "data.yaml"])
+    run(seeds, data)
+
+    (seeds / "data.yaml").write_text(SEEDS["data.yaml"].replace("ledger-db", "ledger-store"))
+    report = run(seeds, data)
+
+    assert report["changed"] == ["data.yaml"]
+    assert report["written"] == [
+        "components/ingested_Data.yaml", "relationships/ingested_Orders.yaml", "relationships/ingested_Payments.yaml",
+    ]
+    assert edges(data) == {("payments", "ledger-store"), ("orders", "ledger-store"), ("carts", "payments")}
+
+
+def test_dropped_sources_lose_their_records(tmp_path: Any) -> None:
+    seeds, data = setup(tmp_path, ["payments.yaml", "orders.yaml", "data.yaml"])
+    run(seeds, data)
+
+    setup(tmp_path, ["payments.yaml", "data.yaml"])
+    report = run(seeds, data)
+
+    assert report["removed"] == ["components/ingested_Orders.yaml", "relationships/ingested_Orders.yaml"]
+    assert sorted(c.id for c in YAMLMetadataAdapter(str(data)).load_components()) == ["ledger-db", "payments"]
+
+
+def test_records_still_produced_by_another_source_are_kept(tmp_path: Any) -> None:
+    (tmp_path / "seeds").mkdir()
+    (tmp_path / "seeds" / "a.yaml").write_text(
+        "services:\n  - {id: x, name: X from a, group: G}\n  - {id: y, name: Y, group: G}\n"
+    )
+    (tmp_path / "seeds" / "b.yaml").write_text("services:\n  - {id: x, name: X from b, group: G}\n")
+    seeds, data = setup(tmp_path, ["a.yaml", "b.yaml"])
+    run(seeds, data)
+
+    # b still produces x, whose record (b's, the later source) stays in the shard as it is
+    (seeds / "a.yaml").write_text("services:\n  - {id: y, name: Y, group: G}\n")
+    assert run(seeds, data) == {"written": [], "removed": [], "changed": ["a.yaml"]}
+    assert loaded(data) == full_ingest(seeds)
+    assert loaded(data)["components"]["x"]["name"] == "X from b"
+
+    # Once b stops producing x, a's record of x is extracted again
+    (seeds / "a.yaml").write_text("services:\n  - {id: x, name: X from a, group: G}\n")
+    run(seeds, data)
+    (seeds / "b.yaml").write_text("services:\n  - {id: z, name: Z, group: G}\n")
+    assert run(seeds, data)["changed"] == ["b.yaml"]
+    assert loaded(data) == full_ingest(seeds)
+    assert loaded(data)["components"]["x"]["name"] == "X from a"
+
+
+def test_ids_shared_across_groups_are_only_in_the_last_sources_shard(tmp_path: Any) -> None:
+    (tmp_path / "seeds").mkdir()
+    (tmp_path / "seeds" / "a.yaml").write_text("services:\n  - {id: ledger, name: Ledger, group: Zeta}\n")
+    (tmp_path / "seeds" / "b.yaml").write_text("services:\n  - {id: ledger, name: Ledger v2, group: Alpha}\n")
+    seeds, data = setup(tmp_path, ["a.yaml", "b.yaml"])
+
+    assert run(seeds, data)["written"] == ["components/ingested_Alpha.yaml"]
+    assert loaded(data) == full_ingest(seeds)
+    assert loaded(data)["components"]["ledger"]["metadata"] == {"group": "Alpha"}
+
+    # b moves its copy to a's group, then stops producing it: a's record comes back, in a's shard
+    (seeds / "b.yaml").write_text("services:\n  - {id: ledger, name: Ledger v3, group: Zeta}\n")
+    assert run(seeds, data) == {
+        "written": ["components/ingested_Zeta.yaml"], "removed": ["components/ingested_Alpha.yaml"],
+        "changed": ["b.yaml"],
+    }
+    assert loaded(data) == full_ingest(seeds)
+    (seeds / "b.yaml").write_text("services:\n  - {id: other, name: Other, group: Alpha}\n")
+    run(seeds, data)
+    assert loaded(data) == full_ingest(seeds)
+    assert loaded(data)["components"]["ledger"]["name"] == "Ledger"
+
+
+def test_relationships_differing_in_any_field_are_kept(tmp_path: Any) -> None:
+    (tmp_path / "seeds").mkdir()
+    # The same edge and type (none) twice, differing only in description: as a dependency and a chain step
+    (tmp_path / "seeds" / "a.yaml").write_text(
+        "services:\n  - {id: p, name: P, group: G, uses: [Q]}\n  - {id: q, name: Q, group: G}\n"
+        "chains:\n  - {path: P -> Q}\n"
+    )
+    seeds, data = setup(tmp_path, ["a.yaml"])
+
+    run(seeds, data)
+
+    assert [json.loads(r)["description"] for r in loaded(data)["relationships"]] == ["depends on", "flow step"]
+    assert loaded(data) == full_ingest(seeds)
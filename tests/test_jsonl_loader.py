@@ -0,0 +1,68 @@
+import json
+from typing import Any
+
+import pytest
+
+from diagram_generator.adapters.input.jsonl_loader import JSONLMetadataAdapter
+from diagram_generator.adapters.input.yaml_loader import YAMLMetadataAdapter
+from diagram_generator.core.domain.compact_flow import CompactFlow
+
+
+def write_jsonl(path: Any, records: list[Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("".join(f"{json.dumps(r)}\n" for r in records))
+
+
+def test_yaml_jsonl_and_dsl_mix_in_one_data_dir(tmp_path: Any) -> None:
+    (tmp_path / "components").mkdir()
+    (tmp_path / "components" / "people.yaml").write_text(
+        "components:\n  - id: user\n    name: User\n    type: person\n"
+    )
+    write_jsonl(tmp_path / "components" / "inventory.jsonl", [{"id": "api", "name": "API", "type": "service"}])
+    write_jsonl(tmp_path / "relationships" / "inventory.jsonl", [
+        {"source_id": "user", "target_id": "api", "description": "Uses"},
+    ])
+    write_jsonl(tmp_path / "views" / "views.jsonl", [{"key": "context", "title": "Context", "type": "c4_context"}])
+    (tmp_path / "flows").mkdir()
+    (tmp_path / "flows" / "login.flow").write_text("api -> db : Query\n")
+
+    adapter = YAMLMetadataAdapter(str(tmp_path))
+
+    assert [c.id for c in adapter.load_components()] == ["user", "api"]
+    assert [(r.source_id, r.target_id) for r in adapter.load_relationships()] == [("user", "api"), ("api", "db")]
+    assert [v.key for v in adapter.load_view_configs()] == ["context"]
+    assert [f.id for f in adapter.load_flows()] == ["login"]
+
+
+def test_invalid_lines_are_reported_and_skipped(tmp_path: Any, capsys: pytest.CaptureFixture[str]) -> None:
+    path = tmp_path / "components" / "inventory.jsonl"
+    path.parent.mkdir()
+    path.write_text(
+        '{"id": "api", "name": "API", "type": "service"}\n'
+        "\n"
+        '{"id": "broken", "name": \n'
+        '{"id": "no name", "type": "service"}\n'
+        '{"id": "db", "name": "DB", "type": "database"}\n'
+    )
+
+    components = JSONLMetadataAdapter(tmp_path).load_components()
+
+    assert [c.id for c in components] == ["api", "db"]
+    output = capsys.readouterr().out
+    assert "inventory.jsonl:3" in output
+    assert "inventory.jsonl:4" in output
+
+
+def test_large_flows_stay_compact(tmp_path: Any, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("diagram_generator.adapters.input.jsonl_loader.COMPACT_FLOW_STEPS", 2)
+    steps = [{"source_id": "a", "target_id": "b", "description": f"step {i}"} for i in range(3)]
+    write_jsonl(tmp_path / "flows" / "flows.jsonl", [
+        {"id": "small", "description": "Small", "steps": steps[:1]},
+        {"id": "large", "description": "Large", "steps": steps},
+    ])
+
+    small, large = JSONLMetadataAdapter(tmp_path).load_flows()
+
+    assert not isinstance(small, CompactFlow)
+    assert isinstance(large, CompactFlow)
+    assert [s.description for s in large.steps] == ["step 0", "step 1", "step 2"]
@@ -0,0 +1,161 @@
+from pathlib import Path
+from typing import Any
+
+import pytest
+from ruamel.yaml import YAML
+
+from diagram_generator.core.services import legacy_sources
+from diagram_generator.core.services.legacy_sources import LegacyStream
+from diagram_generator.core.services.seed_ingester import SeedIngester
+
+INVENTORY = """\
+# Production inventory
+actors:
+  customer:
+    name: Customer
+  admin: {type: actor, name: Admin}
+systems:
+  core:
+    name: Core
+    deployment: k8s
+    owner: null
+  core: {name: Core v2, type: ui}
+
+- id: svc-a
+  name: Service A
+- name: no id
+- id: svc-b
+  name: Service B
+  type: database
+
+vendors:
+  base: &base
+    name: Stripe
+    type: integration
+  stripe-eu:
+    <<: *base
+    region: eu
+yes:
+  flag: {name: Flag}
+"""
+
+FLOWS = """\
+title: preamble without an id
+id: phone-verification
+name: Phone Verification
+status: live
+flow_steps:
+  - from: app
+    to: api
+    action: "Send\\ncode"
+    data: phone
+  - from: api
+    to: app
+    type: response
+id: broken
+flow_steps:
+  - action: null
+id:
+name: no id
+id: id-verification
+"""
+
+
+def rows(path: Path, fmt: str, **kwargs: Any) -> list[dict[str, Any]]:
+    return list(LegacyStream(path, fmt, "internal", **kwargs).rows())
+
+
+def test_inventory_blocks_map_to_legacy_components(tmp_path: Any) -> None:
+    path = tmp_path / "internal.yaml"
+    path.write_text(INVENTORY)
+
+    components = rows(path, "legacy_components")
+
+    assert [(c["id"], c["type"], c["tags"] if "tags" in c else None) for c in components] == [
+        ("customer", "person", ["actors"]),
+        ("admin", "person", ["actors"]),
+        ("core", "web_ui", ["systems"]),
+        ("svc-a", "component", None),
+        ("svc-b", "database", None),
+        ("base", "service", ["vendors"]),
+        ("stripe-eu", "service", ["vendors"]),
+        ("flag", "service", [True]),
+    ]
+    assert components[2]["name"] == "Core v2"
+    assert components[6]["name"] == "Stripe"
+    assert components[6]["region"] == "eu"
+
+
+def test_string_deployments_move_to_metadata(tmp_path: Any) -> None:
+    path = tmp_path / "internal.yaml"
+    path.write_text("systems:\n  core: {metadata: {team: x}, deployment: k8s}\n  edge: {deployment: {replicas: 2}}\n")
+
+    core, edge = rows(path, "legacy_components")
+
+    assert core["metadata"] == {"team": "x", "deployment_string": "k8s"}
+    assert edge["deployment"] == {"replicas": 2}
+
+
+def test_unparsable_block_is_skipped(tmp_path: Any) -> None:
+    path = tmp_path / "internal.yaml"
+    path.write_text("actors:\n  a: {name: A}\n  b: {name: [B\n- id: kept\n")
+
+    assert [c["id"] for c in rows(path, "legacy_components")] == ["kept"]
+
+
+def test_block_with_a_duplicate_anchor_is_skipped_whole(tmp_path: Any) -> None:
+    # Each entry parses alone, but the block as a whole does not
+    path = tmp_path / "internal.yaml"
+    path.write_text("systems:\n  a: &dup {name: A}\n  b: &dup {name: B}\n- id: kept\n")
+
+    assert [c["id"] for c in rows(path, "legacy_components")] == ["kept"]
+
+
+def test_parallel_parse_reports_progress(tmp_path: Any, monkeypatch: Any) -> None:
+    monkeypatch.setattr(legacy_sources, "BATCH", 3)
+    path = tmp_path / "internal.yaml"
+    path.write_text(INVENTORY * 5)
+    reports: list[tuple[int, int]] = []
+
+    parallel = rows(path, "legacy_components", workers=2, progress=lambda *report: reports.append(report))
+
+    assert parallel == rows(path, "legacy_components")
+    assert reports[-1] == (50, path.stat().st_size)
+    assert [entries for entries, _ in reports] == sorted(entries for entries, _ in reports)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_flow_sections_map_to_legacy_flows(tmp_path: Any, workers: int) -> None:
+    path = tmp_path / "internal-flow.yaml"
+    path.write_text(FLOWS)
+
+    phone, verification = rows(path, "legacy_flows", workers=workers)
+
+    assert phone["description"] == "Phone Verification"
+    assert phone["tags"] == ["live"]
+    assert phone["metadata"] == {"status": "live"}
+    assert [(s["description"], s["protocol"]) for s in phone["steps"]] == [
+        ("Send code\\n[phone]", None), ("Interaction", "HTTP 200"),
+    ]
+    assert verification == {
+        "id": "id-verification", "description": "Imported Flow", "steps": [], "tags": ["import"], "metadata": {},
+    }
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_ingester_reads_legacy_sources(tmp_path: Any, stream: bool) -> None:
+    (tmp_path / "internal.yaml").write_text(INVENTORY)
+    config = tmp_path / "ingestion_config.yaml"
+    with open(config, "w") as f:
+        YAML(typ="safe").dump({
+            "sources": [{"file": "internal.yaml", "format": "legacy_components", "workers": 2, "stream": stream}],
+            "mappings": {"components": [{
+                "source_path": "internal", "item_model": "Service", "spec": {"id": "id", "name": "name"},
+            }]},
+        }, f)
+
+    results = SeedIngester(str(config), str(tmp_path)).ingest()
+
+    assert [c.id for c in results["components"]] == [
+        "customer", "admin", "core", "svc-a", "svc-b", "base", "stripe-eu", "flag",
+    ]
@@ -0,0 +1,108 @@
+from itertools import pairwise
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+from diagram_generator.core.domain.component import Component, ComponentType, Service
+from diagram_generator.core.domain.flow import Flow, FlowStep
+from diagram_generator.core.domain.relationship import Relationship
+from diagram_generator.core.domain.view_config import Type as ViewType
+from diagram_generator.core.domain.view_config import ViewConfig
+from diagram_generator.core.services.component_hierarchy import ComponentHierarchy
+from diagram_generator.core.use_cases.generate_diagram import GenerateDiagramUseCase
+
+
+def build_model() -> tuple[list[Component], list[Relationship]]:
+    """3 systems x 3 containers x 4 services, every service calling its successor."""
+    components: list[Component] = []
+    for s in range(3):
+        for c in range(3):
+            for i in range(4):
+                components.append(Service(
+                    id=f"s{s}-c{c}-{i}", name=f"Svc {i}", type=ComponentType.service,
+                    metadata={"group": f"System {s}.Container {c}"},
+                ))
+    relationships = [
+        Relationship(source_id=a.id, target_id=b.id, description="calls", protocol=None)
+        for a, b in pairwise(components)
+    ]
+    return components, relationships
+
+
+def render_args(view: ViewConfig, flows: list[Flow] | None = None) -> tuple[Any, ...]:
+    components, relationships = build_model()
+    metadata = MagicMock()
+    metadata.load_components.return_value = components
+    metadata.load_relationships.return_value = relationships
+    metadata.load_view_configs.return_value = [view]
+    metadata.load_flows.return_value = flows or []
+    diagram = MagicMock()
+
+    GenerateDiagramUseCase(metadata, diagram).execute(view.key)
+    return tuple(diagram.render.call_args[0])
+
+
+@pytest.mark.parametrize(("max_nodes", "expected_level", "expected_nodes"), [
+    (100, None, 36),
+    (20, "container", 9),
+    (5, "system", 3),
+    (1, "system", 3), # Nothing fits: degrade to the coarsest level
+])
+def test_budget_picks_finest_fitting_level(max_nodes: int, expected_level: str | None, expected_nodes: int) -> None:
+    view = ViewConfig(key="v", title="V", type=ViewType.flowchart, max_nodes=max_nodes)
+
+    config, components, relationships, _ = render_args(view)
+
+    assert config.abstraction_level == expected_level
+    assert len(components) == expected_nodes
+    ids = {c.id for c in components}
+    assert all(r.source_id in ids and r.target_id in ids for r in relationships)
+
+
+def test_edge_budget_on_flow_view() -> None:
+    components, _ = build_model()
+    steps = [
+        FlowStep(source_id=a.id, target_id=b.id, description="step", protocol=None, is_dashed=False)
+        for a, b in pairwise(components)
+    ]
+    flow = Flow(id="f", description="F", steps=steps)
+    view = ViewConfig(key="v", title="V", type=ViewType.sequence, flow_id="f", max_edges=10)
+
+    config, _, _, flows = render_args(view, [flow])
+
+    assert config.abstraction_level == "container"
+    rendered = next(f for f in flows if f.id == config.flow_id)
+    assert len(rendered.steps) == 8 # noqa: PLR2004
+
+
+def test_estimate_matches_rolled_up_graph() -> None:
+    components, relationships = build_model()
+    hierarchy = ComponentHierarchy(components)
+    edges = [(r.source_id, r.target_id) for r in relationships]
+    ids = [c.id for c in components]
+
+    assert hierarchy.estimate_size(ids, edges, "component") == (36, 35)
+    assert hierarchy.estimate_size(ids, edges, "container") == (9, 8)
+    assert hierarchy.estimate_size(ids, edges, "system") == (3, 2)
+
+
+def test_budgeted_views_share_the_abstractors_hierarchy() -> None:
+    components, relationships = build_model()
+    metadata = MagicMock()
+    metadata.load_components.return_value = components
+    metadata.load_relationships.return_value = relationships
+    metadata.load_view_configs.return_value = [
+        ViewConfig(key=f"v{budget}", title="V", type=ViewType.flowchart, max_nodes=budget) for budget in (20, 5)
+    ]
+    metadata.load_flows.return_value = []
+    use_case = GenerateDiagramUseCase(metadata, MagicMock())
+
+    use_case.prepare("v20")
+    hierarchy = use_case._abstractor.hierarchy(components)
+    parents = hierarchy.parent_map("container")
+    use_case.prepare("v5")
+
+    # Same trie, and the parent maps the first view's estimate built were kept
+    assert use_case._abstractor.hierarchy(components) is hierarchy
+    assert hierarchy.parent_map("container") is parents
@@ -0,0 +1,73 @@
+from typing import Any
+
+from ruamel.yaml import YAML
+
+from diagram_generator.core.services.seed_ingester import SeedIngester
+
+MAPPINGS = {
+    "components": [
+        {"source_path": "services", "item_model": "Service", "spec": {"id": "id", "name": "name"}},
+        {"source_path": "databases", "item_model": "Database", "spec": {"id": "id", "name": "name"}},
+    ],
+    "flows": [
+        {"source_path": "flows", "spec": {"id": "id", "description": "name", "metadata": {"direction": "path"}}},
+    ],
+    "relationships": [
+        {"source_path": "services", "spec": {"source_id": "name", "targets": "uses", "type": "dependency"}},
+        {"source_path": "flows", "spec": {"direction": "path", "type": "flow_step"}},
+    ],
+}
+
+SEEDS = {
+    # Uses names defined by the sources after it
+    "payments.yaml": (
+        "services:\n"
+        "  - {id: payments, name: Payments Service, uses: [Ledger DB, Orders Service]}\n"
+        "flows:\n"
+        "  - {id: pay, name: Pay, path: Payments Service -> Orders Service -> Ledger DB}\n"
+    ),
+    "orders.yaml": (
+        "services:\n"
+        "  - {id: orders, name: Orders Service, uses: Ledger DB}\n"
+        "  - {id: carts, name: Carts Service, uses: [Orders Service, Unknown Thing]}\n"
+    ),
+    "data.yaml": "databases:\n  - {id: ledger-db, name: Ledger DB}\n",
+}
+
+
+def ingester(tmp_path: Any, files: list[str], stream: tuple[str, ...] = ()) -> SeedIngester:
+    for name, seed in SEEDS.items():
+        (tmp_path / name).write_text(seed)
+    config = {
+        "sources": [{"file": name, "format": "yaml", "stream": name in stream} for name in files],
+        "mappings": MAPPINGS,
+    }
+    path = tmp_path / "ingestion_config.yaml"
+    with open(path, "w") as f:
+        YAML(typ="safe").dump(config, f)
+    return SeedIngester(str(path), str(tmp_path))
+
+
+def dump(results: dict[str, list[Any]]) -> dict[str, list[dict[str, Any]]]:
+    return {kind: [r.model_dump(mode="json") for r in records] for kind, records in results.items()}
+
+
+def test_parallel_ingest_matches_serial_ingest(tmp_path: Any) -> None:
+    files = ["payments.yaml", "orders.yaml", "missing.yaml", "data.yaml"]
+    serial = dump(ingester(tmp_path, files, stream=("orders.yaml",)).ingest())
+    parallel = dump(ingester(tmp_path, files, stream=("orders.yaml",)).ingest(workers=2))
+
+    assert parallel == serial
+    assert [c["id"] for c in serial["components"]] == ["payments", "orders", "carts", "ledger-db"]
+
+
+def test_names_resolve_whatever_the_source_order(tmp_path: Any) -> None:
+    forward = dump(ingester(tmp_path, ["payments.yaml", "orders.yaml", "data.yaml"]).ingest())
+    backward = dump(ingester(tmp_path, ["data.yaml", "orders.yaml", "payments.yaml"]).ingest(workers=2))
+
+    edges = {(r["source_id"], r["target_id"]) for r in forward["relationships"]}
+    assert edges == {(r["source_id"], r["target_id"]) for r in backward["relationships"]}
+    assert edges == {
+        ("payments", "ledger-db"), ("payments", "orders"), ("orders", "ledger-db"),
+        ("carts", "orders"), ("carts", "Unknown_Thing"),
+    }
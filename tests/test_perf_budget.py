@@ -0,0 +1,53 @@
+import json
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from diagram_generator.benchmarks.runner import BenchmarkRunner, compare_results
+from diagram_generator.benchmarks.scaled import ScaledRepoGenerator
+from diagram_generator.benchmarks.synthetic import SyntheticRepoGenerator, SyntheticSpec
+
+BUDGET_FILE = Path(__file__).parent / "perf_budget.json"
+
+
+def _complex_bank_x100(root: Path) -> None:
+    ScaledRepoGenerator(Path("examples/complex_bank"), 100).generate(root)
+
+
+def _dsl_parse_50k(root: Path) -> None:
+    spec = SyntheticSpec(components=1_000, relationships=0, flows=0, dsl_files=1, dsl_lines=50_000, views=0)
+    SyntheticRepoGenerator(spec).generate(root)
+
+
+# Fixed models the budget is measured on
+BENCHMARKS: dict[str, Callable[[Path], None]] = {
+    "complex_bank_x100": _complex_bank_x100,
+    "dsl_parse_50k": _dsl_parse_50k,
+}
+
+
+@pytest.mark.perf
+@pytest.mark.parametrize("name", list(BENCHMARKS))
+def test_stays_within_budget(name: str, tmp_path: Any, request: pytest.FixtureRequest) -> None:
+    BENCHMARKS[name](tmp_path / "data")
+    results = BenchmarkRunner(str(tmp_path / "data"), "templates", str(tmp_path / "dist")).run()
+
+    budget = json.loads(BUDGET_FILE.read_text())
+    entry = budget["benchmarks"][name]
+
+    if request.config.getoption("--update-perf-budget"):
+        # Only the stages (and total) already budgeted are gated, so only those are rewritten
+        entry["stages"] = {stage: results["stages"][stage] for stage in entry["stages"]}
+        if "total" in entry:
+            entry["total"] = results["total"]
+        BUDGET_FILE.write_text(json.dumps(budget, indent=2) + "\n")
+        return
+
+    rows = compare_results(entry, results, entry["tolerance"], entry.get("tolerances"), entry.get("min_delta", 0.0))
+    regressed = [
+        f"{row['stage']}: {row['baseline']:.3f}s -> {row['current']:.3f}s (allowed +{row['tolerance']:.0%})"
+        for row in rows if row["regressed"]
+    ]
+    assert not regressed, f"{name} regressed past its budget in {BUDGET_FILE.name}:\n" + "\n".join(regressed)
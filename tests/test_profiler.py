@@ -0,0 +1,91 @@
+import json
+from typing import Any
+
+from typer.testing import CliRunner
+
+from diagram_generator.cli.main import app
+from diagram_generator.core.domain.flow import Flow, FlowStep
+from diagram_generator.core.services.memory_report import SizeBreakdown
+from diagram_generator.core.services.profiler import profiling, span
+
+runner = CliRunner()
+
+
+def test_spans_are_noops_when_disabled() -> None:
+    first = span("render", view="a")
+    second = span("load")
+
+    assert first is second # One shared no-op, nothing recorded or allocated per call
+    with first:
+        pass
+
+
+def test_spans_nest_and_summarise() -> None:
+    with profiling() as profiler:
+        for view in ("a", "b"):
+            with span("view", "view", view=view), span("render", "render", view=view):
+                pass
+
+    assert [s.name for s in profiler.spans] == ["render", "view", "render", "view"]
+    assert {name: calls for name, calls, _, _ in profiler.summary()} == {"view": 2, "render": 2}
+    assert {row[0] for row in profiler.top("view", ("view",))} == {"a", "b"}
+    assert span("after") is span("again") # Deactivated on exit
+
+
+def test_generate_all_writes_chrome_trace(tmp_path: Any) -> None:
+    trace_file = tmp_path / "trace.json"
+
+    result = runner.invoke(app, [
+        "generate-all", "--data-dir", "tests/data", "--output-dir", str(tmp_path / "dist"),
+        "--trace-file", str(trace_file),
+    ])
+
+    assert result.exit_code == 0
+    assert "Slowest Views" in result.stdout
+    events = json.loads(trace_file.read_text())["traceEvents"]
+    names = {e["name"] for e in events}
+    assert {"view", "load", "yaml.parse", "render", "write"} <= names
+    assert all(e["ph"] == "X" and e["dur"] >= 0 for e in events)
+
+
+def test_memory_spans_record_peak_and_retained() -> None:
+    kept = []
+    with profiling(memory=True) as profiler:
+        with span("outer"):
+            with span("temporary"):
+                len([0] * 1_000_000) # ~8 MB, freed before the span ends
+            with span("kept"):
+                kept.append([1] * 100_000)
+
+    rows = {name: (peak, retained) for name, _, peak, retained in profiler.memory_summary()}
+    assert rows["temporary"][0] > 7_000_000 # noqa: PLR2004
+    assert rows["temporary"][1] < 100_000 # noqa: PLR2004
+    assert rows["kept"][1] > 700_000 # noqa: PLR2004
+    assert rows["outer"][0] >= rows["temporary"][0] # Nested peaks propagate outwards
+    assert profiler.snapshot is not None
+
+
+def test_size_breakdown_counts_nested_models_once() -> None:
+    step = FlowStep(source_id="a", target_id="b", description="call", protocol=None, is_dashed=False)
+    flows = [Flow(id="f", description="F", steps=[step]), Flow(id="g", description="G", steps=[step])]
+
+    breakdown = SizeBreakdown()
+    breakdown.add("flows", flows)
+    breakdown.add("steps", [step]) # Already counted through the flows
+
+    types = {name: count for name, count, _ in breakdown.top_types(limit=100)}
+    assert types["Flow"] == 2 # noqa: PLR2004
+    assert types["FlowStep"] == 1
+    assert breakdown.kinds["steps"] == (1, 0)
+    assert breakdown.kinds["flows"][1] > 0
+
+
+def test_generate_all_memory_report(tmp_path: Any) -> None:
+    result = runner.invoke(app, [
+        "generate-all", "--data-dir", "tests/data", "--output-dir", str(tmp_path / "dist"), "--memory-report",
+    ])
+
+    assert result.exit_code == 0
+    assert "Memory per Stage" in result.stdout
+    assert "Top Allocation Sites" in result.stdout
+    assert "Loaded Model by Object Type" in result.stdout
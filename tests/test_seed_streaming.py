@@ -0,0 +1,99 @@
+from pathlib import Path
+from typing import Any
+
+import yaml
+from ruamel.yaml import YAML
+from typer.testing import CliRunner
+
+from diagram_generator.cli.main import app
+from diagram_generator.core.services.seed_ingester import SeedIngester
+from diagram_generator.core.services.yaml_stream import YAMLListStream
+
+ROOT = Path(__file__).parent.parent
+
+SEED = """\
+defaults: &defaults {tier: gold, layer: core}
+system_context:
+  components:
+    - {id: bank, name: Bank, platform: cloud}
+capabilities:
+  - id: payments
+    name: Payments Service
+    domain: Payments
+    <<: *defaults
+    depends_on: [Orders Service, ledger-db]
+  - {id: orders, name: Orders Service, domain: Orders, tier: 2, depends_on: Payments Service}
+  - {name: No Id}
+data_architecture:
+  technical_capability_dbs:
+    databases_list:
+      - {db_instance: ledger-db, db_type: postgres, service: Payments Service, data_ownership: {owner_domain: Payments}}
+      - {db_instance: no-type-db, service: Orders Service}
+hld_flows:
+  - {id: checkout, name: Checkout, status: live, api: {direction: "Payments Service -> Orders Service"}}
+  - {id: refunds, name: Refunds, api: {direction: "orders → ledger-db"}}
+"""
+
+
+def ingester(tmp_path: Any, stream: bool) -> SeedIngester:
+    (tmp_path / "seed.yaml").write_text(SEED)
+    config = YAML(typ="safe").load((ROOT / "ingestion_config.yaml").read_text())
+    config["sources"] = [{"file": str(tmp_path / "seed.yaml"), "format": "yaml", "stream": stream}]
+    path = tmp_path / f"ingestion_config_{stream}.yaml"
+    with open(path, "w") as f:
+        YAML(typ="safe").dump(config, f)
+    return SeedIngester(str(path), str(tmp_path))
+
+
+def dump(records: list[Any]) -> list[dict[str, Any]]:
+    return [r.model_dump(mode="json") for r in records]
+
+
+def test_streaming_ingests_what_a_whole_document_load_does(tmp_path: Any) -> None:
+    whole = ingester(tmp_path, stream=False).ingest()
+    streamed = ingester(tmp_path, stream=True).ingest()
+
+    # The same records; only the order across mappings of one kind may differ
+    for kind in ("components", "flows", "relationships"):
+        assert sorted(dump(streamed[kind]), key=repr) == sorted(dump(whole[kind]), key=repr), kind
+    assert [c.id for c in streamed["components"]] == ["bank", "payments", "orders", "ledger-db"]
+    assert streamed["components"][1].metadata["tier"] == "gold"
+    assert streamed["components"][2].metadata["tier"] == 2 # noqa: PLR2004
+    assert ("payments", "orders") in [(r.source_id, r.target_id) for r in streamed["relationships"]]
+
+
+def test_list_stream_yields_items_as_they_are_read(tmp_path: Any) -> None:
+    path = tmp_path / "seed.yaml"
+    path.write_text(SEED)
+    items = YAMLListStream(path).items(["capabilities", "hld_flows", "missing.path"])
+
+    source_path, first = next(items)
+
+    assert (source_path, first["id"], first["tier"]) == ("capabilities", "payments", "gold")
+    assert [(p, i.get("id")) for p, i in items] == [
+        ("capabilities", "orders"), ("capabilities", None), ("hld_flows", "checkout"), ("hld_flows", "refunds"),
+    ]
+
+
+def test_list_stream_reads_json(tmp_path: Any) -> None:
+    path = tmp_path / "seed.json"
+    path.write_text('{"meta": {"n": 2}, "data": {"items": [{"id": "a", "n": 1.5}, {"id": "b", "ok": true}]}}')
+
+    assert [item for _, item in YAMLListStream(path).items(["data.items"])] == [
+        {"id": "a", "n": 1.5}, {"id": "b", "ok": True},
+    ]
+
+
+def test_ingest_command_writes_what_it_used_to(tmp_path: Any) -> None:
+    results = ingester(tmp_path, stream=False).ingest()
+    ingester(tmp_path, stream=True)
+
+    result = CliRunner().invoke(app, [
+        "ingest", "--config", str(tmp_path / "ingestion_config_True.yaml"), "--output-dir", str(tmp_path),
+    ])
+
+    assert result.exit_code == 0, result.output
+    # Records are written one by one, in the same YAML as dumping them all at once
+    for kind in ("components", "flows", "relationships"):
+        expected = yaml.dump({kind: [r.model_dump(exclude_none=True, mode="json") for r in results[kind]]})
+        assert (tmp_path / f"ingested_{kind}.yaml").read_text() == expected
@@ -0,0 +1,98 @@
+import json
+from typing import Any
+
+import pytest
+from ruamel.yaml import YAML
+
+from diagram_generator.core.services.seed_ingester import SeedIngester
+from diagram_generator.core.services.source_streams import JSONListStream, RowStream
+
+MAPPINGS = {
+    "components": [{
+        "source_path": "cmdb",
+        "item_model": "Service",
+        "spec": {"id": "id", "name": "name", "metadata": {"group": "owner.domain", "tier": "tier"}},
+    }],
+    "relationships": [{"source_path": "cmdb", "spec": {"source_id": "name", "targets": "uses"}}],
+}
+
+
+def ingest(tmp_path: Any, source: dict[str, Any]) -> dict[str, list[Any]]:
+    config = tmp_path / "ingestion_config.yaml"
+    with open(config, "w") as f:
+        YAML(typ="safe").dump({"sources": [source], "mappings": MAPPINGS}, f)
+    return SeedIngester(str(config), str(tmp_path)).ingest()
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_csv_rows_nest_dotted_columns(tmp_path: Any, stream: bool) -> None:
+    (tmp_path / "cmdb.csv").write_text(
+        "﻿id;name;owner.domain;tier;uses\n"
+        "api;API;Payments;1;Ledger\n"
+        "ledger;Ledger;;2;\n"
+    )
+
+    results = ingest(tmp_path, {"file": "cmdb.csv", "format": "csv", "delimiter": ";", "stream": stream})
+
+    assert [(c.id, c.metadata) for c in results["components"]] == [
+        ("api", {"group": "Payments", "tier": "1"}), ("ledger", {"group": None, "tier": "2"}),
+    ]
+    assert [(r.source_id, r.target_id) for r in results["relationships"]] == [("api", "ledger")]
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_jsonl_rows_skip_invalid_lines(tmp_path: Any, stream: bool) -> None:
+    (tmp_path / "export.jsonl").write_text(
+        '{"id": "api", "name": "API", "owner": {"domain": "Payments"}}\n'
+        "\n"
+        '{"id": "broken", \n'
+        '{"id": "db", "name": "DB", "tier": 2}\n'
+    )
+
+    results = ingest(tmp_path, {"file": "export.jsonl", "format": "jsonl", "root": "cmdb", "stream": stream})
+
+    assert [(c.id, c.metadata) for c in results["components"]] == [
+        ("api", {"group": "Payments", "tier": None}), ("db", {"group": None, "tier": 2}),
+    ]
+
+
+def test_json_streams_what_it_loads(tmp_path: Any) -> None:
+    count = 50
+    document = {
+        "meta": {"cmdb": [{"id": "not-this-one"}], "note": "brackets ] in [ strings } {"},
+        "cmdb": [{"id": f"svc-{i}", "name": f"Service {i}", "uses": [f"Service {i + 1}"], "tier": i / 3}
+                 for i in range(count)],
+    }
+    (tmp_path / "cmdb.json").write_text(json.dumps(document, indent=2))
+
+    whole = ingest(tmp_path, {"file": "cmdb.json", "format": "json"})
+    streamed = ingest(tmp_path, {"file": "cmdb.json", "format": "json", "stream": True})
+
+    assert len(whole["components"]) == count
+    for kind in ("components", "relationships"):
+        assert [r.model_dump() for r in streamed[kind]] == [r.model_dump() for r in whole[kind]]
+
+
+def test_json_stream_reads_across_small_buffers(tmp_path: Any, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(JSONListStream, "CHUNK", 3)
+    items = [{"n": -12.5e-3, "s": 'quote " and \\ backslash', "u": "ünï"}, [1, [2, {}]], 123456789, None]
+    path = tmp_path / "data.json"
+    path.write_text(json.dumps({"skip": {"x": [items]}, "data": {"items": items}}, ensure_ascii=False))
+
+    assert [item for _, item in JSONListStream(path).items(["data.items"])] == items
+
+
+def test_unknown_formats_are_reported(tmp_path: Any, capsys: pytest.CaptureFixture[str]) -> None:
+    (tmp_path / "cmdb.xml").write_text("<cmdb/>")
+
+    assert ingest(tmp_path, {"file": "cmdb.xml", "format": "xml"}) == {
+        "components": [], "flows": [], "relationships": [],
+    }
+    assert "Unknown format xml" in capsys.readouterr().out
+
+
+def test_rows_default_to_the_file_stem(tmp_path: Any) -> None:
+    (tmp_path / "cmdb.jsonl").write_text('{"id": "a", "name": "A"}\n')
+
+    assert list(RowStream(tmp_path / "cmdb.jsonl", "jsonl", "cmdb").items(["other"])) == []
+    assert [c.id for c in ingest(tmp_path, {"file": "cmdb.jsonl", "format": "jsonl"})["components"]] == ["a"]
@@ -0,0 +1,129 @@
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+from typer.testing import CliRunner
+
+from diagram_generator.adapters.input.source_validator import SourceValidator
+from diagram_generator.cli.main import app
+
+runner = CliRunner()
+
+FILES = {
+    "components/core.yaml": """\
+components:
+  - {id: web, name: Web, type: service, metadata: {group: Bank.Channels}}
+  - {id: api, name: API, type: service, metadata: {group: Bank..Core}}
+  - {id: db, name: DB, type: database, metadata: {group: "Bank.Core Banking"}}
+  - {id: ledger, name: Ledger, type: service, metadata: {group: Bank.Core_Banking}}
+  - {id: core, name: Core, type: system}
+  - {id: broken, type: service}
+""",
+    "components/more.jsonl": '{"id": "api", "name": "API v2", "type": "service"}\n\nnot json\n',
+    "components/bad.yaml": "components:\n  - {id: x\n",
+    "relationships/core.yaml": """\
+- {source_id: web, target_id: api, description: Calls}
+- {source_id: api, target_id: cache, description: Reads}
+- {source_id: api, description: Missing target}
+""",
+    "relationships/pay.flow": 'group "Bank.Channels" {\n  web -> api : "Pay"\n}\napi -> psp : "Charge"\n',
+    "relationships/broken.flow": "web -> -> api\n",
+    "flows/flows.yaml": """\
+flows:
+  - id: refund
+    description: Refund
+    steps:
+      - {source_id: web, target_id: api, description: Refund}
+      - {source_id: api, target_id: ghost, description: Lost}
+      - {source_id: NOTE_ANCHOR, target_id: NOTE_ANCHOR, description: Note, metadata: {type: note}}
+  - {id: pay, description: Also pay, steps: []}
+""",
+    "views/views.yaml": """\
+- {key: pay, title: Pay, type: sequence, flow_id: pay}
+- {key: nope, title: Nope, type: sequence, flow_id: missing}
+- {key: scoped, title: Scoped, type: c4_container, scope_id: nowhere}
+- {key: pay, title: Again, type: c4_context}
+""",
+}
+
+
+@pytest.fixture
+def data_dir(tmp_path: Any) -> Path:
+    for name, content in FILES.items():
+        path = tmp_path / name
+        path.parent.mkdir(exist_ok=True)
+        path.write_text(content)
+    return Path(tmp_path)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_every_check_reports_its_issues(data_dir: Path, workers: int) -> None:
+    report = SourceValidator(data_dir).run(workers)
+
+    issues = [(i["check"], i["location"], i["severity"]) for i in report["issues"]]
+    assert issues == [
+        ("parse", "components/bad.yaml", "error"),
+        ("parse", "components/more.jsonl:3", "error"),
+        ("parse", "relationships/broken.flow", "error"),
+        ("schema", "components/core.yaml#6", "error"),
+        ("schema", "relationships/core.yaml#3", "error"),
+        ("duplicate_id", "components/more.jsonl:1", "error"),
+        ("duplicate_id", "flows/flows.yaml#2", "error"),
+        ("duplicate_id", "views/views.yaml#4", "error"),
+        ("dangling_relationship", "relationships/core.yaml#2", "warning"),
+        ("dangling_relationship", "relationships/pay.flow", "warning"),
+        ("dangling_flow_step", "flows/flows.yaml#1", "error"),
+        ("unknown_flow", "views/views.yaml#2", "error"),
+        ("unknown_scope", "views/views.yaml#3", "error"),
+        ("group_path", "components/core.yaml#2", "error"),
+        ("group_path", "components/core.yaml#4", "error"),
+    ]
+    messages = {i["location"]: i["message"] for i in report["issues"]}
+    assert messages["components/more.jsonl:1"] == "Component id 'api' is also defined at components/core.yaml#2"
+    assert messages["flows/flows.yaml#2"] == "Flow id 'pay' is also defined at relationships/pay.flow"
+    assert messages["flows/flows.yaml#1"] == "Step 2 of flow 'refund': unknown id 'ghost'"
+    assert messages["components/core.yaml#2"] == "Component 'api': group path 'Bank..Core' has an empty segment"
+    assert messages["components/core.yaml#4"] == (
+        "Component 'ledger': group 'Bank.Core_Banking' has the id 'Bank_Core_Banking' of group 'Bank.Core Banking'"
+    )
+    assert (report["errors"], report["warnings"], report["records"], report["files"]) == (13, 2, 19, 8)
+
+
+def test_group_named_like_a_component(tmp_path: Any) -> None:
+    (tmp_path / "components").mkdir()
+    (tmp_path / "components" / "c.yaml").write_text(
+        "- {id: web, name: Web, type: service, metadata: {group: api}}\n- {id: api, name: API, type: service}\n"
+    )
+
+    report = SourceValidator(tmp_path).run()
+
+    assert [i["message"] for i in report["issues"]] == ["Component 'web': group 'api' has the id 'api' of a component"]
+
+
+def test_duplicate_keys_do_not_parse(tmp_path: Any) -> None:
+    (tmp_path / "components").mkdir()
+    (tmp_path / "components" / "c.yaml").write_text("- {id: web, name: Web, type: service, name: Web v2}\n")
+    # A merged key that the mapping overrides is not a duplicate
+    (tmp_path / "components" / "m.yaml").write_text(
+        "- &base {id: api, name: API, type: service}\n- {<<: *base, id: db}\n"
+    )
+
+    report = SourceValidator(tmp_path).run()
+
+    assert [(i["check"], i["location"]) for i in report["issues"]] == [("parse", "components/c.yaml")]
+    assert "found duplicate key 'name'" in report["issues"][0]["message"]
+
+
+def test_validate_command_prints_a_json_report(data_dir: Path) -> None:
+    result = runner.invoke(app, ["validate", "--data-dir", str(data_dir), "--json", "--workers", "1"])
+
+    assert result.exit_code == 1
+    report = json.loads(result.stdout)
+    assert (report["passed"], report["summary"]["duplicate_id"]) == (False, 3)
+
+    result = runner.invoke(app, ["validate", "--data-dir", "examples/complex_bank", "--workers", "1"])
+    assert result.exit_code == 0
+    assert "0 errors" in result.stdout
+    result = runner.invoke(app, ["validate", "--data-dir", "examples/complex_bank", "--strict"])
+    assert result.exit_code == 1
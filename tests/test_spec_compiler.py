@@ -0,0 +1,73 @@
+from typing import Any
+
+import pytest
+from glom import Coalesce, glom
+
+from diagram_generator.core.services.seed_ingester import SeedIngester
+from diagram_generator.core.services.spec_compiler import MissingPathError, compile_path, compile_spec
+
+TARGETS: list[tuple[Any, str]] = [
+    ({}, "items"), # Dicts are only indexed, never searched for attributes
+    ({"a": {}}, "a.keys"),
+    ({"a": [{"b": 1}, {"b": 2}]}, "a.1.b"),
+    ({"a": [1]}, "a.5"),
+    ({"a": [1, 2]}, "a.-1"),
+    ({"a": (1, 2)}, "a.0"),
+    ({"a": [1]}, "a.x"),
+    ({"a": None}, "a.b"),
+    ({"a": "text"}, "a.upper"), # Anything else is searched for attributes
+    ({"a": {"1": "x"}}, "a.1"),
+    ({"a": {1: "x"}}, "a.1"), # Not converted to int for dicts
+    ({"a": {"b": None}}, "a.b"),
+    ({"a.b": 1}, "a.b"),
+    ({"a": [{"b": 1}, {"c": 2}]}, "a.*.b"),
+    ({"": 1}, ""),
+    ({"a": {"": 2}}, "a."),
+]
+
+
+@pytest.mark.parametrize(("target", "path"), TARGETS)
+def test_paths_resolve_like_glom(target: Any, path: str) -> None:
+    assert compile_path(path)(target) == glom(target, Coalesce(path, default=None))
+
+
+def test_specs_match_the_safe_glom_spec(tmp_path: Any) -> None:
+    spec = {"id": "id", "name": "name", "metadata": {"owner": "owner.domain", "first": "tags.0"}}
+    items = [
+        {"id": "a", "name": "A", "owner": {"domain": "payments"}, "tags": ["x", "y"]},
+        {"id": "b", "owner": "not a dict", "tags": []},
+        {},
+    ]
+    (tmp_path / "ingestion_config.yaml").write_text("sources: []\n")
+    safe_spec = SeedIngester(str(tmp_path / "ingestion_config.yaml"), str(tmp_path))._build_safe_spec(spec)
+
+    assert [compile_spec(spec)(item) for item in items] == [glom(item, safe_spec) for item in items]
+
+
+def test_t_paths_are_required() -> None:
+    extract = compile_spec({"id": "id", "type": "T.db_type"})
+
+    assert extract({"db_type": "postgres"}) == {"id": None, "type": "postgres"}
+    with pytest.raises(MissingPathError, match="db_type"):
+        extract({"id": "db"})
+
+
+def test_ingester_skips_items_missing_required_paths(tmp_path: Any) -> None:
+    (tmp_path / "seed.yaml").write_text(
+        "databases:\n"
+        "  - {db_instance: orders-db, db_type: postgres, owner: {domain: Orders}}\n"
+        "  - {db_instance: no-type-db}\n"
+    )
+    config = tmp_path / "ingestion_config.yaml"
+    config.write_text(
+        "sources:\n  - {file: seed.yaml, format: yaml}\n"
+        "mappings:\n"
+        "  components:\n"
+        "    - source_path: databases\n"
+        "      item_model: Database\n"
+        "      spec: {id: db_instance, name: db_instance, type: T.db_type, metadata: {group: owner.domain}}\n"
+    )
+
+    components = SeedIngester(str(config), str(tmp_path)).ingest()["components"]
+
+    assert [(c.id, c.metadata) for c in components] == [("orders-db", {"group": "Orders"})]
@@ -0,0 +1,151 @@
+import sqlite3
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+from typer.testing import CliRunner
+
+from diagram_generator.adapters.input.bundle_loader import BundleMetadataAdapter
+from diagram_generator.adapters.input.factory import open_metadata
+from diagram_generator.adapters.input.sqlite_loader import SQLiteMetadataAdapter, write_database
+from diagram_generator.cli.main import app
+from diagram_generator.core.domain.compact_flow import CompactFlow
+from diagram_generator.core.domain.component import Database, Service
+from diagram_generator.core.domain.flow import Flow, FlowStep
+from diagram_generator.core.domain.relationship import Relationship
+from diagram_generator.core.domain.view_config import Filters, ViewConfig
+from diagram_generator.core.domain.view_config import Type as ViewType
+from diagram_generator.core.use_cases.generate_diagram import GenerateDiagramUseCase
+
+runner = CliRunner()
+
+
+def compile_example(tmp_path: Any, name: str) -> Path:
+    path = tmp_path / name
+    result = runner.invoke(app, ["compile", "--data-dir", "examples/complex_bank", "--output", str(path)])
+    assert result.exit_code == 0, result.stdout
+    return path # type: ignore[no-any-return]
+
+
+def test_database_matches_bundle(tmp_path: Any) -> None:
+    database = open_metadata(str(compile_example(tmp_path, "model.sqlite")))
+    bundle = BundleMetadataAdapter(str(compile_example(tmp_path, "model.dgb")))
+
+    assert isinstance(database, SQLiteMetadataAdapter)
+    assert database.load_components() == bundle.load_components()
+    assert database.load_relationships() == bundle.load_relationships()
+    assert database.load_flows() == bundle.load_flows()
+    assert database.load_view_configs() == bundle.load_view_configs()
+
+
+def test_filter_graph_is_pushed_down(tmp_path: Any) -> None:
+    adapter = SQLiteMetadataAdapter(str(compile_example(tmp_path, "model.db")))
+    use_case = GenerateDiagramUseCase(adapter, MagicMock())
+    components, relationships = adapter.load_components(), adapter.load_relationships()
+
+    for view in adapter.load_view_configs():
+        assert adapter.filter_graph(view) == use_case.filter_graph(view, components, relationships)
+
+
+GROUPED = [
+    Service(id="api", name="API", tags=["edge", "public"], metadata={"group": "Bank . Core"}),
+    Service(id="db-proxy", name="Proxy", tags=["internal"], metadata={"group": "Bank.Core.Data"}),
+    Database(id="ledger", name="Ledger", tags=["internal"], metadata={"group": "Bank.Core.Data"}),
+    Service(id="other", name="Other", metadata={"group": "Bankers"}),
+]
+GROUPED_RELATIONSHIPS = [
+    Relationship(source_id="api", target_id="db-proxy", description="reads"),
+    Relationship(source_id="db-proxy", target_id="ledger", description="queries"),
+    Relationship(source_id="other", target_id="api", description="calls"),
+]
+
+
+def test_indexed_queries(tmp_path: Any) -> None:
+    path = tmp_path / "model.sqlite"
+    write_database(path, GROUPED, GROUPED_RELATIONSHIPS, [], [])
+    adapter = SQLiteMetadataAdapter(str(path))
+
+    assert adapter.load_component("db-proxy") == GROUPED[1]
+    assert adapter.load_component("missing") is None
+    assert adapter.components_with_tags(["public", "internal"]) == GROUPED[:3]
+    assert adapter.components_of_type("service") == [GROUPED[0], GROUPED[1], GROUPED[3]]
+    assert adapter.components_in_group("Bank") == GROUPED[:3] # Not "Bankers"
+    assert adapter.components_in_group("Bank.Core.Data") == GROUPED[1:3]
+    assert adapter.relationships_of("api", "out") == GROUPED_RELATIONSHIPS[:1]
+    assert adapter.relationships_of("api", "in") == GROUPED_RELATIONSHIPS[2:]
+    assert adapter.relationships_of("api") == [GROUPED_RELATIONSHIPS[0], GROUPED_RELATIONSHIPS[2]]
+
+
+@pytest.mark.parametrize("filters", [
+    Filters(types=["service"]),
+    Filters(groups=["Bank"]),
+    Filters(groups=["Bank.Core.Data", "Bankers"]),
+    Filters(groups=["Bank . Core"], types=["service", "person"]),
+    Filters(tags=["internal"], types=["database"], groups=["Bank.Core"]),
+    Filters(groups=["Bank.Co"]),
+])
+def test_type_and_group_filters_are_pushed_down(tmp_path: Any, filters: Filters) -> None:
+    view = ViewConfig(key="v", title="V", type=ViewType.flowchart, filters=filters)
+    path = tmp_path / "model.sqlite"
+    write_database(path, GROUPED, GROUPED_RELATIONSHIPS, [], [view])
+    adapter = SQLiteMetadataAdapter(str(path))
+
+    expected = GenerateDiagramUseCase(MagicMock(), MagicMock()).filter_graph(view, GROUPED, GROUPED_RELATIONSHIPS)
+
+    assert adapter.filter_graph(view) == expected
+    assert "components" not in adapter._models
+
+
+def test_use_case_filters_tagged_views_in_sql(tmp_path: Any) -> None:
+    components = [
+        Service(id="api", name="API", tags=["edge", "public"]),
+        Service(id="db-proxy", name="Proxy", tags=["internal"]),
+        Service(id="other", name="Other"),
+    ]
+    relationships = [
+        Relationship(source_id="api", target_id="db-proxy", description="reads"),
+        Relationship(source_id="other", target_id="api", description="calls"),
+    ]
+    views = [
+        ViewConfig(key="tagged", title="Tagged", type=ViewType.flowchart, filters=Filters(tags=["public", "internal"])),
+        ViewConfig(key="rolled-up", title="Rolled up", type=ViewType.flowchart, abstraction_level="system"),
+    ]
+    path = tmp_path / "model.sqlite"
+    write_database(path, components, relationships, [], views)
+    adapter = SQLiteMetadataAdapter(str(path))
+
+    view, tagged, between, _ = GenerateDiagramUseCase(adapter, MagicMock()).prepare("tagged")
+
+    assert (view, tagged, between) == (views[0], components[:2], relationships[:1])
+    # Answered by the indexes alone: the whole model was never loaded
+    assert "components" not in adapter._models
+    # Roll-ups resolve parents against every component, so those views load the model
+    GenerateDiagramUseCase(adapter, MagicMock()).prepare("rolled-up")
+    assert "components" in adapter._models
+
+
+def test_flows_keep_step_order_and_large_flows_stay_compact(
+    tmp_path: Any, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr("diagram_generator.adapters.input.sqlite_loader.COMPACT_FLOW_STEPS", 3)
+    steps = [FlowStep(source_id=f"s{i}", target_id=f"s{i + 1}", description=f"step {i}") for i in range(12)]
+    small = Flow(id="small", description="Small", steps=steps[:2])
+    large = CompactFlow.from_flow(Flow(id="large", description="Large", steps=steps))
+    path = tmp_path / "flows.sqlite"
+    write_database(path, [], [], [small, large, Flow(id="empty", description="Empty")], [])
+
+    adapter = SQLiteMetadataAdapter(str(path))
+
+    flows = adapter.load_flows()
+    assert flows[:2] == [small, large]
+    assert flows[2].steps == []
+    assert adapter.load_flow("large") == large
+    assert adapter.load_flow("missing") is None
+
+
+def test_database_is_opened_read_only(tmp_path: Any) -> None:
+    adapter = SQLiteMetadataAdapter(str(compile_example(tmp_path, "model.sqlite")))
+
+    with pytest.raises(sqlite3.OperationalError, match="readonly"):
+        adapter.connection.execute("DELETE FROM components")
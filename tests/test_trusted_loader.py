@@ -0,0 +1,61 @@
+import contextlib
+import io
+
+import pytest
+from pydantic import ValidationError
+
+from diagram_generator.adapters.input.yaml_loader import YAMLMetadataAdapter
+from diagram_generator.core.services import trusted_loader
+from diagram_generator.core.services.trusted_loader import (
+    VERIFY_ENV,
+    TrustedDataError,
+    TrustedLoader,
+    dump_records,
+    schema_version,
+)
+
+
+def load_example() -> YAMLMetadataAdapter:
+    return YAMLMetadataAdapter("examples/complex_bank")
+
+
+def test_construct_matches_validation() -> None:
+    adapter = load_example()
+    with contextlib.redirect_stdout(io.StringIO()):
+        loaded = {"components": adapter.load_components(), "relationships": adapter.load_relationships()}
+
+    for kind, models in loaded.items():
+        trusted = TrustedLoader(verify_every=1).load(kind, dump_records(models), schema_version())
+
+        assert trusted == models
+        assert [m.model_fields_set for m in trusted] == [m.model_fields_set for m in models]
+        assert [type(m) for m in trusted] == [type(m) for m in models] # Union members picked by `type`
+
+
+def test_only_matching_stamp_is_trusted() -> None:
+    bad = [{"id": "not valid!", "name": "Bad", "type": "service"}]
+
+    trusted = TrustedLoader().load("components", bad, schema_version())
+    assert trusted[0].id == "not valid!" # Not validated: the stamp vouches for it
+
+    with pytest.raises(ValidationError):
+        TrustedLoader().load("components", bad, "stale-version")
+
+
+def test_models_without_a_converter_are_validated(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(trusted_loader, "_converter", lambda annotation: None)
+    bad = [{"id": "not valid!", "name": "Bad", "type": "service"}]
+
+    with pytest.raises(ValidationError):
+        TrustedLoader().load("components", bad, schema_version())
+
+
+def test_debug_switch_revalidates_a_sample(monkeypatch: pytest.MonkeyPatch) -> None:
+    good = {"id": "ok", "name": "Ok", "type": "service"}
+    records = [good, good, {"id": "not valid!", "name": "Bad", "type": "service"}]
+
+    TrustedLoader(verify_every=3).load("components", records, schema_version()) # Only record 0 is checked
+
+    monkeypatch.setenv(VERIFY_ENV, "1")
+    with pytest.raises(TrustedDataError):
+        TrustedLoader().load("components", records, schema_version())